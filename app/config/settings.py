@@ -39,6 +39,18 @@ class KafkaSettings(BaseConfig):
     ssl_cafile: str = None
     ssl_certfile: str = None
     ssl_keyfile: str = None
+    # Producer tuning
+    acks: Any = Field(default=1)
+    linger_ms: int = Field(default=5)
+    batch_size: int = Field(default=64 * 1024)  # in bytes
+    compression_type: str = None  # gzip, snappy, lz4 or zstd
+    max_in_flight: int = Field(default=500)
+    ack_timeout: float = Field(default=10.0)  # in seconds
+    # Consumer tuning
+    max_poll_records: int = Field(default=500)
+    poll_timeout_ms: int = Field(default=1000)
+    high_water: int = Field(default=1000)  # pause partitions at this many undelivered records
+    low_water: int = Field(default=250)  # resume partitions once drained to this level
 
 # ------------------------------------------------------
 # Redis Settings
@@ -52,6 +64,25 @@ class RedisSettings(BaseConfig):
     port: int = Field(default=6379)
     db: int = Field(default=0)
     url: str = Field(default="redis://localhost:6379/")
+    subscriber_queue_size: int = Field(default=1000)  # maxsize of queues created by subscribe()
+    overflow_policy: str = Field(default="block")  # "block" (backlog per subscriber, nothing lost) or "drop" when a subscriber queue is full
+    embedding_batch_window_ms: float = Field(default=5.0)
+    embedding_max_batch_size: int = Field(default=64)
+    embedding_workers: int = Field(default=1)
+    embedding_cache_size: int = Field(default=10000)  # in-process LRU entries
+    embedding_cache_ttl: int = Field(default=7 * 24 * 3600)  # in seconds; 0 disables expiry
+    context_snapshot_ttl: int = Field(default=24 * 3600)  # in seconds; claim-check contexts for expanded tasks
+    context_snapshot_cache_size: int = Field(default=32)  # snapshots kept in-process per worker
+    context_inline_max_bytes: int = Field(default=16 * 1024)  # smaller contexts are sent inline instead of by snapshot
+    publish_batch_window_ms: float = Field(default=2.0)  # publishes within this window share one pipeline
+    publish_max_batch_size: int = Field(default=256)
+    publish_subscriber_ttl: float = Field(default=1.0)  # in seconds; how long PUBLISH receiver counts are trusted
+    barrier_ttl: int = Field(default=24 * 3600)  # in seconds; fan-in barrier state and collected results
+    read_cache_local_ttl: float = Field(default=30.0)  # in seconds; database reads served from process memory
+    read_cache_ttl: int = Field(default=300)  # in seconds; database reads shared through Redis
+    read_cache_size: int = Field(default=1024)  # in-process entries
+    ingest_chunk_size: int = Field(default=256)  # records embedded and written per pipeline round trip
+    ingest_max_in_flight: int = Field(default=2)  # chunks processed concurrently during bulk loads
 
     class Config:
         env_prefix = 'REDIS_'
@@ -121,6 +152,11 @@ class DatabaseSettings(BaseConfig):
     url: str = Field(default=os.getenv('SUPABASE_URL', ''))
     key: str = Field(default=os.getenv('SUPABASE_KEY', ''))
     auth_service_role_key: str = Field(default=os.getenv('SUPABASE_AUTH_SERVICE_ROLE_KEY', ''))
+    max_connections: int = Field(default=20)  # pooled HTTP connections to the REST API
+    timeout: float = Field(default=30.0)  # in seconds
+    rpc_concurrency: int = Field(default=8)  # concurrent calls in fetch_many and bulk updates
+    bulk_chunk_size: int = Field(default=500)  # rows per bulk insert/upsert/delete request
+    shared_cache_services: List[str] = Field(default_factory=list)  # services whose cached reads may be copied to Redis; keep decrypted user data out
 
     class Config:
         env_prefix = 'SUPABASE_'
@@ -143,8 +179,12 @@ class WorkerSettings(BaseConfig):
     """
     Configuration settings for the Worker service.
     """
-    max_tasks: int = Field(default=10)
-    task_timeout: int = Field(default=300)  # in seconds
+    max_tasks: int = Field(default=10)  # concurrent task executions per worker
+    task_timeout: int = Field(default=300)  # in seconds; a job can opt out by submitting with timeout=0
+    max_backlog: int = Field(default=100)  # queued executions at which Kafka consumption pauses
+    default_lane: str = Field(default="interactive")  # "interactive" or "batch"
+    interactive_weight: int = Field(default=3)  # interactive jobs started per batch job
+    batch_weight: int = Field(default=1)
     
 class ContextManagerSettings(BaseConfig):
     """
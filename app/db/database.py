@@ -1,10 +1,13 @@
 # app/db/database.py
 
+import asyncio
 import json
-from typing import List, Dict, Any
-from supabase import create_client, Client
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
 from app.config.settings import DatabaseSettings, settings
+from app.services.supabase.rest_client import SupabaseRestClient
+from app.services.cache.read_through import ReadThroughCache
+from app.debug_log import log_debug
 
 class Database:
     _instance = None
@@ -19,6 +22,24 @@ class Database:
         self.auth_service_role_key = config['auth_service_role_key']
         self.key = config['key']
         self.db_context_managers = settings.db_context_managers  # Add this line
+        self.rpc_concurrency = config.get('rpc_concurrency', 8)
+        # Read cache families are named by each service's context_prefix, including the user context manager's services
+        self.context_prefixes = {
+            name: service.get('context_prefix', f"{name}:")
+            for managers in ((settings.user_context_manager or {}).get('db_context_managers', {}), self.db_context_managers or {})
+            for name, service in managers.items()
+            if isinstance(service, dict)
+        }
+        # Only these services' cached reads are copied to Redis; decrypted user data stays in process memory
+        self.shared_cache_services = set(config.get('shared_cache_services', []))
+        # Requests go over one pooled async HTTP client; nothing blocks the event loop
+        self.rest = SupabaseRestClient(
+            self.url,
+            self.key,
+            max_connections=config.get('max_connections', 20),
+            timeout=config.get('timeout', 30.0),
+            chunk_size=config.get('bulk_chunk_size', 500)
+        )
         Database._instance = self
         from app.logging_config import configure_logger
         self.logger = configure_logger('Database')
@@ -28,7 +49,6 @@ class Database:
     async def start(self):
         self.logger.info("Starting Database service")
         try:
-            self.supabase = create_client(self.url, self.key)
             await self._run_test()
             self.logger.info("Database service started successfully")
         except Exception as e:
@@ -38,17 +58,15 @@ class Database:
     async def _run_test(self):
         try:
             # Perform a simple query to test the connection
-            response = self.supabase.table('users').select("id").limit(1).execute()
-            if response.data is not None:
-                self.logger.info("Database connection test successful")
-            else:
-                raise Exception("No data returned from test query")
+            await self.rest.select('users', 'id', limit=1)
+            self.logger.info("Database connection test successful")
         except Exception as e:
             self.logger.error(f"Database connection test failed: {str(e)}")
             raise
 
     async def shutdown(self):
         self.logger.info("Shutting down Database service")
+        await self.rest.close()
         self.logger.info("Database service shut down")
     
     @classmethod
@@ -58,8 +76,7 @@ class Database:
         return cls._instance
 
     def _check_permission(self, operation: str, service: str):
-        self.logger.info(f"Checking permission for operation: {operation} on service: {service}")
-        self.logger.info(f"Service config: {self.db_context_managers}")  # Changed from self.config to self.db_context_managers
+        log_debug(self.logger, "Checking permission", operation=operation, service=service)
         if service not in self.db_context_managers:
             raise PermissionError(f"Service '{service}' not found in database configuration")
         
@@ -70,87 +87,171 @@ class Database:
         else:
             raise ValueError(f"Invalid configuration for service '{service}'")
 
+    @property
+    def cache(self) -> ReadThroughCache:
+        from containers import get_container
+        return get_container().redis().read_cache
+
+    def cache_family(self, service: str, owner_id: Any) -> str:
+        """Name of the read cache family holding a service's reads for one owner, e.g. ``user_context:{user_id}``."""
+        return f"{self.context_prefixes.get(service, f'{service}:')}{owner_id}"
+
+    async def cached(self, service: str, owner_id: Any, field: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Read through the cache; ``loader`` only runs on a miss.
+
+        Args:
+            service (str): Service whose context_prefix names the family.
+            owner_id (Any): Usually the user id the data belongs to.
+            field (str): Names the read within the family.
+            loader (Callable): Coroutine function performing the read.
+
+        Returns:
+            Any: The value, shared with other readers; do not mutate it.
+        """
+        return await self.cache.get(self.cache_family(service, owner_id), field, loader, shared=service in self.shared_cache_services)
+
+    def cached_blocking(self, service: str, owner_id: Any, field: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """``cached`` for synchronous tools running in a worker thread."""
+        return self.cache.get_blocking(self.cache_family(service, owner_id), field, loader, shared=service in self.shared_cache_services)
+
+    async def invalidate(self, service: str, *owner_ids: Any):
+        """Drop cached reads of a service for the given owners, in every worker."""
+        await self.cache.invalidate(*(self.cache_family(service, owner_id) for owner_id in owner_ids if owner_id))
+
+    def invalidate_blocking(self, service: str, *owner_ids: Any):
+        """``invalidate`` for synchronous tools running in a worker thread."""
+        self.cache.invalidate_blocking(*(self.cache_family(service, owner_id) for owner_id in owner_ids if owner_id))
+
+    async def invalidate_service(self, service: str):
+        """Drop the cached reads of a service for every owner, in every worker."""
+        await self.cache.invalidate_prefix(self.context_prefixes.get(service, f"{service}:"))
+
+    async def _invalidate_writes(self, service: str, owner_ids: List[Any]):
+        # A write that cannot be tied to its owner may have changed anyone's data
+        if not owner_ids or any(owner_id is None for owner_id in owner_ids):
+            await self.invalidate_service(service)
+        else:
+            await self.invalidate(service, *set(owner_ids))
+
+    def _owner_id(self, service: str, params: Dict[str, Any]) -> Optional[Any]:
+        """
+        The user a query's rows belong to, or None if the params do not say.
+
+        Only explicit user ids count; a row ``id`` is the owner only for the users table itself.
+        """
+        names = ['user_id', 'p_user_id']
+        if self.db_context_managers.get(service, {}).get('table_name') == 'users':
+            names += ['id', 'p_id']
+        for name in names:
+            if params.get(name):
+                return params[name]
+        return None
+
+    def _table(self, service: str) -> str:
+        return self.db_context_managers[service]['table_name']
+
+    def _resolve_query(self, query: dict, params: Dict[str, Any], service: str) -> Tuple[str, Dict[str, Any]]:
+        """Map a configured query of a service to its Postgres function and call parameters."""
+        service_config = self.db_context_managers[service]
+        if query['function'] not in service_config['queries']:
+            raise ValueError(f"Query '{query}' not found in service configuration")
+        function_info = service_config['queries'][query['function']]
+        function_params = function_info['params']
+        
+        # Prepare the parameters for the function call
+        call_params = {param: params.get(param) for param in function_params}
+        return function_info['function'], call_params
+
+    async def _call_function(self, function_name: str, call_params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        # Log the function call
+        self.logger.info(f"Calling Postgres function: {function_name}")
+        log_debug(self.logger, "Postgres function params", function=function_name, params=call_params)
+        try:
+            result = await self.rest.rpc(function_name, call_params)
+        except Exception as e:
+            if "Could not find the function" in str(e):
+                self.logger.error(f"Function {function_name} not found in the database. Error: {str(e)}")
+                raise ValueError(f"Function {function_name} not found in the database")
+            raise
+        log_debug(self.logger, "Function result", function=function_name, result=result)
+        if result is None:
+            return []
+        return result if isinstance(result, list) else [result]
+
+    async def _run_query(self, query: dict, params: Dict[str, Any], service: str) -> List[Dict[str, Any]]:
+        """Call a configured query; ``get*`` functions read through the cache, other functions invalidate it."""
+        function_name, call_params = self._resolve_query(query, params, service)
+        owner_id = self._owner_id(service, call_params)
+        if function_name.startswith('get'):
+            if owner_id is None:
+                return await self._call_function(function_name, call_params)
+            field = f"{function_name}:{json.dumps(call_params, sort_keys=True, default=str)}"
+            return await self.cached(service, owner_id, field, lambda: self._call_function(function_name, call_params))
+        rows = await self._call_function(function_name, call_params)
+        await self._invalidate_writes(service, [owner_id])
+        return rows
+
     async def fetch_all(self, query: dict, params: Dict[str, Any], service: str) -> List[Dict[str, Any]]:
         self._check_permission('fetch_all', service)
         try:
-            service_config = self.db_context_managers[service]
-            
-            if query['function'] in service_config['queries']:
-                function_info = service_config['queries'][query['function']]
-                function_name = function_info['function']
-                function_params = function_info['params']
-                
-                # Prepare the parameters for the function call
-                call_params = {param: params.get(param) for param in function_params}
-                
-                # Log the function call
-                self.logger.info(f"Calling Postgres function: {function_name} with params: {call_params}")
-                
-                try:
-                    # Call the Postgres function
-                    result = self.supabase.rpc(function_name, call_params).execute()
-                    
-                    # Log the result
-                    self.logger.info(f"Function result: {result.data}")
-                    
-                    return result.data if result.data else []
-                except Exception as e:
-                    if "Could not find the function" in str(e):
-                        self.logger.error(f"Function {function_name} not found in the database. Error: {str(e)}")
-                        raise ValueError(f"Function {function_name} not found in the database")
-                    raise
-            else:
-                raise ValueError(f"Query '{query}' not found in service configuration")
+            return await self._run_query(query, params, service)
         except Exception as e:
-            self.logger.error(f"Error executing '{str(query)}' with exception: {str(e.with_traceback(None))}")
+            self.logger.error(f"Error executing '{str(query)}' with exception: {str(e)}")
             raise
 
     async def fetch_one(self, query: dict, params: Dict[str, Any], service: str) -> Dict[str, Any]:
         self._check_permission('fetch_one', service)
         try:
-            service_config = self.config[service]
-            
-            if query['function'] in service_config['queries']:
-                function_info = service_config['queries'][query['function']]
-                function_name = function_info['function']
-                function_params = function_info['params']
-                
-                # Prepare the parameters for the function call
-                call_params = {param: params.get(param) for param in function_params}
-                
-                # Log the function call
-                self.logger.info(f"Calling Postgres function: {function_name} with params: {call_params}")
-                
-                try:
-                    # Call the Postgres function
-                    result = self.supabase.rpc(function_name, call_params).execute()
-                    
-                    # Log the result
-                    self.logger.info(f"Function result: {result.data}")
-                    
-                    return result.data[0] if result.data else None
-                except Exception as e:
-                    if "Could not find the function" in str(e):
-                        self.logger.error(f"Function {function_name} not found in the database. Error: {str(e)}")
-                        raise ValueError(f"Function {function_name} not found in the database")
-                    raise
-            else:
-                raise ValueError(f"Query '{query}' not found in service configuration")
+            rows = await self._run_query(query, params, service)
+            return rows[0] if rows else None
         except Exception as e:
             self.logger.error(f"Error executing '{str(query)}' query: {str(e)}")
             raise
 
+    async def fetch_many(self, requests: List[Tuple[dict, Dict[str, Any], str]], concurrency: Optional[int] = None) -> List[List[Dict[str, Any]]]:
+        """
+        Run several configured queries concurrently.
+
+        Every query is checked against its service's ``allowed_operations`` as a
+        ``fetch_all`` before anything is sent.
+
+        Args:
+            requests (List[Tuple[dict, Dict[str, Any], str]]): ``(query, params, service)`` as for ``fetch_all``.
+            concurrency (int, optional): Most calls in flight at once; defaults to the ``rpc_concurrency`` setting.
+
+        Returns:
+            List[List[Dict[str, Any]]]: The rows of each query, in request order.
+        """
+        for _, _, service in requests:
+            self._check_permission('fetch_all', service)
+        semaphore = asyncio.Semaphore(concurrency or self.rpc_concurrency)
+
+        async def call(query: dict, params: Dict[str, Any], service: str):
+            async with semaphore:
+                return await self._run_query(query, params, service)
+
+        try:
+            return list(await asyncio.gather(*(call(query, params, service) for query, params, service in requests)))
+        except Exception as e:
+            self.logger.error(f"Error executing {len(requests)} concurrent queries: {str(e)}")
+            raise
+
     async def execute(self, query: str, params: Dict[str, Any], service: str) -> None:
         self._check_permission('execute', service)
         try:
+            table = self._table(service)
             if query.lower().startswith('insert'):
-                self.supabase.table(self.config[service].table_name).insert(params).execute()
+                await self.rest.insert(table, params)
+            elif query.lower().startswith('upsert'):
+                await self.rest.upsert(table, params)
             elif query.lower().startswith('update'):
-                self.supabase.table(self.config[service].table_name).update(params).eq('id', params['id']).execute()
+                await self.rest.update(table, params, {'id': params['id']})
             elif query.lower().startswith('delete'):
-                self.supabase.table(self.config[service].table_name).delete().eq('id', params['id']).execute()
+                await self.rest.delete(table, {'id': params['id']})
             else:
                 raise ValueError(f"Unsupported query type: {query}")
+            await self._invalidate_writes(service, [self._owner_id(service, params)])
         except Exception as e:
             self.logger.error(f"Error executing query: {str(e)}")
             raise
@@ -158,25 +259,41 @@ class Database:
     async def fetch_key(self, key: str, service: str) -> Dict[str, Any]:
         self._check_permission('fetch_key', service)
         try:
-            result = self.supabase.table(self.config[service].table_name).select().eq('id', key).execute()
-            return result.data[0] if result.data else None
+            rows = await self.rest.select(self._table(service), filters={'id': key}, limit=1)
+            return rows[0] if rows else None
         except Exception as e:
             self.logger.error(f"Error fetching key {key}: {str(e)}")
             raise
 
     async def execute_many(self, query: str, params_list: List[Dict[str, Any]], service: str) -> None:
+        """
+        Run a write for many rows with as few requests as the operation allows.
+
+        Inserts and upserts are sent in bulk and deletes as one ``id=in.(...)``
+        filter, each chunked by ``bulk_chunk_size``. Updates keep their per-row
+        semantics (an upsert would create missing rows) but run concurrently,
+        bounded by ``rpc_concurrency``.
+        """
         self._check_permission('execute_many', service)
         try:
+            table = self._table(service)
             if query.lower().startswith('insert'):
-                self.supabase.table(self.config[service].table_name).insert(params_list).execute()
+                await self.rest.insert(table, params_list)
+            elif query.lower().startswith('upsert'):
+                await self.rest.upsert(table, params_list)
             elif query.lower().startswith('update'):
-                for params in params_list:
-                    self.supabase.table(self.config[service].table_name).update(params).eq('id', params['id']).execute()
+                semaphore = asyncio.Semaphore(self.rpc_concurrency)
+
+                async def update(params: Dict[str, Any]):
+                    async with semaphore:
+                        await self.rest.update(table, params, {'id': params['id']})
+
+                await asyncio.gather(*(update(params) for params in params_list))
             elif query.lower().startswith('delete'):
-                for params in params_list:
-                    self.supabase.table(self.config[service].table_name).delete().eq('id', params['id']).execute()
+                await self.rest.delete(table, {'id': [params['id'] for params in params_list]})
             else:
                 raise ValueError(f"Unsupported query type: {query}")
+            await self._invalidate_writes(service, [self._owner_id(service, params) for params in params_list])
         except Exception as e:
             self.logger.error(f"Error executing batch query: {str(e)}")
             
@@ -0,0 +1,122 @@
+import json
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Tuple
+
+DEFAULT_MAX_PAYLOAD = 2000
+MAX_SAMPLE_KEYS = 1024
+
+# LRU of sampling counters; keys often name per-session channels, so the least recently used are dropped
+_sample_counts: "OrderedDict[Tuple[str, str], int]" = OrderedDict()
+_sample_lock = threading.Lock()
+
+
+def truncate(text: str, limit: int = DEFAULT_MAX_PAYLOAD) -> str:
+    """Cut text down to ``limit`` characters, noting how much was dropped."""
+    if limit and len(text) > limit:
+        return f"{text[:limit]}... ({len(text) - limit} more chars)"
+    return text
+
+
+def render(value: Any, limit: int = DEFAULT_MAX_PAYLOAD, indent: int = None) -> str:
+    """
+    Turn a log payload into capped text.
+
+    Args:
+        value (Any): The payload; a callable is called first, strings are used as-is,
+            anything else is serialized as JSON.
+        limit (int): Maximum characters kept; 0 keeps everything.
+        indent (int, optional): JSON indentation.
+
+    Returns:
+        str: The rendered payload.
+    """
+    if callable(value):
+        value = value()
+    if not isinstance(value, str):
+        try:
+            value = json.dumps(value, indent=indent, default=str)
+        except (TypeError, ValueError):
+            value = repr(value)
+    return truncate(value, limit)
+
+
+class Payload:
+    """
+    A log argument that is only rendered when the record is formatted.
+
+    Pass it as a ``%s`` argument to any logger call so large values are only
+    serialized if a handler actually emits the record::
+
+        logger.debug("Context: %s", payload(context))
+    """
+
+    __slots__ = ("value", "limit", "indent")
+
+    def __init__(self, value: Any, limit: int = DEFAULT_MAX_PAYLOAD, indent: int = None):
+        self.value = value
+        self.limit = limit
+        self.indent = indent
+
+    def __str__(self) -> str:
+        return render(self.value, self.limit, self.indent)
+
+
+def payload(value: Any, limit: int = DEFAULT_MAX_PAYLOAD, indent: int = None) -> Payload:
+    """Wrap a value, or a callable producing it, as a lazily rendered log argument."""
+    return Payload(value, limit, indent)
+
+
+def log_debug(logger: logging.Logger, event: str, limit: int = DEFAULT_MAX_PAYLOAD, **fields: Any):
+    """
+    Log a debug event with structured fields, doing no work unless DEBUG is enabled.
+
+    Field values are rendered with ``render``: callables are called, non-strings
+    are serialized as JSON, and each value is capped at ``limit`` characters.
+    Pass expensive values (``traceback.format_stack``, a context dict) unevaluated.
+
+    Args:
+        logger (logging.Logger): The logger to write to.
+        event (str): Short description of what happened.
+        limit (int): Maximum characters per field value.
+        **fields: Values to include as ``key=value``.
+    """
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+    _emit(logger, event, limit, fields)
+
+
+def log_sampled(logger: logging.Logger, key: str, event: str, every: int = 100, limit: int = DEFAULT_MAX_PAYLOAD, **fields: Any):
+    """
+    Like ``log_debug``, but only the first and then every ``every``-th event with the same key is logged.
+
+    Meant for events that happen once per message or item, where a full log
+    line each time would dominate the cost of the work itself.
+
+    Args:
+        logger (logging.Logger): The logger to write to.
+        key (str): Identifies the event stream being sampled, e.g. a channel. Only the
+            ``MAX_SAMPLE_KEYS`` most recently used keys keep their counts.
+        event (str): Short description of what happened.
+        every (int): Sampling interval.
+        limit (int): Maximum characters per field value.
+        **fields: Values to include as ``key=value``.
+    """
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+    with _sample_lock:
+        count = _sample_counts.pop((logger.name, key), 0) + 1
+        _sample_counts[(logger.name, key)] = count
+        if len(_sample_counts) > MAX_SAMPLE_KEYS:
+            _sample_counts.popitem(last=False)
+    if every > 1 and (count - 1) % every:
+        return
+    fields["sampled"] = f"{count} (1/{every})"
+    _emit(logger, event, limit, fields)
+
+
+def _emit(logger: logging.Logger, event: str, limit: int, fields: Dict[str, Any]):
+    message = " ".join([event] + [f"{name}={render(value, limit)}" for name, value in fields.items()])
+    # stacklevel points funcName/lineno at the caller of log_debug/log_sampled
+    logger.debug(message, stacklevel=3)
@@ -1,9 +1,14 @@
 """Module for configuring logging in the AgentWorkflowService application."""
 import os
 import uuid
+import atexit
+import copy
 import logging
+import queue
+import sys
 import threading
-from logging.handlers import RotatingFileHandler
+from collections import OrderedDict
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from colorama import Fore, Style, init
 from colorlog import ColoredFormatter
 from watchtower import CloudWatchLogHandler
@@ -178,29 +183,238 @@ def get_logging_level():
     level = os.getenv('LOGGING_LEVEL', 'INFO').upper()
     return getattr(logging, level, logging.INFO)
 
+_known_log_dirs = set()
+_known_log_dirs_lock = threading.Lock()
+
+def ensure_log_dir(log_dir, refresh=False):
+    """
+    Create a log directory once per process.
+
+    Args:
+        log_dir: Directory to create.
+        refresh: Create it again even if it was created before, e.g. after it was deleted.
+    """
+    if not log_dir:
+        return
+    with _known_log_dirs_lock:
+        if log_dir in _known_log_dirs and not refresh:
+            return
+        Path(log_dir).mkdir(parents=True, exist_ok=True)
+        _known_log_dirs.add(log_dir)
+
 class CustomRotatingFileHandler(RotatingFileHandler):
     """Custom handler that ensures log directory exists before writing"""
     
     def __init__(self, filename, mode='a', maxBytes=0, backupCount=0, encoding=None, delay=False):
         # Create directory if it doesn't exist
-        log_dir = os.path.dirname(filename)
-        if log_dir:
-            Path(log_dir).mkdir(parents=True, exist_ok=True)
-            
+        ensure_log_dir(os.path.dirname(filename))
         super().__init__(filename, mode, maxBytes, backupCount, encoding, delay)
     
+    def _open(self):
+        """Open the log file, recreating its directory in case it was deleted"""
+        # Runs when the stream is (re)opened, e.g. after a rollover, rather than on every record
+        ensure_log_dir(os.path.dirname(self.baseFilename), refresh=True)
+        return super()._open()
+    
     def emit(self, record):
-        """Emit a record with directory creation"""
+        """Emit a record"""
         try:
-            # Ensure directory exists before each emit in case it was deleted
-            log_dir = os.path.dirname(self.baseFilename)
-            if log_dir:
-                Path(log_dir).mkdir(parents=True, exist_ok=True)
             super().emit(record)
         except Exception as e:
             # Avoid infinite recursion if logging fails
             print(f"Error in log emission: {str(e)}")
 
+class LogFilePool:
+    """
+    Open log files shared by every logger, bounded by an LRU.
+
+    Only the log listener thread uses a pool. Lines are buffered per file and
+    written with one call per file on ``flush``; files past ``max_bytes`` are
+    rotated like ``RotatingFileHandler`` does. The least recently written file
+    is closed once more than ``max_open`` are open, so per-session logs of a
+    long-running worker do not accumulate file descriptors.
+    """
+
+    def __init__(self, max_open=128, max_bytes=10*1024*1024, backup_count=5, encoding='utf-8'):
+        self.max_open = max_open
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.encoding = encoding
+        self._files = OrderedDict()
+        self._pending = {}
+
+    def append(self, path, text):
+        """Buffer a line for a file until the next flush."""
+        self._pending.setdefault(path, []).append(text)
+
+    def flush(self):
+        """Write every buffered line."""
+        pending, self._pending = self._pending, {}
+        for path, parts in pending.items():
+            try:
+                self._write(path, "".join(parts))
+            except Exception as e:
+                print(f"Error writing log file {path}: {str(e)}", file=sys.stderr)
+
+    def _write(self, path, data):
+        stream = self._open(path)
+        stream.write(data)
+        stream.flush()
+        if self.max_bytes and stream.tell() >= self.max_bytes:
+            self._rotate(path)
+
+    def _open(self, path):
+        stream = self._files.get(path)
+        if stream is not None:
+            self._files.move_to_end(path)
+            return stream
+        ensure_log_dir(os.path.dirname(path))
+        try:
+            stream = open(path, 'a', encoding=self.encoding)
+        except FileNotFoundError:
+            # The directory was removed since it was first created
+            ensure_log_dir(os.path.dirname(path), refresh=True)
+            stream = open(path, 'a', encoding=self.encoding)
+        self._files[path] = stream
+        while len(self._files) > self.max_open:
+            _, oldest = self._files.popitem(last=False)
+            oldest.close()
+        return stream
+
+    def _rotate(self, path):
+        self._files.pop(path).close()
+        if self.backup_count > 0:
+            for i in range(self.backup_count - 1, 0, -1):
+                source, dest = f"{path}.{i}", f"{path}.{i + 1}"
+                if os.path.exists(source):
+                    os.replace(source, dest)
+            os.replace(path, f"{path}.1")
+
+    def open_files(self):
+        return len(self._files)
+
+    def close(self):
+        """Write buffered lines and close every file."""
+        self.flush()
+        while self._files:
+            _, stream = self._files.popitem(last=False)
+            stream.close()
+
+class PooledFileHandler(logging.Handler):
+    """Handler run by the log listener that formats records into a LogFilePool instead of owning a file."""
+
+    def __init__(self, filename, pool, level=logging.NOTSET):
+        super().__init__(level)
+        self.filename = filename
+        self.pool = pool
+
+    def emit(self, record):
+        try:
+            self.pool.append(self.filename, self.format(record) + "\n")
+        except Exception:
+            self.handleError(record)
+
+class RoutingQueueHandler(QueueHandler):
+    """Queue handler that tags each record with the handlers the listener should run for it."""
+
+    def __init__(self, log_queue, targets):
+        super().__init__(log_queue)
+        self.targets = targets
+
+    _traceback_formatter = logging.Formatter()
+
+    def prepare(self, record):
+        # QueueHandler.prepare folds the traceback into the message and drops exc_info.
+        # Keep the message plain and carry the rendered traceback as exc_text instead, so
+        # each formatter on the listener appends it exactly once, as it would in sync mode.
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = record.exc_text or self._traceback_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        record.log_targets = self.targets
+        return record
+
+class BatchingQueueListener(QueueListener):
+    """
+    Single thread that runs the handlers of every queued record.
+
+    Records are drained in batches of up to ``batch_size``; the file pool is
+    flushed once per batch, so a burst of records costs one write per file.
+    """
+
+    def __init__(self, log_queue, pool, batch_size=512):
+        super().__init__(log_queue)
+        self.pool = pool
+        self.batch_size = batch_size
+
+    def handle(self, record):
+        for handler in getattr(record, 'log_targets', ()):
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+    def _monitor(self):
+        log_queue = self.queue
+        while True:
+            batch = [log_queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(log_queue.get_nowait())
+                except queue.Empty:
+                    break
+            stopping = False
+            for record in batch:
+                if record is self._sentinel:
+                    stopping = True
+                else:
+                    self.handle(record)
+            self.pool.flush()
+            if stopping:
+                break
+
+    def stop(self):
+        super().stop()
+        self.pool.close()
+
+_log_queue = None
+_log_listener = None
+_log_pool = None
+_log_listener_lock = threading.Lock()
+
+def use_queue_logging():
+    """Whether LOGGING_MODE in the .env file selects the queue-backed logging mode."""
+    return os.getenv('LOGGING_MODE', 'sync').lower() == 'queue'
+
+def start_log_listener():
+    """Start the log listener thread if it is not running and return the queue it reads."""
+    global _log_queue, _log_listener, _log_pool
+    with _log_listener_lock:
+        if _log_listener is None:
+            _log_queue = queue.SimpleQueue()
+            _log_pool = LogFilePool(max_open=int(os.getenv('LOG_MAX_OPEN_FILES', '128')))
+            _log_listener = BatchingQueueListener(_log_queue, _log_pool)
+            _log_listener.start()
+            atexit.register(stop_log_listener)
+        return _log_queue
+
+def stop_log_listener():
+    """Write every queued record, close the pooled log files and stop the listener thread."""
+    global _log_listener
+    with _log_listener_lock:
+        if _log_listener is not None:
+            _log_listener.stop()
+            _log_listener = None
+
+def get_log_listener_stats():
+    """Get the size of the log queue and the number of open pooled log files."""
+    return {
+        'running': _log_listener is not None,
+        'queued': _log_queue.qsize() if _log_queue is not None else 0,
+        'open_files': _log_pool.open_files() if _log_pool is not None else 0,
+    }
+
 class LogFilter(logging.Filter):
     """Filter to exclude specific log messages"""
     def __init__(self):
@@ -267,13 +481,15 @@ def configure_logger(name, log_path=None, level=logging.INFO, session_id=None):
         '%(asctime)s - %(levelname)s - %(name)s\n'
         'Message: %(message)s\n'
         'Path: %(pathname)s:%(lineno)d\n'
-        'Function: %(funcName)s\n'
-        '%(exc_info)s\n'
+        'Function: %(funcName)s'
     )
     
     # Create and add the filter
     log_filter = LogFilter()
     
+    if use_queue_logging():
+        return _configure_queue_logger(logger, name, log_path, session_id, log_filter, file_formatter, console_formatter, error_formatter)
+    
     # Console handler
     console_handler = logging.StreamHandler()
     console_handler.setFormatter(console_formatter)
@@ -282,11 +498,7 @@ def configure_logger(name, log_path=None, level=logging.INFO, session_id=None):
     
     # File handler if path specified
     if log_path:
-        log_file = f"{name}.log"
-        if isinstance(log_path, (list, tuple)):
-            log_file = os.path.join('logs', *log_path, log_file)
-        else:
-            log_file = os.path.join('logs', log_path, log_file)
+        log_file = _log_file_path(name, log_path)
             
         file_handler = CustomRotatingFileHandler(
             filename=log_file,
@@ -312,6 +524,36 @@ def configure_logger(name, log_path=None, level=logging.INFO, session_id=None):
     
     return logger
 
+def _log_file_path(name, log_path):
+    log_file = f"{name}.log"
+    if isinstance(log_path, (list, tuple)):
+        return os.path.join('logs', *log_path, log_file)
+    return os.path.join('logs', log_path, log_file)
+
+def _configure_queue_logger(logger, name, log_path, session_id, log_filter, file_formatter, console_formatter, error_formatter):
+    """Attach a single queue handler whose targets run on the log listener thread."""
+    log_queue = start_log_listener()
+    
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(console_formatter)
+    targets = [console_handler]
+    
+    if log_path:
+        file_handler = PooledFileHandler(_log_file_path(name, log_path), _log_pool)
+        file_handler.setFormatter(file_formatter)
+        targets.append(file_handler)
+    
+    if session_id:
+        error_handler = PooledFileHandler(os.path.join('logs', 'sessions', session_id, 'errors.log'), _log_pool, level=logging.ERROR)
+        error_handler.setFormatter(error_formatter)
+        targets.append(error_handler)
+    
+    # Filtering before enqueueing keeps dropped records off the queue entirely
+    queue_handler = RoutingQueueHandler(log_queue, targets)
+    queue_handler.addFilter(log_filter)
+    logger.addHandler(queue_handler)
+    return logger
+
 def get_logger(name):
     """Get an existing logger or create a new one"""
     return logging.getLogger(name)
@@ -328,5 +570,5 @@ def setup_logging():
     configure_logger('')  # Empty string configures the root logger
 
     # Ensure logs directory exists
-    os.makedirs('logs', exist_ok=True)
+    ensure_log_dir('logs')
 
@@ -409,6 +409,7 @@ class AgencyTaskGroup(BaseModel):
                     group['id'] = str(uuid.uuid4())
                     group['key'] = f"{TASK_GROUP_EXECUTE_PREFIX}:{group['id']}"
                     group['session_id'] = object_data['session_id']
+                    group['lane'] = group.get('lane', object_data.get('lane'))
                     group['context_info'] = object_data['context_info']
                     group['description'] = group.get('description', f"Task group for {group['name']}")
             try:
@@ -439,7 +440,9 @@ class AgencyTaskGroup(BaseModel):
                     "session_id": task_group.session_id,
                     "tasks": task_group.tasks,
                     "context_info": task_group.context_info.dict(),
-                    "key": task_group.key
+                    "key": task_group.key,
+                    "lane": task_group.lane,
+                    "max_concurrency": task_group.max_concurrency
                 },
                 "context": self.context_info.context 
             }
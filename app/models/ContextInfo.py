@@ -59,10 +59,8 @@ class ContextInfo(BaseContextInfo):
         logger.info(f"Querying vector database for {vector_field} with query: {query}")
         
         try:
-            embeddings = self._redis_service.generate_embeddings({vector_field: query}, [vector_field])
-            
             results = await self._redis_service.async_search_index(
-                embeddings,
+                query,
                 f"{vector_field}_vector",
                 index_name,
                 limit,
@@ -267,7 +265,7 @@ class ContextInfo(BaseContextInfo):
                     if user_id:
                         self.context['user_id'] = user_id
 
-                    embeddings = redis_service.generate_embeddings(
+                    embeddings = await redis_service.async_generate_embeddings(
                         context_info.model_dump() if hasattr(context_info, 'model_dump') else context_info,
                         ["input_description", "input_context", "action_summary", "outcome_description", "feedback", "output"]
                     )
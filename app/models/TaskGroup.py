@@ -1,4 +1,5 @@
 from datetime import datetime
+from functools import partial
 import json
 import time
 import traceback
@@ -13,6 +14,9 @@ from app.models.TaskProcessor import TaskProcessor
 from app.models.ContextInfo import ContextInfo
 from app.logging_config import configure_logger
 from app.models.task_expansion import TaskExpansion
+from app.models.task_scheduler import TaskScheduler
+from app.models.task_group_state import TaskGroupStateStore
+from app.debug_log import log_debug, log_sampled
 from app.services.cache import redis
 from app.utilities.errors import DependencyError, TaskGroupExecutionError
 from app.constants import TASK_PREFIX, CONTEXT_INFO_CONTEXT
@@ -24,8 +28,25 @@ import logging
 import json
 
 from app.utilities.event_handler import EventHandler
-from app.utilities.redis_publisher import RedisPublisher
+from app.services.metrics import metrics_registry
+import weakref
 
+# Live task groups by id(), read when metrics are collected; models are unhashable, so not a WeakSet
+_live_groups: "weakref.WeakValueDictionary[int, TaskGroup]" = weakref.WeakValueDictionary()
+# Scheduler runs started by TaskGroup.handle; held here so they are not garbage collected mid-run
+_running_groups: Set[asyncio.Task] = set()
+
+
+def _active_task_metrics() -> Dict[tuple, float]:
+    return {(group.name, group.id): len(group.tasks_running) for group in list(_live_groups.values())}
+
+
+metrics_registry.gauge_callback(
+    "task_group_active_tasks",
+    "Tasks currently running in each live TaskGroup.",
+    ["task_group", "group_id"],
+    _active_task_metrics
+)
 
 
 class TaskGroup(BaseModel):
@@ -42,6 +63,8 @@ class TaskGroup(BaseModel):
     tasks: List[Dict[str, Any]] = Field([], description="The tasks in the group.")
     session_id: str = Field(..., description="The ID of the session")
     context_info: ContextInfo = Field(..., description="The context of the task group")
+    max_concurrency: Optional[int] = Field(None, description="Maximum number of tasks in flight at once; unlimited when not set.")
+    lane: Optional[str] = Field(None, description="Worker execution lane for the group's tasks: 'interactive' or 'batch'.")
     
     
     # Task State Tracking
@@ -54,6 +77,11 @@ class TaskGroup(BaseModel):
     _message_processor_task: Optional[asyncio.Task] = PrivateAttr(default=None)
     _processing_active: bool = PrivateAttr(default=False)
     _event_handler: EventHandler = PrivateAttr(default=None)
+    _scheduler: TaskScheduler = PrivateAttr(default=None)
+    _scheduler_idle: asyncio.Event = PrivateAttr(default=None)
+    _state_store: TaskGroupStateStore = PrivateAttr(default=None)
+    _status: Optional[str] = PrivateAttr(default=None)
+    _completion_time: Optional[str] = PrivateAttr(default=None)
     
     # Result Tracking
     _expected_results: Dict[str, int] = PrivateAttr(default_factory=dict)
@@ -76,6 +104,7 @@ class TaskGroup(BaseModel):
     # Track existing subscriptions
     def __init__(self, **data):
         super().__init__(**data)
+        _live_groups[id(self)] = self
         # Main group logger
         self._logger = configure_logger(
             f"{self.__class__.__name__}",
@@ -104,17 +133,20 @@ class TaskGroup(BaseModel):
         self._event_handler = EventHandler()
         self._tasks_lock = asyncio.Lock()  # Add tasks lock
         
+        # Build the dependency graph once; raises on cycles before anything is dispatched
+        self._scheduler = TaskScheduler(
+            self.tasks,
+            available_keys=self.context_info.context.keys(),
+            max_concurrency=self.max_concurrency
+        )
+        self._scheduler_idle = asyncio.Event()
+        self._state_store = TaskGroupStateStore(self.id)
+        
         # Initialize Redis connection
         from containers import get_container
         self._redis = get_container().redis()
         
-        self._logger.debug(f"""
-        Initialized TaskGroup:
-        - ID: {self.id}
-        - Name: {self.name}
-        - Session: {self.session_id}
-        - Tasks: {len(self.tasks)}
-        """)
+        log_debug(self._logger, "Initialized TaskGroup", id=self.id, name=self.name, session=self.session_id, tasks=len(self.tasks))
     
     @classmethod
     async def handle(cls, key: str, action: str, object_data: Dict[str, Any], context: Dict[str, Any]):
@@ -142,18 +174,28 @@ class TaskGroup(BaseModel):
             task_group = cls(**object_data)
             task_group._logger.info(f"Initializing new TaskGroup: key={key}")
 
-            # Start all core tasks concurrently
-            await asyncio.gather(
-                task_group._register_default_handlers(),
-                task_group.process_tasks()
-            )
+            await task_group._register_default_handlers()
+            await task_group.save_state()
+
+            # The DAG can run for up to an hour; return now so the event's offset is committed
+            # once the group is persisted instead of after every task finishes
+            run = asyncio.create_task(task_group.process_tasks(), name=f"task_group:{task_group.id}")
+            _running_groups.add(run)
+            run.add_done_callback(task_group._on_processing_done)
 
         except Exception as e:
-            task_group._logger = configure_logger(f"{cls.__name__}")
-            task_group._logger.error(f"Error initializing task group: {str(e)}")
-            task_group._logger.error(traceback.format_exc())
+            # The constructor may have raised (e.g. DependencyError on a cycle), so there may be no instance
+            logger = configure_logger(f"{cls.__name__}")
+            logger.error(f"Error initializing task group: {str(e)}")
+            logger.error(traceback.format_exc())
             raise
     
+    def _on_processing_done(self, run: asyncio.Task):
+        """Drop a finished scheduler run; process_tasks has already logged and reported any failure."""
+        _running_groups.discard(run)
+        if not run.cancelled() and run.exception() is not None:
+            self._logger.error(f"Task group {self.name} stopped: {run.exception()}")
+
     # Optional: Add to __del__ as a safeguard
     def __del__(self):
         """Destructor to ensure cleanup if object is garbage collected"""
@@ -212,6 +254,8 @@ class TaskGroup(BaseModel):
                 
                 # Remove from running tasks
                 self.tasks_running.discard(task_name)
+                self._scheduler.complete(task_name)
+                await self._dispatch_ready()
                 
                 # Process results
                 for result_key, value in results.items():
@@ -254,6 +298,8 @@ class TaskGroup(BaseModel):
                 
                 # Remove from running tasks
                 self.tasks_running.discard(task_name)
+                self._scheduler.fail(task_name)
+                await self._dispatch_ready()
                 
                 # Check retry possibility
                 await self._event_handler.handle_event('task_retry', {
@@ -297,7 +343,7 @@ class TaskGroup(BaseModel):
                     json.dumps(state_data)
                 )
                 
-                self._logger.debug(f"Updated state for task {task_name}: {state}")
+                log_debug(self._logger, "Updated task state", task=task_name, state=state)
                 
         except Exception as e:
             self._logger.error(f"Error updating task state: {str(e)}")
@@ -378,12 +424,10 @@ class TaskGroup(BaseModel):
                 # Clear existing state
                 await self._cleanup_task_state(task_name)
                 
-                # Initialize processor and retry
-                task_processor = TaskProcessor(
-                    self.context_info,
-                    self.session_id
-                )
-                await self.process_tasks()
+                # Put the task back in the ready set and dispatch it
+                self.tasks_failed.pop(task_name, None)
+                self._scheduler.retry(task_name)
+                await self._dispatch_ready()
             else:
                 raise ValueError(f"Task data not found for {task_name}")
                 
@@ -843,12 +887,12 @@ class TaskGroup(BaseModel):
                 - failed_tasks: List of failed tasks
                 - completion_time: Timestamp of completion
         """
-        self._logger.debug(f"""
-        Handling group state update:
-        - Input data: {json.dumps(data, default=str)}
-        - Current completed tasks: {list(self.tasks_completed)}
-        - Current failed tasks: {self.tasks_failed}
-        """)
+        log_debug(
+            self._logger, "Handling group state update",
+            data=data,
+            completed_tasks=lambda: list(self.tasks_completed),
+            failed_tasks=self.tasks_failed
+        )
         try:
             status = data.get('status')
             if status == 'completed':
@@ -866,20 +910,10 @@ class TaskGroup(BaseModel):
             completion_time = data.get('completion_time', datetime.utcnow().isoformat())
             
             if status:
-                # Prepare state data
-                state_data = {
-                    'status': status,
-                    'completed_tasks': list(completed_tasks),
-                    'failed_tasks': list(failed_tasks),
-                    'updated_at': datetime.utcnow().isoformat(),
-                    'completion_time': completion_time
-                }
-                
-                # Store in Redis
-                await self._redis.client.set(
-                    f"task_group:{self.id}:state",
-                    json.dumps(state_data)
-                )
+                # Task lists are already tracked per task; only the group status goes in the header
+                self._status = status
+                self._completion_time = completion_time
+                await self.save_state()
                 
                 self._logger.info(f"""
                 Group state updated:
@@ -938,12 +972,9 @@ class TaskGroup(BaseModel):
             )
             
             if task_data:
-                # Initialize processor and process task
-                task_processor = TaskProcessor(
-                    self.context_info,
-                    self.session_id
-                )
-                await self.process_tasks()
+                for dependency in dependencies:
+                    self._scheduler.resolve(dependency)
+                await self._dispatch_ready()
             else:
                 self._logger.error(f"Task data not found for {task_name}")
                 
@@ -958,7 +989,10 @@ class TaskGroup(BaseModel):
     async def process_tasks(self, timeout: int = 3600):  # Default 1 hour timeout
         """
         Main entry point for processing tasks in the group.
-        Initializes tracking and starts task execution.
+
+        Subscribes to the group's result channels, dispatches the tasks whose
+        dependencies are already met and then waits while result messages
+        release the rest through the scheduler.
         
         Args:
             timeout: Maximum time in seconds to wait for all tasks to complete
@@ -969,10 +1003,6 @@ class TaskGroup(BaseModel):
             async with asyncio.timeout(timeout):
                 # Initialize tracking
                 self._processing_active = True
-                await self._tasks_lock.acquire()
-                
-                # Initialize result tracking
-                #await self.initialize_result_tracking()
                 
                 # Emit group state update
                 await self._event_handler.handle_event('group_state_update', {
@@ -981,61 +1011,20 @@ class TaskGroup(BaseModel):
                     'failed_tasks': []
                 })
                 
-                #start_time = time.time()
-                #task_processor = TaskProcessor(self.context_info, self.session_id)
-                rendered_current_tasks = False
-                previous_tasks_pending = set()
-                
-                # Get tasks that are ready to execute
-                pending_tasks = await self.collect_pending_tasks()
-                
-                if not pending_tasks:
-                    if not self.tasks_running:
-                        if len(self.tasks_completed) == len(self.tasks):
-                            self._logger.info("All tasks completed successfully")
-                            return
-                        elif self.tasks_failed:
-                            self._logger.error(f"Some tasks failed: {self.tasks_failed}")
-                            return
-                    else:
-                        if previous_tasks_pending != pending_tasks:
-                            if not rendered_current_tasks:
-                                self._logger.info("Tasks currently running: " + str(self.tasks_running))
-                                rendered_current_tasks = True
-                                
-                        previous_tasks_pending = pending_tasks
-
-                # Create tasks for parallel execution
-                execution_tasks = []
-                
-                # Execute ready tasks
-                for task in pending_tasks:
-                    task_name = task.get('name')                        
-                    self.tasks_running.add(task_name)
-                    
-                    task["key"] = "task_execute:" + self.session_id + ":" + task_name
-                    task["context_info"] = self.context_info.dict()
-                    task_info = TaskInfo(**task)
-                    # Add to execution tasks list instead of awaiting
-                    execution_tasks.append(self.execute_task(task_info))
-                    
-                try:    
-                    # Execute all tasks in parallel
-                    if execution_tasks:
-                        await asyncio.gather(*execution_tasks, return_exceptions=True)
-                    
-                    # Check completion status
-                    if not pending_tasks and not self.tasks_running:
-                        if len(self.tasks_completed) == len(self.tasks):
-                            self._logger.info("All tasks completed successfully")
-                            return
-                        elif self.tasks_failed:
-                            self._logger.error(f"Some tasks failed: {self.tasks_failed}")
-                            return
-                except Exception as e:
-                    self._logger.error(f"Error processing task {task_name}: {str(e)}")
-                    self.tasks_failed[task_name] = str(e)
-                    self.tasks_running.discard(task_name)
+                await self._subscribe_to_results()
+                
+                # Account for work finished before this run, e.g. after load_state
+                for task_name in self.tasks_completed:
+                    self._scheduler.complete(task_name)
+                await self._load_published_results()
+                
+                await self._dispatch_ready()
+                await self._scheduler_idle.wait()
+                
+                if not (self.tasks_failed or self._scheduler.blocked):
+                    self._logger.info("All tasks completed successfully")
+                else:
+                    self._logger.error(f"Some tasks failed: {self.tasks_failed}; blocked: {sorted(self._scheduler.blocked)}")
                 
         except asyncio.TimeoutError:
             self._logger.error(f"Task group processing timed out after {timeout} seconds")
@@ -1067,6 +1056,89 @@ class TaskGroup(BaseModel):
             })
             raise
 
+        finally:
+            # The processor task is parked on its queue, so clearing the flag alone never ends it
+            await self.cleanup_subscriptions(self._redis)
+
+    async def _dispatch_ready(self):
+        """Send every task the scheduler has released, then flag the group idle if nothing is left to run."""
+        for task_name in self._scheduler.take_ready():
+            task = self._scheduler.tasks[task_name]
+            self.tasks_running.add(task_name)
+            
+            task["key"] = "task_execute:" + self.session_id + ":" + task_name
+            task["context_info"] = self.context_info.dict()
+            try:
+                await self.execute_task(TaskInfo(**task))
+            except Exception as e:
+                self._logger.error(f"Error processing task {task_name}: {str(e)}")
+                self.tasks_failed[task_name] = str(e)
+                self.tasks_running.discard(task_name)
+                self._scheduler.fail(task_name)
+        
+        if self._scheduler.is_idle:
+            self._scheduler_idle.set()
+        else:
+            self._scheduler_idle.clear()
+
+    async def _check_dependency_completion(self, result_key: str):
+        """Release the tasks waiting on a completed result."""
+        if self._scheduler.resolve(result_key):
+            await self._dispatch_ready()
+
+    async def _subscribe_to_results(self):
+        """Subscribe once to the session channels of every result key produced in this group."""
+        if self._message_processor_task is not None:
+            return
+        queue = asyncio.Queue()
+        for result_key in self._scheduler.producers:
+            channel = f"session:{self.session_id}:{result_key}"
+            await self._redis.subscribe(
+                channel,
+                queue,
+                callback=partial(self._handle_dependency_message, channel),
+                session_id=self.session_id
+            )
+            self._subscriptions[channel] = queue
+        # Tasks without result keys hold a scheduler slot until their processor reports them done;
+        # any task's slot is freed when its processor reports it failed
+        for task_name, task in self._scheduler.tasks.items():
+            channels = {f"session:{self.session_id}:task_failed:{task_name}": partial(self._handle_task_failed_message, task_name)}
+            if not task.get('result_keys'):
+                channels[f"session:{self.session_id}:task_done:{task_name}"] = partial(self._handle_task_done_message, task_name)
+            for channel, callback in channels.items():
+                await self._redis.subscribe(
+                    channel,
+                    queue,
+                    callback=callback,
+                    session_id=self.session_id
+                )
+                self._subscriptions[channel] = queue
+        self._message_processor_task = asyncio.create_task(self._process_result_messages(queue))
+
+    async def _process_result_messages(self, queue: asyncio.Queue):
+        while self._processing_active:
+            callback, message = await queue.get()
+            try:
+                await callback(message)
+            finally:
+                queue.task_done()
+
+    async def _load_published_results(self):
+        """Resolve result keys that were published before this group subscribed."""
+        result_keys = [key for key in self._scheduler.producers if key not in self._scheduler.resolved_keys]
+        if not result_keys:
+            return
+        values = await self._redis.client.mget([f"session:{self.session_id}:{key}" for key in result_keys])
+        for result_key, value in zip(result_keys, values):
+            if value is None:
+                continue
+            try:
+                self.context_info.context[result_key] = json.loads(value)
+            except (json.JSONDecodeError, TypeError):
+                self.context_info.context[result_key] = value
+            self._scheduler.resolve(result_key)
+
     async def mark_task_complete(self, task_name: str, results: Dict[str, Any]):
         """
         Mark a task as complete and update related state.
@@ -1077,17 +1149,24 @@ class TaskGroup(BaseModel):
         """
         try:
             quick_log.info(f"[STATE_UPDATE] {task_name} - Marking task complete")
-            quick_log.debug(f"[STATE_RESULTS] {task_name} - Results: {list(results.keys()) if results else 'None'}")
-            quick_log.debug(f"[STATE_CURRENT] {task_name} - In completed: {task_name in self.tasks_completed}, In running: {task_name in self.tasks_running}, In failed: {any(t['task_name'] == task_name for t in self.tasks_failed)}")
+            log_debug(
+                quick_log, f"[STATE_CURRENT] {task_name}",
+                results=lambda: list(results.keys()) if results else None,
+                in_completed=lambda: task_name in self.tasks_completed,
+                in_running=lambda: task_name in self.tasks_running,
+                in_failed=lambda: task_name in self.tasks_failed
+            )
 
             async with self._tasks_lock:
                 # Early return if already completed
                 if task_name in self.tasks_completed:
-                    self._logger.warning(f"""
-                    Task {task_name} already marked complete:
-                    - Completed tasks: {self.tasks_completed}
-                    - Stack trace: {traceback.format_stack()}
-                    """)
+                    self._logger.warning(f"Task {task_name} already marked complete")
+                    log_debug(
+                        self._logger, "Duplicate completion",
+                        task=task_name,
+                        completed_tasks=lambda: sorted(self.tasks_completed),
+                        stack=lambda: "".join(traceback.format_stack())
+                    )
                     return
 
                 # Validate results
@@ -1098,6 +1177,7 @@ class TaskGroup(BaseModel):
                 # Update completion status
                 self.tasks_completed.add(task_name)
                 self.tasks_running.discard(task_name)
+                self._scheduler.complete(task_name)
 
                 # Store completion state in Redis
                 completion_data = {
@@ -1107,20 +1187,12 @@ class TaskGroup(BaseModel):
                     'results': results
                 }
 
-                # Use pipeline for atomic Redis updates
-                async with self._redis.client as redis:
-                    # Store task state
-                    await redis.publish(
-                        f"task_group:{self.id}:task:{task_name}:state",
-                        json.dumps(completion_data)
-                    )
-                    # Update group completion status
-                    if len(self.tasks_completed) == len(self.tasks):
-                        await redis.publish(
-                            f"task_group:{self.id}:status",
-                            'completed'
-                        )
-                        self._processing_active = False
+                # Task state and group status go out in one round trip
+                messages = [(f"task_group:{self.id}:task:{task_name}:state", json.dumps(completion_data))]
+                if len(self.tasks_completed) == len(self.tasks):
+                    messages.append((f"task_group:{self.id}:status", 'completed'))
+                    self._processing_active = False
+                await self._redis.publish_many(messages)
 
                 # Emit events
                 await self._event_handler.handle_event('task_state_update', {
@@ -1147,6 +1219,8 @@ class TaskGroup(BaseModel):
                         'total_tasks': len(self.tasks)
                     })
 
+            await self._dispatch_ready()
+
         except Exception as e:
             self._logger.error(f"Error marking task {task_name} as complete: {str(e)}")
             self._logger.error(traceback.format_exc())
@@ -1157,6 +1231,23 @@ class TaskGroup(BaseModel):
             })
 
     
+    async def _handle_task_done_message(self, task_name: str, message: Any):
+        """Complete a task without result keys, freeing its scheduler slot."""
+        await self.mark_task_complete(task_name, {})
+
+    async def _handle_task_failed_message(self, task_name: str, message: Any):
+        """Fail a task its processor gave up on, freeing its scheduler slot for the tasks still waiting."""
+        if task_name not in self._scheduler.running:
+            # Already finished, failed or never dispatched, e.g. a second expanded task of a failed parent
+            return
+        error = message.get('error') if isinstance(message, dict) else None
+        async with self._tasks_lock:
+            self.tasks_failed[task_name] = error or "Task failed"
+            self.tasks_running.discard(task_name)
+            self._scheduler.fail(task_name)
+        self._logger.error(f"Task {task_name} failed: {self.tasks_failed[task_name]}")
+        await self._dispatch_ready()
+
     async def _handle_dependency_message(self, channel: str, message: Any):
         """Handle incoming dependency message and update context."""
         try:
@@ -1165,7 +1256,7 @@ class TaskGroup(BaseModel):
             # Parse message if needed
             if isinstance(message, (str, bytes)):
                 message = json.loads(message if isinstance(message, str) else message.decode())
-                quick_log.debug(f"Parsed message for channel {channel}")
+                log_sampled(quick_log, channel, "Parsed message", channel=channel)
             
             # Extract result key from channel
             result_key = channel.split(':')[-1]
@@ -1178,8 +1269,11 @@ class TaskGroup(BaseModel):
             
             # Handle different message formats
             if isinstance(message, dict):
-                # Try to get value directly or from result key
-                result_value = message.get(result_key, message)
+                # Result notifications carry the value; otherwise try the result key
+                if message.get('type') == 'result':
+                    result_value = message.get('value')
+                else:
+                    result_value = message.get(result_key, message)
                 
                 # Add to received results
                 if result_value is not None:
@@ -1208,7 +1302,7 @@ class TaskGroup(BaseModel):
                             'count': len(self._received_results[result_key])
                         })
                     
-                    await asyncio.create_task(self.process_tasks())
+                        await self._check_dependency_completion(result_key)
                 
         except Exception as e:
             self._logger.error(f"Error handling dependency message: {str(e)}")
@@ -1218,7 +1312,7 @@ class TaskGroup(BaseModel):
         """Process a single message from a subscription queue"""
         try:
             quick_log.info(f"Updating context from channel: {channel}")
-            quick_log.debug(f"Current context keys: {list(self.context_info.context.keys())}")
+            log_debug(quick_log, "Current context", keys=lambda: list(self.context_info.context.keys()))
             # Parse message
             if isinstance(message, tuple) and len(message) == 2 and isinstance(message[0], Callable) and isinstance(message[1], bytes):
                 callback, data = message
@@ -1316,12 +1410,12 @@ class TaskGroup(BaseModel):
         """Process a single task after checking its dependencies."""
         task_name = task_data.get('name')
         
-        self._logger.debug(f"""
-        Processing task with dependencies:
-        - Task: {task_name}
-        - Task state: {'completed' if task_name in self.tasks_completed else 'running' if task_name in self.tasks_running else 'pending'}
-        - Context keys: {list(self.context_info.context.keys())}
-        """)
+        log_debug(
+            self._logger, "Processing task with dependencies",
+            task=task_name,
+            state=lambda: 'completed' if task_name in self.tasks_completed else 'running' if task_name in self.tasks_running else 'pending',
+            context_keys=lambda: list(self.context_info.context.keys())
+        )
         try:
             # CRITICAL: Check completion status first with lock
             async with self._tasks_lock:
@@ -1336,8 +1430,7 @@ class TaskGroup(BaseModel):
                 # Mark as running before releasing lock
                 self.tasks_running.add(task_name)
             
-            # Update state asynchronously
-            state_task = asyncio.create_task(self.save_state())
+            await self.save_state()
             
             # Prepare task data
             if 'key' not in task_data:
@@ -1394,7 +1487,8 @@ class TaskGroup(BaseModel):
                     "validator_tool": task.validator_tool,
                     "expansion_config": task.expansion_config,
                     "shared_instructions": task.shared_instructions,
-                    "agent_class": task.agent_class
+                    "agent_class": task.agent_class,
+                    "lane": self.lane
                 },
                 "context": self.context_info.context
             }
@@ -1414,12 +1508,7 @@ class TaskGroup(BaseModel):
                 json.dumps(task_tracking)
             )
             
-            self._logger.debug(f"""
-            Distributing task:
-            - Key: {task.key}
-            - Name: {task.name}
-            - Status: pending
-            """)
+            log_debug(self._logger, "Distributing task", key=task.key, name=task.name, status='pending')
             
         except Exception as e:
             self._logger.error(f"Error executing task {task.name}: {str(e)}")
@@ -1484,11 +1573,11 @@ class TaskGroup(BaseModel):
                         #    json.dumps(mapping_data)
                         #)
             
-            self._logger.debug(f"""
-            Initialized result tracking:
-            - Expected results: {self._expected_results}
-            - Task result mapping: {self._task_result_mapping}
-            """)
+            log_debug(
+                self._logger, "Initialized result tracking",
+                expected_results=self._expected_results,
+                task_result_mapping=self._task_result_mapping
+            )
             
         except Exception as e:
             self._logger.error(f"Error initializing result tracking: {str(e)}")
@@ -1505,22 +1594,19 @@ class TaskGroup(BaseModel):
             keys = await self._redis.client.keys(pattern)
             
             for key in keys:
-                context_data = await self._redis.client.get(key)
-                if context_data:
-                    try:
-                        context = json.loads(context_data)
+                try:
+                    # Snapshot plus any deltas appended since its last compaction
+                    context = await TaskGroupStateStore.load_context(self._redis.client, key)
+                    if context:
                         # Merge context, avoiding overwrite of existing values
                         for k, v in context.items():
                             if k not in self.context_info.context:
                                 self.context_info.context[k] = v
-                    except json.JSONDecodeError:
-                        self._logger.warning(f"Invalid context data in Redis for key: {key}")
+                except json.JSONDecodeError:
+                    self._logger.warning(f"Invalid context data in Redis for key: {key}")
             
             # Store updated context
-            await self._redis.client.set(
-                f"task_group:{self.id}:context",
-                json.dumps(self.context_info.context)
-            )
+            await self.save_state()
             
             self._logger.debug(f"Synchronized session context for task group {self.id}")
             
@@ -1581,48 +1667,6 @@ class TaskGroup(BaseModel):
             self._logger.error(f"Error validating task config: {str(e)}")
             return False
     
-    async def collect_pending_tasks(self) -> List[Dict[str, Any]]:
-        try:
-            # Track task states to avoid repeated logging
-            _logged_states = getattr(self, '_logged_states', {})
-            if not hasattr(self, '_logged_states'):
-                self._logged_states = {}
-
-            # Only log overall state if it has changed
-            current_state = (
-                len(self.tasks),
-                list(sorted(self.tasks_completed)),  # Convert to list for comparison
-                list(sorted(self.tasks_failed.keys())),
-                list(sorted(self.tasks_running))
-            )
-            
-            pending_tasks = []
-            
-            for task in self.tasks:
-                task_name = task.get('name')
-                
-                # Skip completed, failed, or running tasks
-                if (task_name in self.tasks_completed or 
-                    task_name in self.tasks_failed or 
-                    task_name in self.tasks_running):
-                    continue
-
-                # Add required 'key' field for TaskInfo validation
-                task_info = {
-                    'key': task_name,  # Add missing required field
-                    **task  # Spread existing task data
-                }
-                
-                pending_tasks.append(task)
-                    
-
-            return pending_tasks
-
-        except Exception as e:
-            self._logger.error(f"Error collecting pending tasks: {str(e)}")
-            self._logger.error(traceback.format_exc())
-            return []
-    
     ############################
     # State Management Methods #
     ############################
@@ -1649,12 +1693,7 @@ class TaskGroup(BaseModel):
             if status == 'completed' and task_name not in self.tasks_completed:
                 self.tasks_completed.add(task_name)
             elif status == 'failed':
-                failure_record = {
-                    'task_name': task_name,
-                    'error': error,
-                    'timestamp': datetime.now().isoformat()
-                }
-                self.tasks_failed.append(failure_record)
+                self.tasks_failed[task_name] = error
             
             # Update Redis state
             key = f"task:{self.id}:{task_name}:state"
@@ -1678,86 +1717,64 @@ class TaskGroup(BaseModel):
             self._logger.error(traceback.format_exc())
     
     async def save_state(self):
-        """Save current task group state to Redis."""
-        try:            
-            # Convert sets to lists for JSON serialization
-            state = {
-                'id': self.id,
-                'name': self.name,
-                'session_id': self.session_id,
-                'tasks_completed': list(self.tasks_completed),
-                'tasks_failed': self.tasks_failed,
-                'running_tasks': list(self.tasks_running),
-                'expected_results': {k: v for k, v in self._expected_results.items()},
-                'received_results': {k: list(v) if isinstance(v, set) else v 
-                                   for k, v in self._received_results.items()},
-                'task_attempts': {k: v for k, v in self._task_attempts.items()},
-                'timestamp': datetime.now().isoformat(),
-                'version': '2.0'
-            }
-            
-            # Convert sets to lists for JSON serialization
-            state = {
+        """
+        Persist what changed since the last save to Redis.
+
+        Only the header fields, the task statuses and received results that
+        changed, and a delta of the context are written, in one pipeline; the
+        context snapshot is rewritten periodically by the state store.
+        """
+        try:
+            header = {
                 'id': self.id,
                 'name': self.name,
                 'session_id': self.session_id,
-                'tasks_completed': list(self.tasks_completed),
-                'tasks_failed': self.tasks_failed,
-                'running_tasks': list(self.tasks_running),
+                'status': self._status,
+                'completion_time': self._completion_time,
                 'expected_results': {k: v for k, v in self._expected_results.items()},
-                'received_results': {k: list(v) if isinstance(v, set) else v 
-                                   for k, v in self._received_results.items()},
                 'task_attempts': {k: v for k, v in self._task_attempts.items()},
-                'timestamp': datetime.now().isoformat(),
-                'version': '2.0'
             }
+            commands = await self._state_store.save(
+                self._redis.client,
+                header=header,
+                task_states=self._task_states(),
+                received_results={k: list(v) if isinstance(v, set) else v
+                                  for k, v in self._received_results.items()},
+                context=self.context_info.context
+            )
             
-            # Save state atomically
-            async with self._redis.client.pipeline() as pipe:
-                # Save main state
-                await pipe.set(f"task_group:{self.id}:state", json.dumps(state))
-                
-                # Save individual task states
-                for task_name in self.tasks_completed:
-                    await pipe.set(
-                        f"task_group:{self.id}:task:{task_name}:state",
-                        json.dumps({'status': 'completed', 'timestamp': datetime.now().isoformat()})
-                    )
-                
-                # Save context separately
-                await pipe.set(
-                    f"task_group:{self.id}:context",
-                    json.dumps(self.context_info.context)
-                )
-                
-                await pipe.execute()
-                
-            self._logger.debug(f"Saved state for task group {self.id}")
+            self._logger.debug(f"Saved state for task group {self.id} ({commands} writes)")
             
         except Exception as e:
             self._logger.error(f"Error saving state: {str(e)}")
             self._logger.error(traceback.format_exc())
 
+    def _task_states(self) -> Dict[str, Dict[str, Any]]:
+        """Current status of every task that has started."""
+        states = {name: {'status': 'running'} for name in self.tasks_running}
+        states.update({name: {'status': 'failed', 'error': error} for name, error in self.tasks_failed.items()})
+        states.update({name: {'status': 'completed'} for name in self.tasks_completed})
+        return states
+
     async def load_state(self):
-        """Load task group state from Redis."""
+        """Load task group state from Redis, replaying context deltas onto the last snapshot."""
         try:
-            key = f"task_group:{self.id}:state"
-            state_data = await self._redis.client.get(key)
-            
-            if state_data:
-                state = json.loads(state_data)
-                self.tasks_completed = state.get('tasks_completed', set())
-                self.tasks_failed = state.get('tasks_failed', {})
-                self.tasks_running = set(state.get('running_tasks', []))
-                self._expected_results = state.get('expected_results', {})
-                self._received_results = state.get('received_results', {})
-                self._task_attempts = state.get('task_attempts', {})
+            state = await self._state_store.load(self._redis.client)
+            
+            if state:
+                header = state['header']
+                tasks = state['tasks']
+                self.tasks_completed = {name for name, task in tasks.items() if task.get('status') == 'completed'}
+                self.tasks_failed = {name: task.get('error') for name, task in tasks.items() if task.get('status') == 'failed'}
+                self.tasks_running = {name for name, task in tasks.items() if task.get('status') == 'running'}
+                self._status = header.get('status')
+                self._completion_time = header.get('completion_time')
+                self._expected_results = header.get('expected_results', {})
+                self._received_results = state['received']
+                self._task_attempts = header.get('task_attempts', {})
                 
                 # Load context
-                context_key = f"task_group:{self.id}:context"
-                context_data = await self._redis.client.get(context_key)
-                if context_data:
-                    self.context_info.context.update(json.loads(context_data))
+                self.context_info.context.update(state['context'])
                 
                 self._logger.debug(f"Loaded state for task group {self.id}")
                 
@@ -1770,16 +1787,13 @@ class TaskGroup(BaseModel):
         try:
             
             await self.cleanup_subscriptions(self._redis)
-            # Clean up state
-            await self._redis.client.delete(f"task_group:{self.id}:state")
-            
-            # Clean up context
-            await self._redis.client.delete(f"task_group:{self.id}:context")
+            # Clean up state, task statuses, received results and context
+            await self._state_store.delete(self._redis.client)
             
             # Clean up task states
-            for task in self.tasks:
-                task_name = task.get('name')
-                await self._redis.client.delete(f"task:{self.id}:{task_name}:state")
+            task_keys = [f"task:{self.id}:{task.get('name')}:state" for task in self.tasks]
+            if task_keys:
+                await self._redis.client.delete(*task_keys)
             
             # Clean up result mappings
             await self._redis.client.delete(f"session:{self.session_id}:result_keys")
@@ -1793,8 +1807,10 @@ class TaskGroup(BaseModel):
     async def get_task_state(self, task_name: str) -> Optional[str]:
         """Get current state of a task from Redis."""
         try:
-            key = f"task:{self.id}:{task_name}:state"
-            state_data = await self._redis.client.get(key)
+            state_data = await self._redis.client.hget(self._state_store.tasks_key, task_name)
+            if not state_data:
+                # Tasks whose state was only reported through task:{id}:{name}:state
+                state_data = await self._redis.client.get(f"task:{self.id}:{task_name}:state")
             if state_data:
                 state = json.loads(state_data)
                 return state.get('status')
@@ -1828,7 +1844,7 @@ class TaskGroup(BaseModel):
         """
         try:
             quick_log.info(f"Processing task result - Task: {task_name}, Key: {result_key}")
-            quick_log.debug(f"Result type: {type(value)}, Preview: {str(value)[:100]}...")
+            log_debug(quick_log, "Result", type=type(value).__name__, preview=lambda: str(value), limit=100)
 
             # Validate result
             if not await self.validate_result(value, task_name, result_key):
@@ -1891,14 +1907,13 @@ class TaskGroup(BaseModel):
                 'parent_task_key': parent_key
             }
 
-            self._logger.info(f"""
-            Updating Redis mappings:
-            - Result key: {result_key}
-            - Task: {task_name}
-            - Is Expanded: {is_expanded}
-            - Parent Key: {parent_key}
-            - Mapping data: {json.dumps(mapping_data, indent=2)}
-            """)
+            self._logger.info(f"Updating Redis mappings for {result_key} from task {task_name}")
+            log_debug(
+                self._logger, "Redis mapping",
+                result_key=result_key, task=task_name,
+                is_expanded=is_expanded, parent_key=parent_key,
+                mapping_data=mapping_data
+            )
             
             # Update Redis mappings
             await self._redis.client.hset(
@@ -1921,28 +1936,7 @@ class TaskGroup(BaseModel):
                 f"task_group:{self.id}:results:{result_key}",
                 json.dumps(results_data)
             )
-
-            # If this is an expanded task, update parent task tracking
-            if is_expanded:
-                expansion_key = f"{parent_key}:expansion"
-                async with self._redis.client.pipeline() as pipe:
-                    while True:
-                        try:
-                            await pipe.watch(expansion_key)
-                            expansion_data = await self._redis.client.get(expansion_key)
-                            
-                            if expansion_data:
-                                expansion_state = json.loads(expansion_data)
-                                expansion_state['received_tasks'] = expansion_state.get('received_tasks', 0) + 1
-                                expansion_state['last_update'] = datetime.now().isoformat()
-                                
-                                pipe.multi()
-                                await pipe.set(expansion_key, json.dumps(expansion_state))
-                                await pipe.execute()
-                                break
-                                
-                        except self._redis.WatchError:
-                            continue
+            # Expanded tasks are counted at the parent's barrier by their TaskProcessor, not here
 
         except Exception as e:
             self._logger.error(f"Redis mapping failed for {result_key}: {str(e)}")
@@ -1953,15 +1947,14 @@ class TaskGroup(BaseModel):
         try:
             from containers import get_container
             redis = get_container().redis()
-            publisher = RedisPublisher()
 
             self._logger.info(f"""
             Publishing result to Redis:
             - Key: {result_key}
             - Task Group: {self.id}
             - Result count: {len(self._received_results[result_key])}
-            - Value preview: {str(self._received_results[result_key])[:100]}...
             """)
+            log_debug(self._logger, "Result preview", key=result_key, value=lambda: str(self._received_results[result_key]), limit=100)
 
             # Update context directly
             self.context_info.context[result_key] = self._received_results[result_key]
@@ -1982,13 +1975,16 @@ class TaskGroup(BaseModel):
             task_group_channel = f"task_group_execute:{self.id}:{result_key}"
             session_channel = f"session:{self.session_id}:results"
             
-            pub_success1 = await publisher.publish(redis, task_group_channel, result_data)
-            pub_success2 = await publisher.publish(redis, session_channel, result_data)
+            # Results must reach late subscribers too, so never skip channels that looked idle
+            sent = await redis.publish_many(
+                [(task_group_channel, result_data), (session_channel, result_data)]
+            )
             
             self._logger.info(f"""
             Published to channels:
-            - Task group channel: {task_group_channel} (success: {pub_success1})
-            - Session channel: {session_channel} (success: {pub_success2})
+            - Task group channel: {task_group_channel}
+            - Session channel: {session_channel}
+            - Sent: {sent}/2
             """)
 
             # Emit completion event
@@ -2043,7 +2039,7 @@ class TaskGroup(BaseModel):
         Ensures proper resource cleanup and prevents memory leaks.
         """
         try:
-            self.logger.info("Starting subscription cleanup")
+            self._logger.info("Starting subscription cleanup")
             
             # Stop the message processor
             self._processing_active = False
@@ -2051,12 +2047,15 @@ class TaskGroup(BaseModel):
                 self._message_processor_task.cancel()
                 try:
                     await asyncio.wait_for(self._message_processor_task, timeout=5.0)
-                except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+                except asyncio.CancelledError:
+                    pass
+                except asyncio.TimeoutError as e:
                     self._logger.warning(f"Message processor shutdown: {str(e)}")
+                self._message_processor_task = None
 
             # Cancel all active tasks
             if hasattr(self, '_active_tasks'):
-                self.logger.info(f"Cancelling {len(self._active_tasks)} active tasks")
+                self._logger.info(f"Cancelling {len(self._active_tasks)} active tasks")
                 for task in self._active_tasks:
                     if not task.done():
                         task.cancel()
@@ -2094,13 +2093,10 @@ class TaskGroup(BaseModel):
     async def _cleanup_single_subscription(self, redis: RedisService, channel: str) -> None:
         """Helper method to cleanup a single subscription with error handling"""
         try:
-            from containers import get_container
-            event_manager = get_container().event_manager()
-            
             # Use the channel as-is since it already contains the task_group_id
             full_channel = channel
             if channel in self._subscriptions:
-                await event_manager.unsubscribe(full_channel, self._subscriptions[channel])
+                await redis.unsubscribe(full_channel, self._subscriptions[channel])
                 self._logger.debug(f"Unsubscribed from channel: {full_channel}")
         except Exception as e:
             self._logger.error(f"Error unsubscribing from channel {channel}: {e}")
@@ -2112,11 +2108,7 @@ class TaskGroup(BaseModel):
         
         # Get current subscriptions
         subs = await redis.client.pubsub_numsub(channel)
-        self._logger.debug(f"""
-        Validating subscriptions for channel {channel}:
-        - Active subscriptions: {subs}
-        - Channel exists: {bool(subs)}
-        """)
+        log_debug(self._logger, "Validated subscriptions", channel=channel, active=subs)
         return bool(subs)
 
     ##async def publish_dependency_update(self, task_name: str, result_key: str, value: Any) -> bool:
@@ -2144,8 +2136,6 @@ class TaskGroup(BaseModel):
     ##        channel = f"task_group_execute:{self.id}:{result_key}"
     ##        
     ##        # Use RedisPublisher utility
-    ##        from app.utilities.redis_publisher import RedisPublisher
-    ##        publisher = RedisPublisher()
     ##        success = await publisher.publish(redis, channel, message)
     ##
     ##        self._logger.info(f"""
@@ -2362,12 +2352,7 @@ class TaskGroup(BaseModel):
             bool: True if result is valid, False otherwise
         """
         try:
-            self._logger.debug(f"""
-            Validating result:
-            - Task: {task_name}
-            - Key: {result_key}
-            - Value type: {type(value)}
-            """)
+            log_debug(self._logger, "Validating result", task=task_name, key=result_key, value_type=type(value).__name__)
 
             # Basic validation - ensure value is not None
             if value is None:
@@ -2386,22 +2371,19 @@ class TaskGroup(BaseModel):
                     return False
                 
                 # Check expansion tracking
-                expansion_key = f"{parent_key}:expansion"
-                expansion_data = await self._redis.client.get(expansion_key)
-                if not expansion_data:
+                expansion_state = await self._redis.barriers.state(parent_key)
+                if not expansion_state:
                     self._logger.error(f"No expansion tracking found for {parent_key}")
                     return False
                     
-                expansion_state = json.loads(expansion_data)
-                total_tasks = expansion_state.get('total_tasks', 0)
-                received_tasks = expansion_state.get('received_tasks', 0)
-                
-                self._logger.debug(f"""
-                Expansion state for {parent_key}:
-                - Total tasks: {total_tasks}
-                - Received tasks: {received_tasks}
-                - Current task: {expanded_id}
-                """)
+                total_tasks = expansion_state['total_tasks']
+                received_tasks = expansion_state['received_tasks']
+                
+                log_sampled(
+                    self._logger, f"expansion_state:{parent_key}", "Expansion state",
+                    parent_key=parent_key, total_tasks=total_tasks,
+                    received_tasks=received_tasks, current_task=expanded_id
+                )
                 
                 # Validate expanded result structure
                 if isinstance(value, dict):
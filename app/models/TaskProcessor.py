@@ -14,6 +14,8 @@ from app.logging_config import configure_logger
 from app.utilities.assistant_event_handler import AgencySwarmEventHandler
 from app.utilities.event_handler import EventHandler
 from app.models.agency import Agency
+from app.utilities.templates import PLACEHOLDER, TemplateValues, compile_template
+from app.debug_log import log_debug, log_sampled
 from app.utilities.errors import (
     DependencyError,
     ConfigurationError,
@@ -47,6 +49,7 @@ class TaskProcessor(BaseModel):
     context_info: ContextInfo = Field(..., description="The context information")
     task_info: TaskInfo = Field(..., description="The task information")
     total_tasks: int = Field(default=0, description="Total number of tasks in the workflow")
+    lane: Optional[str] = Field(default=None, description="Worker execution lane: 'interactive' or 'batch'")
     
     # Task State Tracking
     tasks_completed: Set[str] = Field(default_factory=set, description="Set of completed task names")
@@ -83,10 +86,6 @@ class TaskProcessor(BaseModel):
     _task_attempts: Dict[str, int] = PrivateAttr(default_factory=dict)
     _tasks_lock: asyncio.Lock = PrivateAttr(default_factory=asyncio.Lock)
     
-    # Add new tracking attributes
-    _expansion_tracking: Dict[str, Dict[str, Any]] = PrivateAttr(default_factory=dict)
-    _expansion_locks: Dict[str, asyncio.Lock] = PrivateAttr(default_factory=dict)
-    
     class Config:
         arbitrary_types_allowed = True
         json_encoders = {
@@ -254,11 +253,11 @@ class TaskProcessor(BaseModel):
         self._task_logger.error(f"Error in {data.get('context')}: {data.get('error')}")
         await self._handle_error_recovery(data)
 
-    async def execute_task(self) -> None:
-        """Execute a task with proper dependency management"""
+    async def execute_task(self) -> Optional[asyncio.Future]:
+        """Execute a task with proper dependency management. Returns the pooled run of a single task."""
         try:
             quick_log.info(f"[TASK_START] {self.task_info.name} - Starting execution")
-            quick_log.debug(f"[TASK_CONFIG] {self.task_info.name} - Dependencies: {self.task_info.dependencies}")
+            log_debug(quick_log, f"[TASK_CONFIG] {self.task_info.name}", dependencies=self.task_info.dependencies)
 
             await self._event_handler.handle_event('task_started', {
                 'task_name': self.task_info.name,
@@ -295,56 +294,58 @@ class TaskProcessor(BaseModel):
                 from containers import get_container
                 kafka = get_container().kafka()
                 
-                # Initialize expansion tracking before sending tasks
-                expansion_key = f"{self.task_info.key}:expansion"
+                # Expanded tasks report to this barrier; it must exist before any of them can run
                 total_tasks = len(expanded_tasks)
                 quick_log.debug(f"[TASK_EXPAND] {self.task_info.name} - Total expanded tasks: {total_tasks}")
+                if not await self._redis.barriers.create(self.task_info.key, total_tasks):
+                    quick_log.info(f"[TASK_EXPAND] {self.task_info.name} - Barrier already exists, keeping its arrivals")
+                if not expanded_tasks:
+                    # No expanded task will arrive at the barrier, so publish the empty results here
+                    await self._publish_expansion_results(self.task_info.key, self.task_info.result_keys)
+                    return None
                 
-                # Store the expected number of results with additional tracking
-                await self._redis.client.set(
-                    expansion_key,
-                    json.dumps({
-                        "total_tasks": total_tasks,
-                        "received_tasks": 0,
-                        "results": {},
-                        "start_time": datetime.utcnow().isoformat(),
-                        "status": "in_progress"
-                    })
-                )
+                # Claim check: store a large context once and send only its reference with each item.
+                # Items already carry their rendered templates, so the snapshot is shared as-is.
+                # Small contexts travel inline, so they never depend on a snapshot outliving the fan-out.
+                context_ref = None
+                if not self._redis.context_snapshots.should_inline(serialized_context):
+                    try:
+                        context_ref = await self._redis.context_snapshots.put(self.context_info.context)
+                    except Exception as e:
+                        quick_log.warning(f"[TASK_EXPAND] {self.task_info.name} - Could not store context snapshot, sending it inline: {str(e)}")
                 
-                # Send each expanded task to Kafka
+                # Build every expanded task message, then send them as one batch
+                kafka_messages = []
                 for i, expanded_task in enumerate(expanded_tasks):
                     expanded_key = f"{self.task_info.key}:{i}"
-                    quick_log.info(f"Sending expanded task {expanded_task['name']} to Kafka")
+                    log_sampled(quick_log, f"queue_expanded:{self.task_info.name}", "Queueing expanded task for Kafka", task=expanded_task['name'])
                     expanded_task['session_id'] = self.session_id
-                    
-                    # Convert context_info to dict first if it's not already
-                    context_info_dict = (
-                        self.context_info.dict() 
-                        if hasattr(self.context_info, 'dict') 
-                        else self.context_info
-                    )
-                    
-                    expanded_task['context_info'] = json.dumps(context_info_dict, default=str)
+                    expanded_task['context_ref'] = context_ref
                     expanded_task['is_expanded_task'] = True
                     expanded_task['parent_task_key'] = self.task_info.key
+                    expanded_task['lane'] = self.lane
                     
-                    kafka_message = {
+                    kafka_messages.append({
                         "key": expanded_key,
                         "action": "execute",
                         "object": expanded_task,
-                        "context": serialized_context,  # Use the already serialized context
-                    }
-                    
-                    await kafka.send_message("agency_action", kafka_message)
-                    
-                    from containers import get_container
-                    redis = get_container().redis()
-                    
-                    await redis.client.incr(f"{self.task_info.key}:total_tasks")
+                        "context": None if context_ref else serialized_context,
+                    })
+                
+                quick_log.info(f"Sending {len(kafka_messages)} expanded tasks to Kafka")
+                await kafka.send_many("agency_action", kafka_messages, key_func=lambda m: m["key"])
             else:
-                # Execute single task normally
-                asyncio.create_task(self._execute_single_task(self.task_info, self.task_info.tools))
+                # Agent runs go through the worker's bounded pool instead of an unbounded task
+                from containers import get_container
+                execution = get_container().worker().submit(
+                    lambda: self._execute_single_task(self.task_info, self.task_info.tools),
+                    session_id=self.session_id,
+                    lane=self.lane,
+                    name=self.task_info.name
+                )
+                # Callers only wait for the pooled run, so its failure has to be reported from here
+                execution.add_done_callback(self._on_execution_done)
+                return execution
             
         except (DependencyError, ConfigurationError, TaskExecutionError) as e:
             await self.mark_task_failed(self.task_info.name, str(e))
@@ -358,6 +359,18 @@ class TaskProcessor(BaseModel):
             await self.mark_task_failed(self.task_info.name, str(error))
             raise error
     
+    def _on_execution_done(self, execution: asyncio.Future):
+        """Mark the task failed when its pooled run raised, timed out or was cancelled."""
+        if execution.cancelled():
+            error = "Task execution was cancelled"
+        elif execution.exception() is not None:
+            error = str(execution.exception())
+        else:
+            return
+        task = asyncio.ensure_future(self.mark_task_failed(self.task_info.name, error))
+        self._active_tasks.add(task)
+        task.add_done_callback(self._active_tasks.discard)
+
     async def _execute_single_task(self, task: TaskInfo, tools) -> None:
         """
         Execute a single task (either original or expanded) with proper context management
@@ -368,26 +381,17 @@ class TaskProcessor(BaseModel):
             else:
                 self._task_logger.info(f"Executing single task: {task.name}")
                 
-            message = task.message_template
-            
-            # Then process other context variables
-            for key, value in self.context_info.context.items():
-                placeholder = f"{{{key}}}"
-                if placeholder in message:
-                    message = message.replace(placeholder, str(value))
-            
-            task.message_template = message
-        
-            # Process shared_instructions template variables
-            shared_instructions = task.shared_instructions
-            
-            # Then process other context variables
-            for key, value in self.context_info.context.items():
-                placeholder = f"{{{key}}}"
-                if placeholder in shared_instructions:
-                    shared_instructions = shared_instructions.replace(placeholder, str(value))
-                    
-            task.shared_instructions = shared_instructions
+            # Both templates share one set of values, so each referenced key is stringified once
+            values = TemplateValues(self.context_info.context, str)
+            for field in ('message_template', 'shared_instructions'):
+                template = getattr(task, field)
+                if not template:
+                    continue
+                compiled = compile_template(template, PLACEHOLDER)
+                missing = [key for key in compiled.missing(values) if key.isidentifier()]
+                if missing:
+                    self._task_logger.warning(f"{task.name}: {field} references keys not in context, left as-is: {missing}")
+                setattr(task, field, compiled.render(values))
         except KeyError as e:
             missing_key = str(e).strip("'")
             available_keys = list(self.context_info.context.keys())
@@ -410,17 +414,18 @@ class TaskProcessor(BaseModel):
         from app.models.agents.Agent import Agent
         from app.factories.agent_factory import AgentFactory
         
+        # The rendered task instructions differ per task, so they go with the run rather than
+        # into the assistant; the assistant stays identical across tasks and is reused
         agent: Agent = await AgentFactory.from_name(
             name=task.agent_class,
             session_id=self.session_id,
             tools=tools,
-            instructions=task.shared_instructions,
             context_info=self.context_info,
             logger=self._task_logger
         )
             
-        agency = Agency(agency_chart=[agent], shared_instructions=task.shared_instructions, session_id=self.session_id, logger=self._task_logger)
-        await agency.get_completion(message)
+        agency = Agency(agency_chart=[agent], session_id=self.session_id, logger=self._task_logger)
+        await agency.get_completion(task.message_template, additional_instructions=task.shared_instructions)
         
         if isinstance(agent.context_info, dict):
             agent.context_info = ContextInfo(**agent.context_info)
@@ -437,10 +442,11 @@ class TaskProcessor(BaseModel):
                     self._task_logger.warning(f"Task result is None for optional key: {result_key}")
                 else:
                     self._task_logger.warning(f"Task result is None for key: {result_key}")
-                    agency = Agency(agency_chart=[agent], shared_instructions=task.shared_instructions, session_id=self.session_id, logger=self._task_logger)
+                    agency = Agency(agency_chart=[agent], session_id=self.session_id, logger=self._task_logger)
                     await agency.get_completion(
                     f"{task.message_template}\n\n"
-                    f"Please try again. Please ensure that all necessary tools are used to generate the required {result_key}."
+                    f"Please try again. Please ensure that all necessary tools are used to generate the required {result_key}.",
+                    additional_instructions=task.shared_instructions
                 )
         
             if task.validator_prompt and task.validator_tool:
@@ -461,34 +467,27 @@ class TaskProcessor(BaseModel):
                 self.context_info.context[result_key] = result
                 agent.context_info.context[result_key] = result
                 
-            self._task_logger.debug(f"""
-            Context updated:
-            - Key: {result_key}
-            - Previous value: {self.context_info.context.get(result_key)}
-            - New value: {result}
-            - Merged result: {self.context_info.context[result_key]}
-            - Updated keys: {set(self.context_info.context.keys())}
-            """)
-        
-        total_tasks = await self._redis.client.decr(f"{self.task_info.key}:total_tasks")
+            log_debug(
+                self._task_logger, "Context updated",
+                key=result_key,
+                new_value=result,
+                merged_result=lambda: self.context_info.context[result_key],
+                updated_keys=lambda: sorted(self.context_info.context.keys())
+            )
         
-        # We need to update any context in Redis for all the keys in context_info.context
-        for key in self.task_info.result_keys:
-            if key in self.context_info.context:
-                if task.expansion_config:
-                    if key in task.expansion_config['array_mapping'].values():
-                        await self._redis.client.lpush(
-                            f"session:{self.session_id}:task_results:{key}",
-                            json.dumps(outputs[key])
-                        )
-                        
-                        if total_tasks == 0:
-                            await self._notify_subscribers({
-                                'task_name': self.task_info.name,
-                                'result_key': key,
-                                'value': outputs[key]
-                            })
-                else:
+        if task.is_expanded_task and task.parent_task_key:
+            # Only the expanded task that completes the parent's barrier (or a redelivery of it) publishes, with every task's results
+            arrival = await self._redis.barriers.arrive(task.parent_task_key, task.key, outputs)
+            log_sampled(
+                self._task_logger, f"expansion_progress:{task.parent_task_key}", "Expansion progress",
+                parent=task.parent_task_key, received=f"{arrival['received']}/{arrival['expected']}"
+            )
+            if arrival['completed']:
+                await self._publish_expansion_results(task.parent_task_key, task.result_keys)
+        else:
+            # We need to update any context in Redis for all the keys in context_info.context
+            for key in self.task_info.result_keys:
+                if key in self.context_info.context:
                     if outputs[key] is not None:
                         await self._redis.client.hset(
                             f"session:{self.session_id}:task_results",
@@ -502,6 +501,13 @@ class TaskProcessor(BaseModel):
                         })
             
 
+        if not task.result_keys and not task.is_expanded_task:
+            # Nothing is published for such a task, so tell its group it is done
+            await self._redis.publish(
+                f"session:{self.session_id}:task_done:{task.name}",
+                json.dumps({'type': 'task_done', 'task_name': task.name})
+            )
+
         if not outputs:
             self._task_logger.warning(f"Task {self.task_info.name} completed but returned no results")
         else:
@@ -548,11 +554,22 @@ class TaskProcessor(BaseModel):
         
         try:
             if action == 'execute':
-                # Deserialize context if it's a string
-                context_dict = (
-                    json.loads(context) if isinstance(context, str)
-                    else context
-                )
+                context_ref = object_data.get('context_ref')
+                snapshot_error = None
+                if context_ref and not context:
+                    # Expanded tasks share one context snapshot, fetched once per worker
+                    try:
+                        context_dict = await redis.context_snapshots.get(context_ref)
+                    except KeyError:
+                        # A redelivery cannot bring the snapshot back, so fail the task rather than the handler
+                        snapshot_error = f"Context snapshot {context_ref} expired before task {object_data.get('name')} could run"
+                        context_dict = {}
+                else:
+                    # Deserialize context if it's a string
+                    context_dict = (
+                        json.loads(context) if isinstance(context, str)
+                        else context
+                    )
                 
                 # Create processor instance
                 processor = cls(
@@ -561,6 +578,7 @@ class TaskProcessor(BaseModel):
                     context_info=ContextInfo(context=context_dict),
                     session_id=object_data.get('session_id'),
                     total_tasks=total_tasks,
+                    lane=object_data.get('lane'),
                     task_info=TaskInfo(
                         key=key,
                         name=object_data.get('name'),
@@ -575,12 +593,18 @@ class TaskProcessor(BaseModel):
                         message_template=object_data.get('message_template', None),
                         validator_prompt=object_data.get('validator_prompt', None),
                         validator_tool=object_data.get('validator_tool', None),
-                        expansion_config=object_data.get('expansion_config', None)
+                        expansion_config=object_data.get('expansion_config', None),
+                        is_expanded_task=object_data.get('is_expanded_task', False),
+                        parent_task_key=object_data.get('parent_task_key')
                     )
                 )
 
-                # Setup dependencies and process task
-                asyncio.create_task(cls._setup_and_process_task(processor, key, object_data, context_dict, logger))
+                if snapshot_error:
+                    await processor.mark_task_failed(processor.task_info.name, snapshot_error)
+                    return
+
+                # Setup dependencies and process task; the event counts as handled once the run finishes
+                await cls._setup_and_process_task(processor, key, object_data, context_dict, logger)
             else:
                 logger.warning(f"Unsupported action for TaskProcessor: {action}")
                 
@@ -619,8 +643,15 @@ class TaskProcessor(BaseModel):
                         session_id=processor.session_id
                     )
             
-            # Process the task
-            asyncio.create_task(cls._process_task(processor, key, object_data, context, logger))
+            # Process the task and wait for its run. A task still missing dependencies
+            # is handled here once subscribed; it runs when the dependency update arrives.
+            task = await cls._process_task(processor, key, object_data, context, logger)
+            if task is not None:
+                execution = await task
+                if execution is not None:
+                    # A failed pooled run is reported by _on_execution_done
+                    await asyncio.wait([execution])
+            return task
             
         except Exception as e:
             logger.error(f"Error in task setup: {str(e)}")
@@ -722,7 +753,7 @@ class TaskProcessor(BaseModel):
                     'timestamp': datetime.utcnow().isoformat()
                 })
             
-            self._task_logger.debug(f"Updated state in Redis: {state_data}")
+            log_debug(self._task_logger, "Updated state in Redis", state=state_data)
             
         except Exception as e:
             self._task_logger.error(f"Error saving state to Redis: {str(e)}")
@@ -808,7 +839,7 @@ class TaskProcessor(BaseModel):
                 'result_key': result_key,
                 'value': value
             }
-            await self._redis.client.publish(channel, json.dumps(message))
+            await self._redis.publish(channel, json.dumps(message))
             await self._redis.client.set(channel, json.dumps(value, cls=TaskContextEncoder))
             
             await self._event_handler.handle_event('result_published', {
@@ -822,6 +853,44 @@ class TaskProcessor(BaseModel):
             self._task_logger.error(f"Error notifying subscribers: {str(e)}")
             self._task_logger.error(traceback.format_exc())
 
+    async def _publish_expansion_results(self, parent_key: str, result_keys: List[str]):
+        """
+        Store and publish the combined results of a completed expansion.
+
+        Array results of the expanded tasks are concatenated in expansion order.
+
+        Args:
+            parent_key (str): Key of the task that was expanded.
+            result_keys (List[str]): Result keys the expanded tasks produce.
+        """
+        results = await self._redis.barriers.results(parent_key)
+        def expansion_index(item):
+            # Members are "{parent_key}:{index}"
+            suffix = item[0].rsplit(':', 1)[-1]
+            return int(suffix) if suffix.isdigit() else 0
+
+        ordered = sorted(results.items(), key=expansion_index)
+        for key in result_keys:
+            combined = []
+            for _, outputs in ordered:
+                value = (outputs or {}).get(key)
+                if isinstance(value, list):
+                    combined.extend(value)
+                elif value is not None:
+                    combined.append(value)
+            self.context_info.context[key] = combined
+            await self._redis.client.hset(
+                f"session:{self.session_id}:task_results",
+                key,
+                json.dumps(combined)
+            )
+            await self._notify_subscribers({
+                'task_name': self.task_info.name,
+                'result_key': key,
+                'value': combined
+            })
+        self._task_logger.info(f"Published combined results of {len(results)} expanded tasks for {parent_key}")
+
     async def _validate_result_data(self, data: Dict[str, Any]):
         """Validate published result data"""
         try:
@@ -878,12 +947,12 @@ class TaskProcessor(BaseModel):
                 await self._save_state_to_redis(data)
                 return
 
-            self._task_logger.debug(f"""
-            Handling processor state update:
-            - Input data: {data}
-            - Current completed tasks: {self.tasks_completed}
-            - Current failed tasks: {self.tasks_failed}
-            """)
+            log_debug(
+                self._task_logger, "Handling processor state update",
+                data=data,
+                completed_tasks=lambda: self.tasks_completed,
+                failed_tasks=lambda: self.tasks_failed
+            )
 
             await self._save_state_to_redis(data)
             
@@ -958,6 +1027,14 @@ class TaskProcessor(BaseModel):
                 await self.cleanup_task_resources(task_name)
                 
                 self._task_logger.error(f"Task {task_name} marked as failed: {error_message}")
+
+            # The group only hears about processor-side failures through Redis; without this
+            # the task holds its scheduler slot until the group times out
+            group_task = self._group_task_name(task_name)
+            await self._redis.publish(
+                f"session:{self.session_id}:task_failed:{group_task}",
+                json.dumps({'type': 'task_failed', 'task_name': group_task, 'error': error_message})
+            )
                 
         except Exception as e:
             self._task_logger.error(f"Error marking task {task_name} as failed: {str(e)}")
@@ -968,6 +1045,18 @@ class TaskProcessor(BaseModel):
                 'task_name': task_name
             })
 
+    def _group_task_name(self, task_name: str) -> str:
+        """
+        Name of the task the group dispatched. A failed expanded task fails its
+        parent, whose barrier can no longer complete.
+        """
+        parent_key = self.task_info.parent_task_key if self.task_info.is_expanded_task else None
+        if not parent_key:
+            return task_name
+        # TaskGroup keys the tasks it dispatches "task_execute:{session_id}:{name}"
+        prefix = f"task_execute:{self.session_id}:"
+        return parent_key[len(prefix):] if parent_key.startswith(prefix) else parent_key.rsplit(':', 1)[-1]
+
     async def cleanup_task_resources(self, task_name: str):
         """Clean up resources associated with a task"""
         try:
@@ -1017,101 +1106,6 @@ class TaskProcessor(BaseModel):
                 'task_name': task_name
             })
 
-    async def _wait_for_expanded_tasks(self, parent_key: str, total_tasks: int) -> Dict[str, Any]:
-        """
-        Wait for all expanded tasks to complete and collect results.
-        
-        Args:
-            parent_key (str): The key of the parent task
-            total_tasks (int): Total number of expanded tasks to wait for
-            
-        Returns:
-            Dict[str, Any]: Combined results from all expanded tasks
-        """
-        quick_log.info(f"Waiting for expanded tasks - Parent: {parent_key}, Expected: {total_tasks}")
-        try:
-            from containers import get_container
-            redis = get_container().redis()
-            
-            # Initialize expansion tracking if not exists
-            if parent_key not in self._expansion_tracking:
-                self._expansion_tracking[parent_key] = {
-                    'total_tasks': total_tasks,
-                    'received_tasks': 0,
-                    'results': {},
-                    'completed': False
-                }
-                self._expansion_locks[parent_key] = asyncio.Lock()
-            
-            # Subscribe to expansion completion channel
-            channel = f"{parent_key}:expansion:completion"
-            pubsub = redis.client.pubsub()
-            await pubsub.subscribe(channel)
-            
-            # Track received tasks and results
-            expansion_key = f"{parent_key}:expansion"
-            
-            try:
-                while True:
-                    # Check current expansion state
-                    expansion_data = await redis.client.get(expansion_key)
-                    if expansion_data:
-                        async with self._expansion_locks[parent_key]:
-                            expansion_state = json.loads(expansion_data)
-                            received = expansion_state.get('received_tasks', 0)
-                            quick_log.debug(f"Expansion progress - Parent: {parent_key}, Received: {received}/{total_tasks}")
-                            
-                            self._task_logger.debug(f"""
-                            Expansion progress for {parent_key}:
-                            - Received tasks: {received}/{total_tasks}
-                            - Current results: {expansion_state.get('results', {})}
-                            """)
-                            
-                            # If we have all tasks, mark as completed
-                            if received == total_tasks and not self._expansion_tracking[parent_key]['completed']:
-                                self._expansion_tracking[parent_key].update({
-                                    'received_tasks': received,
-                                    'results': expansion_state.get('results', {}),
-                                    'completed': True
-                                })
-                                
-                                self._task_logger.info(f"All expanded tasks completed for {parent_key}")
-                                return expansion_state.get('results', {})
-                    
-                    # Wait for next message
-                    message = await pubsub.get_message(ignore_subscribe_messages=True)
-                    if message:
-                        data = json.loads(message['data'])
-                        if data.get('task_key') == parent_key and data.get('status') == 'completed':
-                            async with self._expansion_locks[parent_key]:
-                                if not self._expansion_tracking[parent_key]['completed']:
-                                    self._expansion_tracking[parent_key].update({
-                                        'results': data.get('results', {}),
-                                        'completed': True
-                                    })
-                                    return data.get('results', {})
-                    
-                    await asyncio.sleep(0.1)
-                    
-            except Exception as e:
-                self._task_logger.error(f"Error waiting for expanded tasks: {str(e)}")
-                self._task_logger.error(traceback.format_exc())
-                raise
-                
-        finally:
-            # Only unsubscribe if all tasks are received or on error
-            if (parent_key in self._expansion_tracking and 
-                self._expansion_tracking[parent_key]['completed']):
-                await pubsub.unsubscribe(channel)
-                self._task_logger.info(f"Unsubscribed from channel {channel} after completion")
-                
-                # Cleanup tracking data
-                async with self._expansion_locks[parent_key]:
-                    self._expansion_tracking.pop(parent_key, None)
-                self._expansion_locks.pop(parent_key, None)
-            else:
-                self._task_logger.warning(f"Keeping subscription active for incomplete expansion {parent_key}")
-
     async def _handle_dependency_update(self, data: tuple):
         """Handle updates to task dependencies"""
         try:
@@ -1119,7 +1113,7 @@ class TaskProcessor(BaseModel):
             dependency = value.get('result_key')
             value = value.get('value')
             
-            self._task_logger.debug(f"Raw dependency value received: {value}")
+            log_debug(self._task_logger, "Raw dependency value received", value=value)
             
             if dependency and value is not None:
                 # Handle byte-string conversion if needed
@@ -1128,20 +1122,20 @@ class TaskProcessor(BaseModel):
                         # If it's bytes, decode first
                         if isinstance(value, bytes):
                             value = value.decode('utf-8')
-                            self._task_logger.debug(f"Decoded bytes to string: {value}")
+                            log_debug(self._task_logger, "Decoded bytes to string", value=value)
                         
                         # If it starts with b' and ends with ', remove those
                         if value.startswith("b'") and value.endswith("'"):
                             value = value[2:-1]
-                            self._task_logger.debug(f"Removed b'' wrapper: {value}")
+                            log_debug(self._task_logger, "Removed b'' wrapper", value=value)
                         
                         # Replace escaped quotes
                         value = value.replace("\\'", "'")
-                        self._task_logger.debug(f"Unescaped quotes: {value}")
+                        log_debug(self._task_logger, "Unescaped quotes", value=value)
                         
                         # Parse JSON
                         value = json.loads(value)
-                        self._task_logger.debug(f"Successfully parsed JSON: {value}")
+                        log_debug(self._task_logger, "Successfully parsed JSON", value=value)
                         
                     except json.JSONDecodeError as e:
                         self._task_logger.error(f"JSON parsing failed: {e}")
@@ -1157,7 +1151,7 @@ class TaskProcessor(BaseModel):
                 if is_array_dependency:
                     if dependency in self.context_info.context and isinstance(self.context_info.context[dependency], list):
                         self.context_info.context[dependency].append(value)
-                        self._task_logger.debug(f"Updated context with array dependency {dependency} = {value}")
+                        log_debug(self._task_logger, "Updated context with array dependency", dependency=dependency, value=value)
                 else:
                     self.context_info.context.update({dependency: value})
                         
@@ -1488,7 +1482,7 @@ class TaskProcessor(BaseModel):
                     result_key,
                     json.dumps(mapping_data)
                 )
-                self._task_logger.debug(f"Registered result key: {result_key} with mapping: {mapping_data}")
+                log_debug(self._task_logger, "Registered result key", key=result_key, mapping=mapping_data)
             
             # Log registered keys
             registered_keys = await self._redis.client.hgetall(f"session:{self.session_id}:result_keys")
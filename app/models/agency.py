@@ -27,13 +27,13 @@ from rich.console import Console
 from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
 from typing_extensions import override
 from app.models.agents.Agent import Agent
+from app.models.assistant_registry import assistant_registry
 from app.tools.base_tool import BaseTool
 from app.tools.oai import FileSearch
 from app.tools.oai.code_interpreter import CodeInterpreter
 from app.utilities.errors import RefusalError
 from app.utilities.files import get_file_purpose, get_tools
 from app.utilities.shared_state import SharedState
-from profiler import profile_async
 from .message_output import MessageOutput
 from .message_output import MessageOutputLive
 from app.models.thread import Thread
@@ -863,8 +863,7 @@ class Agency:
         if self.settings_callbacks:
             self.logger.debug("Loading settings from callbacks")
             loaded_settings = self.settings_callbacks["load"]()
-            with open(self.settings_path, 'w') as f:
-                json.dump(loaded_settings, f, indent=4)
+            assistant_registry.replace_settings(self.settings_path, loaded_settings)
 
         for agent in self.agents:
             self.logger.debug(f"Initializing agent: {agent.name}")
@@ -903,9 +902,7 @@ class Agency:
 
         if self.settings_callbacks:
             self.logger.debug("Saving settings via callbacks")
-            with open(self.agents[0].get_settings_path(), 'r') as f:
-                settings = f.read()
-            settings = json.loads(settings)
+            settings = assistant_registry.get_settings(self.agents[0].get_settings_path())
             self.settings_callbacks["save"](settings)
         
         self.logger.info("All agents initialized successfully")
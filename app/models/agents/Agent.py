@@ -29,6 +29,7 @@ from app.utilities.llm_client import get_openai_client
 from app.tools.oai import Retrieval, CodeInterpreter
 from typing import List, Optional
 from app.models.ContextInfo import ContextInfo
+from app.models.assistant_registry import assistant_registry
 from app.utilities.shared_state import SharedState
 
 if TYPE_CHECKING:
@@ -282,7 +283,7 @@ class Agent:
     async def save_message_to_redis(self, message: str):
         r = self.redis_service.client
         r.ft("messages")
-        embeddings = self.redis_service.generate_embeddings({"message": message}, ["message"])
+        embeddings = await self.redis_service.async_generate_embeddings({"message": message}, ["message"])
         message_id = str(uuid.uuid4())
         await r.hset(f"{self.id}:message:{message_id}", mapping={
             "agent_name": self.name,
@@ -387,7 +388,8 @@ class Agent:
                     formatted_key = key.replace('_', ' ').title()
                     additional_instructions.append(f"\n## {formatted_key}:\n{formatted_value}")
         
-        self.instructions = f"{self.instructions}\n\n{' '.join(additional_instructions)}"
+        # Task context changes with every task; sending it with the run keeps the assistant itself reusable
+        self.add_additional_instructions(' '.join(additional_instructions))
         
         # Ensure tools are initialized
         if not self.tools:
@@ -456,9 +458,20 @@ class Agent:
         """
         if not self.client:
             self.post_init()
-        # check if settings.json exists
         path = self.get_settings_path()
 
+        # reuse the assistant already resolved for this exact configuration in this process
+        config_key = None
+        if not self.id:
+            config_key = assistant_registry.config_key(self)
+            assistant = assistant_registry.get(config_key)
+            if assistant is not None:
+                self.assistant = assistant
+                self.id = assistant.id
+                if assistant.tool_resources:
+                    self.tool_resources = assistant.tool_resources.model_dump()
+                return self
+
         # load assistant from id
         if self.id:
             self.assistant = self.client.beta.assistants.retrieve(self.id)
@@ -481,31 +494,25 @@ class Agent:
             return self
         
         # load assistant from settings
-        if os.path.exists(path):
-
-            with open(path, 'r') as f:
-                settings = json.load(f)
-                # iterate settings and find the assistant with the same name
-                for assistant_settings in settings:
-                    if assistant_settings['name'] == self.name:
-                        try:
-                            self.assistant = self.client.beta.assistants.retrieve(assistant_settings['id'])
-                            self.id = assistant_settings['id']
-                            if self.assistant.tool_resources:
-                                self.tool_resources = self.assistant.tool_resources.model_dump()
-                            
-                            # add examples to the assistant tools
-                            # set the tool resources
-                            # update the assistant
-                            
-                            # update assistant if parameters are different
-                            if not self._check_parameters(self.assistant.model_dump()):
-                                print("Updating assistant... " + self.name)
-                                self._update_assistant()
-                            self._update_settings()
-                            return self
-                        except NotFoundError:
-                            continue
+        # iterate settings and find the assistant with the same name
+        for assistant_settings in assistant_registry.get_settings(path):
+            if assistant_settings['name'] == self.name:
+                try:
+                    self.assistant = self.client.beta.assistants.retrieve(assistant_settings['id'])
+                    self.id = assistant_settings['id']
+                    if self.assistant.tool_resources:
+                        self.tool_resources = self.assistant.tool_resources.model_dump()
+                    
+                    # update assistant if parameters are different
+                    if not self._check_parameters(self.assistant.model_dump()):
+                        print("Updating assistant... " + self.name)
+                        self._update_assistant()
+                    else:
+                        self._update_settings()
+                    assistant_registry.register(config_key, self.assistant)
+                    return self
+                except NotFoundError:
+                    continue
 
         # create assistant if settings.json does not exist or assistant with the same name does not exist
         self.assistant = self.client.beta.assistants.create(
@@ -526,6 +533,7 @@ class Agent:
         self.id = self.assistant.id
 
         self._save_settings()
+        assistant_registry.register(config_key, self.assistant)
 
         return self
 
@@ -686,8 +694,17 @@ class Agent:
         else:
             raise Exception("Invalid tool type.")
 
-    def get_oai_tools(self):
-        from app.tools.base_tool import BaseTool
+    def get_oai_tools(self, as_json: bool = False):
+        """
+        Get the agent's tools in the format of the Assistants API.
+
+        Args:
+            as_json (bool): Return each tool as canonical JSON instead of a dict; function tools use their cached form.
+
+        Returns:
+            list: The tool definitions, in the agent's tool order.
+        """
+        from app.tools.base_tool import BaseTool, canonical_json
         from app.tools.oai.FileSearch import FileSearch
         from app.tools.oai import CodeInterpreter, Retrieval
         tools = []
@@ -712,13 +729,13 @@ class Agent:
             tool._session_id = self.context_info.context.get('session_id', None)
             if inspect.isclass(tool) and tool.__name__ not in processed_tools:
                 processed_tools.append(tool.__name__)
-                if issubclass(tool, FileSearch):
-                    tools.append(tool().model_dump())
-                elif issubclass(tool, CodeInterpreter):
-                    tools.append(tool().model_dump())
-                elif issubclass(tool, Retrieval):
-                    tools.append(tool().model_dump())
+                if issubclass(tool, (FileSearch, CodeInterpreter, Retrieval)):
+                    definition = tool().model_dump()
+                    tools.append(canonical_json(definition) if as_json else definition)
                 elif issubclass(tool, BaseTool):
+                    if as_json:
+                        tools.append(tool.openai_tool_json)
+                        continue
                     schema = tool.openai_schema
                     tools.append({
                         "type": "function",
@@ -856,6 +873,8 @@ class Agent:
 
         This method compares the current agent's parameters such as name, description, instructions, tools, file IDs, metadata, and model with the given assistant settings. It uses DeepDiff to compare complex structures like tools and metadata. If any parameter does not match, it returns False; otherwise, it returns True.
         """
+        from app.tools.base_tool import canonical_json
+
         if self.name != assistant_settings['name']:
             return False
 
@@ -865,9 +884,11 @@ class Agent:
         if self.instructions != assistant_settings['instructions']:
             return False
 
-        tools_diff = DeepDiff(self.get_oai_tools(), assistant_settings['tools'], ignore_order=True)
-        if tools_diff != {}:
-            return False
+        # Canonical JSON settles the common case; DeepDiff only runs when the forms differ, e.g. in list order
+        if sorted(self.get_oai_tools(as_json=True)) != sorted(canonical_json(tool) for tool in assistant_settings['tools']):
+            tools_diff = DeepDiff(self.get_oai_tools(), assistant_settings['tools'], ignore_order=True)
+            if tools_diff != {}:
+                return False
 
         if self.temperature != assistant_settings['temperature']:
             return False
@@ -896,32 +917,11 @@ class Agent:
         return True
 
     def _save_settings(self):
-        path = self.get_settings_path()
-        # check if settings.json exists
-        if not os.path.isfile(path):
-            with open(path, 'w') as f:
-                json.dump([self.assistant.model_dump()], f, indent=4)
-        else:
-            settings = []
-            with open(path, 'r') as f:
-                settings = json.load(f)
-                settings.append(self.assistant.model_dump())
-            with open(path, 'w') as f:
-                json.dump(settings, f, indent=4)
+        # kept in memory and written to settings.json in the background
+        assistant_registry.save_settings(self.get_settings_path(), self.assistant.model_dump())
 
     def _update_settings(self):
-        path = self.get_settings_path()
-        # check if settings.json exists
-        if os.path.isfile(path):
-            settings = []
-            with open(path, 'r') as f:
-                settings = json.load(f)
-                for i, assistant_settings in enumerate(settings):
-                    if assistant_settings['id'] == self.id:
-                        settings[i] = self.assistant.model_dump()
-                        break
-            with open(path, 'w') as f:
-                json.dump(settings, f, indent=4)
+        assistant_registry.save_settings(self.get_settings_path(), self.assistant.model_dump())
 
     # --- Helper Methods ---
 
@@ -1048,15 +1048,5 @@ class Agent:
         self._delete_settings()
 
     def _delete_settings(self):
-        path = self.get_settings_path()
-        # check if settings.json exists
-        if os.path.isfile(path):
-            settings = []
-            with open(path, 'r') as f:
-                settings = json.load(f)
-                for i, assistant_settings in enumerate(settings):
-                    if assistant_settings['id'] == self.id:
-                        settings.pop(i)
-                        break
-            with open(path, 'w') as f:
-                json.dump(settings, f, indent=4)
+        assistant_registry.forget(self.id)
+        assistant_registry.delete_settings(self.get_settings_path(), self.id)
@@ -0,0 +1,167 @@
+import atexit
+import copy
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional
+from app.logging_config import configure_logger
+
+
+class AssistantRegistry:
+    """
+    Process-wide cache of OpenAI assistants and of the agents' settings file.
+
+    Assistants are keyed by a hash of the agent's static configuration, so an
+    agent whose configuration was already created, loaded or updated in this
+    process reuses that assistant without any OpenAI call. Settings files are
+    read once and kept in memory; changes are written back in the background
+    after ``flush_delay`` seconds, batching the writes of agents initialized
+    close together, and once more at exit.
+    """
+
+    def __init__(self, flush_delay: float = 2.0):
+        """
+        Initialize the AssistantRegistry.
+
+        Args:
+            flush_delay (float): Seconds to wait after a settings change before writing the file.
+        """
+        self.logger = configure_logger(f"{self.__class__.__module__}.{self.__class__.__name__}")
+        self.flush_delay = flush_delay
+        self._assistants: Dict[str, Any] = {}
+        self._settings: Dict[str, List[Dict[str, Any]]] = {}
+        self._dirty = set()
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.RLock()
+        self.stats = {"hits": 0, "misses": 0, "settings_writes": 0}
+        atexit.register(self.flush)
+
+    @staticmethod
+    def config_key(agent) -> str:
+        """
+        Hash the parts of an agent that define its assistant.
+
+        Args:
+            agent (Agent): The agent.
+
+        Returns:
+            str: SHA-256 of the canonical JSON of the static configuration.
+        """
+        tool_resources = copy.deepcopy(agent.tool_resources)
+        if tool_resources and tool_resources.get('file_search'):
+            tool_resources['file_search'].pop('vector_stores', None)
+        config = {
+            'model': agent.model,
+            'name': agent.name,
+            'description': agent.description,
+            'instructions': agent.instructions,
+            'tools': agent.get_oai_tools(as_json=True),
+            'tool_resources': tool_resources,
+            'temperature': agent.temperature,
+            'top_p': agent.top_p,
+            'response_format': agent.response_format,
+        }
+        return hashlib.sha256(json.dumps(config, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            assistant = self._assistants.get(key)
+            self.stats["hits" if assistant is not None else "misses"] += 1
+            return assistant
+
+    def register(self, key: str, assistant: Any):
+        with self._lock:
+            self._assistants[key] = assistant
+
+    def forget(self, assistant_id: str):
+        """Drop every cached entry for an assistant, e.g. after it was deleted."""
+        with self._lock:
+            for key in [key for key, assistant in self._assistants.items() if assistant.id == assistant_id]:
+                del self._assistants[key]
+
+    def get_settings(self, path: str) -> List[Dict[str, Any]]:
+        """
+        Get the assistant settings stored at a path, reading the file on first use.
+
+        Args:
+            path (str): Path of the settings file.
+
+        Returns:
+            List[Dict[str, Any]]: The settings entries; a copy.
+        """
+        with self._lock:
+            return copy.deepcopy(self._load(path))
+
+    def _load(self, path: str) -> List[Dict[str, Any]]:
+        if path not in self._settings:
+            settings = []
+            if os.path.isfile(path):
+                with open(path, 'r') as f:
+                    settings = json.load(f)
+            self._settings[path] = settings
+        return self._settings[path]
+
+    def save_settings(self, path: str, assistant_settings: Dict[str, Any]):
+        """
+        Add or replace the settings entry with the same id.
+
+        Args:
+            path (str): Path of the settings file.
+            assistant_settings (Dict[str, Any]): The assistant's ``model_dump()``.
+        """
+        with self._lock:
+            settings = self._load(path)
+            for i, existing in enumerate(settings):
+                if existing.get('id') == assistant_settings.get('id'):
+                    settings[i] = assistant_settings
+                    break
+            else:
+                settings.append(assistant_settings)
+            self._mark_dirty(path)
+
+    def replace_settings(self, path: str, settings: List[Dict[str, Any]]):
+        """Replace all settings stored at a path, e.g. with settings loaded from a callback."""
+        with self._lock:
+            self._settings[path] = copy.deepcopy(settings)
+            self._mark_dirty(path)
+
+    def delete_settings(self, path: str, assistant_id: str):
+        with self._lock:
+            settings = self._load(path)
+            remaining = [entry for entry in settings if entry.get('id') != assistant_id]
+            if len(remaining) != len(settings):
+                self._settings[path] = remaining
+                self._mark_dirty(path)
+
+    def _mark_dirty(self, path: str):
+        self._dirty.add(path)
+        if self._timer is None:
+            self._timer = threading.Timer(self.flush_delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        """Write every changed settings file now."""
+        # The timer and atexit both flush; writing under the lock keeps an older snapshot from landing last
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            dirty, self._dirty = self._dirty, set()
+            for path in dirty:
+                try:
+                    with open(path, 'w') as f:
+                        json.dump(self._settings[path], f, indent=4)
+                    self.stats["settings_writes"] += 1
+                except OSError as e:
+                    self.logger.error(f"Error writing assistant settings to {path}: {str(e)}")
+                    self._mark_dirty(path)
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self.stats, "assistants": len(self._assistants), "pending_writes": len(self._dirty)}
+
+
+# Create a global instance of AssistantRegistry
+assistant_registry = AssistantRegistry()
@@ -4,6 +4,8 @@ import logging
 import traceback
 from typing import Dict, Any, List, Tuple, Optional
 from app.logging_config import configure_logger
+from app.debug_log import log_debug, log_sampled
+from app.utilities.templates import TemplateValues, compile_template
 
 logger = configure_logger('TaskExpansion')
 
@@ -30,15 +32,15 @@ class TaskExpansion:
             # Safely get context keys
             context_keys = list(context.keys()) if isinstance(context, dict) else "Context is not a dictionary"
             
-            logger.info(f"""
-            ====== TASK EXPANSION DEBUG ======
-            Task Name: {task_data.get('name')}
-            Expansion Config: {json.dumps(expansion_config, indent=2)}
-            Context Type: {type(context)}
-            Context Keys: {context_keys}
-            Dependencies: {task_data.get('dependencies', [])}
-            ================================
-            """)
+            logger.info(f"Expanding task {task_data.get('name')}")
+            log_debug(
+                logger, "Task expansion",
+                task=task_data.get('name'),
+                expansion_config=expansion_config,
+                context_type=type(context).__name__,
+                context_keys=context_keys,
+                dependencies=task_data.get('dependencies', [])
+            )
 
             expanded_tasks = []
             array_mapping = expansion_config.get('array_mapping', {})
@@ -77,14 +79,13 @@ class TaskExpansion:
                 # Retry finding array dependencies after parsing
                 array_deps = TaskExpansion.find_array_dependencies(task_data, context, expansion_config)
 
-            logger.info(f"""
-            ====== ARRAY DEPENDENCIES DEBUG ======
-            Found Dependencies: {array_deps}
-            Array Mapping: {array_mapping}
-            Identifiers: {identifiers}
-            Raw Context: {json.dumps(context, indent=2) if isinstance(context, dict) else str(context)}
-            ==================================
-            """)
+            log_debug(
+                logger, "Array dependencies",
+                found=lambda: [(name, len(value) if isinstance(value, list) else type(value).__name__) for name, value in array_deps],
+                array_mapping=array_mapping,
+                identifiers=identifiers,
+                context=context
+            )
             
             if not array_deps:
                 logger.error(f"No array dependencies found for task: {task_data.get('name')}")
@@ -98,13 +99,11 @@ class TaskExpansion:
                     logger.error(f"Expected list for {dep_name}, got {type(dep_array)}: {dep_array}")
                     continue
                 
-                logger.info(f"""
-                ====== PROCESSING ARRAY DEPENDENCY ======
-                Dependency: {dep_name}
-                Array Length: {len(dep_array)}
-                Array Contents: {json.dumps(dep_array[:2], indent=2)}... (truncated)
-                =======================================
-                """)
+                logger.info(f"Processing array dependency {dep_name} with {len(dep_array)} items")
+                log_debug(logger, "Array dependency", dependency=dep_name, first_items=lambda: dep_array[:2])
+                
+                # Context values are formatted at most once across all items
+                template_values = TemplateValues(context if isinstance(context, dict) else {}, TaskExpansion.format_template_value)
                 
                 # Create expanded task for each array item
                 for i, item in enumerate(dep_array):
@@ -127,18 +126,16 @@ class TaskExpansion:
                                     if field_name in item:
                                         value = item[field_name]
                                         replacements[identifier_key] = value
-                                        logger.debug(f"""
-                                        Found value for identifier {identifier_key}
-                                        Array: {array_name}
-                                        Field: {field_name}
-                                        Value: {value}
-                                        """)
+                                        log_sampled(
+                                            logger, f"identifier:{task_data.get('name')}:{identifier_key}", "Found identifier value",
+                                            identifier=identifier_key, array=array_name, field=field_name, value=value
+                                        )
                                     else:
-                                        logger.debug(f"""
-                                        Could not find field {field_name} in item from array {array_name}
-                                        Available keys: {list(item.keys())}
-                                        Item: {json.dumps(item, indent=2)}
-                                        """)
+                                        log_debug(
+                                            logger, "Identifier field missing from item",
+                                            field=field_name, array=array_name,
+                                            available_keys=list(item.keys()), item=item
+                                        )
                             except ValueError as e:
                                 logger.error(f"Invalid identifier path format {identifier_path}. Should be 'array_name.field_name': {e}")
                             except Exception as e:
@@ -159,13 +156,10 @@ class TaskExpansion:
                         """)
                         continue
 
-                    logger.info(f"""
-                    ====== TASK EXPANSION ITEM {i} ======
-                    Replacements: {json.dumps(replacements, indent=2)}
-                    Original Instructions: {expanded_task.get('shared_instructions')}
-                    Original Message: {expanded_task.get('message_template')}
-                    ================================
-                    """)
+                    log_sampled(
+                        logger, f"expansion_item:{task_data.get('name')}", "Expanding item",
+                        item=i, replacements=replacements
+                    )
 
                     # Replace template variables
                     if 'message_template' in expanded_task:
@@ -173,22 +167,24 @@ class TaskExpansion:
                             expanded_task['message_template'],
                             replacements,
                             context if isinstance(context, dict) else {},
-                            logger
+                            logger,
+                            values=template_values
                         )
                     if 'shared_instructions' in expanded_task:
                         expanded_task['shared_instructions'] = TaskExpansion.replace_template_vars(
                             expanded_task['shared_instructions'],
                             replacements,
                             context if isinstance(context, dict) else {},
-                            logger
+                            logger,
+                            values=template_values
                         )
 
-                    logger.info(f"""
-                    ====== EXPANDED TASK {i} RESULT ======
-                    New Instructions: {expanded_task.get('shared_instructions')}
-                    New Message: {expanded_task.get('message_template')}
-                    ====================================
-                    """)
+                    log_sampled(
+                        logger, f"expanded_item:{task_data.get('name')}", "Expanded item",
+                        item=i,
+                        instructions=expanded_task.get('shared_instructions'),
+                        message=expanded_task.get('message_template')
+                    )
 
                     # Update task name to be unique
                     item_id = str(i + 1)
@@ -265,7 +261,14 @@ class TaskExpansion:
         return array_deps
 
     @staticmethod
-    def replace_template_vars(template: str, replacements: Dict[str, Any], context: Dict[str, Any], logger: logging.Logger = logger) -> str:
+    def format_template_value(value: Any) -> Any:
+        """Format a value for substitution into a template, joining lists into a comma-separated string."""
+        if isinstance(value, list):
+            return ", ".join(str(item) for item in value)
+        return TaskExpansion.format_structured_data(value)
+
+    @staticmethod
+    def replace_template_vars(template: str, replacements: Dict[str, Any], context: Dict[str, Any], logger: logging.Logger = logger, values: Optional[TemplateValues] = None) -> str:
         """
         Replace template variables with actual values.
         
@@ -273,24 +276,20 @@ class TaskExpansion:
             template: Template string with placeholders
             replacements: Dictionary of replacements
             context: Current context for additional variables
+            values: Formatted context values to reuse across calls; built from context when omitted
             
         Returns:
             Template with variables replaced
         """
         try:
-            # Combine replacements with context
-            template_context = context.copy()
-            template_context.update(replacements)
-            
-            # Format template with combined context, handling list values
-            formatted_context = {}
-            for k, v in template_context.items():
-                if isinstance(v, list):
-                    # Convert list to string representation
-                    formatted_context[k] = ", ".join(str(item) for item in v)
-                else:
-                    formatted_context[k] = TaskExpansion.format_structured_data(v)
-            return template.format(**formatted_context)
+            # Only the variables the template references are formatted
+            compiled = compile_template(template)
+            values = values or TemplateValues(context, TaskExpansion.format_template_value)
+            missing = compiled.missing(values, replacements)
+            if missing:
+                logger.warning(f"Missing template variable: {', '.join(missing)}")
+                return template
+            return compiled.render(values, replacements)
             
         except KeyError as e:
             logger.warning(f"Missing template variable: {str(e)}")
@@ -0,0 +1,235 @@
+import asyncio
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from app.logging_config import configure_logger
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, default=str)
+
+
+class TaskGroupStateStore:
+    """
+    Incremental Redis persistence for a TaskGroup.
+
+    Layout under ``task_group:{id}``:
+
+    - ``:state``          small JSON header (ids, expected results, attempts); written only when it changes
+    - ``:tasks``          hash of task name -> JSON status; only tasks whose status changed are written
+    - ``:received``       hash of result key -> JSON list of received results; only changed keys are written
+    - ``:context``        JSON snapshot of the context as of the last compaction
+    - ``:context:deltas`` list of ``{"set": {...}, "del": [...]}`` changes since that snapshot
+
+    Deltas are folded back into the snapshot once ``compact_every`` of them have
+    accumulated or they outgrow the snapshot itself.
+    """
+
+    VERSION = '3.0'
+
+    def __init__(self, group_id: str, compact_every: int = 50):
+        """
+        Initialize the TaskGroupStateStore.
+
+        Args:
+            group_id (str): The ID of the task group.
+            compact_every (int): Number of context deltas after which the snapshot is rewritten.
+        """
+        self.logger = configure_logger(f"{self.__class__.__module__}.{self.__class__.__name__}")
+        self.group_id = group_id
+        self.compact_every = compact_every
+        self.state_key = f"task_group:{group_id}:state"
+        self.tasks_key = f"task_group:{group_id}:tasks"
+        self.received_key = f"task_group:{group_id}:received"
+        self.context_key = f"task_group:{group_id}:context"
+        self.deltas_key = f"task_group:{group_id}:context:deltas"
+        # What Redis already holds, as serialized values, so saves only send differences
+        self._header: Optional[str] = None
+        self._tasks: Dict[str, str] = {}
+        self._received_counts: Dict[str, int] = {}
+        self._context: Optional[Dict[str, str]] = None
+        self._snapshot_bytes = 0
+        self._delta_count = 0
+        self._delta_bytes = 0
+        # Saves diff against the cached state above, so they must not interleave
+        self._lock = asyncio.Lock()
+
+    async def save(self, client, header: Dict[str, Any], task_states: Dict[str, Dict[str, Any]], received_results: Dict[str, List[Any]], context: Dict[str, Any]) -> int:
+        """
+        Write whatever changed since the last save in a single pipeline.
+
+        Args:
+            client: The async Redis client.
+            header (Dict[str, Any]): Small group-level fields.
+            task_states (Dict[str, Dict[str, Any]]): Status per task name; ``updated_at`` is added when a task changes.
+            received_results (Dict[str, List[Any]]): Received results per result key; treated as append-only.
+            context (Dict[str, Any]): The full current context.
+
+        Returns:
+            int: Number of commands sent; 0 when nothing changed.
+        """
+        async with self._lock:
+            return await self._save(client, header, task_states, received_results, context)
+
+    async def _save(self, client, header: Dict[str, Any], task_states: Dict[str, Dict[str, Any]], received_results: Dict[str, List[Any]], context: Dict[str, Any]) -> int:
+        header_json = _dumps({**header, 'version': self.VERSION})
+        now = datetime.now().isoformat()
+        changed_tasks = {}
+        for name, state in task_states.items():
+            serialized = _dumps(state)
+            if self._tasks.get(name) != serialized:
+                changed_tasks[name] = serialized
+        changed_received = {
+            key: _dumps(results) for key, results in received_results.items()
+            if self._received_counts.get(key) != len(results)
+        }
+        serialized_context = {key: _dumps(value) for key, value in context.items()}
+        compact, delta = self._context_changes(serialized_context)
+
+        commands = 0
+        async with client.pipeline(transaction=True) as pipe:
+            if header_json != self._header:
+                pipe.set(self.state_key, header_json)
+                commands += 1
+            if changed_tasks:
+                pipe.hset(self.tasks_key, mapping={name: _dumps({**task_states[name], 'updated_at': now}) for name in changed_tasks})
+                commands += 1
+            if changed_received:
+                pipe.hset(self.received_key, mapping=changed_received)
+                commands += 1
+            if compact:
+                snapshot = "{" + ",".join(f"{json.dumps(key)}:{value}" for key, value in serialized_context.items()) + "}"
+                pipe.set(self.context_key, snapshot)
+                pipe.delete(self.deltas_key)
+                commands += 2
+            elif delta is not None:
+                pipe.rpush(self.deltas_key, delta)
+                commands += 1
+            if commands:
+                await pipe.execute()
+
+        self._header = header_json
+        self._tasks.update(changed_tasks)
+        self._received_counts.update({key: len(received_results[key]) for key in changed_received})
+        if compact:
+            self._snapshot_bytes = len(snapshot)
+            self._delta_count = 0
+            self._delta_bytes = 0
+        elif delta is not None:
+            self._delta_count += 1
+            self._delta_bytes += len(delta)
+        self._context = serialized_context
+        return commands
+
+    def _context_changes(self, serialized_context: Dict[str, str]) -> Tuple[bool, Optional[str]]:
+        """Return whether to write a fresh snapshot, otherwise the delta to append (None if unchanged)."""
+        if self._context is None:
+            return True, None
+        changed = {key: value for key, value in serialized_context.items() if self._context.get(key) != value}
+        removed = [key for key in self._context if key not in serialized_context]
+        if not changed and not removed:
+            return False, None
+        delta = '{"set":{' + ",".join(f"{json.dumps(key)}:{value}" for key, value in changed.items()) + '},"del":' + json.dumps(removed) + '}'
+        if self._delta_count + 1 >= self.compact_every or self._delta_bytes + len(delta) > max(self._snapshot_bytes, 1):
+            return True, None
+        return False, delta
+
+    async def load(self, client) -> Optional[Dict[str, Any]]:
+        """
+        Read the header, task states, received results and context (snapshot plus deltas).
+
+        Args:
+            client: The async Redis client.
+
+        Returns:
+            Dict[str, Any] | None: ``header``, ``tasks``, ``received`` and ``context``, or None if nothing was saved.
+        """
+        async with self._lock:
+            return await self._load(client)
+
+    async def _load(self, client) -> Optional[Dict[str, Any]]:
+        async with client.pipeline(transaction=False) as pipe:
+            pipe.get(self.state_key)
+            pipe.hgetall(self.tasks_key)
+            pipe.hgetall(self.received_key)
+            pipe.get(self.context_key)
+            pipe.lrange(self.deltas_key, 0, -1)
+            header_data, tasks_data, received_data, snapshot, deltas = await pipe.execute()
+
+        if not header_data:
+            return None
+        header = json.loads(header_data)
+        tasks = {_text(name): json.loads(value) for name, value in (tasks_data or {}).items()}
+        received = {_text(key): json.loads(value) for key, value in (received_data or {}).items()}
+        context = self.apply_deltas(json.loads(snapshot) if snapshot else {}, deltas or [])
+
+        # Older snapshots kept everything in the header
+        if 'tasks_completed' in header and not tasks:
+            tasks.update({name: {'status': 'failed', 'error': error} for name, error in (header.get('tasks_failed') or {}).items()})
+            tasks.update({name: {'status': 'running'} for name in header.get('running_tasks', [])})
+            tasks.update({name: {'status': 'completed'} for name in header.get('tasks_completed', [])})
+        if 'received_results' in header and not received:
+            received = header.get('received_results') or {}
+
+        self._header = _dumps({**header, 'version': self.VERSION}) if header.get('version') == self.VERSION else None
+        self._tasks = {name: _dumps({k: v for k, v in state.items() if k != 'updated_at'}) for name, state in tasks.items()}
+        self._received_counts = {key: len(results) for key, results in received.items()}
+        self._context = {key: _dumps(value) for key, value in context.items()} if snapshot else None
+        self._snapshot_bytes = len(snapshot) if snapshot else 0
+        self._delta_count = len(deltas or [])
+        self._delta_bytes = sum(len(delta) for delta in deltas or [])
+        return {'header': header, 'tasks': tasks, 'received': received, 'context': context}
+
+    @staticmethod
+    def apply_deltas(context: Dict[str, Any], deltas: List[Any]) -> Dict[str, Any]:
+        """
+        Replay context deltas, oldest first, onto a snapshot.
+
+        Args:
+            context (Dict[str, Any]): The snapshot; updated in place.
+            deltas (List): Serialized deltas as stored in the deltas list.
+
+        Returns:
+            Dict[str, Any]: The reconstructed context.
+        """
+        for raw in deltas:
+            delta = json.loads(raw)
+            context.update(delta.get('set', {}))
+            for key in delta.get('del', []):
+                context.pop(key, None)
+        return context
+
+    @classmethod
+    async def load_context(cls, client, context_key: str) -> Optional[Dict[str, Any]]:
+        """
+        Reconstruct another group's context from its snapshot key and deltas.
+
+        Args:
+            client: The async Redis client.
+            context_key (str): A ``task_group:{id}:context`` key.
+
+        Returns:
+            Dict[str, Any] | None: The context, or None if no snapshot exists.
+        """
+        async with client.pipeline(transaction=False) as pipe:
+            pipe.get(context_key)
+            pipe.lrange(f"{_text(context_key)}:deltas", 0, -1)
+            snapshot, deltas = await pipe.execute()
+        if not snapshot:
+            return None
+        return cls.apply_deltas(json.loads(snapshot), deltas or [])
+
+    async def delete(self, client):
+        """Delete every key of the group's persisted state."""
+        async with self._lock:
+            await client.delete(self.state_key, self.tasks_key, self.received_key, self.context_key, self.deltas_key)
+            self._header = None
+            self._tasks = {}
+            self._received_counts = {}
+            self._context = None
+            self._delta_count = 0
+            self._delta_bytes = 0
+
+
+def _text(value: Any) -> str:
+    return value.decode('utf-8') if isinstance(value, bytes) else value
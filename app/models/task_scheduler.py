@@ -0,0 +1,225 @@
+import heapq
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from app.utilities.errors import ConfigurationError, DependencyError
+
+
+class TaskScheduler:
+    """
+    Dependency graph for the tasks of a task group.
+
+    The graph is built once from ``tasks[].dependencies`` and ``tasks[].result_keys``.
+    Only dependencies produced by another task in the group gate a task; keys
+    coming from outside the group are left to the TaskProcessor, as before.
+    Each task keeps a count of its unresolved dependency keys and becomes ready
+    the moment the last one is resolved. Ready tasks are released longest
+    critical path first, up to ``max_concurrency`` at a time.
+    """
+
+    def __init__(self, tasks: List[Dict[str, Any]], available_keys: Iterable[str] = (), max_concurrency: Optional[int] = None):
+        """
+        Initialize the TaskScheduler.
+
+        Args:
+            tasks (List[Dict[str, Any]]): Task configurations with ``name``, ``dependencies`` and ``result_keys``.
+            available_keys (Iterable[str]): Keys already present in the context.
+            max_concurrency (int, optional): Maximum number of tasks running at once; unlimited when None.
+
+        Raises:
+            ConfigurationError: If a task has no name or two tasks share a name.
+            DependencyError: If the dependency graph contains a cycle.
+        """
+        self.max_concurrency = max_concurrency
+        self.tasks: Dict[str, Dict[str, Any]] = {}
+        self._order: Dict[str, int] = {}
+        for index, task in enumerate(tasks):
+            name = task.get('name')
+            if not name:
+                raise ConfigurationError("Task is missing a name", field='name')
+            if name in self.tasks:
+                raise ConfigurationError(f"Duplicate task name {name}", task_name=name, field='name')
+            self.tasks[name] = task
+            self._order[name] = index
+
+        self.producers: Dict[str, Set[str]] = {}
+        for name, task in self.tasks.items():
+            for key in task.get('result_keys') or []:
+                self.producers.setdefault(key, set()).add(name)
+
+        self.resolved_keys: Set[str] = set(available_keys) & set(self.producers)
+        self._missing: Dict[str, Set[str]] = {}
+        self._waiting_on: Dict[str, Set[str]] = {}
+        self._dependents: Dict[str, Set[str]] = {name: set() for name in self.tasks}
+        for name, task in self.tasks.items():
+            optional = set(task.get('optional_dependencies') or [])
+            internal = {key for key in task.get('dependencies') or [] if key in self.producers and key not in optional}
+            for key in internal:
+                for producer in self.producers[key]:
+                    self._dependents[producer].add(name)
+            missing = internal - self.resolved_keys
+            self._missing[name] = missing
+            for key in missing:
+                self._waiting_on.setdefault(key, set()).add(name)
+
+        self.priority = self._critical_paths()
+
+        self.running: Set[str] = set()
+        self.completed: Set[str] = set()
+        self.failed: Set[str] = set()
+        self.dispatched: Set[str] = set()
+        self._pending_outputs: Dict[str, Set[str]] = {}
+        self._ready: List[Tuple[int, int, str]] = []
+        for name, missing in self._missing.items():
+            if not missing:
+                self._push_ready(name)
+
+    def _critical_paths(self) -> Dict[str, int]:
+        """Topologically sort the tasks, failing on cycles, and return each task's longest downstream chain."""
+        in_degree = {name: 0 for name in self.tasks}
+        for dependents in self._dependents.values():
+            for dependent in dependents:
+                in_degree[dependent] += 1
+
+        queue = [name for name, degree in in_degree.items() if degree == 0]
+        ordered = []
+        while queue:
+            name = queue.pop()
+            ordered.append(name)
+            for dependent in self._dependents[name]:
+                in_degree[dependent] -= 1
+                if in_degree[dependent] == 0:
+                    queue.append(dependent)
+
+        if len(ordered) < len(self.tasks):
+            cyclic = sorted((name for name, degree in in_degree.items() if degree > 0), key=self._order.get)
+            raise DependencyError(
+                "Task dependencies contain a cycle",
+                invalid_deps=cyclic,
+                suggestions=[f"Check the dependencies and result_keys of: {', '.join(cyclic)}"]
+            )
+
+        priority: Dict[str, int] = {}
+        for name in reversed(ordered):
+            priority[name] = 1 + max((priority[dependent] for dependent in self._dependents[name]), default=0)
+        return priority
+
+    def _push_ready(self, name: str):
+        heapq.heappush(self._ready, (-self.priority[name], self._order[name], name))
+
+    def take_ready(self) -> List[str]:
+        """
+        Claim the ready tasks that fit under the concurrency cap.
+
+        Every started task holds a slot until its result keys resolve or, for a
+        task without result keys, until it is completed explicitly. Tasks whose
+        result keys are all resolved already are marked complete instead of
+        being started again.
+
+        Returns:
+            List[str]: Names of the tasks to start now, most critical first.
+        """
+        started = []
+        while self._ready and (self.max_concurrency is None or len(self.running) < self.max_concurrency):
+            _, _, name = heapq.heappop(self._ready)
+            if name in self.dispatched or name in self.completed:
+                continue
+            result_keys = set(self.tasks[name].get('result_keys') or [])
+            outputs = result_keys - self.resolved_keys
+            if result_keys and not outputs:
+                # Everything it would produce was already published
+                self._finish(name)
+                continue
+            self.dispatched.add(name)
+            self.running.add(name)
+            if outputs:
+                self._pending_outputs[name] = outputs
+            started.append(name)
+        return started
+
+    def resolve(self, key: str) -> bool:
+        """
+        Record that a result key is available.
+
+        Args:
+            key (str): The result key.
+
+        Returns:
+            bool: True if this is the first time the key was resolved.
+        """
+        if key not in self.producers or key in self.resolved_keys:
+            return False
+        self.resolved_keys.add(key)
+
+        for name in self._waiting_on.pop(key, set()):
+            missing = self._missing[name]
+            missing.discard(key)
+            if not missing and name not in self.dispatched and name not in self.completed:
+                self._push_ready(name)
+
+        for name in list(self._pending_outputs):
+            outputs = self._pending_outputs[name]
+            outputs.discard(key)
+            if not outputs:
+                self._finish(name)
+        return True
+
+    def complete(self, name: str):
+        """
+        Mark a task complete, freeing its slot and resolving its result keys.
+
+        Args:
+            name (str): The task name.
+        """
+        if name not in self.tasks or name in self.completed:
+            return
+        self.dispatched.add(name)
+        self._finish(name)
+        for key in self.tasks[name].get('result_keys') or []:
+            self.resolve(key)
+
+    def fail(self, name: str):
+        """
+        Mark a task failed, freeing its slot. Its dependents stay blocked until
+        its result keys are resolved some other way, e.g. by a retry.
+
+        Args:
+            name (str): The task name.
+        """
+        if name not in self.tasks:
+            return
+        self.running.discard(name)
+        self._pending_outputs.pop(name, None)
+        self.dispatched.discard(name)
+        self.failed.add(name)
+
+    def retry(self, name: str):
+        """Forget a failure so the task is scheduled again."""
+        if name in self.failed:
+            self.failed.discard(name)
+            if not self._missing[name]:
+                self._push_ready(name)
+
+    def _finish(self, name: str):
+        self.running.discard(name)
+        self._pending_outputs.pop(name, None)
+        self.failed.discard(name)
+        self.completed.add(name)
+
+    @property
+    def blocked(self) -> Set[str]:
+        """Tasks still waiting on dependencies; once idle, these are blocked by a failed producer."""
+        return {name for name, missing in self._missing.items() if missing and name not in self.dispatched and name not in self.completed}
+
+    @property
+    def is_idle(self) -> bool:
+        """True when nothing is running and nothing can be started."""
+        return not self.running and not any(name not in self.dispatched and name not in self.completed for _, _, name in self._ready)
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            'tasks': len(self.tasks),
+            'ready': len(self._ready),
+            'running': len(self.running),
+            'completed': len(self.completed),
+            'failed': len(self.failed),
+            'blocked': len(self.blocked),
+        }
@@ -1,4 +1,5 @@
 import asyncio
+import functools
 import inspect
 import json
 import os
@@ -8,6 +9,7 @@ from typing import Coroutine, List, Optional, Type, Union, TypeVar, AsyncGenerat
 from app.utilities.logging_mixin import LoggingMixin, log_performance, OperationContext
 
 from openai import APIError, BadRequestError
+from openai.lib.streaming import AsyncAssistantEventHandler
 from openai.types.beta import AssistantToolChoice
 from openai.types.beta.threads.message import Attachment
 from openai.types.beta.threads.run import TruncationStrategy
@@ -17,16 +19,86 @@ from app.utilities.streaming import AgencyEventHandler
 from app.models.agents.Agent import Agent
 from app.models.message_output import MessageOutput, MessageOutputLive
 from app.models.User import User
-from app.utilities.llm_client import get_openai_client
+from app.utilities.llm_client import get_openai_client, get_async_openai_client
+from app.logging_config import configure_logger
+from app.services.metrics import metrics_registry
 
-from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import re
 import logging
 
+run_seconds = metrics_registry.histogram(
+    "llm_run_seconds",
+    "Duration of Thread.get_completion, from sending the message to the final answer.",
+    ["agent", "status"]
+)
+run_steps = metrics_registry.histogram(
+    "llm_run_steps",
+    "Tool-call rounds per Thread.get_completion.",
+    ["agent"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34)
+)
+tool_seconds = metrics_registry.histogram(
+    "tool_execute_seconds",
+    "Duration of Thread.execute_tool, by tool and outcome.",
+    ["tool", "status"]
+)
+
+
+def _observe_run(func):
+    """Record latency and tool-call rounds of a get_completion generator, however it ends."""
+    @functools.wraps(func)
+    async def wrapper(self, *args, **kwargs):
+        recipient_agent = kwargs.get('recipient_agent') or (args[3] if len(args) > 3 else None) or self.recipient_agent
+        agent_name = getattr(recipient_agent, 'name', 'unknown')
+        self._run_steps = 0
+        started = time.perf_counter()
+        status = "failed"
+        try:
+            async for item in func(self, *args, **kwargs):
+                yield item
+            status = "completed"
+        except GeneratorExit:
+            status = "closed"
+            raise
+        finally:
+            run_seconds.labels(agent_name, status).observe(time.perf_counter() - started)
+            run_steps.labels(agent_name).observe(self._run_steps)
+    return wrapper
+
+
+class AsyncEventHandlerBridge(AsyncAssistantEventHandler):
+    """
+    Drives a synchronous ``AssistantEventHandler`` from an async run stream, so
+    existing handlers such as ``AgencyEventHandler`` keep receiving every event
+    while the stream itself is consumed without blocking the event loop.
+    """
+
+    def __init__(self, handler=None):
+        super().__init__()
+        self.handler = handler
+
+    async def on_event(self, event):
+        if self.handler is not None:
+            # Dispatches to on_text_delta, on_tool_call_created, ... and keeps the handler's snapshots current
+            self.handler._emit_sse_event(event)
+
+    async def on_end(self):
+        if self.handler is not None:
+            self.handler.on_end()
+
+    async def on_exception(self, exception: Exception):
+        if self.handler is not None:
+            self.handler.on_exception(exception)
+
+    async def on_timeout(self):
+        if self.handler is not None:
+            self.handler.on_timeout()
+
+
 class Thread(LoggingMixin):
     async_mode: str = None
-    max_workers: int = 4
+    max_workers: int = 4  # tool calls of one run executing at once
 
     @property
     def thread_url(self):
@@ -46,11 +118,13 @@ class Thread(LoggingMixin):
         })
         
         self.client = get_openai_client()
+        self.async_client = get_async_openai_client()
         self.id = None
         self.thread = None
         self.run = None
         self.stream = None
         self.num_run_retries = 0
+        self._run_steps = 0  # tool-call rounds of the current get_completion
         self.send_message_in_progress = False
 
     def init_thread(self):
@@ -98,6 +172,7 @@ class Thread(LoggingMixin):
                                    yield_messages=False,
                                    response_format=response_format)
 
+    @_observe_run
     async def get_completion(self,
                        message: str | List[dict],
                        message_files: List[str] = None,
@@ -140,7 +215,7 @@ class Thread(LoggingMixin):
 
         if not self.thread:
             self.logger.info("Initializing thread")
-            self.init_thread()
+            await asyncio.to_thread(self.init_thread)
 
         if event_handler:
             self.logger.debug(f"Setting up event handler for agents: {self.agent.name} -> {recipient_agent.name}")
@@ -153,7 +228,7 @@ class Thread(LoggingMixin):
 
         # send message
         self.logger.debug("Creating message object")
-        message_obj = self.create_message(
+        message_obj = await self.create_message(
             message=message,
             role="user",
             attachments=attachments
@@ -164,7 +239,7 @@ class Thread(LoggingMixin):
             yield MessageOutput("text", self.agent.name, recipient_agent.name, message, message_obj)
 
         self.logger.debug("Creating run with recipient agent")
-        self._create_run(recipient_agent, additional_instructions, event_handler, tool_choice, response_format=response_format)
+        await self._create_run(recipient_agent, additional_instructions, event_handler, tool_choice, response_format=response_format)
 
         error_attempts = 0
         validation_attempts = 0
@@ -176,31 +251,9 @@ class Thread(LoggingMixin):
             # function execution
             if self.run.status == "requires_action":
                 self.logger.info("Run requires action - processing tool calls")
+                self._run_steps += 1
                 tool_calls = self.run.required_action.submit_tool_outputs.tool_calls
-                tool_outputs_and_names = []  # list of tuples (name, tool_output)
-                sync_tool_calls = [tool_call for tool_call in tool_calls if tool_call.function.name == "SendMessage"]
-
-                if self.async_mode == 'tools_threading':
-                    self.logger.debug("Using tools threading mode")
-                    futures_with_calls = []
-                    with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                        for tool_call in tool_calls:
-                            if tool_call.function.name != "SendMessage":
-                                self.logger.debug(f"Submitting tool call: {tool_call.function.name}")
-                                future = executor.submit(await self.execute_tool, tool_call, recipient_agent, event_handler, tool_outputs_and_names)
-                                futures_with_calls.append((future, tool_call))
-                        
-                        for future, tool_call in futures_with_calls:
-                            tool_output = future.result()
-                            self.logger.debug(f"Tool call completed: {tool_call.function.name}")
-                            tool_outputs_and_names.append((tool_call.function.name, {"tool_call_id": tool_call.id, "output": tool_output}))
-                else:
-                    self.logger.debug("Using sequential tool execution mode")
-                    for tool_call in tool_calls:
-                        if tool_call.function.name != "SendMessage":
-                            self.logger.debug(f"Executing tool: {tool_call.function.name}")
-                            tool_output = await self.execute_tool(tool_call, recipient_agent, event_handler, tool_outputs_and_names)
-                            tool_outputs_and_names.append((tool_call.function.name, {"tool_call_id": tool_call.id, "output": tool_output}))
+                tool_outputs_and_names = await self._execute_tool_calls(tool_calls, recipient_agent, event_handler)
 
                 tool_outputs = await self._execute_async_tool_calls_outputs(tool_outputs_and_names)
 
@@ -222,17 +275,17 @@ class Thread(LoggingMixin):
                 # submit tool outputs
                 try:
                     self.logger.debug("Submitting tool outputs")
-                    self._submit_tool_outputs(tool_outputs, event_handler)
+                    await self._submit_tool_outputs(tool_outputs, event_handler)
                 except BadRequestError as e:
                     self.logger.warning(f"BadRequestError encountered: {str(e)}")
                     if 'Runs in status "expired"' in e.message or '''tool_outputs' ''' in e.message or 'tool_outputs too large' in e.message:
                         self.logger.info("Handling expired run - recreating message and run")
-                        self.create_message(
+                        await self.create_message(
                             message="Previous request timed out. Please repeat the exact same tool calls in the exact same order with the same arguments.",
                             role="user"
                         )
 
-                        self._create_run(recipient_agent, additional_instructions, event_handler, 'required', temperature=0)
+                        await self._create_run(recipient_agent, additional_instructions, event_handler, 'required', temperature=0)
                         await self._run_until_done()
 
                         if self.run.status != "requires_action":
@@ -257,13 +310,13 @@ class Thread(LoggingMixin):
                                         tool_calls.remove(tool_call)
                                         break
 
-                        self._submit_tool_outputs(tool_outputs, event_handler)
+                        await self._submit_tool_outputs(tool_outputs, event_handler)
                     else:
                         raise e
             # error
             elif self.run.status == "failed":
                 self.logger.error(f"Run failed: {self.run.last_error}")
-                full_message += self._get_last_message_text()
+                full_message += await self._get_last_message_text()
                 common_errors = ["something went wrong", "the server had an error processing your request", "rate limit reached"]
                 error_message = self.run.last_error.message.lower()
 
@@ -272,9 +325,9 @@ class Thread(LoggingMixin):
                     if error_attempts < 2:
                         await asyncio.sleep(1 + error_attempts)
                     else:
-                        self.create_message(message="Continue.", role="user")
+                        await self.create_message(message="Continue.", role="user")
                     
-                    self._create_run(recipient_agent, additional_instructions, event_handler, 
+                    await self._create_run(recipient_agent, additional_instructions, event_handler, 
                                      tool_choice, response_format=response_format)
                     error_attempts += 1
                 else:
@@ -288,7 +341,7 @@ class Thread(LoggingMixin):
             # return assistant message
             else:
                 self.logger.debug("Processing assistant message")
-                message_obj = self._get_last_assistant_message()
+                message_obj = await self._get_last_assistant_message()
                 last_message = message_obj.content[0].text.value
                 full_message += last_message
                 if recipient_agent.response_validator:
@@ -311,7 +364,7 @@ class Thread(LoggingMixin):
                                 content = str(e)
 
                             self.logger.info(f"Retrying with validation feedback (attempt {validation_attempts + 1})")
-                            message_obj = self.create_message(
+                            message_obj = await self.create_message(
                                 message=content,
                                 role="user"
                             )
@@ -331,87 +384,72 @@ class Thread(LoggingMixin):
 
                             validation_attempts += 1
 
-                            self._create_run(recipient_agent, additional_instructions, event_handler, tool_choice, response_format=response_format)
+                            await self._create_run(recipient_agent, additional_instructions, event_handler, tool_choice, response_format=response_format)
 
                             continue
                 self.logger.info("Completion successful, yielding final message")
                 yield last_message
                 return
 
-    def _create_run(self, recipient_agent, additional_instructions, event_handler, tool_choice, temperature=None, response_format: Optional[dict] = None):
+    async def _create_run(self, recipient_agent, additional_instructions, event_handler, tool_choice, temperature=None, response_format: Optional[dict] = None):
+        """
+        Start a run and stream it until it needs tool outputs or finishes.
+
+        The stream ends as soon as the run reaches ``requires_action`` or a
+        terminal status, so ``self.run`` is up to date without polling.
+        """
         try:
-            if event_handler:
-                with self.client.beta.threads.runs.stream(
-                        thread_id=self.thread.id,
-                        event_handler=event_handler(),
-                        assistant_id=recipient_agent.id,
-                        additional_instructions=additional_instructions,
-                        tool_choice=tool_choice,
-                        max_prompt_tokens=recipient_agent.max_prompt_tokens,
-                        max_completion_tokens=recipient_agent.max_completion_tokens,
-                        truncation_strategy=recipient_agent.truncation_strategy,
-                        temperature=temperature,
-                        extra_body={"parallel_tool_calls": recipient_agent.parallel_tool_calls},
-                        response_format=response_format
-                ) as stream:
-                    stream.until_done()
-                    self.run = stream.get_final_run()
-            else:
-                self.run = self.client.beta.threads.runs.create(
+            async with self.async_client.beta.threads.runs.stream(
                     thread_id=self.thread.id,
+                    event_handler=AsyncEventHandlerBridge(event_handler() if event_handler else None),
                     assistant_id=recipient_agent.id,
-                    additional_instructions=additional_instructions,
+                    additional_instructions=self._run_instructions(recipient_agent, additional_instructions),
                     tool_choice=tool_choice,
                     max_prompt_tokens=recipient_agent.max_prompt_tokens,
                     max_completion_tokens=recipient_agent.max_completion_tokens,
                     truncation_strategy=recipient_agent.truncation_strategy,
                     temperature=temperature,
-                    parallel_tool_calls=recipient_agent.parallel_tool_calls,
+                    extra_body={"parallel_tool_calls": recipient_agent.parallel_tool_calls},
                     response_format=response_format
-                )
-                self.run = self.client.beta.threads.runs.poll(
-                    thread_id=self.thread.id,
-                    run_id=self.run.id,
-                    # poll_interval_ms=500,
-                )
+            ) as stream:
+                await stream.until_done()
+                self.run = await stream.get_final_run()
         except APIError as e:
             if "The server had an error processing your request" in e.message and self.num_run_retries < 3:
-                time.sleep(1 + self.num_run_retries)
-                self._create_run(recipient_agent, additional_instructions, event_handler, tool_choice, response_format=response_format)
+                await asyncio.sleep(1 + self.num_run_retries)
                 self.num_run_retries += 1
+                await self._create_run(recipient_agent, additional_instructions, event_handler, tool_choice, temperature=temperature, response_format=response_format)
             else:
                 raise e
 
+    @staticmethod
+    def _run_instructions(recipient_agent, additional_instructions) -> Optional[str]:
+        """Per-run instructions: those passed for this message, then the agent's per-task context."""
+        parts = list(additional_instructions) if isinstance(additional_instructions, list) else [additional_instructions]
+        parts.extend(getattr(recipient_agent, 'additional_instructions', None) or [])
+        return "\n\n".join(part for part in parts if part) or None
+
     async def _run_until_done(self):
-        while self.run.status in ['queued', 'in_progress', "cancelling"]:
-            await asyncio.sleep(0.5)
-            self.run = await self.client.beta.threads.runs.retrieve(
+        """Wait for the run to leave the active states; only needed if a stream ended early."""
+        if self.run.status in ['queued', 'in_progress', "cancelling"]:
+            self.run = await self.async_client.beta.threads.runs.poll(
                 thread_id=self.thread.id,
-                run_id=self.run.id
+                run_id=self.run.id,
+                poll_interval_ms=500,
             )
 
-    def _submit_tool_outputs(self, tool_outputs, event_handler):
-        if not event_handler:
-            try:
-                self.run = self.client.beta.threads.runs.submit_tool_outputs_and_poll(
-                    thread_id=self.thread.id,
-                    run_id=self.run.id,
-                    tool_outputs=tool_outputs
-                )
-            except Exception as e:
-                raise e
-        else:
-            with self.client.beta.threads.runs.submit_tool_outputs_stream(
-                    thread_id=self.thread.id,
-                    run_id=self.run.id,
-                    tool_outputs=tool_outputs,
-                    event_handler=event_handler()
-            ) as stream:
-                stream.until_done()
-                self.run = stream.get_final_run()
-
-    def _get_last_message_text(self):
-        messages = self.client.beta.threads.messages.list(
+    async def _submit_tool_outputs(self, tool_outputs, event_handler):
+        async with self.async_client.beta.threads.runs.submit_tool_outputs_stream(
+                thread_id=self.thread.id,
+                run_id=self.run.id,
+                tool_outputs=tool_outputs,
+                event_handler=AsyncEventHandlerBridge(event_handler() if event_handler else None)
+        ) as stream:
+            await stream.until_done()
+            self.run = await stream.get_final_run()
+
+    async def _get_last_message_text(self):
+        messages = await self.async_client.beta.threads.messages.list(
             thread_id=self.id,
             limit=1
         )
@@ -421,8 +459,8 @@ class Thread(LoggingMixin):
 
         return messages.data[0].content[0].text.value
 
-    def _get_last_assistant_message(self):
-        messages = self.client.beta.threads.messages.list(
+    async def _get_last_assistant_message(self):
+        messages = await self.async_client.beta.threads.messages.list(
             thread_id=self.id,
             limit=1
         )
@@ -437,9 +475,9 @@ class Thread(LoggingMixin):
 
         raise Exception("No assistant message found in the thread")   
 
-    def create_message(self, message: str, role: str = "user", attachments: List[dict] = None):
+    async def create_message(self, message: str, role: str = "user", attachments: List[dict] = None):
         try:
-            return self.client.beta.threads.messages.create(
+            return await self.async_client.beta.threads.messages.create(
                 thread_id=self.id,
                 role=role,
                 content=message,
@@ -455,16 +493,16 @@ class Thread(LoggingMixin):
                 thread_id, run_id = match.groups()
                 thread_id = f"thread_{thread_id}"
                 run_id = f"run_{run_id}"
-                self.client.beta.threads.runs.cancel(
+                await self.async_client.beta.threads.runs.cancel(
                     thread_id=thread_id,
                     run_id=run_id
                 )
-                self.run = self.client.beta.threads.runs.poll(
+                self.run = await self.async_client.beta.threads.runs.poll(
                     thread_id=thread_id,
                     run_id=run_id,
                     poll_interval_ms=500,
                 )
-                return self.client.beta.threads.messages.create(
+                return await self.async_client.beta.threads.messages.create(
                     thread_id=thread_id,
                     role=role,
                     content=message,
@@ -483,6 +521,8 @@ class Thread(LoggingMixin):
         if not tool:
             return f"Error: Function {tool_call.function.name} not found. Available functions: {[func.__name__ for func in funcs]}"
 
+        started = time.perf_counter()
+        status = "error"
         try:
             # init tool
             args = tool_call.function.arguments
@@ -507,6 +547,7 @@ class Thread(LoggingMixin):
             from app.logging_config import configure_logger
             logger = configure_logger('Thread')
             logger.debug(f"Function {tool.__class__.__name__} completed with output: {output}")
+            status = "ok"
             return output
         except Exception as e:
             error_message = f"Error: {e}\n{traceback.format_exc().split('For further information visit')[0]}"
@@ -514,7 +555,50 @@ class Thread(LoggingMixin):
             logger = configure_logger('Thread')
             logger.error(error_message)
             return error_message
+        finally:
+            tool_seconds.labels(tool_call.function.name, status).observe(time.perf_counter() - started)
         
+    async def _execute_tool_calls(self, tool_calls, recipient_agent, event_handler) -> List[tuple]:
+        """
+        Execute the tool calls of a run concurrently.
+
+        At most ``max_workers`` calls run at once, and at most
+        ``ToolConfig.max_concurrency`` calls of the same tool. A tool with
+        ``ToolConfig.one_call_at_a_time`` runs only its first call; later calls to
+        it in the same run get an error output, as before.
+
+        Returns:
+            List[tuple]: ``(tool name, {"tool_call_id", "output"})`` in the order of ``tool_calls``.
+        """
+        run_limit = asyncio.Semaphore(self.max_workers)
+        tool_limits = {}
+        tools = {func.__name__: func for func in recipient_agent.functions}
+        claimed = set()
+        outputs = [None] * len(tool_calls)
+
+        async def run_call(index, tool_call):
+            # Wait for the tool's own limit first so a queued call does not hold a run-wide slot
+            async with tool_limits[tool_call.function.name]:
+                async with run_limit:
+                    self.logger.debug(f"Executing tool: {tool_call.function.name}")
+                    outputs[index] = await self.execute_tool(tool_call, recipient_agent, event_handler)
+
+        calls = []
+        for index, tool_call in enumerate(tool_calls):
+            name = tool_call.function.name
+            config = getattr(tools.get(name), "ToolConfig", None)
+            if getattr(config, "one_call_at_a_time", False):
+                if name in claimed:
+                    outputs[index] = f"Error: Function {name} is already called. You can only call this function once at a time. Please wait for the previous call to finish before calling it again."
+                    continue
+                claimed.add(name)
+            if name not in tool_limits:
+                tool_limits[name] = asyncio.Semaphore(getattr(config, "max_concurrency", None) or self.max_workers)
+            calls.append(run_call(index, tool_call))
+
+        await asyncio.gather(*calls)
+        return [(tool_call.function.name, {"tool_call_id": tool_call.id, "output": output}) for tool_call, output in zip(tool_calls, outputs)]
+
     async def _execute_async_tool_calls_outputs(self, tool_outputs_and_names):
         async_tool_calls = []
         for tool_output in tool_outputs_and_names:
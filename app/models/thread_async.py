@@ -81,7 +81,7 @@ class ThreadAsync(Thread):
         if run.status == "failed":
             return f"System Notification: 'Agent run failed with error: {run.last_error.message}. You may send another message.'"
 
-        messages = await self.client.beta.threads.messages.list(
+        messages = await self.async_client.beta.threads.messages.list(
             thread_id=self.id,
             order="desc",
         )
@@ -90,9 +90,9 @@ class ThreadAsync(Thread):
 
     async def get_last_run(self):
         if not self.thread:
-            await self.init_thread()
+            await asyncio.to_thread(self.init_thread)
 
-        runs = await self.client.beta.threads.runs.list(
+        runs = await self.async_client.beta.threads.runs.list(
             thread_id=self.thread.id,
             order="desc",
         )
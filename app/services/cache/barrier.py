@@ -0,0 +1,181 @@
+import json
+import time
+from typing import Any, Callable, Dict, Optional
+from app.logging_config import configure_logger
+
+# KEYS: state hash, results hash
+# ARGV: member, JSON result, timestamp, TTL in seconds
+# Returns {received, expected, completed, added}; expected is -1 if the barrier does not exist.
+# completed is 1 for the arrival that completed the barrier, and again for a repeated arrival of
+# that same member, so a redelivery can finish what the first attempt started if it died.
+ARRIVE_SCRIPT = """
+local expected = tonumber(redis.call('HGET', KEYS[1], 'total_tasks'))
+if not expected then
+    return {0, -1, 0, 0}
+end
+local received
+local added = redis.call('HSETNX', KEYS[2], ARGV[1], ARGV[2])
+if added == 1 then
+    received = redis.call('HINCRBY', KEYS[1], 'received_tasks', 1)
+    redis.call('HSET', KEYS[1], 'last_update', ARGV[3])
+    if received == 1 then
+        redis.call('EXPIRE', KEYS[2], ARGV[4])
+    end
+else
+    received = tonumber(redis.call('HGET', KEYS[1], 'received_tasks'))
+end
+if received < expected then
+    return {received, expected, 0, added}
+end
+if redis.call('HGET', KEYS[1], 'status') == 'completed' then
+    if added == 1 or redis.call('HGET', KEYS[1], 'completed_by') ~= ARGV[1] then
+        return {received, expected, 0, added}
+    end
+else
+    redis.call('HSET', KEYS[1], 'status', 'completed', 'completed_at', ARGV[3], 'completed_by', ARGV[1])
+end
+return {received, expected, 1, added}
+"""
+
+# KEYS: state hash, results hash
+# ARGV: expected, timestamp, TTL in seconds
+# Returns 1 if the barrier was created, 0 if it already existed.
+# A barrier expecting no results is created completed, since nothing will arrive to complete it.
+CREATE_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return 0
+end
+redis.call('DEL', KEYS[2])
+redis.call('HSET', KEYS[1], 'total_tasks', ARGV[1], 'received_tasks', 0, 'status', 'in_progress', 'start_time', ARGV[2])
+if tonumber(ARGV[1]) == 0 then
+    redis.call('HSET', KEYS[1], 'status', 'completed', 'completed_at', ARGV[2])
+end
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+return 1
+"""
+
+
+class FanInBarrier:
+    """
+    Distributed barrier that collects one result per participant of a fan-out.
+
+    ``create`` records how many results are expected, once per fan-out. Each participant calls
+    ``arrive`` with its result; a server-side script stores the result and
+    counts it in one atomic step, ignores repeated arrivals of the same member
+    (e.g. a redelivered Kafka message), and on the last arrival marks the
+    barrier completed. Only that arrival is told it completed the barrier, so
+    exactly one participant goes on to combine the ``results``. A repeated
+    arrival of the member that completed the barrier completes it again, so a
+    redelivery can finish what a crashed worker started.
+    """
+
+    def __init__(self, client_getter: Callable[[], Any], ttl_seconds: int = 24 * 3600):
+        """
+        Initialize the FanInBarrier.
+
+        Args:
+            client_getter (Callable): Returns the shared async Redis client.
+            ttl_seconds (int): Expiry of barrier state and results in Redis.
+        """
+        self.logger = configure_logger(f"{self.__class__.__module__}.{self.__class__.__name__}")
+        self._client_getter = client_getter
+        self.ttl_seconds = ttl_seconds
+        self._create_script = None
+        self._arrive_script = None
+        self.stats = {"created": 0, "arrivals": 0, "duplicate_arrivals": 0, "completed": 0}
+
+    @staticmethod
+    def state_key(key: str) -> str:
+        return f"{key}:expansion"
+
+    @staticmethod
+    def results_key(key: str) -> str:
+        return f"{key}:expansion:results"
+
+    async def create(self, key: str, expected: int) -> bool:
+        """
+        Create the barrier for a fan-out unless it already exists.
+
+        A redelivered fan-out therefore keeps the arrivals already counted
+        instead of resetting an in-flight barrier. A barrier expecting no
+        results starts out completed; its creator has to publish the (empty)
+        results itself.
+
+        Args:
+            key (str): Identifies the fan-out, e.g. the parent task key.
+            expected (int): Number of results to wait for.
+
+        Returns:
+            bool: True if the barrier was created, False if it already existed.
+        """
+        client = self._client_getter()
+        if self._create_script is None:
+            self._create_script = client.register_script(CREATE_SCRIPT)
+        created = await self._create_script(
+            keys=[self.state_key(key), self.results_key(key)],
+            args=[expected, time.time(), self.ttl_seconds],
+            client=client
+        )
+        if created:
+            self.stats["created"] += 1
+        return bool(created)
+
+    async def arrive(self, key: str, member: str, result: Any) -> Dict[str, Any]:
+        """
+        Record one participant's result.
+
+        Args:
+            key (str): The barrier key passed to ``create``.
+            member (str): Identifies the participant; a second arrival with the same member is not counted.
+            result (Any): JSON-serializable result.
+
+        Returns:
+            Dict[str, Any]: ``received`` and ``expected`` counts, and ``completed``, True only
+            for the arrival that completed the barrier or a repeat of it.
+
+        Raises:
+            KeyError: If the barrier does not exist or has expired.
+        """
+        client = self._client_getter()
+        if self._arrive_script is None:
+            self._arrive_script = client.register_script(ARRIVE_SCRIPT)
+        received, expected, completed, added = await self._arrive_script(
+            keys=[self.state_key(key), self.results_key(key)],
+            args=[member, json.dumps(result, default=str), time.time(), self.ttl_seconds],
+            client=client
+        )
+        if expected < 0:
+            raise KeyError(f"No barrier for {key}")
+        self.stats["arrivals" if added else "duplicate_arrivals"] += 1
+        if completed:
+            self.stats["completed"] += 1
+        return {"received": received, "expected": expected, "completed": bool(completed)}
+
+    async def state(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a barrier's progress.
+
+        Returns:
+            Dict[str, Any] | None: ``total_tasks``, ``received_tasks``, ``status`` and timestamps,
+            or None if the barrier does not exist.
+        """
+        stored = await self._client_getter().hgetall(self.state_key(key))
+        if not stored:
+            return None
+        state = {self._decode(field): self._decode(value) for field, value in stored.items()}
+        for field in ("total_tasks", "received_tasks"):
+            state[field] = int(state.get(field, 0))
+        return state
+
+    async def results(self, key: str) -> Dict[str, Any]:
+        """Get the results recorded so far, by member."""
+        stored = await self._client_getter().hgetall(self.results_key(key))
+        return {self._decode(member): json.loads(value) for member, value in stored.items()}
+
+    @staticmethod
+    def _decode(value: Any) -> Any:
+        # The pooled client ignores decode_responses, so hashes may come back as bytes
+        return value.decode("utf-8") if isinstance(value, bytes) else value
+
+    def get_stats(self) -> Dict[str, int]:
+        return dict(self.stats)
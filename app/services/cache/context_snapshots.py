@@ -0,0 +1,127 @@
+import asyncio
+import hashlib
+import json
+from collections import OrderedDict
+from typing import Any, Callable, Dict
+from app.logging_config import configure_logger
+
+
+class ContextSnapshotStore:
+    """
+    Claim-check storage for large task contexts.
+
+    A context is serialized once, stored in Redis under the SHA-256 of its JSON
+    and never modified afterwards, so messages can carry the short reference
+    instead of the payload. Readers keep the raw JSON of recently used snapshots
+    in an in-process LRU and share one in-flight fetch per reference, so a worker
+    that receives many items of the same fan-out reads the snapshot from Redis once.
+
+    Contexts no larger than ``inline_max_bytes`` are cheaper to send inline and
+    cannot expire, so ``should_inline`` tells producers to skip the snapshot.
+    """
+
+    def __init__(self, client_getter: Callable[[], Any], ttl_seconds: int = 24 * 3600, max_local_entries: int = 32, inline_max_bytes: int = 16 * 1024, prefix: str = "context_snapshot"):
+        """
+        Initialize the ContextSnapshotStore.
+
+        Args:
+            client_getter (Callable): Returns the shared async Redis client, or None if not connected.
+            ttl_seconds (int): Expiry of snapshots in Redis; must outlive the slowest consumer.
+            max_local_entries (int): Number of snapshots kept in the in-process LRU.
+            inline_max_bytes (int): Largest serialized context sent inline instead of by reference.
+            prefix (str): Redis key prefix.
+        """
+        self.logger = configure_logger(f"{self.__class__.__module__}.{self.__class__.__name__}")
+        self._client_getter = client_getter
+        self.ttl_seconds = ttl_seconds
+        self.max_local_entries = max_local_entries
+        self.inline_max_bytes = inline_max_bytes
+        self.prefix = prefix
+        self._local: "OrderedDict[str, str]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.stats = {
+            "writes": 0,
+            "local_hits": 0,
+            "redis_hits": 0,
+            "misses": 0,
+            "bytes_written": 0,
+        }
+
+    def _key(self, ref: str) -> str:
+        return f"{self.prefix}:{ref}"
+
+    def should_inline(self, payload: str) -> bool:
+        """Whether a serialized context is small enough to send inline."""
+        return len(payload.encode('utf-8')) <= self.inline_max_bytes
+
+    async def put(self, context: Dict[str, Any]) -> str:
+        """
+        Store a context snapshot and return its reference.
+
+        Storing the same content twice only refreshes its expiry.
+
+        Args:
+            context (Dict[str, Any]): The context to store.
+
+        Returns:
+            str: The content hash identifying the snapshot.
+        """
+        payload = json.dumps(context, default=str, sort_keys=True)
+        ref = hashlib.sha256(payload.encode('utf-8')).hexdigest()
+        client = self._client_getter()
+        key = self._key(ref)
+        if await client.set(key, payload, ex=self.ttl_seconds or None, nx=True):
+            self.stats["writes"] += 1
+            self.stats["bytes_written"] += len(payload)
+        elif self.ttl_seconds:
+            await client.expire(key, self.ttl_seconds)
+        self._remember(ref, payload)
+        return ref
+
+    async def get(self, ref: str) -> Dict[str, Any]:
+        """
+        Load a context snapshot by reference.
+
+        Each call returns a freshly parsed dict, so callers may mutate it.
+
+        Args:
+            ref (str): The reference returned by ``put``.
+
+        Returns:
+            Dict[str, Any]: The context.
+
+        Raises:
+            KeyError: If the snapshot has expired or never existed.
+        """
+        payload = self._local.get(ref)
+        if payload is not None:
+            self._local.move_to_end(ref)
+            self.stats["local_hits"] += 1
+            return json.loads(payload)
+
+        pending = self._inflight.get(ref)
+        if pending is None:
+            pending = self._inflight[ref] = asyncio.ensure_future(self._fetch(ref))
+            pending.add_done_callback(lambda _: self._inflight.pop(ref, None))
+        return json.loads(await asyncio.shield(pending))
+
+    async def _fetch(self, ref: str) -> str:
+        data = await self._client_getter().get(self._key(ref))
+        if data is None:
+            self.stats["misses"] += 1
+            raise KeyError(f"Context snapshot {ref} not found")
+        self.stats["redis_hits"] += 1
+        payload = data.decode('utf-8') if isinstance(data, bytes) else data
+        self._remember(ref, payload)
+        return payload
+
+    def _remember(self, ref: str, payload: str):
+        self._local[ref] = payload
+        self._local.move_to_end(ref)
+        while len(self._local) > self.max_local_entries:
+            self._local.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self.stats)
+        stats["local_entries"] = len(self._local)
+        return stats
@@ -0,0 +1,165 @@
+import hashlib
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+import numpy as np
+from app.logging_config import configure_logger
+
+
+class EmbeddingCache:
+    """
+    Two-tier, content-addressed cache for text embeddings.
+
+    An in-process LRU sits in front of Redis. Entries are keyed by a SHA-256 of
+    the model name plus the preprocessed text and stored in Redis as float32
+    bytes, so every worker shares the vectors any one of them computed.
+    """
+
+    def __init__(self, model_name: str, client_getter: Callable[[], Any], max_local_entries: int = 10000, ttl_seconds: int = 7 * 24 * 3600, prefix: str = "embedding_cache"):
+        """
+        Initialize the EmbeddingCache.
+
+        Args:
+            model_name (str): Name of the model producing the vectors.
+            client_getter (Callable): Returns the shared async Redis client, or None if not connected.
+            max_local_entries (int): Size of the in-process LRU.
+            ttl_seconds (int): Expiry of Redis entries; 0 keeps them until Redis evicts them.
+            prefix (str): Redis key prefix.
+        """
+        self.logger = configure_logger(f"{self.__class__.__module__}.{self.__class__.__name__}")
+        self.model_name = model_name
+        self._client_getter = client_getter
+        self.max_local_entries = max_local_entries
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+        self._local: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self.stats = {
+            "local_hits": 0,
+            "redis_hits": 0,
+            "misses": 0,
+            "writes": 0,
+            "evictions": 0,
+            "errors": 0,
+        }
+
+    def key_for(self, text: str) -> str:
+        """
+        Get the Redis key for a preprocessed text.
+
+        Args:
+            text (str): Preprocessed text.
+
+        Returns:
+            str: The content-addressed key.
+        """
+        digest = hashlib.sha256(f"{self.model_name}\0{text}".encode("utf-8")).hexdigest()
+        return f"{self.prefix}:{digest}"
+
+    def get_local(self, text: str) -> Optional[List[float]]:
+        """
+        Look a text up in the in-process tier only.
+
+        Args:
+            text (str): Preprocessed text.
+
+        Returns:
+            List[float] | None: The vector, or None on a miss.
+        """
+        key = self.key_for(text)
+        vector = self._local.get(key)
+        if vector is None:
+            return None
+        self._local.move_to_end(key)
+        self.stats["local_hits"] += 1
+        return vector.tolist()
+
+    def set_local(self, text: str, vector: List[float]):
+        self._remember(self.key_for(text), np.asarray(vector, dtype=np.float32))
+
+    async def get_many(self, texts: List[str]) -> Dict[str, List[float]]:
+        """
+        Look up several texts, checking the in-process tier and then Redis with one MGET.
+
+        Args:
+            texts (List[str]): Preprocessed texts.
+
+        Returns:
+            Dict[str, List[float]]: Vectors for the texts that were cached.
+        """
+        found: Dict[str, List[float]] = {}
+        remote: Dict[str, str] = {}
+        for text in texts:
+            vector = self.get_local(text)
+            if vector is not None:
+                found[text] = vector
+            else:
+                remote[text] = self.key_for(text)
+
+        client = self._client_getter()
+        if remote and client is not None:
+            try:
+                values = await client.mget(list(remote.values()))
+                for (text, key), value in zip(remote.items(), values):
+                    if value:
+                        vector = np.frombuffer(value, dtype=np.float32)
+                        self._remember(key, vector)
+                        found[text] = vector.tolist()
+                        self.stats["redis_hits"] += 1
+            except Exception as e:
+                self.stats["errors"] += 1
+                self.logger.warning(f"Embedding cache lookup failed: {str(e)}")
+
+        self.stats["misses"] += len(texts) - len(found)
+        return found
+
+    async def set_many(self, vectors: Dict[str, List[float]]):
+        """
+        Store freshly computed vectors in both tiers.
+
+        Args:
+            vectors (Dict[str, List[float]]): Vectors keyed by preprocessed text.
+        """
+        if not vectors:
+            return
+        entries = {}
+        for text, vector in vectors.items():
+            key = self.key_for(text)
+            array = np.asarray(vector, dtype=np.float32)
+            self._remember(key, array)
+            entries[key] = array.tobytes()
+
+        client = self._client_getter()
+        if client is None:
+            return
+        try:
+            async with client.pipeline(transaction=False) as pipe:
+                for key, value in entries.items():
+                    pipe.set(key, value, ex=self.ttl_seconds or None)
+                await pipe.execute()
+            self.stats["writes"] += len(entries)
+        except Exception as e:
+            self.stats["errors"] += 1
+            self.logger.warning(f"Embedding cache write failed: {str(e)}")
+
+    def _remember(self, key: str, vector: np.ndarray):
+        self._local[key] = vector
+        self._local.move_to_end(key)
+        while len(self._local) > self.max_local_entries:
+            self._local.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        Get hit/miss counters.
+
+        Returns:
+            Dict[str, float]: Counters plus the overall hit rate and local tier size.
+        """
+        stats = dict(self.stats)
+        hits = stats["local_hits"] + stats["redis_hits"]
+        lookups = hits + stats["misses"]
+        stats["hit_rate"] = hits / lookups if lookups else 0.0
+        stats["local_entries"] = len(self._local)
+        return stats
+
+    def clear_local(self):
+        self._local.clear()
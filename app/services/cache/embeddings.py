@@ -0,0 +1,200 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from app.logging_config import configure_logger
+from app.services.cache.embedding_cache import EmbeddingCache
+
+
+class EmbeddingService:
+    """
+    Runs the text vectorization model off the event loop and micro-batches requests.
+
+    Concurrent ``embed`` calls made within ``batch_window_ms`` of each other are
+    collected into a single ``embed_many`` call on a dedicated thread pool, so
+    the event loop never blocks on model inference.
+    """
+
+    def __init__(self, model_loader: Callable[[], Any], batch_window_ms: float = 5.0, max_batch_size: int = 64, workers: int = 1, cache: Optional[EmbeddingCache] = None):
+        """
+        Initialize the EmbeddingService.
+
+        Args:
+            model_loader (Callable): Returns the vectorizer; called on the worker thread.
+            batch_window_ms (float): How long to wait for more requests before running a batch.
+            max_batch_size (int): Largest number of texts sent to the model at once.
+            workers (int): Number of inference threads.
+            cache (EmbeddingCache, optional): Consulted before the model; only misses are embedded.
+        """
+        self.logger = configure_logger(f"{self.__class__.__module__}.{self.__class__.__name__}")
+        self._model_loader = model_loader
+        self.cache = cache
+        self.workers = workers
+        # Created on first use, so the service keeps working after a shutdown/start cycle
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.batch_window = batch_window_ms / 1000
+        self.max_batch_size = max_batch_size
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._batch_tasks: Set[asyncio.Task] = set()
+        self._inflight = 0
+        self.stats = {
+            "requests": 0,
+            "batches": 0,
+            "texts_embedded": 0,
+            "failures": 0,
+            "busy_seconds": 0.0,
+            "max_queue_depth": 0,
+        }
+
+    async def embed(self, text: str) -> List[float]:
+        """
+        Embed a single text, sharing a model call with other concurrent requests.
+
+        Args:
+            text (str): Already preprocessed text.
+
+        Returns:
+            List[float]: The embedding vector.
+        """
+        self.stats["requests"] += 1
+        if self.cache is not None:
+            vector = self.cache.get_local(text)
+            if vector is not None:
+                return vector
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((text, future))
+        self.stats["max_queue_depth"] = max(self.stats["max_queue_depth"], self.queue_depth)
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_window, self._flush)
+        return await future
+
+    async def embed_many(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed a list of texts, returning vectors in the same order.
+
+        Args:
+            texts (List[str]): Already preprocessed texts.
+
+        Returns:
+            List[List[float]]: One embedding vector per text.
+        """
+        if not texts:
+            return []
+        return list(await asyncio.gather(*(self.embed(text) for text in texts)))
+
+    def embed_many_sync(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed texts on the calling thread, for code that is not running on the event loop.
+
+        Args:
+            texts (List[str]): Already preprocessed texts.
+
+        Returns:
+            List[List[float]]: One embedding vector per text.
+        """
+        if self.cache is None:
+            return self._embed_batch(texts)
+
+        # Only the in-process tier is reachable without the event loop
+        by_text = {}
+        for text in texts:
+            vector = self.cache.get_local(text)
+            if vector is not None:
+                by_text[text] = vector
+        misses = [text for text in dict.fromkeys(texts) if text not in by_text]
+        if misses:
+            for text, vector in zip(misses, self._embed_batch(misses)):
+                self.cache.set_local(text, vector)
+                by_text[text] = vector
+        return [by_text[text] for text in texts]
+
+    @property
+    def queue_depth(self) -> int:
+        """Texts waiting for a batch plus texts currently being embedded."""
+        return len(self._pending) + self._inflight
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        Get throughput and queue-depth counters.
+
+        Returns:
+            Dict[str, float]: Counters including average batch size and texts per busy second.
+        """
+        stats = dict(self.stats)
+        stats["queue_depth"] = self.queue_depth
+        stats["avg_batch_size"] = stats["texts_embedded"] / stats["batches"] if stats["batches"] else 0.0
+        stats["texts_per_second"] = stats["texts_embedded"] / stats["busy_seconds"] if stats["busy_seconds"] else 0.0
+        if self.cache is not None:
+            stats["cache"] = self.cache.get_stats()
+        return stats
+
+    def _flush(self):
+        """Move pending requests into model batches of at most ``max_batch_size`` texts."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        pending, self._pending = self._pending, []
+        for i in range(0, len(pending), self.max_batch_size):
+            task = asyncio.get_running_loop().create_task(self._run_batch(pending[i:i + self.max_batch_size]))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+
+    async def _run_batch(self, batch: List[Tuple[str, asyncio.Future]]):
+        # Identical texts in one batch are embedded once
+        unique_texts = list(dict.fromkeys(text for text, _ in batch))
+        self._inflight += len(batch)
+        started = time.perf_counter()
+        try:
+            by_text = await self.cache.get_many(unique_texts) if self.cache is not None else {}
+            misses = [text for text in unique_texts if text not in by_text]
+            if misses:
+                vectors = await asyncio.get_running_loop().run_in_executor(self._get_executor(), self._embed_batch, misses)
+                computed = dict(zip(misses, vectors))
+                by_text.update(computed)
+                if self.cache is not None:
+                    await self.cache.set_many(computed)
+                self.stats["batches"] += 1
+                self.stats["texts_embedded"] += len(misses)
+            for text, future in batch:
+                if not future.done():
+                    future.set_result(by_text[text])
+        except Exception as e:
+            self.stats["failures"] += 1
+            self.logger.error(f"Embedding batch of {len(unique_texts)} text(s) failed: {str(e)}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            self._inflight -= len(batch)
+            self.stats["busy_seconds"] += time.perf_counter() - started
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="embedding")
+        return self._executor
+
+    def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        return self._model_loader().embed_many(texts)
+
+    def shutdown(self):
+        """
+        Stop the inference threads and fail any requests still waiting for a batch.
+
+        Later requests start a new thread pool, so a restarted service can embed again.
+        """
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        pending, self._pending = self._pending, []
+        for _, future in pending:
+            if not future.done():
+                future.set_exception(RuntimeError("EmbeddingService is shut down"))
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
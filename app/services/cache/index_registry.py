@@ -0,0 +1,214 @@
+import asyncio
+import hashlib
+import inspect
+import json
+import os
+import time
+from typing import Any, Dict, Optional, Tuple
+from redis.exceptions import ResponseError
+from redisvl.index import AsyncSearchIndex
+from redisvl.schema import IndexSchema
+from app.logging_config import configure_logger
+
+SCHEMA_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), "schemas")
+
+
+def is_missing_index_error(error: Exception) -> bool:
+    """
+    Check whether a Redis error means the search index does not exist.
+
+    Args:
+        error (Exception): The error raised by a search command.
+
+    Returns:
+        bool: True if the index is missing on the server.
+    """
+    if not isinstance(error, ResponseError):
+        return False
+    message = str(error).lower()
+    return "no such index" in message or "unknown index name" in message
+
+
+class IndexRegistry:
+    """
+    Per-process registry of parsed index schemas and connected AsyncSearchIndex handles.
+
+    Each schema under ``services/cache/schemas/`` is parsed once and each index is
+    connected once on the shared Redis client. A handle is rebuilt only when its
+    schema file changes, the shared client is replaced, or it is invalidated after
+    a missing-index error.
+
+    A fingerprint of the schema each server index was built from is kept in
+    Redis. Existing indexes are never rebuilt implicitly: an index without a
+    fingerprint adopts the current one, and a mismatch is only logged, since
+    workers on different schema versions would otherwise keep rebuilding it
+    during a rolling deploy. ``rebuild`` (``seed_index.py --rebuild``) recreates
+    an index from the schema on disk.
+    """
+
+    def __init__(self, schema_dir: str = SCHEMA_DIR, check_interval: float = 30.0):
+        """
+        Initialize the IndexRegistry.
+
+        Args:
+            schema_dir (str): Directory holding the ``<index>.yaml`` schema files.
+            check_interval (float): Minimum seconds between schema file mtime checks.
+        """
+        self.logger = configure_logger(f"{self.__class__.__module__}.{self.__class__.__name__}")
+        self.schema_dir = schema_dir
+        self.check_interval = check_interval
+        self._schemas: Dict[str, Tuple[float, IndexSchema]] = {}
+        self._last_checked: Dict[str, float] = {}
+        self._indexes: Dict[str, Tuple[Any, IndexSchema, AsyncSearchIndex]] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    @staticmethod
+    def normalize_name(index_name: str) -> str:
+        """Strip a trailing ``.yaml`` so ``context`` and ``context.yaml`` share one entry."""
+        return index_name[:-5] if index_name.endswith(".yaml") else index_name
+
+    def schema_path(self, index_name: str) -> str:
+        return os.path.join(self.schema_dir, self.normalize_name(index_name) + ".yaml")
+
+    @staticmethod
+    def fingerprint_key(schema: IndexSchema) -> str:
+        return f"index_schema:{schema.index.name}"
+
+    @staticmethod
+    def fingerprint(schema: IndexSchema) -> str:
+        """Hash of a schema's definition; equal hashes mean the server index needs no rebuild."""
+        return hashlib.sha256(json.dumps(schema.to_dict(), sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+    def get_schema(self, index_name: str) -> IndexSchema:
+        """
+        Get the parsed schema for an index, re-parsing only if the file changed.
+
+        Args:
+            index_name (str): The name of the index.
+
+        Returns:
+            IndexSchema: The parsed schema.
+
+        Raises:
+            FileNotFoundError: If the schema file does not exist.
+        """
+        schema, _ = self._load_schema(self.normalize_name(index_name))
+        return schema
+
+    def _load_schema(self, name: str) -> Tuple[IndexSchema, bool]:
+        cached = self._schemas.get(name)
+        now = time.monotonic()
+        if cached and now - self._last_checked.get(name, 0.0) < self.check_interval:
+            return cached[1], False
+
+        path = self.schema_path(name)
+        try:
+            mtime = os.stat(path).st_mtime
+        except FileNotFoundError:
+            self._schemas.pop(name, None)
+            raise FileNotFoundError(f"Index schema file {path} not found.")
+        self._last_checked[name] = now
+
+        if cached and cached[0] == mtime:
+            return cached[1], False
+
+        schema = IndexSchema.from_yaml(path)
+        self._schemas[name] = (mtime, schema)
+        if cached:
+            self.logger.info(f"Schema for index {name} changed on disk; reloading")
+        return schema, True
+
+    async def get(self, index_name: str, client: Any) -> AsyncSearchIndex:
+        """
+        Get a connected search index, creating the index on the server if it is missing.
+
+        Args:
+            index_name (str): The name of the index.
+            client: The shared async Redis client.
+
+        Returns:
+            AsyncSearchIndex: The connected search index.
+        """
+        name = self.normalize_name(index_name)
+        schema, _ = self._load_schema(name)
+        cached = self._indexes.get(name)
+        if cached and cached[0] is client and cached[1] is schema:
+            return cached[2]
+
+        lock = self._locks.setdefault(name, asyncio.Lock())
+        async with lock:
+            cached = self._indexes.get(name)
+            if cached and cached[0] is client and cached[1] is schema:
+                return cached[2]
+
+            index = AsyncSearchIndex(schema=schema)
+            result = index.set_client(client)
+            if inspect.isawaitable(result):
+                await result
+            await self._sync_server_index(name, index, schema, client)
+            self._indexes[name] = (client, schema, index)
+            return index
+
+    async def _sync_server_index(self, name: str, index: AsyncSearchIndex, schema: IndexSchema, client: Any):
+        """Create the server index if it is missing, and check its stored fingerprint against ``schema``."""
+        fingerprint = self.fingerprint(schema)
+        stored = await client.get(self.fingerprint_key(schema))
+        if isinstance(stored, bytes):
+            stored = stored.decode("utf-8")
+
+        if not await index.exists():
+            await index.create(overwrite=False)
+            self.logger.info(f"Created search index {name}")
+        elif stored is None:
+            # Indexes built before fingerprints were stored are taken as they are
+            pass
+        elif stored != fingerprint:
+            self.logger.warning(
+                f"Search index {name} was built from a different schema; "
+                f"run `python seed_index.py {name} --rebuild` to re-index it"
+            )
+            return
+        else:
+            return
+        await client.set(self.fingerprint_key(schema), fingerprint)
+
+    async def rebuild(self, index_name: str, client: Any):
+        """
+        Recreate a server index from the schema on disk, keeping its documents so
+        Redis re-indexes the existing hashes.
+
+        Args:
+            index_name (str): The name of the index.
+            client: The shared async Redis client.
+        """
+        name = self.normalize_name(index_name)
+        schema, _ = self._load_schema(name)
+        lock = self._locks.setdefault(name, asyncio.Lock())
+        async with lock:
+            index = AsyncSearchIndex(schema=schema)
+            result = index.set_client(client)
+            if inspect.isawaitable(result):
+                await result
+            await index.create(overwrite=True, drop=False)
+            await client.set(self.fingerprint_key(schema), self.fingerprint(schema))
+            self._indexes[name] = (client, schema, index)
+        self.logger.info(f"Rebuilt search index {name}; re-indexing existing documents")
+
+    def invalidate(self, index_name: Optional[str] = None):
+        """
+        Drop cached handles so the next ``get`` reconnects and re-checks the index.
+
+        Args:
+            index_name (str, optional): The index to invalidate. All indexes when omitted.
+        """
+        if index_name is None:
+            self._indexes.clear()
+            self._last_checked.clear()
+            return
+        name = self.normalize_name(index_name)
+        self._indexes.pop(name, None)
+        self._last_checked.pop(name, None)
+
+
+# Create a global instance of IndexRegistry
+index_registry = IndexRegistry()
@@ -0,0 +1,287 @@
+import asyncio
+import hashlib
+import json
+import time
+from collections import deque
+from typing import Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Deque, Dict, Iterable, List, Optional, Tuple, Union
+import numpy as np
+from app.logging_config import configure_logger
+from app.debug_log import log_debug
+
+HASH_FIELD = "content_hash"
+
+
+def fields_from_schema(schema: Any) -> Tuple[Dict[str, bool], bool]:
+    """
+    Derive what to store and embed from an index schema.
+
+    A ``<field>_vector`` vector field means ``<field>`` is embedded; other
+    non-vector fields are stored as text.
+
+    Args:
+        schema (IndexSchema): The parsed index schema.
+
+    Returns:
+        Tuple[Dict[str, bool], bool]: ``{field: should_vectorize}``, and whether
+        the schema has a ``metadata_vector``.
+    """
+    vectors = {name for name, field in schema.fields.items() if str(getattr(field.type, "value", field.type)).lower() == "vector"}
+    fields = {name: f"{name}_vector" in vectors for name in schema.fields if name not in vectors}
+    for vector in vectors:
+        source = vector[:-len("_vector")]
+        if vector.endswith("_vector") and source != "metadata":
+            fields[source] = True
+    return fields, "metadata_vector" in vectors
+
+
+class IngestionPipeline:
+    """
+    Streams records into a Redis search index in bounded chunks.
+
+    Records are pulled from any iterable or async iterable ``chunk_size`` at a
+    time, so memory stays bounded by ``chunk_size * max_in_flight`` records
+    however large the source is. Each chunk costs one pipelined read of the
+    stored content hashes, one batched embedding call for the records that
+    changed, and one pipelined ``HSET``; the next chunk is prepared while the
+    previous one is written.
+
+    Every stored record carries a hash of its content, so re-ingesting an
+    unchanged record is skipped without embedding it. After each chunk the
+    number of records consumed is checkpointed in Redis; an interrupted run
+    started again with the same ``run_id`` skips straight past them.
+    """
+
+    def __init__(self, client_getter: Callable[[], Any], embed: Callable[[List[str]], Awaitable[List[Any]]], chunk_size: int = 256, max_in_flight: int = 2, checkpoint_prefix: str = "ingest:checkpoint"):
+        """
+        Initialize the IngestionPipeline.
+
+        Args:
+            client_getter (Callable): Returns the shared async Redis client.
+            embed (Callable): Embeds a list of texts, returning vectors in order.
+            chunk_size (int): Records read, embedded and written together.
+            max_in_flight (int): Chunks processed concurrently.
+            checkpoint_prefix (str): Redis key prefix for checkpoints.
+        """
+        self.logger = configure_logger(f"{self.__class__.__module__}.{self.__class__.__name__}")
+        self._client_getter = client_getter
+        self._embed = embed
+        self.chunk_size = chunk_size
+        self.max_in_flight = max(max_in_flight, 1)
+        self.checkpoint_prefix = checkpoint_prefix
+        self.stats = {"records": 0, "written": 0, "unchanged": 0, "resumed": 0, "texts_embedded": 0, "chunks": 0}
+
+    def checkpoint_key(self, run_id: str) -> str:
+        return f"{self.checkpoint_prefix}:{run_id}"
+
+    async def ingest(
+        self,
+        records: Union[Iterable[Any], AsyncIterable[Any]],
+        fields_vectorization: Dict[str, bool],
+        prefix: str,
+        id_column: str = "id",
+        metadata_vector: bool = True,
+        overwrite: bool = True,
+        force: bool = False,
+        run_id: Optional[str] = None,
+        nested_field: Optional[str] = None,
+        on_chunk: Optional[Callable[[List[str]], Any]] = None,
+        chunk_size: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Load records into Redis hashes under ``prefix``.
+
+        Args:
+            records (Iterable | AsyncIterable): Dicts, or objects with ``model_dump``/``to_dict``.
+            fields_vectorization (Dict[str, bool]): Fields to store, and whether to embed each.
+            prefix (str): Key prefix of the index; keys are ``{prefix}:{id}``.
+            id_column (str): Record field holding the id; records without one use their position.
+            metadata_vector (bool): Also embed all fields together as ``metadata_vector``.
+            overwrite (bool): Replace existing records; otherwise existing keys are left alone.
+            force (bool): Re-embed and write records even if their content is unchanged.
+            run_id (str, optional): Enables checkpoints; a rerun with the same id resumes.
+            nested_field (str, optional): Look fields missing at the top level up in this
+                nested dict, e.g. ``context_info``.
+            on_chunk (Callable, optional): Called with the keys of each chunk, in order, including
+                chunks a resumed run skips.
+            chunk_size (int, optional): Overrides the pipeline's ``chunk_size`` for this run.
+
+        Returns:
+            Dict[str, Any]: ``records``, ``written``, ``unchanged`` and ``resumed`` counts and ``seconds``.
+        """
+        started = time.monotonic()
+        client = self._client_getter()
+        checkpoint_key = self.checkpoint_key(run_id) if run_id else None
+        resume_from = 0
+        if checkpoint_key:
+            stored = await client.hget(checkpoint_key, "position")
+            resume_from = int(stored or 0)
+            if resume_from:
+                self.logger.info(f"Resuming {run_id} after {resume_from} records")
+
+        spec = (fields_vectorization, prefix, id_column, metadata_vector, overwrite, force, nested_field)
+        result = {"records": 0, "written": 0, "unchanged": 0, "resumed": resume_from}
+        in_flight: Deque[Tuple[int, asyncio.Task]] = deque()
+
+        async def complete_oldest():
+            position, task = in_flight.popleft()
+            keys, written, unchanged = await task
+            result["written"] += written
+            result["unchanged"] += unchanged
+            if checkpoint_key:
+                await client.hset(checkpoint_key, mapping={"position": position, "updated_at": time.time()})
+            if on_chunk is not None:
+                on_chunk(keys)
+
+        position = 0
+        try:
+            async for chunk in self._chunks(records, chunk_size or self.chunk_size):
+                start, position = position, position + len(chunk)
+                result["records"] += len(chunk)
+                if start < resume_from:
+                    # Loaded by the interrupted run; only report their keys
+                    skipped = min(position, resume_from) - start
+                    if on_chunk is not None:
+                        on_chunk(self._keys(chunk[:skipped], start, prefix, id_column))
+                    chunk, start = chunk[skipped:], start + skipped
+                    if not chunk:
+                        continue
+                in_flight.append((position, asyncio.create_task(self._process_chunk(chunk, start, spec))))
+                if len(in_flight) >= self.max_in_flight:
+                    await complete_oldest()
+            while in_flight:
+                await complete_oldest()
+        except BaseException:
+            # Chunks are checkpointed in order, so whatever was not completed is redone on resume
+            for _, task in in_flight:
+                task.cancel()
+            raise
+
+        if checkpoint_key:
+            await client.delete(checkpoint_key)
+        self.stats["records"] += result["records"]
+        self.stats["written"] += result["written"]
+        self.stats["unchanged"] += result["unchanged"]
+        self.stats["resumed"] += resume_from
+        result["seconds"] = round(time.monotonic() - started, 3)
+        self.logger.info(f"Ingested {result['records']} records under {prefix}: {result['written']} written, {result['unchanged']} unchanged")
+        return result
+
+    async def _chunks(self, records: Union[Iterable[Any], AsyncIterable[Any]], size: int) -> AsyncIterator[List[Any]]:
+        chunk = []
+        if hasattr(records, "__aiter__"):
+            async for record in records:
+                chunk.append(record)
+                if len(chunk) >= size:
+                    yield chunk
+                    chunk = []
+        else:
+            for record in records:
+                chunk.append(record)
+                if len(chunk) >= size:
+                    yield chunk
+                    chunk = []
+                    # Let other tasks run between chunks of a synchronous source
+                    await asyncio.sleep(0)
+        if chunk:
+            yield chunk
+
+    @staticmethod
+    def _to_dict(obj: Any) -> Dict[str, Any]:
+        if isinstance(obj, dict):
+            return obj
+        if hasattr(obj, "model_dump"):
+            return obj.model_dump()
+        return obj.to_dict()
+
+    def _keys(self, chunk: List[Any], start: int, prefix: str, id_column: str) -> List[str]:
+        keys = []
+        for offset, obj_dict in enumerate(map(self._to_dict, chunk)):
+            record_id = obj_dict.get(id_column)
+            keys.append(f"{prefix}:{record_id if record_id is not None else start + offset}")
+        return keys
+
+    @staticmethod
+    def content_hash(record: Dict[str, str], fields_vectorization: Dict[str, bool], metadata_vector: bool) -> str:
+        """Hash of what a stored record is built from; equal hashes mean embedding again would change nothing."""
+        payload = json.dumps([record, sorted(field for field, embed in fields_vectorization.items() if embed), metadata_vector], sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def build_record(self, obj: Any, fields_vectorization: Dict[str, bool], nested_field: Optional[str] = None) -> Tuple[Dict[str, Any], Dict[str, str]]:
+        """
+        Turn a source object into the hash fields to store, before embedding.
+
+        Returns:
+            Tuple[Dict[str, Any], Dict[str, str]]: The source as a dict, and the string fields to store.
+        """
+        obj_dict = self._to_dict(obj)
+        nested = obj_dict.get(nested_field) if nested_field else None
+        if nested is not None and not isinstance(nested, dict):
+            nested = self._to_dict(nested)
+        record = {}
+        for field in fields_vectorization:
+            field_data = obj_dict.get(field)
+            if field_data is None and nested:
+                field_data = nested.get(field)
+            if field_data is None:
+                field_data = ""
+            record[field] = json.dumps(field_data, default=str) if isinstance(field_data, (dict, list)) else str(field_data)
+        record["item"] = json.dumps(obj_dict, default=str)
+        return obj_dict, record
+
+    async def _process_chunk(self, chunk: List[Any], start: int, spec: tuple) -> Tuple[List[str], int, int]:
+        fields_vectorization, prefix, id_column, metadata_vector, overwrite, force, nested_field = spec
+        client = self._client_getter()
+        # Converted once; build_record and _keys take dicts as they are
+        chunk = [self._to_dict(obj) for obj in chunk]
+        keys, records = self._keys(chunk, start, prefix, id_column), []
+        for obj_dict in chunk:
+            _, record = self.build_record(obj_dict, fields_vectorization, nested_field)
+            record[HASH_FIELD] = self.content_hash(record, fields_vectorization, metadata_vector)
+            records.append(record)
+
+        # One round trip tells which records are already stored as they are
+        pipe = client.pipeline(transaction=False)
+        for key in keys:
+            if overwrite:
+                pipe.hget(key, HASH_FIELD)
+            else:
+                pipe.exists(key)
+        stored = await pipe.execute()
+        pending = []
+        for key, record, existing in zip(keys, records, stored):
+            # The pooled client ignores decode_responses, so stored hashes may come back as bytes
+            if isinstance(existing, bytes):
+                existing = existing.decode("utf-8")
+            if overwrite and (force or existing != record[HASH_FIELD]):
+                pending.append((key, record))
+            elif not overwrite and not existing:
+                pending.append((key, record))
+        unchanged = len(records) - len(pending)
+
+        if pending:
+            texts, targets = [], []
+            for _, record in pending:
+                for field, should_vectorize in fields_vectorization.items():
+                    if should_vectorize:
+                        texts.append(record[field])
+                        targets.append((record, f"{field}_vector"))
+                if metadata_vector:
+                    texts.append(" ".join(record[field] for field in fields_vectorization))
+                    targets.append((record, "metadata_vector"))
+            if texts:
+                vectors = await self._embed(texts)
+                for (record, vector_field), vector in zip(targets, vectors):
+                    record[vector_field] = np.array(vector, dtype=np.float32).tobytes()
+                self.stats["texts_embedded"] += len(texts)
+
+            pipe = client.pipeline(transaction=False)
+            for key, record in pending:
+                pipe.hset(key, mapping=record)
+            await pipe.execute()
+
+        self.stats["chunks"] += 1
+        log_debug(self.logger, "Ingested chunk", start=start, size=len(chunk), written=len(pending), unchanged=unchanged)
+        return keys, len(pending), unchanged
+
+    def get_stats(self) -> Dict[str, int]:
+        return dict(self.stats)
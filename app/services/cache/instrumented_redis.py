@@ -0,0 +1,38 @@
+import time
+from redis.asyncio import Redis
+from redis.asyncio.client import Pipeline
+from app.services.metrics import metrics_registry
+
+redis_command_seconds = metrics_registry.histogram(
+    "redis_command_seconds",
+    "Round-trip time of Redis commands and pipelines, by command.",
+    ["command"]
+)
+
+
+class InstrumentedPipeline(Pipeline):
+    """Pipeline that records the round trip of each execute() as ``MULTI`` or ``PIPELINE``."""
+
+    async def execute(self, raise_on_error: bool = True):
+        started = time.perf_counter()
+        try:
+            return await super().execute(raise_on_error=raise_on_error)
+        finally:
+            redis_command_seconds.labels("MULTI" if self.is_transaction else "PIPELINE").observe(time.perf_counter() - started)
+
+
+class InstrumentedRedis(Redis):
+    """Async Redis client that records the round-trip time of every command by name."""
+
+    async def execute_command(self, *args, **options):
+        started = time.perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        finally:
+            command = args[0] if args else "UNKNOWN"
+            if isinstance(command, bytes):
+                command = command.decode("utf-8", "replace")
+            redis_command_seconds.labels(str(command).split(" ", 1)[0].upper()).observe(time.perf_counter() - started)
+
+    def pipeline(self, transaction: bool = True, shard_hint=None) -> InstrumentedPipeline:
+        return InstrumentedPipeline(self.connection_pool, self.response_callbacks, transaction, shard_hint)
@@ -0,0 +1,193 @@
+import json
+import re
+import string
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from app.logging_config import configure_logger
+
+DEFAULT_PROCESS_CONFIG = {
+    "remove_punctuation": True,
+    "remove_extra_whitespace": True,
+    "remove_newlines": True,
+    "split_camel_case": True,
+    "remove_digits": True,
+    "lowercase": True,
+}
+
+DEFAULT_REDACT_CONFIG = {
+    "config": {
+        "entities": ["PERSON", "PHONE_NUMBER", "EMAIL_ADDRESS"]
+    },
+    "analyze": True,
+    "model": "en"
+}
+
+
+class Redactor:
+    """
+    Process-wide Presidio analyzer and anonymizer, loaded on first use.
+
+    Building an ``AnalyzerEngine`` loads the spaCy model, so the engines are
+    created once and shared by every caller.
+    """
+
+    def __init__(self):
+        self.logger = configure_logger(f"{self.__class__.__module__}.{self.__class__.__name__}")
+        self._analyzer = None
+        self._batch_analyzer = None
+        self._anonymizer = None
+        self._lock = threading.Lock()
+
+    def _engines(self):
+        if self._analyzer is None:
+            with self._lock:
+                if self._analyzer is None:
+                    from presidio_analyzer import AnalyzerEngine, BatchAnalyzerEngine
+                    from presidio_anonymizer import AnonymizerEngine
+                    analyzer = AnalyzerEngine()
+                    self._anonymizer = AnonymizerEngine()
+                    self._batch_analyzer = BatchAnalyzerEngine(analyzer_engine=analyzer)
+                    self._analyzer = analyzer
+                    self.logger.info("Loaded Presidio analyzer and anonymizer engines")
+        return self._analyzer, self._batch_analyzer, self._anonymizer
+
+    @staticmethod
+    def _options(redact_config: Optional[Dict[str, Any]]) -> Tuple[List[str], str]:
+        redact_config = redact_config or DEFAULT_REDACT_CONFIG
+        entities = redact_config.get("config", {}).get("entities", DEFAULT_REDACT_CONFIG["config"]["entities"])
+        return entities, redact_config.get("model", "en")
+
+    def redact(self, text: str, redact_config: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Replace configured PII entities in a text with a single anonymize pass.
+
+        Args:
+            text (str): The text to redact.
+            redact_config (Dict[str, Any], optional): Entities and language model to use.
+
+        Returns:
+            str: The redacted text.
+        """
+        return self.redact_many([text], redact_config)[0]
+
+    def redact_many(self, texts: List[str], redact_config: Optional[Dict[str, Any]] = None) -> List[str]:
+        """
+        Redact a list of texts, analyzing them as one batch.
+
+        Args:
+            texts (List[str]): The texts to redact.
+            redact_config (Dict[str, Any], optional): Entities and language model to use.
+
+        Returns:
+            List[str]: The redacted texts, in order.
+        """
+        entities, language = self._options(redact_config)
+        analyzer, batch_analyzer, anonymizer = self._engines()
+        if len(texts) == 1:
+            all_results = [analyzer.analyze(texts[0], language=language, entities=entities)]
+        else:
+            all_results = batch_analyzer.analyze_iterator(texts, language=language, entities=entities)
+
+        redacted = []
+        for text, results in zip(texts, all_results):
+            results = [result for result in results if result.entity_type in entities]
+            redacted.append(anonymizer.anonymize(text=text, analyzer_results=results).text if results else text)
+        return redacted
+
+
+class TextPreprocessor:
+    """
+    Text normalization pipeline compiled once from a ``process_config``.
+
+    Punctuation removal, whitespace collapsing and newline removal are fused
+    into one regex substitution, and camel-case splitting, digit removal and
+    lowercasing into one ``str.translate``. The output is identical to applying
+    the steps one after another.
+    """
+
+    def __init__(self, process_config: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the TextPreprocessor.
+
+        Args:
+            process_config (Dict[str, Any], optional): Step toggles; missing steps default to enabled.
+        """
+        self.config = {**DEFAULT_PROCESS_CONFIG, **(process_config or {})}
+        self._spacing = self._compile_spacing(self.config)
+        self._table = self._compile_table(self.config)
+
+    @staticmethod
+    def _compile_spacing(config: Dict[str, Any]):
+        punctuation = re.escape(string.punctuation) if config["remove_punctuation"] else ""
+        single = punctuation + ("\\n" if config["remove_newlines"] else "")
+        parts = []
+        # After punctuation becomes spaces, any run of two or more punctuation/whitespace
+        # characters collapses to one space; what is left is single punctuation or newlines.
+        if config["remove_extra_whitespace"]:
+            parts.append(f"[{punctuation}\\s]{{2,}}")
+        if single:
+            parts.append(f"[{single}]")
+        return re.compile("|".join(parts)) if parts else None
+
+    @staticmethod
+    def _compile_table(config: Dict[str, Any]) -> Dict[int, Optional[str]]:
+        # Text is ASCII by this point, so per-character mapping covers all three steps
+        table: Dict[int, Optional[str]] = {}
+        for char in string.ascii_uppercase:
+            mapped = char.lower() if config["lowercase"] else char
+            if config["split_camel_case"]:
+                mapped = " " + mapped
+            if mapped != char:
+                table[ord(char)] = mapped
+        if config["remove_digits"]:
+            for char in string.digits:
+                table[ord(char)] = None
+        return table
+
+    def process(self, text: Any) -> str:
+        """
+        Normalize a single text.
+
+        Args:
+            text: The text to normalize; dicts are serialized to JSON first.
+
+        Returns:
+            str: The normalized text.
+        """
+        if isinstance(text, dict):
+            text = json.dumps(text)
+        if not text:
+            return ""
+        text = text.encode('ascii', 'ignore').decode()
+        if self._spacing is not None:
+            text = self._spacing.sub(" ", text)
+        if self._table:
+            text = text.translate(self._table)
+        return text
+
+    def process_many(self, texts: Iterable[Any]) -> List[str]:
+        return [self.process(text) for text in texts]
+
+
+_preprocessors: Dict[Tuple, TextPreprocessor] = {}
+
+
+def get_preprocessor(process_config: Optional[Dict[str, Any]] = None) -> TextPreprocessor:
+    """
+    Get the compiled pipeline for a ``process_config``, building it on first use.
+
+    Args:
+        process_config (Dict[str, Any], optional): Step toggles.
+
+    Returns:
+        TextPreprocessor: The shared pipeline for this configuration.
+    """
+    key = tuple(sorted((process_config or {}).items()))
+    preprocessor = _preprocessors.get(key)
+    if preprocessor is None:
+        preprocessor = _preprocessors[key] = TextPreprocessor(process_config)
+    return preprocessor
+
+
+# Create a global instance of Redactor
+redactor = Redactor()
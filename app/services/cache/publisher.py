@@ -0,0 +1,211 @@
+import asyncio
+import json
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from app.logging_config import configure_logger
+from app.debug_log import log_debug
+
+
+class PipelinedPublisher:
+    """
+    Publishes Redis pub/sub messages in pipelined batches.
+
+    ``publish`` calls made within ``batch_window_ms`` of each other are sent in
+    one pipeline, so a burst of state updates costs one round trip instead of
+    one per message. A message identical to the one already waiting last on its
+    channel is sent once. ``publish_many`` sends a known fan-out (one message to
+    many channels, or many messages to one) right away, after whatever is already
+    waiting. Batches go out one at a time, so each channel sees its messages in
+    the order they were published.
+
+    Subscriber checks are optional and never cost a round trip of their own:
+    ``PUBLISH`` already returns the number of receivers, and that count is
+    cached per channel for ``subscriber_ttl`` seconds. With ``check_subscribers``
+    a message is dropped while its channel is known to have no subscribers.
+    """
+
+    def __init__(self, client_getter: Callable[[], Any], batch_window_ms: float = 2.0, max_batch_size: int = 256, subscriber_ttl: float = 1.0):
+        """
+        Initialize the PipelinedPublisher.
+
+        Args:
+            client_getter (Callable): Returns the current Redis client.
+            batch_window_ms (float): How long to wait for more messages before sending a batch.
+            max_batch_size (int): Largest number of messages sent in one pipeline.
+            subscriber_ttl (float): Seconds a channel's receiver count is trusted.
+        """
+        self.logger = configure_logger(f"{self.__class__.__module__}.{self.__class__.__name__}")
+        self._client_getter = client_getter
+        self.batch_window = batch_window_ms / 1000
+        self.max_batch_size = max_batch_size
+        self.subscriber_ttl = subscriber_ttl
+        # (channel, message, waiters) in publish order, waiting for the batch window
+        self._pending: List[Tuple[str, str, List[asyncio.Future]]] = []
+        # channel -> its latest entry in _pending, the only one a new message may coalesce with
+        self._last_pending: Dict[str, Tuple[str, str, List[asyncio.Future]]] = {}
+        self._send_lock = asyncio.Lock()
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._batch_tasks: Set[asyncio.Task] = set()
+        # channel -> (receivers, monotonic time observed)
+        self._receivers: Dict[str, Tuple[int, float]] = {}
+        self.stats = {
+            "requests": 0,
+            "published": 0,
+            "coalesced": 0,
+            "skipped_no_subscribers": 0,
+            "batches": 0,
+            "failures": 0,
+            "max_batch_size": 0,
+        }
+
+    async def publish(self, channel: str, message: Any, check_subscribers: bool = False) -> bool:
+        """
+        Publish a message, sharing a pipeline with other messages sent close together.
+
+        Args:
+            channel (str): The channel to publish to.
+            message (Any): The message; non-strings are serialized as JSON.
+            check_subscribers (bool): Drop the message if the channel recently had no subscribers.
+
+        Returns:
+            bool: True if the message was sent, False if it was dropped or sending failed.
+        """
+        self.stats["requests"] += 1
+        if check_subscribers and self.known_unsubscribed(channel):
+            self.stats["skipped_no_subscribers"] += 1
+            return False
+
+        future = self._enqueue(channel, self._serialize(message))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(self.batch_window, self._flush)
+        return await future
+
+    async def publish_many(self, items: Iterable[Tuple[str, Any]], check_subscribers: bool = False) -> int:
+        """
+        Publish several messages in one pipeline without waiting for a batch window.
+
+        Args:
+            items (Iterable[Tuple[str, Any]]): ``(channel, message)`` pairs, sent in order.
+            check_subscribers (bool): Drop messages for channels that recently had no subscribers.
+
+        Returns:
+            int: Number of messages sent.
+        """
+        futures = []
+        for channel, message in items:
+            self.stats["requests"] += 1
+            if check_subscribers and self.known_unsubscribed(channel):
+                self.stats["skipped_no_subscribers"] += 1
+                continue
+            futures.append(self._enqueue(channel, self._serialize(message)))
+        if not futures:
+            return 0
+        # Queued behind pending publishes so no channel sees its messages reordered
+        self._flush()
+        return sum(await asyncio.gather(*futures))
+
+    def known_unsubscribed(self, channel: str) -> bool:
+        """Whether the last publish to a channel, within ``subscriber_ttl``, reached no one."""
+        observed = self._receivers.get(channel)
+        if observed is None:
+            return False
+        receivers, at = observed
+        if time.monotonic() - at > self.subscriber_ttl:
+            del self._receivers[channel]
+            return False
+        return receivers == 0
+
+    async def subscriber_count(self, channel: str) -> int:
+        """
+        Get the number of subscribers of a channel, from the cache when fresh.
+
+        Args:
+            channel (str): The channel.
+
+        Returns:
+            int: Subscribers as of at most ``subscriber_ttl`` seconds ago.
+        """
+        observed = self._receivers.get(channel)
+        if observed is not None and time.monotonic() - observed[1] <= self.subscriber_ttl:
+            return observed[0]
+        counts = await self._client_getter().pubsub_numsub(channel)
+        receivers = int(counts[0][1]) if counts else 0
+        self._receivers[channel] = (receivers, time.monotonic())
+        return receivers
+
+    def get_stats(self) -> Dict[str, float]:
+        stats = dict(self.stats)
+        stats["pending"] = sum(len(waiters) for _, _, waiters in self._pending)
+        stats["avg_batch_size"] = stats["published"] / stats["batches"] if stats["batches"] else 0.0
+        stats["cached_channels"] = len(self._receivers)
+        return stats
+
+    @staticmethod
+    def _serialize(message: Any) -> str:
+        if isinstance(message, (str, bytes)):
+            return message
+        return json.dumps(message)
+
+    def _enqueue(self, channel: str, message: str) -> asyncio.Future:
+        """Queue a message, joining the channel's latest pending message if it is identical."""
+        future = asyncio.get_running_loop().create_future()
+        last = self._last_pending.get(channel)
+        if last is not None and last[1] == message:
+            last[2].append(future)
+            self.stats["coalesced"] += 1
+        else:
+            entry = (channel, message, [future])
+            self._pending.append(entry)
+            self._last_pending[channel] = entry
+        return future
+
+    def _flush(self):
+        """Move pending messages into pipelines of at most ``max_batch_size`` messages."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        items, self._pending = self._pending, []
+        self._last_pending = {}
+        for i in range(0, len(items), self.max_batch_size):
+            task = asyncio.get_running_loop().create_task(self._run_batch(items[i:i + self.max_batch_size]))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+
+    async def _run_batch(self, items: List[Tuple[str, str, List[asyncio.Future]]]):
+        # Batches start in flush order and the lock is FIFO, so they reach Redis in that order
+        async with self._send_lock:
+            results = await self._send([(channel, message) for channel, message, _ in items])
+        for _, _, waiters in items:
+            for future in waiters:
+                if not future.done():
+                    future.set_result(results is not None)
+
+    async def _send(self, batch: List[Tuple[str, str]]) -> Optional[List[int]]:
+        """Send ``(channel, message)`` pairs in one pipeline; returns receiver counts, or None on failure."""
+        try:
+            pipe = self._client_getter().pipeline(transaction=False)
+            for channel, message in batch:
+                pipe.publish(channel, message)
+            results = await pipe.execute()
+        except Exception as e:
+            self.stats["failures"] += 1
+            self.logger.error(f"Publishing batch of {len(batch)} message(s) failed: {str(e)}")
+            return None
+
+        now = time.monotonic()
+        for (channel, _), receivers in zip(batch, results):
+            self._receivers[channel] = (int(receivers or 0), now)
+        self.stats["batches"] += 1
+        self.stats["published"] += len(batch)
+        self.stats["max_batch_size"] = max(self.stats["max_batch_size"], len(batch))
+        log_debug(self.logger, "Published batch", size=len(batch), channels=lambda: sorted({channel for channel, _ in batch}), limit=500)
+        return results
+
+    async def drain(self):
+        """Send every publish still waiting for a batch window and wait for in-flight batches."""
+        if self._pending:
+            self._flush()
+        if self._batch_tasks:
+            await asyncio.gather(*self._batch_tasks, return_exceptions=True)
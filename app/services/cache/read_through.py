@@ -0,0 +1,222 @@
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+from app.logging_config import configure_logger
+
+
+class ReadThroughCache:
+    """
+    Two-tier read-through cache for database reads, invalidated by family.
+
+    Entries live under a family, such as ``user_context:{user_id}``, and a
+    field naming the read within it. Parsed values are kept in an in-process
+    LRU for ``local_ttl`` seconds. Behind it, reads marked ``shared`` are kept as
+    JSON in one Redis hash per family for ``redis_ttl`` seconds, shared by all
+    workers; other reads, such as decrypted user data, never leave the process.
+    Concurrent misses for the same entry share one load. ``invalidate`` drops a
+    whole family in both tiers and tells the other workers to drop their local
+    copies.
+
+    Cached values are shared between callers and must not be mutated.
+    """
+
+    def __init__(self, client_getter: Callable[[], Any], publish: Callable[[str, Any], Awaitable[Any]], local_ttl: float = 30.0, redis_ttl: int = 300, max_local_entries: int = 1024, prefix: str = "read_cache", channel: str = "read_cache:invalidate"):
+        """
+        Initialize the ReadThroughCache.
+
+        Args:
+            client_getter (Callable): Returns the shared async Redis client.
+            publish (Callable): Publishes a message to a channel, used for invalidations.
+            local_ttl (float): Seconds an entry is served from process memory.
+            redis_ttl (int): Seconds a family is kept in Redis.
+            max_local_entries (int): Entries kept in the in-process LRU.
+            prefix (str): Redis key prefix.
+            channel (str): Channel invalidations are broadcast on.
+        """
+        self.logger = configure_logger(f"{self.__class__.__module__}.{self.__class__.__name__}")
+        self._client_getter = client_getter
+        self._publish = publish
+        self.local_ttl = local_ttl
+        self.redis_ttl = redis_ttl
+        self.max_local_entries = max_local_entries
+        self.prefix = prefix
+        self.channel = channel
+        self._local: "OrderedDict[Tuple[str, str], Tuple[float, Any]]" = OrderedDict()
+        self._families: Dict[str, Set[str]] = {}
+        # Bumped on invalidation so loads that started earlier do not store stale values
+        self._generations: Dict[str, int] = {}
+        self._inflight: Dict[Tuple[str, str], asyncio.Future] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.stats = {"local_hits": 0, "redis_hits": 0, "loads": 0, "coalesced": 0, "invalidations": 0}
+
+    def _key(self, family: str) -> str:
+        return f"{self.prefix}:{family}"
+
+    async def get(self, family: str, field: str, loader: Callable[[], Awaitable[Any]], shared: bool = True) -> Any:
+        """
+        Get a cached value, loading and storing it on a miss.
+
+        ``None`` results are returned but not cached.
+
+        Args:
+            family (str): Invalidation group, e.g. ``user_context:{user_id}``.
+            field (str): The read within the family.
+            loader (Callable): Coroutine function producing the JSON-serializable value.
+            shared (bool): Also keep the value in Redis for other workers; pass False
+                for values that must not be copied out of the process.
+
+        Returns:
+            Any: The value.
+        """
+        self._loop = asyncio.get_running_loop()
+        entry_key = (family, field)
+        entry = self._local.get(entry_key)
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                self._local.move_to_end(entry_key)
+                self.stats["local_hits"] += 1
+                return entry[1]
+            self._forget(entry_key)
+
+        pending = self._inflight.get(entry_key)
+        if pending is None:
+            pending = self._inflight[entry_key] = asyncio.ensure_future(self._fetch(family, field, loader, self._generations.get(family, 0), shared))
+            pending.add_done_callback(lambda _: self._inflight.pop(entry_key, None))
+        else:
+            self.stats["coalesced"] += 1
+        return await asyncio.shield(pending)
+
+    async def _fetch(self, family: str, field: str, loader: Callable[[], Awaitable[Any]], generation: int, shared: bool) -> Any:
+        client = self._client_getter() if shared else None
+        stored = await client.hget(self._key(family), field) if client is not None else None
+        if stored is not None:
+            self.stats["redis_hits"] += 1
+            value = json.loads(stored)
+        else:
+            self.stats["loads"] += 1
+            value = await loader()
+            if value is None:
+                return None
+            if client is not None and self._generations.get(family, 0) == generation:
+                pipe = client.pipeline(transaction=False)
+                pipe.hset(self._key(family), field, json.dumps(value, default=str))
+                pipe.expire(self._key(family), self.redis_ttl)
+                await pipe.execute()
+        if self._generations.get(family, 0) == generation:
+            self._remember((family, field), value)
+        return value
+
+    def get_blocking(self, family: str, field: str, loader: Callable[[], Awaitable[Any]], shared: bool = True, timeout: float = 60.0) -> Any:
+        """
+        ``get`` for synchronous code running in a worker thread, such as a tool's ``run``.
+
+        Raises:
+            RuntimeError: If called on the event loop's own thread, or before the cache was used on a loop.
+        """
+        return self._run_threadsafe(self.get(family, field, loader, shared), timeout)
+
+    async def invalidate(self, *families: str):
+        """
+        Drop families from both tiers in every worker.
+
+        Args:
+            *families (str): The families to drop.
+        """
+        families = [family for family in families if family]
+        if not families:
+            return
+        self._loop = asyncio.get_running_loop()
+        self.drop_local(*families)
+        client = self._client_getter()
+        if client is not None:
+            await client.delete(*(self._key(family) for family in families))
+            await self._publish(self.channel, {"families": families})
+        self.stats["invalidations"] += len(families)
+
+    async def invalidate_prefix(self, *prefixes: str):
+        """
+        Drop every family starting with one of ``prefixes`` from both tiers in every worker.
+
+        Used when a write cannot be tied to one owner, e.g. ``user_data:`` for all users.
+        """
+        prefixes = [prefix for prefix in prefixes if prefix]
+        if not prefixes:
+            return
+        self._loop = asyncio.get_running_loop()
+        self.drop_local_prefix(*prefixes)
+        client = self._client_getter()
+        if client is not None:
+            for prefix in prefixes:
+                keys = [key async for key in client.scan_iter(match=f"{self._key(prefix)}*", count=500)]
+                if keys:
+                    await client.delete(*keys)
+            await self._publish(self.channel, {"prefixes": prefixes})
+        self.stats["invalidations"] += len(prefixes)
+
+    def invalidate_blocking(self, *families: str, timeout: float = 60.0):
+        """``invalidate`` for synchronous code running in a worker thread."""
+        self._run_threadsafe(self.invalidate(*families), timeout)
+
+    def drop_local(self, *families: str):
+        """Drop families from this process only, e.g. when another worker invalidated them."""
+        loading = {family for family, _ in self._inflight}
+        for family in families:
+            if family in loading:
+                self._generations[family] = self._generations.get(family, 0) + 1
+            for field in self._families.pop(family, ()):
+                self._local.pop((family, field), None)
+
+    def drop_local_prefix(self, *prefixes: str):
+        """Drop every family starting with one of ``prefixes`` from this process only."""
+        known = set(self._families) | {family for family, _ in self._inflight}
+        self.drop_local(*(family for family in known if family.startswith(tuple(prefixes))))
+
+    async def listen(self, queue: asyncio.Queue):
+        """Apply invalidations broadcast by other workers; runs until cancelled."""
+        self._loop = asyncio.get_running_loop()
+        while True:
+            message = await queue.get()
+            try:
+                if isinstance(message, (str, bytes)):
+                    message = json.loads(message)
+                self.drop_local(*message.get("families", []))
+                if message.get("prefixes"):
+                    self.drop_local_prefix(*message["prefixes"])
+            except Exception as e:
+                self.logger.error(f"Invalid cache invalidation message: {str(e)}")
+
+    def _run_threadsafe(self, coro, timeout: float):
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            coro.close()
+            raise RuntimeError("ReadThroughCache has not been used on an event loop yet")
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            coro.close()
+            raise RuntimeError("Use the async methods of ReadThroughCache on the event loop")
+        return asyncio.run_coroutine_threadsafe(coro, loop).result(timeout)
+
+    def _remember(self, entry_key: Tuple[str, str], value: Any):
+        self._local[entry_key] = (time.monotonic() + self.local_ttl, value)
+        self._local.move_to_end(entry_key)
+        self._families.setdefault(entry_key[0], set()).add(entry_key[1])
+        while len(self._local) > self.max_local_entries:
+            self._forget(next(iter(self._local)))
+
+    def _forget(self, entry_key: Tuple[str, str]):
+        self._local.pop(entry_key, None)
+        fields = self._families.get(entry_key[0])
+        if fields is not None:
+            fields.discard(entry_key[1])
+            if not fields:
+                del self._families[entry_key[0]]
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self.stats)
+        stats["local_entries"] = len(self._local)
+        return stats
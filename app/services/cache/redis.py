@@ -1,7 +1,6 @@
 import base64
+from collections import deque
 from datetime import datetime
-from functools import lru_cache
-import gc
 from logging import Logger
 import pickle
 import struct
@@ -15,20 +14,27 @@ from redisvl.query import VectorQuery
 from redisvl.query.filter import FilterExpression
 from redisvl.utils.vectorize import HFTextVectorizer
 from redis.commands.search.field import TextField, VectorField, TagField
-from redisvl.schema import IndexSchema
 from redis.commands.search.indexDefinition import IndexDefinition, IndexType
 import asyncio
 import threading
 import json
-import re
-import string
-import os
 import numpy as np
 from tqdm import tqdm
 from app.interfaces.service import IService
 from app.logging_config import configure_logger
+from app.debug_log import log_debug, log_sampled
+from app.services.cache.index_registry import index_registry, is_missing_index_error
+from app.services.cache.embeddings import EmbeddingService
+from app.services.cache.embedding_cache import EmbeddingCache
+from app.services.cache.context_snapshots import ContextSnapshotStore
+from app.services.cache.publisher import PipelinedPublisher
+from app.services.cache.barrier import FanInBarrier
+from app.services.cache.read_through import ReadThroughCache
+from app.services.cache.ingestion import IngestionPipeline
+from app.services.cache.instrumented_redis import InstrumentedRedis
+from app.services.cache.preprocessing import get_preprocessor, redactor
 from dependency_injector.wiring import inject, Provide
-from redis.asyncio import Redis, ConnectionPool
+from redis.asyncio import ConnectionPool
 from redis.exceptions import ConnectionError, TimeoutError
 
 def get_container():
@@ -41,6 +47,7 @@ class RedisService(IService):
     """
     _instance = None
     _model = None
+    MODEL_NAME = 'sentence-transformers/all-MiniLM-L6-v2'
     
     @classmethod
     def get_model(cls):
@@ -51,7 +58,7 @@ class RedisService(IService):
             HFTextVectorizer: The text vectorization model.
         """
         if cls._model is None:
-            cls._model = HFTextVectorizer('sentence-transformers/all-MiniLM-L6-v2')
+            cls._model = HFTextVectorizer(cls.MODEL_NAME)
         return cls._model
     
     @inject
@@ -87,6 +94,52 @@ class RedisService(IService):
         self.model = self.get_model()
         self.pool = None
         self.connection_lock = asyncio.Lock()
+        self.subscriber_queue_size = config.get('subscriber_queue_size', 1000)
+        self.overflow_policy = config.get('overflow_policy', 'block')
+        self._has_subscriptions = asyncio.Event()
+        self._patterns = set()  # registry names that were psubscribed
+        self.index_registry = index_registry
+        self.embeddings = EmbeddingService(
+            self.get_model,
+            batch_window_ms=config.get('embedding_batch_window_ms', 5.0),
+            max_batch_size=config.get('embedding_max_batch_size', 64),
+            workers=config.get('embedding_workers', 1),
+            cache=EmbeddingCache(
+                self.MODEL_NAME,
+                lambda: self.client,
+                max_local_entries=config.get('embedding_cache_size', 10000),
+                ttl_seconds=config.get('embedding_cache_ttl', 7 * 24 * 3600)
+            )
+        )
+        self.context_snapshots = ContextSnapshotStore(
+            lambda: self.client,
+            ttl_seconds=config.get('context_snapshot_ttl', 24 * 3600),
+            max_local_entries=config.get('context_snapshot_cache_size', 32),
+            inline_max_bytes=config.get('context_inline_max_bytes', 16 * 1024)
+        )
+        self.publisher = PipelinedPublisher(
+            lambda: self.client,
+            batch_window_ms=config.get('publish_batch_window_ms', 2.0),
+            max_batch_size=config.get('publish_max_batch_size', 256),
+            subscriber_ttl=config.get('publish_subscriber_ttl', 1.0)
+        )
+        self.barriers = FanInBarrier(
+            lambda: self.client,
+            ttl_seconds=config.get('barrier_ttl', 24 * 3600)
+        )
+        self.read_cache = ReadThroughCache(
+            lambda: self.client,
+            self.publish,
+            local_ttl=config.get('read_cache_local_ttl', 30.0),
+            redis_ttl=config.get('read_cache_ttl', 300),
+            max_local_entries=config.get('read_cache_size', 1024)
+        )
+        self.ingestion = IngestionPipeline(
+            lambda: self.client,
+            self._get_embeddings,
+            chunk_size=config.get('ingest_chunk_size', 256),
+            max_in_flight=config.get('ingest_max_in_flight', 2)
+        )
 
     async def get_connection(self):
         """
@@ -114,7 +167,7 @@ class RedisService(IService):
         for attempt in range(max_retries):
             try:
                 self.pool = ConnectionPool.from_url(self.redis_url)
-                self.client = Redis(connection_pool=self.pool, decode_responses=True)
+                self.client = InstrumentedRedis(connection_pool=self.pool, decode_responses=True)
                 await self.client.ping()
                 self.pubsub = self.client.pubsub()
                 self.logger.info("Successfully created Redis connection pool")
@@ -150,75 +203,64 @@ class RedisService(IService):
             self.logger.error(traceback.format_exc())
             raise
         
-    async def subscribe(self, channel, queue=None, callback: Optional[Callable[[dict], bool]] = None, filter_func: Optional[Callable[[dict], bool]] = None, session_id: Optional[str] = None):
+    async def subscribe(self, channel, queue=None, callback: Optional[Callable[[dict], bool]] = None, filter_func: Optional[Callable[[dict], bool]] = None, session_id: Optional[str] = None, overflow_policy: Optional[str] = None):
         """
         Subscribe to a Redis channel.
 
         Args:
             channel (str): The channel to subscribe to.
-            queue (asyncio.Queue, optional): Queue to store messages.
+            queue (asyncio.Queue, optional): Queue to store messages. Defaults to a
+                queue bounded by ``subscriber_queue_size``.
             callback (Callable, optional): Callback function for messages.
             filter_func (Callable, optional): Function to filter messages.
             session_id (str, optional): Session ID for tracking subscriptions.
+            overflow_policy (str, optional): "block" to keep messages for this subscriber
+                until its queue has room, or "drop" to discard them while it is full.
+                Defaults to the service setting.
 
         Returns:
             asyncio.Queue: The queue for the subscription.
         """
         await self.ensure_connection()
         if queue is None:
-            queue = asyncio.Queue()
+            queue = asyncio.Queue(maxsize=self.subscriber_queue_size)
             self.logger.debug(f"Created new queue for channel {channel}")
         
         self.logger.info(f"Subscribing to channel: {channel}")
             
-        self.logger.debug(f"""
-        Subscribing to channel:
-        - Channel: {channel}
-        - Queue ID: {id(queue)}
-        - Session ID: {session_id}
-        - Has callback: {callback is not None}
-        - Has filter: {filter_func is not None}
-        - Current subscriptions: {len(self.subscriptions.get(channel, []))}
-        """)
+        log_debug(
+            self.logger, "Subscribing to channel",
+            channel=channel, queue_id=id(queue), session_id=session_id,
+            has_callback=callback is not None, has_filter=filter_func is not None,
+            current_subscriptions=len(self.subscriptions.get(channel, []))
+        )
         
         if channel not in self.subscriptions:
             self.subscriptions[channel] = []
             try:
-                # First verify channel doesn't already exist
-                channels = await self.client.pubsub_channels()
-                if channel.encode() not in channels:
-                    # Then subscribe
-                    await self.pubsub.subscribe(channel)
-                    self.logger.info(f"""
-                    New channel subscription created:
-                    - Channel: {channel}
-                    - Session ID: {session_id}
-                    - Total channels: {len(self.subscriptions)}
-                    """)
+                # The local registry is the source of truth; no round trip to ask the server
+                await self.pubsub.subscribe(channel)
+                self.logger.info(f"""
+                New channel subscription created:
+                - Channel: {channel}
+                - Session ID: {session_id}
+                - Total channels: {len(self.subscriptions)}
+                """)
             except Exception as e:
+                del self.subscriptions[channel]
                 self.logger.error(f"Error subscribing to channel {channel}: {str(e)}")
                 self.logger.error(traceback.format_exc())
                 raise
             
-        subscription_data = {
-            'queue': queue,
-            'callback': callback,
-            'filter_func': filter_func,
-            'session_id': session_id,
-            'created_at': datetime.now().isoformat(),
-            'task': asyncio.current_task(),
-            'last_message_time': None,
-            'message_count': 0
-        }
+        subscription_data = self._new_subscription(queue, callback, filter_func, session_id, overflow_policy)
         self.subscriptions[channel].append(subscription_data)
-        self.logger.debug(f"""
-        Added subscription:
-        - Channel: {channel}
-        - Queue ID: {id(queue)}
-        - Total subscriptions for channel: {len(self.subscriptions[channel])}
-        - Callback type: {type(callback).__name__ if callback else 'None'}
-        - Callback details: {getattr(callback, '__qualname__', str(callback)) if callback else 'None'}
-        """)
+        self._has_subscriptions.set()
+        log_debug(
+            self.logger, "Added subscription",
+            channel=channel, queue_id=id(queue),
+            total_subscriptions=len(self.subscriptions[channel]),
+            callback=lambda: getattr(callback, '__qualname__', str(callback)) if callback else None
+        )
         return queue
 
     async def unsubscribe(self, channel, queue):
@@ -231,7 +273,8 @@ class RedisService(IService):
         """
         await self.ensure_connection()
         if channel in self.subscriptions:
-            self.subscriptions[channel] = [(q, c, f) for q, c, f in self.subscriptions[channel] if q != queue]
+            self._stop_delivery([sub for sub in self.subscriptions[channel] if sub['queue'] is queue])
+            self.subscriptions[channel] = [sub for sub in self.subscriptions[channel] if sub['queue'] is not queue]
             self.logger.debug(f"Removed subscription for channel {channel}")
             if not self.subscriptions[channel]:
                 del self.subscriptions[channel]
@@ -239,22 +282,40 @@ class RedisService(IService):
                 self.logger.info(f"Unsubscribed from channel: {channel}")
 
 
-    async def publish(self, channel: str, message: Any) -> bool:
+    async def publish(self, channel: str, message: Any, check_subscribers: bool = False) -> bool:
         """
         Publish a message to a Redis channel.
 
+        Messages published within a few milliseconds of each other share one
+        pipelined round trip; see ``PipelinedPublisher``.
+
         Args:
             channel (str): The channel to publish to.
             message (Any): The message to publish.
+            check_subscribers (bool): Skip the message if the channel recently had no subscribers.
             
         Returns:
             bool: True if published successfully, False otherwise
         """
-        await self.ensure_connection()
-        
-        from app.utilities.redis_publisher import RedisPublisher
-        publisher = RedisPublisher()
-        return await publisher.publish(self, channel, message)
+        # A PING per message would cost as much as the batching saves; the pool reconnects dropped connections itself
+        if self.client is None:
+            await self.ensure_connection()
+        return await self.publisher.publish(channel, message, check_subscribers=check_subscribers)
+
+    async def publish_many(self, items: List[tuple], check_subscribers: bool = False) -> int:
+        """
+        Publish several messages in a single pipelined round trip.
+
+        Args:
+            items (List[tuple]): ``(channel, message)`` pairs, sent in order.
+            check_subscribers (bool): Skip messages for channels that recently had no subscribers.
+
+        Returns:
+            int: Number of messages sent.
+        """
+        if self.client is None:
+            await self.ensure_connection()
+        return await self.publisher.publish_many(items, check_subscribers=check_subscribers)
 
     async def async_search_index(self, query_data: str, vector_field: str, index_name: str, top_k: int, return_fields: Optional[List[str]] = None, filter_expression: Optional[FilterExpression] = None):
         """
@@ -277,18 +338,9 @@ class RedisService(IService):
         for attempt in range(max_retries):
             try:
                 await self.ensure_connection()
+                index = await self.get_index(index_name)
                 
-                index_schema_file = os.path.join(os.path.dirname(os.path.realpath(__file__)), "schemas", index_name + ".yaml")
-                if not os.path.exists(index_schema_file):
-                    raise FileNotFoundError(f"Index schema file {index_schema_file} not found.")
-                
-                index = None
-                if not await self.index_exists(index_name):
-                    index = await self.create_index(index_name)
-                else:
-                    index = await self.get_index(index_name)
-                
-                query_embedding = self.model.embed(self.preprocess_text(query_data))
+                query_embedding = await self.embeddings.embed(self.preprocess_text(query_data))
                 
                 query = VectorQuery(
                     vector=query_embedding,
@@ -299,11 +351,18 @@ class RedisService(IService):
                 )
                 items = await index.query(query)
                 sorted_items = sorted(items, key=lambda x: x['vector_distance'], reverse=True)
-                self.logger.debug(f"Results: {sorted_items}")
+                log_debug(self.logger, "Vector query results", results=sorted_items)
                 return sorted_items
+            except redis.exceptions.ResponseError as e:
+                if is_missing_index_error(e) and attempt < max_retries - 1:
+                    self.logger.warning(f"Index {index_name} missing on server; recreating")
+                    self.index_registry.invalidate(index_name)
+                else:
+                    raise
             except ConnectionError as e:
                 if attempt < max_retries - 1:
                     self.logger.warning(f"Search attempt {attempt + 1} failed. Retrying in {retry_delay} seconds...")
+                    self.index_registry.invalidate(index_name)
                     await asyncio.sleep(retry_delay)
                     retry_delay *= 2  # Exponential backoff
                 else:
@@ -312,7 +371,10 @@ class RedisService(IService):
 
     async def get_index(self, index_name: str) -> AsyncSearchIndex:
         """
-        Get a Redis search index.
+        Get a Redis search index, creating it on the server if it does not exist.
+
+        Handles come from the process-wide index registry, so the schema is parsed
+        once and the index shares this service's connection pool.
 
         Args:
             index_name (str): The name of the index.
@@ -320,15 +382,9 @@ class RedisService(IService):
         Returns:
             AsyncSearchIndex: The Redis search index.
         """
-        await self.ensure_connection()
-        index_schema_file = os.path.join(os.path.dirname(os.path.realpath(__file__)), "schemas", index_name + ".yaml")
-        if not os.path.exists(index_schema_file):
-            raise FileNotFoundError(f"Index schema file {index_schema_file} not found.")
-        
-        index_schema = IndexSchema.from_yaml(index_schema_file)
-        index = AsyncSearchIndex(schema=index_schema)
-        index = await index.connect(self.redis_url)
-        return index
+        if self.client is None:
+            await self.ensure_connection()
+        return await self.index_registry.get(index_name, self.client)
 
     async def index_exists(self, index_name: str) -> bool:
         """
@@ -362,66 +418,54 @@ class RedisService(IService):
         if not hasattr(self, '_processor_task') or self._processor_task.done():
             self._processor_task = asyncio.create_task(self._process_messages())
             self.logger.info("Message processor task started")
+
+        # Other workers broadcast read cache invalidations; drop our local copies when they do
+        if not hasattr(self, '_read_cache_task') or self._read_cache_task.done():
+            self._read_cache_task = asyncio.create_task(self.read_cache.listen(await self.subscribe(self.read_cache.channel)))
             
         self.logger.info("RedisService started successfully")
 
+    def _new_subscription(self, queue: asyncio.Queue, callback: Optional[Callable], filter_func: Optional[Callable], session_id: Optional[str] = None, overflow_policy: Optional[str] = None) -> dict:
+        """
+        Build the registry entry for a single subscriber.
+        """
+        return {
+            'queue': queue,
+            'callback': callback,
+            'filter_func': filter_func,
+            'session_id': session_id,
+            'overflow_policy': overflow_policy or self.overflow_policy,
+            'created_at': datetime.now().isoformat(),
+            'task': asyncio.current_task(),
+            'last_message_time': None,
+            'message_count': 0,
+            'dropped_count': 0,
+            'backlog': deque(),
+            'delivery': None
+        }
+
     async def _process_messages(self):
         """
-        Process incoming Redis messages.
-        This method runs in a separate task and continuously processes messages from subscribed channels.
+        Dispatch incoming Redis messages to local subscribers.
+
+        Blocks on pubsub.listen() so messages are routed the moment they arrive.
+        listen() returns once nothing is subscribed, so the loop then waits for
+        the next subscribe() or subscribe_pattern().
         """
-        last_channels = set()  # Track last known channels
-        
         try:
             while True:
+                await self._has_subscriptions.wait()
                 try:
-                    # Check subscription status only when channels change
-                    if self.client:
-                        current_channels = set(await self.client.pubsub_channels())
-                        if current_channels != last_channels:
-                            self.logger.debug(f"Currently subscribed to channels: {current_channels}")
-                            last_channels = current_channels
-                    
-                    # Get message from pubsub connection with timeout
-                    message = await self.pubsub.get_message(ignore_subscribe_messages=True, timeout=0.1)
-                    
-                    if message is None:
-                        await asyncio.sleep(0.01)  # Prevent tight loop
-                        continue
-                    
-                    self.logger.debug(f"Received message: {message}")
-                    
-                    if not isinstance(message, dict) or 'channel' not in message:
-                        self.logger.warning(f"Invalid message format: {message}")
-                        continue
-                    
-                    channel_bytes = message.get('channel')
-                    if not channel_bytes:
-                        continue
-                    
-                    channel = channel_bytes.decode('utf-8') if isinstance(channel_bytes, bytes) else str(channel_bytes)
-                    if channel not in self.subscriptions:
-                        self.logger.debug(f"Message received for unsubscribed channel: {channel}")
-                        continue
-                    
-                    data = message.get('data')
-                    try:
-                        if isinstance(data, bytes):
-                            data = json.loads(data.decode('utf-8'))
-                        
-                        # Process message for all subscribers
-                        for subscription in self.subscriptions[channel]:
-                            self.logger.debug(f"Processing message for subscription on channel {channel}")
-                            await self._handle_subscription(subscription, channel, data)
-                            
-                    except json.JSONDecodeError:
-                        self.logger.warning(f"Failed to decode message data for channel {channel}")
-                        continue
+                    async for message in self.pubsub.listen():
+                        await self._dispatch(message)
+                    if not self.pubsub.subscribed:
+                        self._has_subscriptions.clear()
                     
                 except redis.exceptions.ConnectionError:
                     self.logger.error("Redis connection lost, attempting to reconnect...")
-                    await self._ensure_connection()
                     await asyncio.sleep(1)
+                    await self.ensure_connection()
+                    await self._resubscribe()
                     
                 except Exception as e:
                     self.logger.error(f"Error processing Redis message: {str(e)}")
@@ -431,38 +475,101 @@ class RedisService(IService):
         except asyncio.CancelledError:
             self.logger.info("Message processor cancelled")
             raise
-    
-    async def _handle_subscription(self, subscription: dict, channel: str, data: Any):
+
+    async def _resubscribe(self):
         """
-        Handle a single subscription
+        Re-issue subscriptions from the local registry on the current pubsub connection.
         """
-        await self._route_message(channel, subscription['queue'], subscription['callback'], data)
+        for name in list(self.subscriptions):
+            if name in self._patterns:
+                active = self.pubsub.patterns
+                if name not in active and name.encode() not in active:
+                    await self.pubsub.psubscribe(name)
+            else:
+                active = self.pubsub.channels
+                if name not in active and name.encode() not in active:
+                    await self.pubsub.subscribe(name)
+
+    async def _dispatch(self, message: dict):
+        """
+        Fan a pub/sub message out to every subscriber of its channel or pattern.
+
+        Messages are put on subscriber queues without waiting. A subscriber whose
+        queue is full either drops the message or, with the "block" policy, has it
+        kept in its own backlog and delivered in order by its own task, so one
+        slow subscriber never holds up the others or the pub/sub connection.
+        """
+        message_type = message.get('type')
+        if message_type == 'pmessage':
+            name = message.get('pattern')
+        elif message_type == 'message':
+            name = message.get('channel')
+        else:
+            return
+        
+        if isinstance(name, bytes):
+            name = name.decode('utf-8')
+        subscriptions = self.subscriptions.get(name)
+        if not subscriptions:
+            return
+        
+        data = message.get('data')
+        if isinstance(data, bytes):
+            try:
+                data = json.loads(data.decode('utf-8'))
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                self.logger.warning(f"Failed to decode message data for channel {name}")
+                return
+        
+        backlogged = 0
+        for subscription in list(subscriptions):
+            item = (subscription['callback'], data) if subscription['callback'] else data
+            if subscription['backlog']:
+                # Queue behind the messages already waiting so order is kept
+                subscription['backlog'].append(item)
+                backlogged += 1
+                continue
+            try:
+                subscription['queue'].put_nowait(item)
+                self._mark_delivered(subscription)
+            except asyncio.QueueFull:
+                if subscription['overflow_policy'] == 'drop':
+                    subscription['dropped_count'] += 1
+                    if subscription['dropped_count'] == 1 or subscription['dropped_count'] % 100 == 0:
+                        self.logger.warning(f"Subscriber queue full on {name}; dropped {subscription['dropped_count']} message(s)")
+                else:
+                    subscription['backlog'].append(item)
+                    subscription['delivery'] = asyncio.create_task(self._route_message(name, subscription))
+                    backlogged += 1
+        log_sampled(self.logger, name, "Dispatched message", channel=name, subscribers=len(subscriptions), backlogged=backlogged)
+
+    def _mark_delivered(self, subscription: dict):
+        subscription['message_count'] += 1
+        subscription['last_message_time'] = time.time()
 
-    async def _route_message(self, channel: str, queue: asyncio.Queue, callback: Optional[Callable], data: Any):
+    async def _route_message(self, channel: str, subscription: dict):
         """
-        Route a single message to its queue
+        Drain a subscriber's backlog into its full queue, waiting for room
         """
+        backlog = subscription['backlog']
         try:
-            if callback:
-                await queue.put((callback, data))
-            else:
-                await queue.put(data)
-                
-            self.logger.debug(f"""
-            Routed message:
-            - Channel: {channel}
-            - Queue ID: {id(queue)}
-            - Queue size: {queue.qsize()}
-            - Has callback: {callback is not None}
-            """)
+            while backlog:
+                await subscription['queue'].put(backlog[0])
+                backlog.popleft()
+                self._mark_delivered(subscription)
+        except asyncio.CancelledError:
+            raise
         except Exception as e:
-            self.logger.error(f"""
-            Error routing message:
-            - Channel: {channel}
-            - Queue ID: {id(queue)}
-            - Error: {str(e)}
-            - Traceback: {traceback.format_exc()}
-            """)
+            backlog.clear()
+            self.logger.error(f"Error routing message on channel {channel}: {str(e)}")
+
+    @staticmethod
+    def _stop_delivery(subscriptions: List[dict]):
+        """Cancel the backlog delivery of removed subscribers."""
+        for subscription in subscriptions:
+            subscription['backlog'].clear()
+            if subscription['delivery'] is not None and not subscription['delivery'].done():
+                subscription['delivery'].cancel()
 
     async def shutdown(self):
         """
@@ -477,6 +584,11 @@ class RedisService(IService):
                 await self._processor_task
             except asyncio.CancelledError:
                 pass
+
+        if hasattr(self, '_read_cache_task') and not self._read_cache_task.done():
+            self._read_cache_task.cancel()
+
+        await self.publisher.drain()
         
         # Clean up connections
         if self.pool:
@@ -485,10 +597,11 @@ class RedisService(IService):
         self.pubsub = None
         self.pool = None
         self.initialized = False
+        self.embeddings.shutdown()
         self.model = None
         self.logger.info("RedisService shut down successfully")
 
-    async def subscribe_pattern(self, pattern: str, queue=None, callback: Optional[Callable[[dict], bool]] = None, filter_func: Optional[Callable[[dict], bool]] = None):
+    async def subscribe_pattern(self, pattern: str, queue=None, callback: Optional[Callable[[dict], bool]] = None, filter_func: Optional[Callable[[dict], bool]] = None, overflow_policy: Optional[str] = None):
         """
         Subscribe to a Redis channel pattern.
 
@@ -497,12 +610,13 @@ class RedisService(IService):
             queue (asyncio.Queue, optional): Queue to store messages.
             callback (Callable, optional): Callback function for messages.
             filter_func (Callable, optional): Function to filter messages.
+            overflow_policy (str, optional): "block" or "drop" when the queue is full.
 
         Returns:
             asyncio.Queue: The queue for the subscription.
         """
         if queue is None:
-            queue = asyncio.Queue()
+            queue = asyncio.Queue(maxsize=self.subscriber_queue_size)
         
         # Batch subscriptions
         if pattern not in self.subscriptions:
@@ -513,33 +627,36 @@ class RedisService(IService):
             
             # Subscribe to pattern
             await self.pubsub.psubscribe(pattern)
+            self._patterns.add(pattern)
             
             # Log subscription with instance ID
-            self.logger.debug(f"""
-            New pattern subscription:
-            - Pattern: {pattern}
-            - Result key: {result_key}
-            - Instance: {self.instance_id}
-            """)
+            log_debug(self.logger, "New pattern subscription", pattern=pattern, result_key=result_key, instance=self.instance_id)
         
-        self.subscriptions[pattern].append((queue, callback, filter_func))
+        self.subscriptions[pattern].append(self._new_subscription(queue, callback, filter_func, overflow_policy=overflow_policy))
+        self._has_subscriptions.set()
         
         return queue
 
-    async def unsubscribe_pattern(self, pattern: str, queue):
+    async def unsubscribe_pattern(self, pattern: str, queue=None):
         """
         Unsubscribe from a Redis channel pattern.
 
         Args:
             pattern (str): The channel pattern to unsubscribe from.
-            queue (asyncio.Queue): The queue associated with the subscription.
+            queue (asyncio.Queue, optional): The queue associated with the subscription.
+                All subscribers of the pattern are removed when omitted.
         """
         try:
             if pattern in self.subscriptions:
-                self.subscriptions[pattern] = [(q, f) for q, f in self.subscriptions[pattern] if q != queue]
+                self._stop_delivery([sub for sub in self.subscriptions[pattern] if queue is None or sub['queue'] is queue])
+                self.subscriptions[pattern] = [
+                    sub for sub in self.subscriptions[pattern]
+                    if queue is not None and sub['queue'] is not queue
+                ]
                 self.logger.debug(f"Removed subscription for pattern {pattern}")
                 if not self.subscriptions[pattern]:
                     del self.subscriptions[pattern]
+                    self._patterns.discard(pattern)
                     await self.pubsub.punsubscribe(pattern)
                     self.logger.info(f"Unsubscribed from pattern: {pattern}")
         except Exception as e:
@@ -560,67 +677,56 @@ class RedisService(IService):
         Returns:
             str: The preprocessed text.
         """
+        return self.preprocess_texts([text], process_config, redact_config, func, **kwargs)[0]
+
+    def preprocess_texts(self, texts: List[str], process_config: Optional[Dict[str, Any]] = None, redact_config: Optional[Dict[str, Any]] = None, func: Optional[Callable[[str], str]] = None, **kwargs) -> List[str]:
+        """
+        Preprocess a batch of texts for vectorization.
+
+        The pipeline for ``process_config`` is compiled once and reused, and
+        redaction analyzes the whole batch with the shared Presidio engines.
+
+        Args:
+            texts (List[str]): The texts to preprocess.
+            process_config (Dict[str, Any], optional): Configuration for text processing.
+            redact_config (Dict[str, Any], optional): Configuration for text redaction.
+            func (Callable, optional): Custom preprocessing function.
+            **kwargs: Additional keyword arguments for custom processing.
+
+        Returns:
+            List[str]: The preprocessed texts, in order.
+        """
         try:
+            texts = [json.dumps(text) if isinstance(text, dict) else text for text in texts]
             if redact_config is not None:
-                from presidio_analyzer import AnalyzerEngine, RecognizerResult
-                analyzer = AnalyzerEngine()
-                
-                from presidio_anonymizer import AnonymizerEngine
-                anonymizer = AnonymizerEngine()
-            
-                redact_config = redact_config or {
-                    "config": {
-                        "entities": ["PERSON", "PHONE_NUMBER", "EMAIL_ADDRESS"]
-                    },
-                    "analyze": True,
-                    "model": "en"
-                }
-            
-                config = redact_config.get('config', {})
-                config['analyze'] = redact_config.get('analyze', True)
-                config['model'] = redact_config.get('model', 'en')
-                analyzer_results = analyzer.analyze(text, language=config['model'])
-                
-                for result in analyzer_results:
-                    if isinstance(result, RecognizerResult) and result.entity_type in config['entities']:
-                        text = anonymizer.anonymize(text, [result]).text
-            
-            if isinstance(text, dict):
-                text = json.dumps(text)
-            
-            if not text:
-                return ""
-            
-            process_config = process_config or {}
-            text = text.encode('ascii', 'ignore').decode()
-            
-            if process_config.get('remove_punctuation', True):
-                text = re.sub('[%s]' % re.escape(string.punctuation), ' ', text)
-            if process_config.get('remove_extra_whitespace', True):
-                text = re.sub(r'\s{2,}', " ", text)
-            if process_config.get('remove_newlines', True):
-                text = text.replace("\n", " ")
-            if process_config.get('split_camel_case', True):
-                text = " ".join(re.split('(?=[A-Z])', text))
-            if process_config.get('remove_digits', True):
-                text = re.sub(r'\d+', '', text)
-            if process_config.get('lowercase', True):
-                text = text.lower()
-            if func:
-                text = func(text)
-            for key, value in kwargs.items():
-                if callable(value):
-                    text = value(text)
+                present = [i for i, text in enumerate(texts) if text]
+                if present:
+                    redacted = redactor.redact_many([texts[i] for i in present], redact_config)
+                    for i, text in zip(present, redacted):
+                        texts[i] = text
+
+            processed = get_preprocessor(process_config).process_many(texts)
+            hooks = ([func] if func else []) + [value for value in kwargs.values() if callable(value)]
+            results = []
+            for raw, text in zip(texts, processed):
+                if not raw:
+                    results.append("")
+                    continue
+                for hook in hooks:
+                    text = hook(text)
+                results.append(text.strip())
+            return results
         except Exception as e:
             self.logger.error(f"Error preprocessing text: {str(e)} with traceback: {traceback.format_exc()}")
             raise
-        
-        return text.strip()
 
     def generate_embeddings(self, record: dict, fields: List[str], embedding_config: Optional[Dict[str, Any]] = None, key: Optional[str] = None) -> Dict[str, np.ndarray]:
         """
         Generate embeddings for specified fields in a record.
 
+        Runs the model on the calling thread; use ``async_generate_embeddings``
+        from coroutines.
+
         Args:
             record (dict): The record containing the fields to embed.
             fields (List[str]): The fields to generate embeddings for.
@@ -630,7 +736,29 @@ class RedisService(IService):
         Returns:
             Dict[str, np.ndarray]: A dictionary of field names to their embeddings.
         """
-        embeddings = {}
+        all_texts = self._embedding_texts(record, fields, embedding_config, key)
+        return self._map_embeddings(fields, self.embeddings.embed_many_sync(all_texts))
+
+    async def async_generate_embeddings(self, record: dict, fields: List[str], embedding_config: Optional[Dict[str, Any]] = None, key: Optional[str] = None) -> Dict[str, np.ndarray]:
+        """
+        Generate embeddings for specified fields in a record without blocking the event loop.
+
+        Args:
+            record (dict): The record containing the fields to embed.
+            fields (List[str]): The fields to generate embeddings for.
+            embedding_config (Dict[str, Any], optional): Configuration for embedding generation.
+            key (str, optional): Key for encryption (not implemented).
+
+        Returns:
+            Dict[str, np.ndarray]: A dictionary of field names to their embeddings.
+        """
+        all_texts = self._embedding_texts(record, fields, embedding_config, key)
+        return self._map_embeddings(fields, await self.embeddings.embed_many(all_texts))
+
+    def _embedding_texts(self, record: dict, fields: List[str], embedding_config: Optional[Dict[str, Any]] = None, key: Optional[str] = None) -> List[str]:
+        """
+        Build the texts to embed for a record: one per field, then the metadata text.
+        """
         all_texts = []
         
         if key:
@@ -646,16 +774,16 @@ class RedisService(IService):
                 field_data = " ".join([json.dumps(item) for item in field_data])
             else:
                 field_data = str(field_data)
-            
-            preprocessed_text = self.preprocess_text(field_data, process_config=embedding_config.get('process_config'), redact_config=embedding_config.get('redact_config'))
-            all_texts.append(preprocessed_text)
+            all_texts.append(field_data)
         
+        all_texts = self.preprocess_texts(all_texts, process_config=embedding_config.get('process_config'), redact_config=embedding_config.get('redact_config'))
         metadata_text = " ".join(all_texts)
         all_texts.append(metadata_text)
-        
-        # Batch embed all texts
-        all_embeddings = self.model.embed(" ".join(all_texts))
-        
+        return all_texts
+
+    @staticmethod
+    def _map_embeddings(fields: List[str], all_embeddings: List[List[float]]) -> Dict[str, Any]:
+        embeddings = {}
         for i, field in enumerate(fields):
             embeddings[f"{field}_vector"] = all_embeddings[i]
         
@@ -778,83 +906,53 @@ class RedisService(IService):
             index_name (str): The name of the index to create.
 
         Returns:
-            AsyncSearchIndex: The created search index.
+            AsyncSearchIndex: The created (or already existing) search index.
         """
-        index_schema_file = os.path.join(os.path.dirname(os.path.realpath(__file__)), "schemas", index_name + ".yaml")
-        if not os.path.exists(index_schema_file):
-            raise FileNotFoundError(f"Index schema file {index_schema_file} not found.")
-        
-        index = None
         try:
-            if not await self.index_exists(index_name):
-                index = AsyncSearchIndex.from_yaml(index_schema_file)
-                index = await index.connect(self.redis_url)
-                await index.create(False, False)
+            return await self.get_index(index_name)
         except Exception as e:
             self.logger.error(f"Error creating index {index_name}: {str(e)}")
             raise
-        return index
 
-    @lru_cache(maxsize=10000)
-    def _get_embedding(self, text: str):
-        return self.get_model().embed(self.preprocess_text(text))
-
-    async def load_records(self, objects_list, index_name: str, fields_vectorization, overwrite=True, prefix: str = "context", id_column: str = 'id', batch_size: int = 100) -> List[str]:
-        keys = []
-        total_batches = (len(objects_list) + batch_size - 1) // batch_size
+    async def _get_embedding(self, text: str) -> List[float]:
+        return await self.embeddings.embed(self.preprocess_text(text))
 
-        if not await self.index_exists(index_name):
-            await self.create_index(index_name)
+    async def _get_embeddings(self, texts: List[str]) -> List[List[float]]:
+        return await self.embeddings.embed_many(self.preprocess_texts(texts))
 
-        async with self.client.pipeline(transaction=False) as pipe:
-            for i in tqdm(range(0, len(objects_list), batch_size), total=total_batches, desc="Loading records"):
-                batch = objects_list[i:i+batch_size]
-                batch_records = []
+    async def load_records(self, objects_list, index_name: str, fields_vectorization, overwrite=True, prefix: str = "context", id_column: str = 'id', batch_size: Optional[int] = None, run_id: Optional[str] = None) -> List[str]:
+        """
+        Embed records and store them in a search index.
 
-                for obj in batch:
-                    record = {}
-                    all_text = []
+        Streams through ``IngestionPipeline``: records are embedded and written a
+        chunk at a time, and records whose content is unchanged are skipped.
 
-                    obj_dict = obj.to_dict() if not isinstance(obj, dict) else obj
-                    
-                    for field, should_vectorize in fields_vectorization.items():
-                        field_data = obj_dict.get(field, "")
-                        field_data = json.dumps(field_data) if isinstance(field_data, (dict, list)) else str(field_data)
-                        
-                        all_text.append(field_data)
-                        
-                        if should_vectorize:
-                            vector = self._get_embedding(field_data)
-                            record[f"{field}_vector"] = np.array(vector, dtype=np.float32).tobytes()
-                        
-                        record[field] = field_data
-                    
-                    metadata_vectors = self._get_embedding(" ".join(all_text))
-                    record['metadata_vector'] = np.array(metadata_vectors, dtype=np.float32).tobytes()
-                    
-                    record['item'] = json.dumps(obj_dict)
-                    batch_records.append(record)
-
-                for j, record in enumerate(batch_records):
-                    key = f"{prefix}:{record.get(id_column, i+j)}"
-                    keys.append(key)
-                    if overwrite:
-                        pipe.hset(key, mapping=record)
-                    else:
-                        pipe.hmset(key, record)
+        Args:
+            objects_list (Iterable | AsyncIterable): Dicts or objects with ``to_dict``/``model_dump``.
+            index_name (str): The index the records belong to; created if missing.
+            fields_vectorization (Dict[str, bool]): Fields to store, and whether to embed each.
+            overwrite (bool): Replace existing records; otherwise existing keys are left alone.
+            prefix (str): Key prefix of the index.
+            id_column (str): Record field holding the id.
+            batch_size (int, optional): Records per chunk; defaults to ``ingest_chunk_size``.
+            run_id (str, optional): Checkpoints progress so an interrupted load can resume.
 
-                await pipe.execute()
-                
-                # Clear batch variables to free up memory
-                del batch_records
-                del batch
-                gc.collect()  # Force garbage collection
+        Returns:
+            List[str]: The keys of the records, in order; a resumed load includes the
+            records the interrupted run already wrote.
+        """
+        keys = []
+        await self.get_index(index_name)
 
-                # Clear Redis pipeline to prevent memory buildup
-                await pipe.reset()
+        with tqdm(total=len(objects_list) if hasattr(objects_list, '__len__') else None, desc="Loading records") as progress:
+            def on_chunk(chunk_keys: List[str]):
+                keys.extend(chunk_keys)
+                progress.update(len(chunk_keys))
 
-                # Introduce a small delay to allow other tasks to run
-                await asyncio.sleep(0.01)
+            await self.ingestion.ingest(
+                objects_list, fields_vectorization, prefix,
+                id_column=id_column, overwrite=overwrite, run_id=run_id, on_chunk=on_chunk, chunk_size=batch_size
+            )
 
         self.logger.info('Records loaded successfully')
         return keys
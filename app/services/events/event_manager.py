@@ -3,10 +3,11 @@ import asyncio
 import threading
 import json
 import traceback
-from typing import Any, Callable
+from typing import Any, Callable, Dict, Tuple
 from kafka.consumer.fetcher import ConsumerRecord
 from app.interfaces import IService
 from app.logging_config import configure_logger
+from app.services.metrics import metrics_registry
 from dependency_injector.wiring import inject, Provide
 from app.services.worker.worker import Worker
 from contextlib import asynccontextmanager
@@ -40,10 +41,18 @@ class EventManager(IService):
         self.queue = asyncio.Queue()
         self.event_loop = None
         self.tasks = []
+        self._event_tasks = set()  # in-flight handle_event_task tasks
         self.running = False
         self.notified = set()
         self.consumer_thread = None
         self.subscriptions = {}  # Track active subscriptions
+        self._channel_queues: Dict[str, asyncio.Queue] = {}  # per-channel processor queues, for metrics
+        metrics_registry.gauge_callback(
+            "event_queue_depth",
+            "Events waiting in EventManager queues.",
+            ["queue"],
+            self._queue_depths
+        )
 
     @asynccontextmanager
     async def lifespan(self):
@@ -140,6 +149,7 @@ class EventManager(IService):
         for channel in channels:
             # Create separate processing task for each channel
             processor_queue = asyncio.Queue()
+            self._channel_queues[channel] = processor_queue
             
             # Start dedicated processor task
             processor_task = asyncio.create_task(
@@ -202,6 +212,17 @@ class EventManager(IService):
                 self.logger.error(traceback.format_exc())
             finally:
                 queue.task_done()
+        
+        if self._channel_queues.get(channel) is queue:
+            del self._channel_queues[channel]
+
+    def _queue_depths(self) -> Dict[Tuple, float]:
+        """Queue depths reported by the event_queue_depth metric; channel queues are summed to bound label cardinality."""
+        return {
+            ("events",): self.queue.qsize(),
+            ("channels",): sum(queue.qsize() for queue in list(self._channel_queues.values())),
+            ("in_flight",): len(self._event_tasks),
+        }
 
     async def _safe_process_message(self, channel: str, message: Any, callback: callable):
         """
@@ -381,16 +402,15 @@ class EventManager(IService):
                 self.logger.error(f"Unhandled event type for key: {key}")
                 return
             
-            # Create task and don't await it
+            # Kafka commits the event's offset once the returned task finishes, so handlers
+            # return once their work is persisted: agent runs go to the worker pool and
+            # task groups run their scheduler in the background
             task = asyncio.create_task(
                 self.handle_event_task(type_class, key, action, object_data, context)
             )
-            
-            # Add to task list for cleanup
-            self.tasks.append(task)
-            
-            # Clean up completed tasks
-            self.tasks = [t for t in self.tasks if not t.done()]
+            self._event_tasks.add(task)
+            task.add_done_callback(self._event_tasks.discard)
+            return task
             
         except Exception as e:
             self.logger.error(f"Error in __event_listener: {e}")
@@ -410,7 +430,7 @@ class EventManager(IService):
             
             # Add timeout protection
             async with asyncio.timeout(None):  # 3000 second timeout
-                asyncio.create_task(type_class.handle(key, action, object_data, context))
+                await type_class.handle(key, action, object_data, context)
                 task_logger.debug(f"Event handled for key: {key}")
                 
         except asyncio.TimeoutError:
@@ -589,7 +609,7 @@ class EventManager(IService):
     async def _process_update_queue(self, queue: asyncio.Queue, callback: Callable):
         while True:
             update = await queue.get()
-            await callback(json.loads(update))
+            await callback(json.loads(update) if isinstance(update, (str, bytes)) else update)
             queue.task_done()
 
     async def publish_update(self, channel: str, update_event: dict):
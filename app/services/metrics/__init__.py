@@ -0,0 +1,4 @@
+from .registry import CallbackGauge, Counter, Gauge, Histogram, MetricsRegistry, metrics_registry
+from .loop_monitor import monitor_event_loop_lag
+
+__all__ = ["CallbackGauge", "Counter", "Gauge", "Histogram", "MetricsRegistry", "metrics_registry", "monitor_event_loop_lag"]
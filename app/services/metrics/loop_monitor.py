@@ -0,0 +1,25 @@
+import asyncio
+import time
+from app.services.metrics.registry import metrics_registry
+
+event_loop_lag_seconds = metrics_registry.histogram(
+    "event_loop_lag_seconds",
+    "How late the event loop ran a callback scheduled to run after a fixed sleep.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+)
+
+
+async def monitor_event_loop_lag(interval: float = 1.0):
+    """
+    Sleep for ``interval`` seconds in a loop and record how much later than that each wakeup came.
+
+    Sustained lag means something is blocking the loop, e.g. synchronous I/O or
+    CPU-heavy work in a coroutine. Runs until cancelled.
+
+    Args:
+        interval (float): Seconds between measurements.
+    """
+    while True:
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        event_loop_lag_seconds.observe(max(time.perf_counter() - started - interval, 0.0))
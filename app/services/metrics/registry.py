@@ -0,0 +1,283 @@
+import bisect
+import inspect
+import math
+import threading
+import weakref
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Seconds; covers sub-millisecond Redis round trips up to multi-minute LLM runs
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """Base for metrics with a fixed set of label names and one child per label combination."""
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values, **kwargs):
+        """
+        Get the child for a combination of label values, creating it on first use.
+
+        Args:
+            *values: Label values in ``labelnames`` order.
+            **kwargs: Label values by name.
+
+        Raises:
+            ValueError: If the values do not match the metric's label names.
+        """
+        if kwargs:
+            if values:
+                raise ValueError("Pass label values either by position or by name")
+            values = tuple(kwargs.get(name) for name in self.labelnames)
+            if len(kwargs) != len(self.labelnames) or None in values:
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}")
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.get(key)
+                if child is None:
+                    child = self._children[key] = self._new_child()
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def remove(self, *values):
+        """Drop the child for a combination of label values, e.g. for a partition no longer assigned."""
+        with self._lock:
+            self._children.pop(tuple(str(value) for value in values), None)
+
+    def _samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return lines
+
+
+class _Value:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float):
+        self.value = float(value)
+
+
+class Counter(_Metric):
+    """A monotonically increasing count."""
+
+    kind = "counter"
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount: float = 1.0):
+        self.labels().inc(amount)
+
+    def _samples(self):
+        for key, child in list(self._children.items()):
+            yield f"{self.name}_total{_format_labels(self.labelnames, key)} {_format_value(child.value)}"
+
+
+class Gauge(_Metric):
+    """A value that can go up and down."""
+
+    kind = "gauge"
+
+    def _new_child(self):
+        return _Value()
+
+    def set(self, value: float):
+        self.labels().set(value)
+
+    def _samples(self):
+        for key, child in list(self._children.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(child.value)}"
+
+
+class CallbackGauge(_Metric):
+    """
+    A gauge computed when metrics are collected.
+
+    The callback returns ``{label values tuple: value}``, so sources such as
+    queue sizes or live objects are read only on scrape and cost nothing otherwise.
+    Bound methods are held weakly and dropped once their object is collected.
+    """
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str], callback: Callable[[], Dict[Tuple, float]]):
+        super().__init__(name, documentation, labelnames)
+        self._callbacks: List[Callable[[], Optional[Callable]]] = []
+        self.add_callback(callback)
+
+    def add_callback(self, callback: Callable[[], Dict[Tuple, float]]):
+        """Add another source; samples from all sources are reported together."""
+        with self._lock:
+            if any(ref() == callback for ref in self._callbacks):
+                return
+            if inspect.ismethod(callback):
+                self._callbacks.append(weakref.WeakMethod(callback))
+            else:
+                self._callbacks.append(lambda: callback)
+
+    def _samples(self):
+        for ref in list(self._callbacks):
+            callback = ref()
+            if callback is None:
+                with self._lock:
+                    if ref in self._callbacks:
+                        self._callbacks.remove(ref)
+                continue
+            try:
+                values = callback()
+            except Exception:
+                continue
+            for key, value in values.items():
+                key = key if isinstance(key, tuple) else (key,)
+                yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class _HistogramValue:
+    __slots__ = ("upper_bounds", "counts", "sum", "_lock")
+
+    def __init__(self, upper_bounds: Tuple[float, ...]):
+        self.upper_bounds = upper_bounds
+        self.counts = [0] * (len(upper_bounds) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.upper_bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+
+class Histogram(_Metric):
+    """Counts of observations in cumulative buckets, plus their sum and count."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.upper_bounds = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramValue(self.upper_bounds)
+
+    def observe(self, value: float):
+        self.labels().observe(value)
+
+    def _samples(self):
+        for key, child in list(self._children.items()):
+            with child._lock:
+                counts, total = list(child.counts), child.sum
+            cumulative = 0
+            for bound, count in zip(self.upper_bounds + (math.inf,), counts):
+                cumulative += count
+                le = 'le="' + _format_value(bound) + '"'
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}"
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum{labels} {_format_value(total)}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+class MetricsRegistry:
+    """
+    Process-wide set of metrics rendered in the Prometheus text exposition format.
+
+    Metrics are created on first request and shared afterwards, so modules can
+    declare the metrics they record at import time without coordinating.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name} is already registered as a {metric.kind}")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets)
+
+    def gauge_callback(self, name: str, documentation: str, labelnames: Sequence[str], callback: Callable[[], Dict[Tuple, float]]) -> CallbackGauge:
+        """
+        Register a gauge computed on collection; registering the same name again adds a source.
+
+        Args:
+            name (str): Metric name.
+            documentation (str): Help text.
+            labelnames (Sequence[str]): Label names, matching the tuples the callback returns.
+            callback (Callable): Returns ``{label values tuple: value}``.
+        """
+        metric = self._get_or_create(CallbackGauge, name, documentation, labelnames, callback)
+        metric.add_callback(callback)
+        return metric
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text format, version 0.0.4."""
+        lines: List[str] = []
+        for name in sorted(self._metrics):
+            lines.extend(self._metrics[name].render())
+        return "\n".join(lines) + "\n"
+
+
+# Create a global instance of MetricsRegistry
+metrics_registry = MetricsRegistry()
@@ -0,0 +1,3 @@
+from .sampling_profiler import SamplingProfiler, collapsed, flamegraph_svg, sampling_profiler, tag_session
+
+__all__ = ["SamplingProfiler", "collapsed", "flamegraph_svg", "sampling_profiler", "tag_session"]
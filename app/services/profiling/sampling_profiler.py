@@ -0,0 +1,318 @@
+import asyncio
+import hashlib
+import html
+import sys
+import threading
+import time
+import weakref
+from collections import Counter
+from typing import Any, Dict, List, Optional
+from app.logging_config import configure_logger
+
+# asyncio keeps the task each loop is running in this dict; read it from the sampler thread
+_current_tasks = getattr(asyncio.tasks, "_current_tasks", {})
+
+# task -> session id, set by the code that runs work on behalf of a session
+_task_sessions: "weakref.WeakKeyDictionary[asyncio.Task, str]" = weakref.WeakKeyDictionary()
+
+
+def tag_session(session_id: Optional[str]):
+    """
+    Attribute the current asyncio task to a session in profiles.
+
+    Costs a dictionary write and nothing else, whether or not a profile is running.
+
+    Args:
+        session_id (str, optional): The session the task works for.
+    """
+    task = asyncio.current_task()
+    if task is not None and session_id:
+        _task_sessions[task] = session_id
+
+
+class SamplingProfiler:
+    """
+    Statistical profiler that samples every thread's stack for a bounded window.
+
+    While a profile runs, a background thread wakes every ``interval`` seconds,
+    reads ``sys._current_frames()`` and counts each stack. Stacks from the event
+    loop thread are prefixed with the running asyncio task and the session it
+    was tagged with, so concurrent requests show up separately instead of being
+    folded together. Nothing is installed when no profile runs: no thread, no
+    trace or profile hooks.
+
+    Results are kept as collapsed stacks (``frame;frame;frame count``), the input
+    format of flamegraph tools, and can be rendered as an SVG flamegraph.
+    """
+
+    def __init__(self, max_duration: float = 300.0, max_depth: int = 128, min_interval: float = 0.001):
+        """
+        Initialize the SamplingProfiler.
+
+        Args:
+            max_duration (float): Longest profile window allowed, in seconds.
+            min_interval (float): Shortest time between samples allowed, in seconds.
+            max_depth (int): Frames kept per stack, innermost first.
+        """
+        self.logger = configure_logger(f"{self.__class__.__module__}.{self.__class__.__name__}")
+        self.max_duration = max_duration
+        self.max_depth = max_depth
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._counts: Counter = Counter()
+        self._labels: Dict[Any, str] = {}
+        self._started_at: Optional[float] = None
+        self._interval = 0.0
+        self._samples = 0
+        self._last_result: Optional[Dict[str, Any]] = None
+        self.stats = {"profiles": 0, "samples": 0}
+
+    def is_running(self) -> bool:
+        return self._thread is not None
+
+    def start(self, duration: float, interval: float = 0.005) -> Dict[str, Any]:
+        """
+        Start sampling for up to ``duration`` seconds.
+
+        Must be called from the event loop whose tasks should be attributed.
+
+        Args:
+            duration (float): Window length in seconds; capped at ``max_duration``.
+            interval (float): Seconds between samples; raised to ``min_interval``.
+
+        Returns:
+            Dict[str, Any]: The profile's status.
+
+        Raises:
+            RuntimeError: If a profile is already running.
+        """
+        with self._lock:
+            if self._thread is not None:
+                raise RuntimeError("A profile is already running")
+            duration = min(max(duration, 0.0), self.max_duration)
+            # A zero or negative interval would keep the sampler thread spinning
+            interval = max(interval, self.min_interval)
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                loop = None
+            self._counts = Counter()
+            self._labels = {}
+            self._samples = 0
+            self._interval = interval
+            self._started_at = time.time()
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run,
+                args=(time.monotonic() + duration, interval, loop, threading.get_ident()),
+                name="sampling-profiler",
+                daemon=True
+            )
+            self._thread.start()
+        self.logger.info(f"Started sampling profile for {duration}s every {interval * 1000:.1f}ms")
+        return self.status()
+
+    def stop(self) -> Dict[str, Any]:
+        """
+        Stop the running profile, or wait for it to finish, and return its result.
+
+        Returns:
+            Dict[str, Any]: The result (see ``result``); the last result if no profile was running.
+        """
+        with self._lock:
+            thread = self._thread
+            if thread is None:
+                return self._last_result or {}
+            self._stop.set()
+        # The sampler thread stores the result before it exits
+        thread.join()
+        return self._last_result
+
+    async def profile(self, duration: float, interval: float = 0.005) -> Dict[str, Any]:
+        """Run a profile for ``duration`` seconds without blocking the event loop and return its result."""
+        self.start(duration, interval)
+        try:
+            await asyncio.sleep(min(max(duration, 0.0), self.max_duration))
+        finally:
+            result = await asyncio.to_thread(self.stop)
+        return result
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "running": self.is_running(),
+            "started_at": self._started_at,
+            "interval": self._interval,
+            "samples": self._samples,
+        }
+
+    def result(self) -> Optional[Dict[str, Any]]:
+        """
+        Get the last finished profile.
+
+        Returns:
+            Dict[str, Any] | None: ``started_at``, ``duration``, ``interval``, ``samples``,
+            ``stacks`` (collapsed stack -> count) and ``by_session`` sample counts.
+        """
+        return self._last_result
+
+    def _run(self, deadline: float, interval: float, loop: Optional[asyncio.AbstractEventLoop], loop_thread_id: int):
+        own_id = threading.get_ident()
+        try:
+            while not self._stop.wait(interval) and time.monotonic() < deadline:
+                try:
+                    self._sample(own_id, loop, loop_thread_id)
+                except Exception as e:
+                    self.logger.error(f"Error sampling stacks: {str(e)}")
+                    return
+        finally:
+            # Whether stopped or past its deadline, the profile ends here so a new one can start
+            self._finish()
+
+    def _finish(self):
+        with self._lock:
+            self._last_result = self._build_result()
+            self.stats["profiles"] += 1
+            self.stats["samples"] += self._samples
+            self._thread = None
+        self.logger.info(f"Finished sampling profile with {self._samples} samples")
+
+    def _sample(self, own_id: int, loop: Optional[asyncio.AbstractEventLoop], loop_thread_id: int):
+        thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_id:
+                continue
+            stack = []
+            while frame is not None and len(stack) < self.max_depth:
+                stack.append(self._label(frame.f_code))
+                frame = frame.f_back
+            stack.reverse()
+            if thread_id == loop_thread_id and loop is not None:
+                task = _current_tasks.get(loop)
+                if task is None:
+                    root = "loop;idle"
+                else:
+                    root = f"task:{_sanitize(task.get_name())};session:{_task_sessions.get(task, 'none')}"
+            else:
+                root = f"thread:{_sanitize(thread_names.get(thread_id, str(thread_id)))}"
+            self._counts[";".join([root] + stack)] += 1
+        self._samples += 1
+
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            label = self._labels[code] = _sanitize(f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})")
+        return label
+
+    def _build_result(self) -> Dict[str, Any]:
+        by_session: Counter = Counter()
+        for stack, count in self._counts.items():
+            parts = stack.split(";", 2)
+            if parts[0].startswith("task:") and len(parts) > 1:
+                by_session[parts[1][len("session:"):]] += count
+        return {
+            "started_at": self._started_at,
+            "duration": time.time() - self._started_at,
+            "interval": self._interval,
+            "samples": self._samples,
+            "stacks": dict(self._counts.most_common()),
+            "by_session": dict(by_session.most_common()),
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "running": self.is_running()}
+
+
+def _sanitize(name: str) -> str:
+    # ';' separates frames and the last space separates the count in collapsed stacks
+    return name.replace(";", ":").replace("\n", " ")
+
+
+def collapsed(result: Dict[str, Any]) -> str:
+    """
+    Format a profile result as collapsed stacks, one ``frame;frame count`` line per stack.
+
+    Args:
+        result (Dict[str, Any]): A result from ``SamplingProfiler.stop``.
+
+    Returns:
+        str: Input for flamegraph.pl, speedscope and similar tools.
+    """
+    return "".join(f"{stack} {count}\n" for stack, count in (result.get("stacks") or {}).items())
+
+
+def flamegraph_svg(result: Dict[str, Any], width: int = 1200, frame_height: int = 16, min_width: float = 0.5) -> str:
+    """
+    Render a profile result as a self-contained SVG flamegraph.
+
+    Roots are at the top; each frame's width is its share of the samples.
+    Hovering a frame shows its full name and sample count.
+
+    Args:
+        result (Dict[str, Any]): A result from ``SamplingProfiler.stop``.
+        width (int): Image width in pixels.
+        frame_height (int): Height of one frame in pixels.
+        min_width (float): Frames narrower than this many pixels are omitted.
+
+    Returns:
+        str: The SVG document.
+    """
+    root: Dict[str, Any] = {"value": 0, "children": {}}
+    for stack, count in (result.get("stacks") or {}).items():
+        node = root
+        node["value"] += count
+        for name in stack.split(";"):
+            node = node["children"].setdefault(name, {"value": 0, "children": {}})
+            node["value"] += count
+
+    total = root["value"] or 1
+    scale = width / total
+    rects: List[str] = []
+    depth_reached = 0
+    # (name, node, x, depth); siblings are laid out left to right by name
+    pending = []
+    x = 0.0
+    for name, child in sorted(root["children"].items()):
+        pending.append((name, child, x, 0))
+        x += child["value"] * scale
+    while pending:
+        name, node, x, depth = pending.pop()
+        w = node["value"] * scale
+        if w < min_width:
+            continue
+        depth_reached = max(depth_reached, depth)
+        y = depth * frame_height
+        title = html.escape(f"{name} ({node['value']} samples, {node['value'] * 100 / total:.2f}%)")
+        text = html.escape(_fit(name, w))
+        rects.append(
+            f'<g><title>{title}</title>'
+            f'<rect x="{x:.2f}" y="{y}" width="{w:.2f}" height="{frame_height - 1}" fill="{_color(name)}" rx="2"/>'
+            f'<text x="{x + 3:.2f}" y="{y + frame_height - 4}">{text}</text></g>'
+        )
+        child_x = x
+        for child_name, child in sorted(node["children"].items()):
+            pending.append((child_name, child, child_x, depth + 1))
+            child_x += child["value"] * scale
+
+    height = (depth_reached + 1) * frame_height
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'font-family="monospace" font-size="11">\n' + "\n".join(rects) + "\n</svg>\n"
+    )
+
+
+def _fit(name: str, width: float) -> str:
+    chars = int(width / 7) - 1
+    if chars < 3:
+        return ""
+    return name if len(name) <= chars else name[:chars - 2] + ".."
+
+
+def _color(name: str) -> str:
+    digest = hashlib.md5(name.encode("utf-8")).digest()
+    return f"rgb({205 + digest[0] % 50},{digest[1] % 180},{digest[2] % 55})"
+
+
+# Create a global instance of SamplingProfiler
+sampling_profiler = SamplingProfiler()
@@ -1,8 +1,10 @@
 #app/services/communication.py
 from abc import ABC
 import asyncio
+import inspect
 import json
 import logging
+import queue as thread_queue
 import uuid
 import uuid
 import re
@@ -12,21 +14,50 @@ import time
 import traceback
 from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
 from dotenv import load_dotenv
-from kafka import KafkaProducer, KafkaConsumer
+from kafka import ConsumerRebalanceListener, KafkaProducer, KafkaConsumer
 from kafka.consumer.fetcher import ConsumerRecord
+from kafka.structs import OffsetAndMetadata, TopicPartition
 from app.config.settings import KafkaSettings
 from app.interfaces.service import IService
 from app.logging_config import configure_logger
+from app.services.metrics import metrics_registry
 from app.utilities.resource_tracker import ResourceTracker
 
 load_dotenv()
 
+kafka_produce_seconds = metrics_registry.histogram(
+    "kafka_produce_seconds",
+    "Time from producer send to broker acknowledgement, by topic.",
+    ["topic", "status"]
+)
+kafka_consumer_lag = metrics_registry.gauge(
+    "kafka_consumer_lag",
+    "Records between the consumer's position and the partition high watermark at the last poll.",
+    ["topic", "partition"]
+)
+
 def safe_decode(m):
     try:
         return json.loads(m.decode('utf-8'))
     except json.JSONDecodeError:
         return {"raw_message": m.decode('utf-8', errors='replace')}
 
+def _offset_and_metadata(offset: int) -> OffsetAndMetadata:
+    # kafka-python >= 2.1 added a leader_epoch field
+    if 'leader_epoch' in OffsetAndMetadata._fields:
+        return OffsetAndMetadata(offset, '', -1)
+    return OffsetAndMetadata(offset, '')
+
+class _RebalanceListener(ConsumerRebalanceListener):
+    def __init__(self, service: 'KafkaService'):
+        self.service = service
+
+    def on_partitions_revoked(self, revoked):
+        self.service._on_partitions_revoked(revoked)
+
+    def on_partitions_assigned(self, assigned):
+        pass
+
 class KafkaService(IService):
     name = "kafka"
 
@@ -57,6 +88,38 @@ class KafkaService(IService):
         self.topics = [config['topics'] or "agency_workflows"]
         self.event_loop = asyncio.get_event_loop()
         
+        # Producer tuning; the in-flight window bounds unacknowledged sends
+        self.acks = config.get('acks', 1)
+        self.linger_ms = config.get('linger_ms', 5)
+        self.batch_size = config.get('batch_size', 64 * 1024)
+        self.compression_type = config.get('compression_type')
+        self.max_in_flight = config.get('max_in_flight', 500)
+        self.ack_timeout = config.get('ack_timeout', 10.0)
+        self._inflight = asyncio.Semaphore(self.max_in_flight)
+        self._pending_acks = 0
+        self.producer_stats: Dict[str, Dict[str, float]] = {}
+        
+        # Consumer tuning; records are handed to the event loop one poll() batch at a time
+        self.max_poll_records = config.get('max_poll_records', 500)
+        self.poll_timeout_ms = config.get('poll_timeout_ms', 1000)
+        self.high_water = config.get('high_water', 1000)
+        self.low_water = config.get('low_water', 250)
+        self._batch_queue: Optional[asyncio.Queue] = None
+        self._batch_worker: Optional[asyncio.Task] = None
+        self._commit_queue = thread_queue.Queue()
+        self._pending_records = 0
+        self._outstanding: Dict[TopicPartition, Dict[int, bool]] = {}
+        self._record_tasks: Set[asyncio.Task] = set()
+        self._pending_lock = threading.Lock()
+        self._paused = False
+        self._backpressure_sources: List[Callable[[], bool]] = []
+        metrics_registry.gauge_callback(
+            "kafka_pending_records",
+            "Consumed records handed to the event loop and not yet handled by subscribers.",
+            [],
+            self._pending_metrics
+        )
+        
         print(f"KafkaService: {self.to_json()}")
     
     def to_json(self):
@@ -84,11 +147,18 @@ class KafkaService(IService):
             bootstrap_servers=self.bootstrap_servers,
             group_id=self.consumer_group,
             value_deserializer=safe_decode,
-            auto_offset_reset='earliest'
+            auto_offset_reset='earliest',
+            enable_auto_commit=False,
+            max_poll_records=self.max_poll_records
         )
         self.producer = KafkaProducer(
             bootstrap_servers=self.bootstrap_servers,
-            value_serializer=lambda v: json.dumps(v).encode('utf-8')
+            value_serializer=lambda v: json.dumps(v).encode('utf-8'),
+            key_serializer=lambda k: k.encode('utf-8') if isinstance(k, str) else k,
+            acks=self.acks,
+            linger_ms=self.linger_ms,
+            batch_size=self.batch_size,
+            compression_type=self.compression_type
         )
         self.start_consumer_thread()
         self.logger.info("KafkaService started successfully")
@@ -98,6 +168,7 @@ class KafkaService(IService):
         Start a separate thread to run the Kafka consumer.
         """
         self.logger.debug("Starting Kafka consumer thread")
+        self._ensure_batch_worker()
         self.consumer_thread_running = True
         self.consumer_thread = threading.Thread(target=self.run_consumer, daemon=True)
         self.consumer_thread.start()
@@ -106,35 +177,28 @@ class KafkaService(IService):
     def run_consumer(self):
         """
         Run the Kafka consumer in a separate thread to process messages.
+
+        Each poll() batch is handed to the event loop in a single
+        call_soon_threadsafe hop. Offsets are committed from this thread once the
+        event loop reports their records handled, and assigned partitions are
+        paused while more than ``high_water`` records are still being handled.
         """
         self.logger.debug("Running Kafka consumer")
         while self.consumer_thread_running:
             if self.consumer is not None:
                 try:
-                    messages = self.consumer.poll(timeout_ms=1000)
-                    if messages:
-                        self.logger.info(f"Received {len(messages)} message(s)")
-                        for topic_partition, records in messages.items():
-                            for record in records:
-                                topic = record.topic
-                                value = record.value
-                                self.logger.debug(f"Processing message from topic: {topic}")
-                                if topic in self.subscriptions:
-                                    self.logger.debug(f"Subscriptions for topic {topic}: {self.subscriptions[topic]}")
-                                    for queue, callback in self.subscriptions[topic]:
-                                        try:
-                                            if callback:
-                                                result = callback(value)
-                                                if asyncio.iscoroutine(result):
-                                                    self.event_loop.call_soon_threadsafe(
-                                                        asyncio.create_task, result
-                                                    )
-                                            self.event_loop.call_soon_threadsafe(queue.put_nowait, record)
-                                        except Exception as e:
-                                            self.logger.error(f"Error processing message: {e}")
-                    else:
-                        pass
-                        #self.logger.debug("No messages received")
+                    self._commit_processed_offsets()
+                    self._apply_backpressure()
+                    messages = self.consumer.poll(timeout_ms=self.poll_timeout_ms, max_records=self.max_poll_records)
+                    if not messages:
+                        continue
+                    
+                    batch = [record for records in messages.values() for record in records]
+                    self._record_lag(messages)
+                    with self._pending_lock:
+                        self._pending_records += len(batch)
+                    self.logger.debug(f"Received {len(batch)} message(s) from {len(messages)} partition(s)")
+                    self.event_loop.call_soon_threadsafe(self._batch_queue.put_nowait, batch)
                 except Exception as e:
                     if self.consumer_thread_running:
                         self.logger.error(f"Error in Kafka consumer thread: {e}")
@@ -145,14 +209,194 @@ class KafkaService(IService):
             else:
                 self.logger.debug("Consumer is not initialized, sleeping for 1 second")
                 time.sleep(1)  # Wait for consumer to be initialized
+        try:
+            self._commit_processed_offsets()
+        except Exception as e:
+            self.logger.error(f"Error committing offsets on consumer stop: {e}")
         self.logger.debug("Kafka consumer thread stopped")
 
+    def _pending_metrics(self) -> Dict[Tuple, float]:
+        return {(): self._pending_records}
+
+    def _record_lag(self, messages: Dict[TopicPartition, List[ConsumerRecord]]):
+        """Update the lag gauge of each polled partition from its last fetched high watermark. Runs on the consumer thread."""
+        for tp, records in messages.items():
+            highwater = self.consumer.highwater(tp)
+            if highwater is not None and records:
+                kafka_consumer_lag.labels(tp.topic, tp.partition).set(max(highwater - records[-1].offset - 1, 0))
+
+    def _ensure_batch_worker(self):
+        """Start the event loop task that drains consumer batches, if it is not running."""
+        if self._batch_queue is None:
+            self._batch_queue = asyncio.Queue()
+        if self._batch_worker is None or self._batch_worker.done():
+            self._batch_worker = self.event_loop.create_task(self._process_batches())
+
+    async def _process_batches(self):
+        """
+        Deliver consumer batches to subscribers in poll order.
+
+        Batches are enqueued one at a time; their records are handled
+        concurrently and committed per partition as they finish.
+        """
+        while True:
+            batch = await self._batch_queue.get()
+            try:
+                await self._handle_batch(batch)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.error(f"Error handling Kafka batch: {e}")
+                self.logger.error(traceback.format_exc())
+            finally:
+                self._batch_queue.task_done()
+
+    async def _handle_batch(self, batch: List[ConsumerRecord]):
+        """
+        Start subscriber callbacks for a batch and enqueue its records.
+
+        A record's offset is released for commit once every callback awaitable it
+        produced has finished, and only after all earlier records of its partition
+        have, so a commit never covers unfinished work. Bounded subscriber queues
+        are awaited, so a slow consumer holds the next batch until there is room.
+        """
+        for record in batch:
+            tp = TopicPartition(record.topic, record.partition)
+            outstanding = self._outstanding.setdefault(tp, {})
+            outstanding[record.offset] = False
+            pending = []
+            for queue, callback in list(self.subscriptions.get(record.topic, [])):
+                if callback:
+                    try:
+                        result = callback(record.value)
+                        if inspect.isawaitable(result):
+                            pending.append(result)
+                    except Exception as e:
+                        self.logger.error(f"Error processing message: {e}")
+            if pending:
+                task = asyncio.ensure_future(self._await_record(pending))
+                self._record_tasks.add(task)
+                task.add_done_callback(self._record_tasks.discard)
+                task.add_done_callback(lambda _, tp=tp, outstanding=outstanding, offset=record.offset: self._record_done(tp, outstanding, offset))
+            else:
+                self._record_done(tp, outstanding, record.offset)
+
+        for record in batch:
+            for queue, _ in list(self.subscriptions.get(record.topic, [])):
+                if queue is not None:
+                    await queue.put(record)
+
+    async def _await_record(self, pending: List[Any]):
+        """Wait for a record's callbacks, following any awaitable they resolve to (e.g. a started task)."""
+        while pending:
+            nested = []
+            for result in await asyncio.gather(*pending, return_exceptions=True):
+                if isinstance(result, Exception):
+                    self.logger.error(f"Error processing message: {result}")
+                elif inspect.isawaitable(result):
+                    nested.append(result)
+            pending = nested
+
+    def _record_done(self, tp: TopicPartition, outstanding: Dict[int, bool], offset: int):
+        """Mark a record handled and release the completed prefix of its partition for commit."""
+        with self._pending_lock:
+            self._pending_records -= 1
+        if self._outstanding.get(tp) is not outstanding:
+            # The partition was revoked while the record was handled; its new owner redelivers it
+            return
+        outstanding[offset] = True
+        committable = None
+        for pending_offset, done in list(outstanding.items()):
+            if not done:
+                break
+            del outstanding[pending_offset]
+            committable = pending_offset + 1
+        if committable is not None:
+            self._commit_queue.put({tp: committable})
+
+    def _on_partitions_revoked(self, revoked: List[TopicPartition]):
+        """Commit what is finished and forget the rest of the revoked partitions. Runs on the consumer thread."""
+        self._commit_processed_offsets()
+        # A rebalance clears the consumer's pause state, so the next poll re-evaluates backpressure
+        self._paused = False
+        self.event_loop.call_soon_threadsafe(self._forget_partitions, list(revoked))
+
+    def _forget_partitions(self, revoked: List[TopicPartition]):
+        for tp in revoked:
+            self._outstanding.pop(tp, None)
+
+    def _commit_processed_offsets(self):
+        """Commit offsets of records the event loop has finished handling. Runs on the consumer thread."""
+        offsets: Dict[TopicPartition, int] = {}
+        while True:
+            try:
+                handled = self._commit_queue.get_nowait()
+            except thread_queue.Empty:
+                break
+            for tp, offset in handled.items():
+                offsets[tp] = max(offsets.get(tp, 0), offset)
+        if offsets and self.consumer is not None:
+            assigned = self.consumer.assignment()
+            offsets = {tp: offset for tp, offset in offsets.items() if tp in assigned}
+            if offsets:
+                self.consumer.commit(offsets={tp: _offset_and_metadata(offset) for tp, offset in offsets.items()})
+
+    def _downstream_depth(self) -> int:
+        """Records handed to the event loop but not yet handled, plus the fullest bounded subscriber queue."""
+        depth = self._pending_records
+        for subscribers in list(self.subscriptions.values()):
+            for queue, _ in list(subscribers):
+                if queue is not None and queue.maxsize > 0:
+                    depth = max(depth, queue.qsize())
+        return depth
+
+    def add_backpressure_source(self, is_saturated: Callable[[], bool]):
+        """
+        Register a check that pauses consumption while it returns True.
+
+        Args:
+            is_saturated (Callable): Called from the consumer thread before each poll.
+        """
+        if is_saturated not in self._backpressure_sources:
+            self._backpressure_sources.append(is_saturated)
+
+    def _downstream_saturated(self) -> bool:
+        for is_saturated in list(self._backpressure_sources):
+            try:
+                if is_saturated():
+                    return True
+            except Exception as e:
+                self.logger.error(f"Error checking backpressure source: {e}")
+        return False
+
+    def _apply_backpressure(self):
+        """
+        Pause assigned partitions above the high-water mark or while a registered
+        source is saturated, and resume them once both have drained.
+        """
+        depth = self._downstream_depth()
+        saturated = self._downstream_saturated()
+        if not self._paused and (depth >= self.high_water or saturated):
+            partitions = self.consumer.assignment()
+            if partitions:
+                self.consumer.pause(*partitions)
+                self._paused = True
+                self.logger.warning(f"Paused {len(partitions)} partition(s): {depth} record(s) waiting downstream, saturated={saturated}")
+        elif self._paused and depth <= self.low_water and not saturated:
+            partitions = self.consumer.paused()
+            if partitions:
+                self.consumer.resume(*partitions)
+            self._paused = False
+            self.logger.info(f"Resumed consumption: {depth} record(s) waiting downstream")
+
     async def shutdown(self):
         """
         Shutdown the KafkaService by stopping the consumer thread and closing connections.
         """
         self.logger.info("Shutting down KafkaService")
         await self.close()
+        if self._batch_worker and not self._batch_worker.done():
+            self._batch_worker.cancel()
         self.logger.info("KafkaService shut down")
 
     async def close(self):
@@ -180,10 +424,12 @@ class KafkaService(IService):
         if topic not in self.subscribed_topics:
             self.subscribed_topics.add(topic)
             valid_topics = list(self.subscribed_topics)
-            self.consumer.subscribe(valid_topics)
+            self.consumer.subscribe(valid_topics, listener=_RebalanceListener(self))
             self.logger.info(f"Subscribed to Kafka topics: {valid_topics}")
             
             if self.consumer_thread is None or not self.consumer_thread.is_alive():
+                self._ensure_batch_worker()
+                self.consumer_thread_running = True
                 self.consumer_thread = threading.Thread(target=self.run_consumer, daemon=True)
                 self.consumer_thread.start()
                 self.logger.info("Started Kafka consumer thread")
@@ -288,15 +534,170 @@ class KafkaService(IService):
         except Exception as e:
             print(f"Failed to send message to topic {topic}: {e}")
     
-    async def send_message(self, topic, message):
-        self.logger.info(f"Sending message to topic: {topic}")
-        self.logger.debug(f"Message: {message}")
-        future = self.producer.send(topic, value=message)
+    async def send_message(self, topic, message, key: Optional[str] = None, wait: bool = True):
+        """
+        Send a message to a Kafka topic without blocking the event loop.
+
+        The record is handed to the producer's background sender and the broker
+        acknowledgement is bridged back to the event loop as an asyncio future.
+
+        Args:
+            topic (str): Topic to send to.
+            message (Any): JSON-serializable message.
+            key (str, optional): Partitioning key.
+            wait (bool): Await the broker acknowledgement when True, otherwise
+                return the pending acknowledgement future.
+
+        Returns:
+            RecordMetadata | asyncio.Future | None: The record metadata, the pending
+            acknowledgement when ``wait`` is False, or None if the send failed.
+        """
+        self.logger.debug(f"Sending message to topic: {topic}")
         try:
-            record_metadata = future.get(timeout=10)
-            self.logger.info(f"Message sent successfully to {record_metadata.topic} partition {record_metadata.partition}")
+            ack = await self._produce(topic, message, key)
+            if not wait:
+                return ack
+            record_metadata = await asyncio.wait_for(ack, timeout=self.ack_timeout)
+            self.logger.debug(f"Message sent successfully to {record_metadata.topic} partition {record_metadata.partition}")
+            return record_metadata
         except Exception as e:
             self.logger.error(f"Failed to send message: {e}")
+            return None
+
+    async def send_many(self, topic, messages: List[Any], key_func: Optional[Callable[[Any], Optional[str]]] = None) -> List[Any]:
+        """
+        Send a batch of messages to a Kafka topic and await all acknowledgements.
+
+        Sends are enqueued back to back so the producer can pack them into as few
+        broker requests as ``linger_ms``/``batch_size`` allow. Enqueueing waits
+        whenever the in-flight window is full.
+
+        Args:
+            topic (str): Topic to send to.
+            messages (List[Any]): JSON-serializable messages.
+            key_func (Callable, optional): Derives a partitioning key from a message.
+
+        Returns:
+            List[Any]: Record metadata per message, in order, or None for failed sends.
+        """
+        if not messages:
+            return []
+        self.logger.info(f"Sending {len(messages)} message(s) to topic: {topic}")
+        self._record_batch(topic, len(messages))
+
+        acks = []
+        for message in messages:
+            key = key_func(message) if key_func else None
+            try:
+                acks.append(await self._produce(topic, message, key))
+            except Exception as e:
+                self.logger.error(f"Failed to enqueue message for topic {topic}: {e}")
+                acks.append(None)
+
+        async def _await_ack(ack):
+            if ack is None:
+                return None
+            try:
+                return await asyncio.wait_for(ack, timeout=self.ack_timeout)
+            except Exception as e:
+                self.logger.error(f"Failed to send message: {e}")
+                return None
+
+        results = await asyncio.gather(*(_await_ack(ack) for ack in acks))
+        failed = sum(1 for r in results if r is None)
+        if failed:
+            self.logger.warning(f"{failed}/{len(messages)} message(s) failed for topic {topic}")
+        return list(results)
+
+    async def _produce(self, topic, message, key=None) -> asyncio.Future:
+        """
+        Enqueue a record on the producer and return a future for its acknowledgement.
+
+        Blocks (asynchronously) while ``max_in_flight`` records are unacknowledged.
+        """
+        if self.producer is None:
+            raise RuntimeError("KafkaService producer is not started")
+
+        await self._inflight.acquire()
+        self._pending_acks += 1
+        loop = asyncio.get_running_loop()
+        ack = loop.create_future()
+        started = time.perf_counter()
+
+        def on_success(record_metadata):
+            loop.call_soon_threadsafe(self._resolve_ack, ack, topic, started, record_metadata, None)
+
+        def on_error(exc):
+            loop.call_soon_threadsafe(self._resolve_ack, ack, topic, started, None, exc)
+
+        try:
+            future = self.producer.send(topic, value=message, key=key)
+        except Exception:
+            self._inflight.release()
+            self._pending_acks -= 1
+            self._record_send(topic, started, failed=True)
+            raise
+        future.add_callback(on_success)
+        future.add_errback(on_error)
+        return ack
+
+    def _resolve_ack(self, ack: asyncio.Future, topic: str, started: float, record_metadata, error):
+        """Complete an acknowledgement future on the event loop and release its in-flight slot."""
+        self._inflight.release()
+        self._pending_acks -= 1
+        self._record_send(topic, started, failed=error is not None)
+        if ack.done():
+            return
+        if error is not None:
+            ack.set_exception(error if isinstance(error, BaseException) else RuntimeError(str(error)))
+        else:
+            ack.set_result(record_metadata)
+
+    def _topic_stats(self, topic: str) -> Dict[str, float]:
+        if topic not in self.producer_stats:
+            self.producer_stats[topic] = {
+                "sent": 0,
+                "failed": 0,
+                "latency_ms_total": 0.0,
+                "latency_ms_max": 0.0,
+                "batches": 0,
+                "batch_messages": 0,
+                "batch_size_max": 0,
+            }
+        return self.producer_stats[topic]
+
+    def _record_send(self, topic: str, started: float, failed: bool = False):
+        stats = self._topic_stats(topic)
+        latency_ms = (time.perf_counter() - started) * 1000
+        kafka_produce_seconds.labels(topic, "failed" if failed else "sent").observe(latency_ms / 1000)
+        stats["failed" if failed else "sent"] += 1
+        stats["latency_ms_total"] += latency_ms
+        stats["latency_ms_max"] = max(stats["latency_ms_max"], latency_ms)
+
+    def _record_batch(self, topic: str, size: int):
+        stats = self._topic_stats(topic)
+        stats["batches"] += 1
+        stats["batch_messages"] += size
+        stats["batch_size_max"] = max(stats["batch_size_max"], size)
+
+    def get_producer_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get per-topic producer counters.
+
+        Returns:
+            Dict[str, Dict[str, float]]: Counters per topic, including average send
+            latency and average batch size.
+        """
+        report = {}
+        for topic, stats in self.producer_stats.items():
+            completed = stats["sent"] + stats["failed"]
+            report[topic] = {
+                **stats,
+                "inflight": self._pending_acks,
+                "latency_ms_avg": stats["latency_ms_total"] / completed if completed else 0.0,
+                "batch_size_avg": stats["batch_messages"] / stats["batches"] if stats["batches"] else 0.0,
+            }
+        return report
 
     async def AsyncSearchIndex(self, index, query, size=10, sort=None, filter=None):
         """
@@ -0,0 +1,257 @@
+import asyncio
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import httpx
+from app.logging_config import configure_logger
+from app.debug_log import log_debug
+
+
+class SupabaseError(Exception):
+    """Error returned by the Supabase REST API (PostgREST)."""
+
+    def __init__(self, status: int, message: str, code: str = None, details: str = None, hint: str = None):
+        self.status = status
+        self.code = code
+        self.details = details
+        self.hint = hint
+        super().__init__(f"{message} (status {status}{f', code {code}' if code else ''})")
+
+
+def _quote(value: Any) -> str:
+    # PostgREST list values are comma separated; quoting keeps commas and parentheses in values intact
+    text = str(value).replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{text}"'
+
+
+def build_filters(filters: Optional[Dict[str, Any]]) -> Dict[str, str]:
+    """
+    Turn ``{column: value}`` into PostgREST query parameters.
+
+    Lists, tuples and sets become ``in.(...)``; ``None`` becomes ``is.null``;
+    anything else is an equality test.
+
+    Args:
+        filters (Dict[str, Any], optional): Column values to match.
+
+    Returns:
+        Dict[str, str]: Query parameters.
+    """
+    params = {}
+    for column, value in (filters or {}).items():
+        if isinstance(value, (list, tuple, set)):
+            params[column] = f"in.({','.join(_quote(item) for item in value)})"
+        elif value is None:
+            params[column] = "is.null"
+        else:
+            params[column] = f"eq.{value}"
+    return params
+
+
+class SupabaseRestClient:
+    """
+    Async client for the Supabase REST API over a pooled HTTP connection.
+
+    Requests run on the event loop instead of blocking it the way the
+    synchronous supabase-py client does, and reuse keep-alive connections from
+    one pool. Bulk writes are sent as one request per ``chunk_size`` rows, and
+    ``rpc_many`` calls several Postgres functions concurrently with a limit.
+    """
+
+    def __init__(self, url: str, key: str, max_connections: int = 20, timeout: float = 30.0, chunk_size: int = 500):
+        """
+        Initialize the SupabaseRestClient.
+
+        Args:
+            url (str): The Supabase project URL.
+            key (str): API key, sent as both ``apikey`` and bearer token.
+            max_connections (int): Size of the HTTP connection pool.
+            timeout (float): Seconds before a request times out.
+            chunk_size (int): Most rows sent in one bulk request.
+        """
+        self.logger = configure_logger(f"{self.__class__.__module__}.{self.__class__.__name__}")
+        self.base_url = f"{(url or '').rstrip('/')}/rest/v1"
+        self.key = key
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.chunk_size = chunk_size
+        self._client: Optional[httpx.AsyncClient] = None
+        self.stats = {"requests": 0, "rpc_calls": 0, "rows_written": 0, "rows_deleted": 0, "failures": 0}
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers={"apikey": self.key or "", "Authorization": f"Bearer {self.key or ''}"},
+                limits=httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections),
+                timeout=self.timeout
+            )
+        return self._client
+
+    async def _request(self, method: str, path: str, params: Dict[str, str] = None, json: Any = None, prefer: str = None) -> Any:
+        headers = {"Prefer": prefer} if prefer else None
+        self.stats["requests"] += 1
+        try:
+            response = await self._get_client().request(method, path, params=params, json=json, headers=headers)
+        except httpx.HTTPError:
+            self.stats["failures"] += 1
+            raise
+        if response.status_code >= 400:
+            self.stats["failures"] += 1
+            try:
+                error = response.json()
+            except ValueError:
+                error = {"message": response.text}
+            raise SupabaseError(response.status_code, error.get("message", response.reason_phrase), error.get("code"), error.get("details"), error.get("hint"))
+        log_debug(self.logger, "Supabase request", method=method, path=path, status=response.status_code)
+        if not response.content:
+            return None
+        return response.json()
+
+    async def rpc(self, function: str, params: Dict[str, Any] = None) -> Any:
+        """
+        Call a Postgres function.
+
+        Args:
+            function (str): Function name.
+            params (Dict[str, Any], optional): Named arguments.
+
+        Returns:
+            Any: The function's result, usually a list of rows.
+        """
+        self.stats["rpc_calls"] += 1
+        return await self._request("POST", f"/rpc/{function}", json=params or {})
+
+    async def rpc_many(self, calls: Iterable[Tuple[str, Dict[str, Any]]], concurrency: int = 8) -> List[Any]:
+        """
+        Call several Postgres functions concurrently.
+
+        Args:
+            calls (Iterable[Tuple[str, Dict[str, Any]]]): ``(function, params)`` pairs.
+            concurrency (int): Most calls in flight at once.
+
+        Returns:
+            List[Any]: Results in the order of ``calls``.
+        """
+        semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+        async def call(function: str, params: Dict[str, Any]):
+            async with semaphore:
+                return await self.rpc(function, params)
+
+        return list(await asyncio.gather(*(call(function, params) for function, params in calls)))
+
+    async def select(self, table: str, columns: str = "*", filters: Dict[str, Any] = None, limit: int = None, order: str = None) -> List[Dict[str, Any]]:
+        """
+        Read rows from a table or view.
+
+        Args:
+            table (str): Table or view name.
+            columns (str): PostgREST ``select`` expression.
+            filters (Dict[str, Any], optional): Column values to match; see ``build_filters``.
+            limit (int, optional): Most rows returned.
+            order (str, optional): PostgREST ``order`` expression, e.g. ``"updated_at.desc"``.
+
+        Returns:
+            List[Dict[str, Any]]: The matching rows.
+        """
+        params = {"select": columns, **build_filters(filters)}
+        if limit is not None:
+            params["limit"] = str(limit)
+        if order:
+            params["order"] = order
+        return await self._request("GET", f"/{table}", params=params) or []
+
+    async def insert(self, table: str, rows: Any, returning: bool = False) -> List[Dict[str, Any]]:
+        """
+        Insert one row or a list of rows, one request per ``chunk_size`` rows.
+
+        Args:
+            table (str): Table name.
+            rows (Dict | List[Dict]): The rows.
+            returning (bool): Return the inserted rows, e.g. to read generated ids.
+
+        Returns:
+            List[Dict[str, Any]]: Inserted rows if ``returning``, otherwise empty.
+        """
+        return await self._write("POST", table, rows, "return=representation" if returning else "return=minimal", {})
+
+    async def upsert(self, table: str, rows: Any, on_conflict: str = "id", returning: bool = False) -> List[Dict[str, Any]]:
+        """
+        Insert rows, updating the given columns of rows that already exist.
+
+        Rows are grouped by their set of columns so a row never resets columns it does not mention.
+
+        Args:
+            table (str): Table name.
+            rows (Dict | List[Dict]): The rows.
+            on_conflict (str): Column(s) identifying existing rows.
+            returning (bool): Return the written rows.
+
+        Returns:
+            List[Dict[str, Any]]: Written rows if ``returning``, otherwise empty.
+        """
+        rows = [rows] if isinstance(rows, dict) else list(rows)
+        prefer = "resolution=merge-duplicates," + ("return=representation" if returning else "return=minimal")
+        groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+        for row in rows:
+            groups.setdefault(tuple(sorted(row)), []).append(row)
+        written = []
+        for group in groups.values():
+            written.extend(await self._write("POST", table, group, prefer, {"on_conflict": on_conflict}))
+        return written
+
+    async def update(self, table: str, values: Dict[str, Any], filters: Dict[str, Any], returning: bool = False) -> List[Dict[str, Any]]:
+        """
+        Set the same values on every row matching ``filters``.
+
+        Raises:
+            ValueError: If no filters are given, which would update the whole table.
+        """
+        if not filters:
+            raise ValueError(f"Refusing to update every row of {table}")
+        result = await self._request(
+            "PATCH", f"/{table}", params=build_filters(filters), json=values,
+            prefer="return=representation" if returning else "return=minimal"
+        )
+        return result or []
+
+    async def delete(self, table: str, filters: Dict[str, Any]) -> None:
+        """
+        Delete rows matching ``filters``; a list of values deletes many rows in one request per ``chunk_size`` values.
+
+        Raises:
+            ValueError: If no filters are given, which would delete the whole table.
+        """
+        if not filters:
+            raise ValueError(f"Refusing to delete every row of {table}")
+        list_columns = [column for column, value in filters.items() if isinstance(value, (list, tuple, set))]
+        if len(list_columns) != 1:
+            await self._request("DELETE", f"/{table}", params=build_filters(filters), prefer="return=minimal")
+            return
+        column = list_columns[0]
+        values = list(filters[column])
+        for chunk in self._chunks(values):
+            await self._request("DELETE", f"/{table}", params=build_filters({**filters, column: chunk}), prefer="return=minimal")
+            self.stats["rows_deleted"] += len(chunk)
+
+    async def _write(self, method: str, table: str, rows: Any, prefer: str, params: Dict[str, str]) -> List[Dict[str, Any]]:
+        rows = [rows] if isinstance(rows, dict) else list(rows)
+        written = []
+        for chunk in self._chunks(rows):
+            result = await self._request(method, f"/{table}", params=params, json=chunk, prefer=prefer)
+            self.stats["rows_written"] += len(chunk)
+            if result:
+                written.extend(result)
+        return written
+
+    def _chunks(self, items: Sequence[Any]) -> Iterable[Sequence[Any]]:
+        for i in range(0, len(items), self.chunk_size):
+            yield items[i:i + self.chunk_size]
+
+    def get_stats(self) -> Dict[str, int]:
+        return dict(self.stats)
+
+    async def close(self):
+        """Close pooled connections; the next request opens a new pool."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
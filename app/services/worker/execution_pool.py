@@ -0,0 +1,219 @@
+import asyncio
+import time
+from collections import OrderedDict, deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+from app.logging_config import configure_logger
+from app.services.profiling import tag_session
+
+INTERACTIVE = "interactive"
+BATCH = "batch"
+
+
+class PoolJob:
+    """A unit of work waiting for, or holding, an execution slot."""
+
+    def __init__(self, factory: Callable[[], Awaitable[Any]], session_id: str, lane: str, timeout: Optional[float], name: str, future: asyncio.Future):
+        self.factory = factory
+        self.session_id = session_id
+        self.lane = lane
+        self.timeout = timeout
+        self.name = name
+        self.future = future
+        self.enqueued_at = time.monotonic()
+
+
+class ExecutionPool:
+    """
+    Bounded pool for long-running task executions such as agent runs.
+
+    At most ``max_concurrent`` jobs run at once. Waiting jobs are grouped into
+    priority lanes; lanes are served by weighted round-robin so batch work still
+    progresses while interactive work is preferred. Within a lane, sessions take
+    turns, so one session with hundreds of queued tasks cannot starve the others.
+    """
+
+    def __init__(self, max_concurrent: int = 10, max_backlog: int = 100, task_timeout: Optional[float] = 300, lane_weights: Optional[Dict[str, int]] = None):
+        """
+        Initialize the ExecutionPool.
+
+        Args:
+            max_concurrent (int): Maximum number of jobs running at once.
+            max_backlog (int): Queued jobs at which the pool reports itself saturated.
+            task_timeout (float, optional): Default per-job timeout in seconds.
+            lane_weights (Dict[str, int], optional): Jobs taken from each lane per round, highest priority first.
+        """
+        self.logger = configure_logger(f"{self.__class__.__module__}.{self.__class__.__name__}")
+        self.max_concurrent = max_concurrent
+        self.max_backlog = max_backlog
+        self.task_timeout = task_timeout
+        self.lane_weights = lane_weights or {INTERACTIVE: 3, BATCH: 1}
+        # lane -> session_id -> jobs; the OrderedDict order is the session rotation
+        self._lanes: Dict[str, "OrderedDict[str, Deque[PoolJob]]"] = {lane: OrderedDict() for lane in self.lane_weights}
+        self._credits = dict(self.lane_weights)
+        self._running: Dict[asyncio.Task, PoolJob] = {}
+        self._queued = 0
+        self._closed = False
+        self.stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "timed_out": 0,
+            "max_queued": 0,
+            "total_wait_seconds": 0.0,
+        }
+
+    def submit(self, factory: Callable[[], Awaitable[Any]], session_id: Optional[str] = None, lane: str = INTERACTIVE, timeout: Optional[float] = None, name: Optional[str] = None) -> asyncio.Future:
+        """
+        Queue a job and return a future for its result.
+
+        The coroutine is only created when a slot frees up, so queued jobs hold
+        no resources beyond their arguments.
+
+        Args:
+            factory (Callable): Returns the coroutine to run.
+            session_id (str, optional): Session the job belongs to, for fairness.
+            lane (str): Priority lane; unknown lanes fall back to the lowest priority one.
+            timeout (float, optional): Overrides the pool's default timeout; 0 runs the job without a deadline.
+            name (str, optional): Name used in logs.
+
+        Returns:
+            asyncio.Future: Resolves with the job's result or exception.
+        """
+        if self._closed:
+            raise RuntimeError("ExecutionPool is shut down")
+        if lane not in self._lanes:
+            lane = list(self._lanes)[-1]
+        job = PoolJob(
+            factory=factory,
+            session_id=session_id or "default",
+            lane=lane,
+            timeout=self.task_timeout if timeout is None else timeout,
+            name=name or getattr(factory, "__name__", "job"),
+            future=asyncio.get_running_loop().create_future()
+        )
+        # Failures are logged here; mark them retrieved for fire-and-forget callers
+        job.future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._lanes[lane].setdefault(job.session_id, deque()).append(job)
+        self._queued += 1
+        self.stats["submitted"] += 1
+        self.stats["max_queued"] = max(self.stats["max_queued"], self._queued)
+        self._fill_slots()
+        return job.future
+
+    async def run(self, factory: Callable[[], Awaitable[Any]], **kwargs) -> Any:
+        """Submit a job and wait for its result."""
+        return await self.submit(factory, **kwargs)
+
+    @property
+    def running(self) -> int:
+        return len(self._running)
+
+    @property
+    def queued(self) -> int:
+        return self._queued
+
+    def is_saturated(self) -> bool:
+        """True while every slot is busy and the backlog is at its limit; safe to call from other threads."""
+        return len(self._running) >= self.max_concurrent and self._queued >= self.max_backlog
+
+    def _next_job(self) -> Optional[PoolJob]:
+        lanes = [lane for lane, sessions in self._lanes.items() if sessions]
+        if not lanes:
+            return None
+        # Weighted round-robin: a lane with credit left goes first; refill once all are spent
+        lane = next((lane for lane in lanes if self._credits[lane] > 0), None)
+        if lane is None:
+            self._credits = dict(self.lane_weights)
+            lane = lanes[0]
+        self._credits[lane] -= 1
+
+        sessions = self._lanes[lane]
+        session_id, jobs = next(iter(sessions.items()))
+        job = jobs.popleft()
+        if jobs:
+            sessions.move_to_end(session_id)
+        else:
+            del sessions[session_id]
+        self._queued -= 1
+        return job
+
+    def _fill_slots(self):
+        while len(self._running) < self.max_concurrent:
+            job = self._next_job()
+            if job is None:
+                return
+            if job.future.cancelled():
+                continue
+            self.stats["total_wait_seconds"] += time.monotonic() - job.enqueued_at
+            task = asyncio.create_task(self._run_job(job), name=f"pool:{job.name}")
+            self._running[task] = job
+            task.add_done_callback(self._on_done)
+
+    async def _run_job(self, job: PoolJob):
+        tag_session(job.session_id)
+        deadline = asyncio.timeout(job.timeout) if job.timeout else None
+        try:
+            if deadline is not None:
+                async with deadline:
+                    result = await job.factory()
+            else:
+                result = await job.factory()
+            self.stats["completed"] += 1
+            if not job.future.done():
+                job.future.set_result(result)
+        except TimeoutError as e:
+            # Only the pool's own deadline is a timeout; a TimeoutError raised by the job is a failure
+            if deadline is None or not deadline.expired():
+                self._fail(job, e)
+                return
+            self.stats["timed_out"] += 1
+            self.logger.error(f"Job {job.name} for session {job.session_id} timed out after {job.timeout}s")
+            if not job.future.done():
+                job.future.set_exception(asyncio.TimeoutError(f"{job.name} timed out after {job.timeout}s"))
+        except asyncio.CancelledError:
+            if not job.future.done():
+                job.future.cancel()
+            raise
+        except Exception as e:
+            self._fail(job, e)
+
+    def _fail(self, job: PoolJob, error: Exception):
+        self.stats["failed"] += 1
+        self.logger.error(f"Job {job.name} for session {job.session_id} failed: {str(error)}")
+        if not job.future.done():
+            job.future.set_exception(error)
+
+    def _on_done(self, task: asyncio.Task):
+        self._running.pop(task, None)
+        if not self._closed:
+            self._fill_slots()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get pool occupancy and outcome counters.
+
+        Returns:
+            Dict[str, Any]: Counters plus running jobs, queued jobs per lane and average queue wait.
+        """
+        stats = dict(self.stats)
+        stats["running"] = self.running
+        stats["queued"] = {lane: sum(len(jobs) for jobs in sessions.values()) for lane, sessions in self._lanes.items()}
+        stats["sessions_waiting"] = len({session for sessions in self._lanes.values() for session in sessions})
+        started = stats["submitted"] - self._queued
+        stats["avg_wait_seconds"] = stats["total_wait_seconds"] / started if started else 0.0
+        stats["saturated"] = self.is_saturated()
+        return stats
+
+    async def shutdown(self, timeout: float = 10.0):
+        """Cancel queued jobs and wait up to ``timeout`` seconds for running ones."""
+        self._closed = True
+        for sessions in self._lanes.values():
+            for jobs in sessions.values():
+                for job in jobs:
+                    job.future.cancel()
+            sessions.clear()
+        self._queued = 0
+        if self._running:
+            _, pending = await asyncio.wait(list(self._running), timeout=timeout)
+            for task in pending:
+                task.cancel()
@@ -1,8 +1,9 @@
-from typing import Any, Dict, Optional
+from typing import Any, Awaitable, Callable, Dict, Optional
 import asyncio
 import uuid
 from app.config.service_config import ServiceConfig
 from app.services.cache.redis import RedisService
+from app.services.worker.execution_pool import BATCH, INTERACTIVE, ExecutionPool
 from app.interfaces.service import IService
 from app.logging_config import configure_logger
 
@@ -14,8 +15,9 @@ class Worker(IService):
         """
         Start the Worker service.
         """
-        # Startup logic here
-        pass
+        # Stop taking work off Kafka while the execution pool is full
+        from containers import get_container
+        get_container().kafka().add_backpressure_source(self.pool.is_saturated)
     _instance = None
 
     def __init__(self, name: str, worker_uuid: str, config: ServiceConfig, **kwargs):
@@ -28,6 +30,17 @@ class Worker(IService):
         self.logger.info(f"Worker initialized with instance_id: {self.worker_uuid}")
         self.is_active = False
         self.task_queue = asyncio.Queue()
+        config = config or {}
+        self.default_lane = config.get('default_lane', INTERACTIVE)
+        self.pool = ExecutionPool(
+            max_concurrent=config.get('max_tasks', 10),
+            max_backlog=config.get('max_backlog', 100),
+            task_timeout=config.get('task_timeout', 300),
+            lane_weights={
+                INTERACTIVE: config.get('interactive_weight', 3),
+                BATCH: config.get('batch_weight', 1)
+            }
+        )
 
     async def _initialize_service(self, worker_uuid: Optional[str] = None):
         self.worker_uuid = worker_uuid or str(uuid.uuid4())
@@ -52,8 +65,35 @@ class Worker(IService):
                 self.logger.error(f"Error processing task: {str(e)}")
 
     async def execute_task(self, task):
-        # Implement task execution logic here
-        pass
+        """
+        Run a queued task through the execution pool.
+
+        Args:
+            task: A zero-argument callable returning a coroutine, or a dict with
+                ``factory`` and optional ``session_id``, ``lane``, ``timeout`` and ``name``.
+        """
+        if callable(task):
+            task = {'factory': task}
+        self.submit(**task)
+
+    def submit(self, factory: Callable[[], Awaitable[Any]], session_id: Optional[str] = None, lane: Optional[str] = None, timeout: Optional[float] = None, name: Optional[str] = None) -> asyncio.Future:
+        """
+        Queue work on this worker's bounded execution pool.
+
+        Args:
+            factory (Callable): Returns the coroutine to run once a slot is free.
+            session_id (str, optional): Session the work belongs to; sessions take turns.
+            lane (str, optional): "interactive" or "batch"; defaults to the worker's default lane.
+            timeout (float, optional): Overrides ``task_timeout`` for this job; 0 disables the deadline.
+            name (str, optional): Name used in logs.
+
+        Returns:
+            asyncio.Future: Resolves with the result of the work.
+        """
+        return self.pool.submit(factory, session_id=session_id, lane=lane or self.default_lane, timeout=timeout, name=name)
+
+    def get_pool_stats(self) -> Dict[str, Any]:
+        return self.pool.get_stats()
 
     async def add_task(self, task):
         await self.task_queue.put(task)
@@ -63,6 +103,7 @@ class Worker(IService):
         self.is_active = False
         await self.leave()
         await self.task_queue.join()
+        await self.pool.shutdown()
         self.logger.debug("Worker service shut down successfully")
 
     @classmethod
@@ -6,7 +6,7 @@ from pydantic import Field
 from typing import Dict, Any, List, ClassVar, Literal, Union
 from app.tools.base_tool import BaseTool
 from app.logging_config import configure_logger
-from app.services.supabase.supabase import Supabase, Client
+from app.services.supabase.rest_client import SupabaseRestClient
 from app.models.Report import (
     Report, Condition, Letter, Checklist, MentalCAndPTips,
     OnlineFilingGuide, FullLetter, FAQ, GlossaryItem, ResearchItem,
@@ -255,20 +255,22 @@ class CompileDocument(BaseTool):
                 letters = [Letter(**letter) for letter in letters_data]
         return letters
 
-    async def _get_existing_report(self, client: Client, user_id: str) -> Dict[str, Any]:
+    async def _get_existing_report(self, client: SupabaseRestClient, user_id: str) -> Dict[str, Any]:
         """
         Helper method to get existing report from database.
-        Returns both the report data and its ID.
+        Returns both the report data and its ID, through the read cache.
         """
-        result = client.from_("decrypted_reports").select("id, decrypted_report").eq("user_id", user_id).single().execute()
-        if not result.data:
-            return None
-        
-        report_data = json.loads(result.data['decrypted_report'])
-        return {
-            'data': report_data,
-            'id': result.data['id']
-        }
+        async def load():
+            rows = await client.select("decrypted_reports", "id,decrypted_report", filters={"user_id": user_id}, limit=1)
+            if not rows:
+                return None
+            return {
+                'data': json.loads(rows[0]['decrypted_report']),
+                'id': rows[0]['id']
+            }
+
+        from containers import get_container
+        return await get_container().db().cached('reports', user_id, 'decrypted_report', load)
 
     async def run(self) -> Dict[str, Any]:
         """
@@ -296,7 +298,8 @@ class CompileDocument(BaseTool):
                 self._logger.error(f"Invalid UUID format for user_id: {user_id}")
                 raise ValueError("Invalid UUID format for user_id")
             
-            client: Client = Supabase.supabase
+            from containers import get_container
+            client: SupabaseRestClient = get_container().db().rest
 
             # Get existing report if it exists
             existing_report_wrapper = await self._get_existing_report(client, user_id)
@@ -436,14 +439,12 @@ class CompileDocument(BaseTool):
             
             if self.mode == 'publish':
                 if report_id:
-                    result = client.from_("reports").update(record).eq("id", report_id).execute()
+                    await client.update("reports", record, {"id": report_id})
                 else:
-                    result = client.from_("reports").insert(record).execute()
-                    report_id = result.data[0]['id']
-                    
-                    # Fetch the complete document after update
-                    final_result = client.from_("decrypted_reports").select("decrypted_report").eq("id", report_id).single().execute()
-                    final_document = json.loads(final_result.data['decrypted_report']) if final_result.data else None
+                    inserted = await client.insert("reports", record, returning=True)
+                    report_id = inserted[0]['id']
+                from containers import get_container
+                await get_container().db().invalidate('reports', user_id)
                 
             
             final_document = updated_report.dict()
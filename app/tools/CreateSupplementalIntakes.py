@@ -36,6 +36,10 @@ class CreateSupplementalIntakes(BaseTool):
                     }
                 }).execute()
                 results.append(f"Supplemental Intake for {condition} created.")
+
+            if self.conditions:
+                from containers import get_container
+                get_container().db().invalidate_blocking('forms', self.user_id)
                 
         except Exception as e:
             self._logger.error(f"Error running {self.__class__.__name__} tool: {str(e)} with traceback: {e.__traceback__}")
@@ -4,7 +4,6 @@ from typing import Literal
 from pydantic import Field
 import spacy
 from supabase import create_client
-from app.services.supabase.supabase import Supabase
 from presidio_analyzer import AnalyzerEngine
 from presidio_analyzer.nlp_engine import NlpEngineProvider
 from app.tools.base_tool import BaseTool
@@ -23,11 +22,13 @@ class GetIntake(BaseTool):
             analyzer.nlp_engine = "spacy"
             analyzer.language = "en"
             
-            # Fetch data from Supabase
-            response = Supabase.supabase.table("decrypted_forms").select("decrypted_form").eq("user_id", self.user_id).eq("type", self.type).execute()
-            
-            # Assuming the data is accessed via a method like .data()
-            results = response.data
+            # Fetch data from Supabase through the read cache; this runs in a worker thread
+            from containers import get_container
+            db = get_container().db()
+            results = db.cached_blocking(
+                'forms', self.user_id, f"decrypted_forms:{self.type}",
+                lambda: db.rest.select("decrypted_forms", "decrypted_form", {"user_id": self.user_id, "type": self.type})
+            )
             for result in results:
                 self._logger.info(f"{self.__class__.__name__} form: {result['decrypted_form']}")
                 
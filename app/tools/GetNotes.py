@@ -3,7 +3,6 @@ import logging
 from typing import Literal
 from pydantic import Field
 from supabase import create_client
-from app.services.supabase.supabase import Supabase
 from presidio_analyzer import AnalyzerEngine
 from app.tools.base_tool import BaseTool
 from app.logging_config import configure_logger
@@ -21,11 +20,13 @@ class GetNotes(BaseTool):
             analyzer.nlp_engine = "spacy"
             analyzer.language = "en"
             
-            # Fetch data from Supabase
-            response = Supabase.supabase.table("decrypted_notes").select("decrypted_note").eq("user_id", self.user_id).execute()
-            
-            # Assuming the data is accessed via a method like .data()
-            results = response.data
+            # Fetch data from Supabase through the read cache; this runs in a worker thread
+            from containers import get_container
+            db = get_container().db()
+            results = db.cached_blocking(
+                'notes', self.user_id, "decrypted_notes",
+                lambda: db.rest.select("decrypted_notes", "decrypted_note", {"user_id": self.user_id})
+            )
             for result in results:
                 self._logger.info(f"{self.__class__.__name__} form: {result['decrypted_note']}")
                 
@@ -3,7 +3,6 @@ import logging
 from typing import Literal
 from pydantic import Field
 from supabase import create_client
-from app.services.supabase.supabase import Supabase
 from presidio_analyzer import AnalyzerEngine
 from app.tools.base_tool import BaseTool
 
@@ -19,11 +18,13 @@ class GetSupplemental(BaseTool):
             analyzer.nlp_engine = "spacy"
             analyzer.language = "en"
             
-            # Fetch data from Supabase
-            response = Supabase.supabase.table("decrypted_forms").select("decrypted_form").eq("user_id", self.user_id).eq("type", self.type).execute()
-            
-            # Assuming the data is accessed via a method like .data()
-            results = response.data
+            # Fetch data from Supabase through the read cache; this runs in a worker thread
+            from containers import get_container
+            db = get_container().db()
+            results = db.cached_blocking(
+                'forms', self.user_id, f"decrypted_forms:{self.type}",
+                lambda: db.rest.select("decrypted_forms", "decrypted_form", {"user_id": self.user_id, "type": self.type})
+            )
             for result in results:
                 self._logger.info(f"{self.__class__.__name__} form: {result['decrypted_form']}")
                 
@@ -52,7 +52,7 @@ class SaveOutput(BaseTool):
             logger.info(f"Generating embeddings for context: {context}")
             
             # Convert the entire context dictionary to a string for embedding
-            embeddings = redis.generate_embeddings(context, ["session_id", "context_key", "parent_id", "output_name", "output_description", "output"])
+            embeddings = await redis.async_generate_embeddings(context, ["session_id", "context_key", "parent_id", "output_name", "output_description", "output"])
             
             if embeddings is None or "metadata_vector" not in embeddings:
                 logger.error("Failed to generate embeddings")
@@ -76,13 +76,13 @@ class SaveOutput(BaseTool):
             
             # Publish the output to subscribers
             subscribers = await redis.client.smembers(f"node:{self.id}:subscribers")
-            for subscriber in subscribers:
-                await redis.client.publish(subscriber, json.dumps({
-                    "type": "output_update",
-                    "source_node": self.id,
-                    "output_name": self.output_name,
-                    "value": self.output[self.output_name]
-                }))
+            message = json.dumps({
+                "type": "output_update",
+                "source_node": self.id,
+                "output_name": self.output_name,
+                "value": self.output[self.output_name]
+            })
+            await redis.publish_many([(subscriber, message) for subscriber in subscribers])
             
             logger.info(f"Output published to {len(subscribers)} subscribers")
             
@@ -49,6 +49,10 @@ class SaveUserMeta(BaseTool):
                 except Exception as e:
                     configure_logger("SaveUserMeta").error(f"Error saving user meta for user_id: {self.user_id} with meta {self.meta}: {str(e)}")
                     raise e    
+            if responses:
+                # Database reads user_meta through the read cache
+                from containers import get_container
+                get_container().db().invalidate_blocking('user_meta', self.user_id)
             results = "\n".join([str(response.data) for response in responses])
         except Exception as e:
             configure_logger("SaveUserMeta").error(f"Error running {self.__class__.__name__} tool: {str(e)} with traceback: {e.__traceback__}")
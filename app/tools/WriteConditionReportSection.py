@@ -138,4 +138,7 @@ class WriteConditionReportSection(BaseTool):
         """Save the report to the reports table"""
         client: Client = Supabase.supabase
         result = client.from_("reports").upsert(report.dict()).execute()
+        # CompileDocument reads reports through the cache; drop the copy this write made stale
+        from containers import get_container
+        await get_container().db().invalidate('reports', self.request.user_id)
         return result
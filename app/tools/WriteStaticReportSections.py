@@ -421,6 +421,9 @@ To contest a claim:
             # Convert report to dict but preserve the original user_id
             report_dict = report.dict()
             result = client.from_("reports").upsert(report_dict).execute()
+            # CompileDocument reads reports through the cache; drop the copy this write made stale
+            from containers import get_container
+            await get_container().db().invalidate('reports', self.user_id)
             return result
         except Exception as e:
             logger = configure_logger(self.__class__.__name__)
@@ -1,6 +1,10 @@
+import copy
+import importlib
+import json
 import os
+import weakref
 from abc import ABC, abstractmethod
-from typing import Any, ClassVar, List
+from typing import Any, ClassVar, Dict, List, Tuple
 from functools import wraps
 
 from docstring_parser import parse
@@ -22,6 +26,15 @@ def logged_run(func):
         return await decorated_run(self, *args, **kwargs)
     return wrapper
 
+# tool class -> (fingerprint, schema, canonical tool JSON); weak so tools built by ToolFactory can be collected
+_schema_cache: "weakref.WeakKeyDictionary[type, Tuple[Tuple, Dict[str, Any], str]]" = weakref.WeakKeyDictionary()
+
+
+def canonical_json(value: Any) -> str:
+    """Serialize a value with sorted keys and no whitespace, so equal structures give equal strings."""
+    return json.dumps(value, sort_keys=True, separators=(',', ':'), default=str)
+
+
 class BaseTool(BaseModel, ABC):
     _shared_state: ClassVar[SharedState] = None
     _caller_agent: Any = None
@@ -43,7 +56,7 @@ class BaseTool(BaseModel, ABC):
     def _configure_logger(self, session_id: str = None, task_name: str = None):
         """Configure logger with proper folder structure for tool calls"""
         
-        from app.logging_config import configure_logger
+        from app.logging_config import configure_logger, ensure_log_dir
         if not session_id:
             return configure_logger(self.__name__, task_name)
 
@@ -59,8 +72,8 @@ class BaseTool(BaseModel, ABC):
             'tasks'
         )
         
-        # Create directory structure
-        os.makedirs(log_path, exist_ok=True)
+        # Create directory structure; once per path rather than per tool instance
+        ensure_log_dir(log_path)
         
         # Get or create logger
         logger = configure_logger(self.__name__, task_name, session_id=session_id)
@@ -70,6 +83,7 @@ class BaseTool(BaseModel, ABC):
     class ToolConfig:
         strict: bool = False
         one_call_at_a_time: bool = False
+        max_concurrency: int = None  # calls of this tool running at once within a run; the thread's limit when None
 
     @classmethod
     @property
@@ -81,8 +95,37 @@ class BaseTool(BaseModel, ABC):
             Its important to add a docstring to describe how to best use this class, it will be included in the description attribute and be part of the prompt.
 
         Returns:
-            model_json_schema (dict): A dictionary in the format of OpenAI's schema as jsonschema
+            model_json_schema (dict): A dictionary in the format of OpenAI's schema as jsonschema; a copy of the cached schema
+        """
+        return copy.deepcopy(cls._cached_schema()[1])
+
+    @classmethod
+    @property
+    def openai_tool_json(cls) -> str:
+        """
+        Return the canonical JSON of the ``{"type": "function", "function": schema}`` tool entry.
+
+        Computed once per class, for cheap comparisons against a remote assistant's tools.
         """
+        return cls._cached_schema()[2]
+
+    @classmethod
+    def _schema_fingerprint(cls) -> Tuple:
+        # Everything the schema is derived from; model_rebuild() replaces the core schema.
+        # The core schema itself rather than its id, so a new one at a reused address still counts as changed.
+        return (cls.__doc__, getattr(cls.ToolConfig, "strict", False), getattr(cls, "__pydantic_core_schema__", None))
+
+    @classmethod
+    def _cached_schema(cls) -> Tuple[Tuple, Dict[str, Any], str]:
+        fingerprint = cls._schema_fingerprint()
+        entry = _schema_cache.get(cls)
+        if entry is None or entry[0] != fingerprint:
+            schema = cls._build_openai_schema()
+            entry = _schema_cache[cls] = (fingerprint, schema, canonical_json({"type": "function", "function": schema}))
+        return entry
+
+    @classmethod
+    def _build_openai_schema(cls) -> Dict[str, Any]:
         schema = cls.model_json_schema()
         docstring = parse(cls.__doc__ or "")
         parameters = {
@@ -127,10 +170,48 @@ class BaseTool(BaseModel, ABC):
             
         return schema
 
+    @classmethod
+    def clear_schema_cache(cls):
+        """Drop the cached schema of this class, or of every tool when called on BaseTool."""
+        if cls is BaseTool:
+            _schema_cache.clear()
+        else:
+            _schema_cache.pop(cls, None)
+
     @abstractmethod
     @logged_run
     async def run(self, **kwargs):
         """
         Abstract run method to be implemented by subclasses.
         """
-        pass
\ No newline at end of file
+        pass
+
+
+def warm_schema_cache(module_name: str = "app.tools") -> int:
+    """
+    Build the cached schema of every tool exported by a module.
+
+    Called at startup so the first agent initializations do not pay for
+    schema generation and docstring parsing.
+
+    Args:
+        module_name (str): Module whose BaseTool subclasses are warmed.
+
+    Returns:
+        int: Number of tools whose schema was built.
+    """
+    from app.logging_config import configure_logger
+    logger = configure_logger(__name__)
+    module = importlib.import_module(module_name)
+    warmed = 0
+    for name in dir(module):
+        tool = getattr(module, name)
+        if not isinstance(tool, type) or not issubclass(tool, BaseTool) or tool is BaseTool:
+            continue
+        try:
+            tool._cached_schema()
+            warmed += 1
+        except Exception as e:
+            logger.warning(f"Could not build schema for tool {name}: {str(e)}")
+    logger.info(f"Warmed schema cache for {warmed} tools")
+    return warmed
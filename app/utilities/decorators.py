@@ -3,6 +3,14 @@ import json
 from typing import Any, Callable
 import logging
 from datetime import datetime
+from app.debug_log import payload
+
+def _log_safe_value(value: Any) -> Any:
+    # Convert value to string if it's not a basic type
+    return value if isinstance(value, (str, int, float, bool, list, dict)) else str(value)
+
+def _log_safe(kwargs: dict) -> dict:
+    return {k: _log_safe_value(v) for k, v in kwargs.items()}
 
 def log_io(logger: logging.Logger) -> Callable:
     """
@@ -20,31 +28,16 @@ def log_io(logger: logging.Logger) -> Callable:
             # Generate timestamp for the log entry
             timestamp = datetime.utcnow().isoformat()
             
-            # Prepare input parameters for logging
-            # Filter out any sensitive or large data
-            log_safe_kwargs = {
-                k: str(v) if not isinstance(v, (str, int, float, bool, list, dict)) else v
-                for k, v in kwargs.items()
-            }
-            
-            # Log the input
+            # Log the input; parameters are only serialized, capped, if DEBUG is enabled
             logger.info(f"[{timestamp}] Function Call: {func.__name__}")
-            logger.debug(f"[{timestamp}] Input Parameters: {json.dumps(log_safe_kwargs, default=str)}")
+            logger.debug("[%s] Input Parameters: %s", timestamp, payload(lambda: _log_safe(kwargs)))
             
             try:
                 # Execute the function
                 result = await func(*args, **kwargs)
                 
-                # Prepare result for logging
-                # Convert result to string if it's not a basic type
-                log_safe_result = (
-                    str(result) 
-                    if not isinstance(result, (str, int, float, bool, list, dict)) 
-                    else result
-                )
-                
                 # Log the output
-                logger.debug(f"[{timestamp}] Output: {json.dumps(log_safe_result, default=str)}")
+                logger.debug("[%s] Output: %s", timestamp, payload(lambda: json.dumps(_log_safe_value(result), default=str)))
                 return result
                 
             except Exception as e:
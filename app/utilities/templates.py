@@ -0,0 +1,176 @@
+import re
+import string
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+FORMAT = "format"
+PLACEHOLDER = "placeholder"
+
+_PLACEHOLDER_PATTERN = re.compile(r"\{([^{}]+)\}")
+# A format field name is its key followed by any ".attribute" or "[index]" steps
+_FIELD_KEY_PATTERN = re.compile(r"[^.\[]*")
+_formatter = string.Formatter()
+
+
+class TemplateValues:
+    """
+    Values a template is rendered from, formatted lazily and at most once per key.
+
+    One instance can be shared by every template rendered against the same
+    context, e.g. all items of a task expansion, so each referenced value is
+    stringified once no matter how many templates or items use it.
+    """
+
+    def __init__(self, context: Dict[str, Any], format_value: Optional[Callable[[Any], Any]] = None):
+        """
+        Initialize the TemplateValues.
+
+        Args:
+            context (Dict[str, Any]): The values by name; not copied.
+            format_value (Callable, optional): Converts a raw value into what is substituted; values are used as-is when omitted.
+        """
+        self.context = context
+        self.format_value = format_value or (lambda value: value)
+        self._formatted: Dict[str, Any] = {}
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.context
+
+    def get(self, key: str) -> Any:
+        """Get the formatted value of a key, raising KeyError if it is not in the context."""
+        try:
+            return self._formatted[key]
+        except KeyError:
+            value = self._formatted[key] = self.format_value(self.context[key])
+            return value
+
+
+class _Lookup:
+    """Mapping handed to ``str.format_map`` that resolves each referenced key once per render."""
+
+    def __init__(self, values: TemplateValues, overrides: Dict[str, Any]):
+        self.values = values
+        self.overrides = overrides
+        self._resolved: Dict[str, Any] = {}
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return self._resolved[key]
+        except KeyError:
+            pass
+        if key in self.overrides:
+            value = self.values.format_value(self.overrides[key])
+        else:
+            value = self.values.get(key)
+        self._resolved[key] = value
+        return value
+
+
+class CompiledTemplate:
+    """
+    A template parsed once for the keys it references.
+
+    Two styles are supported:
+
+    - ``format``: ``str.format`` syntax, including ``{{`` escapes, conversions,
+      format specs and ``{key[0]}``/``{key.attr}`` access. Rendering fails if a
+      referenced key is missing, like ``str.format``.
+    - ``placeholder``: plain ``{key}`` substitution; placeholders whose key is
+      missing, and any other braces, are left as they are.
+
+    Only the keys the template references are ever looked up or formatted.
+    """
+
+    def __init__(self, source: str, style: str = FORMAT):
+        """
+        Initialize the CompiledTemplate.
+
+        Args:
+            source (str): The template text.
+            style (str): ``format`` or ``placeholder``.
+
+        Raises:
+            ValueError: If a ``format`` template is malformed, e.g. has an unmatched brace.
+        """
+        self.source = source
+        self.style = style
+        # Placeholder style only: (literal, key) pairs; the key is None for the trailing literal
+        self.segments: List[Tuple[str, Optional[str]]] = []
+        self.fields: Set[str] = set()
+        if style == FORMAT:
+            self._add_format_fields(source)
+        elif style == PLACEHOLDER:
+            position = 0
+            for match in _PLACEHOLDER_PATTERN.finditer(source):
+                self.segments.append((source[position:match.start()], match.group(1)))
+                self.fields.add(match.group(1))
+                position = match.end()
+            self.segments.append((source[position:], None))
+        else:
+            raise ValueError(f"Unknown template style: {style}")
+
+    def _add_format_fields(self, source: str):
+        for _, field_name, format_spec, _ in _formatter.parse(source):
+            if field_name is not None:
+                self.fields.add(_FIELD_KEY_PATTERN.match(field_name).group(0))
+            if format_spec and '{' in format_spec:
+                # e.g. {value:{width}}; the spec's own fields are referenced too
+                self._add_format_fields(format_spec)
+
+    def missing(self, values: TemplateValues, overrides: Optional[Dict[str, Any]] = None) -> List[str]:
+        """
+        List the referenced keys that neither the overrides nor the values provide.
+
+        Args:
+            values (TemplateValues): The shared values.
+            overrides (Dict[str, Any], optional): Per-render values that take precedence.
+
+        Returns:
+            List[str]: Missing keys, sorted.
+        """
+        overrides = overrides or {}
+        return sorted(field for field in self.fields if field not in overrides and field not in values)
+
+    def render(self, values: TemplateValues, overrides: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Render the template.
+
+        Args:
+            values (TemplateValues): The shared values.
+            overrides (Dict[str, Any], optional): Per-render values that take precedence;
+                formatted with ``values.format_value`` but not memoized across renders.
+
+        Returns:
+            str: The rendered text.
+
+        Raises:
+            KeyError: If a ``format`` template references a missing key.
+        """
+        lookup = _Lookup(values, overrides or {})
+        if self.style == FORMAT:
+            return self.source.format_map(lookup)
+
+        parts = []
+        for literal, key in self.segments:
+            parts.append(literal)
+            if key is not None:
+                parts.append(str(lookup[key]) if key in lookup.overrides or key in values else f"{{{key}}}")
+        return "".join(parts)
+
+
+@lru_cache(maxsize=1024)
+def compile_template(source: str, style: str = FORMAT) -> CompiledTemplate:
+    """
+    Get the compiled form of a template, parsing it on first use.
+
+    Expanded tasks share their parent's templates, so each distinct template is
+    parsed once per process.
+
+    Args:
+        source (str): The template text.
+        style (str): ``format`` or ``placeholder``.
+
+    Returns:
+        CompiledTemplate: The shared compiled template.
+    """
+    return CompiledTemplate(source, style)
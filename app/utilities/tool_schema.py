@@ -7,8 +7,6 @@ from typing import Any, Dict, List, Type, Union
 import jsonref
 from jsonref import requests
 from pydantic import create_model, Field
-from app.tools.ToolFactory import ToolFactory
-from app.tools.base_tool import BaseTool
 from app.utilities.schema import reference_schema
 
 
@@ -53,6 +51,8 @@ class ToolSchema:
                     raise TypeError(f"Error parsing input for tool '{tool.__class__.__name__}' Please open an issue "
                                     f"on github.")
 
+        # Imported here: app.tools.base_tool imports app.utilities, which imports this module
+        from app.tools.ToolFactory import ToolFactory
         return ToolFactory.from_openai_schema(
             format_tool_to_openai_function(tool),
             callback
@@ -158,6 +158,7 @@ class ToolSchema:
         # Dynamically creating the Pydantic model
         model = create_model(name, **fields)
 
+        from app.tools.base_tool import BaseTool
         tool = type(name, (BaseTool, model), {
             "__doc__": description,
             "run": callback,
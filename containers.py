@@ -13,7 +13,7 @@ from app.db.database import Database
 from app.services.worker.worker import Worker
 from app.services.events.event_manager import EventManager
 from app.utilities.resource_tracker import resource_tracker
-from profiler import profile_async
+from app.tools.base_tool import warm_schema_cache
 
 class Container(containers.DeclarativeContainer):
     """
@@ -102,7 +102,6 @@ class Container(containers.DeclarativeContainer):
     )
 
 # Define get_container function here if needed
-@profile_async
 def get_container():
     return Container()
 
@@ -115,6 +114,7 @@ async def init_resources():
     This function is called during application startup to ensure all
     services are properly initialized and started.
     """
+    warm_schema_cache()
     await container.redis().start()
     await container.kafka().start()
     await container.event_manager().start()
@@ -145,7 +145,6 @@ def create_container():
     container.config.from_dict(settings.dict())
     return container
 
-@profile_async
 async def initialize():
     """
     Initialize the container and its resources.
@@ -156,7 +155,6 @@ async def initialize():
         container = create_container()
     await init_resources()
 
-@profile_async
 async def shutdown():
     """
     Shutdown the container and its resources.
@@ -11,7 +11,7 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import PlainTextResponse, HTMLResponse, JSONResponse
+from fastapi.responses import PlainTextResponse, HTMLResponse, JSONResponse, Response
 import psutil
 from starlette.status import HTTP_422_UNPROCESSABLE_ENTITY
 from fastapi.middleware.cors import CORSMiddleware
@@ -24,13 +24,26 @@ from app.config.settings import settings
 from di import get_container
 from containers import Container, init_resources, resource_tracker, shutdown_resources
 import uvicorn
-from profiler import profiler as app_profiler, profile_async
+from app.services.profiling import collapsed, flamegraph_svg, sampling_profiler
+from app.services.metrics import metrics_registry, monitor_event_loop_lag
 
 sys.dont_write_bytecode = True
 load_dotenv()
 
 setup_logging()
 
+http_request_seconds = metrics_registry.histogram(
+    "http_request_seconds",
+    "Duration of HTTP requests, by method, route and status code.",
+    ["method", "route", "status"]
+)
+metrics_registry.gauge_callback(
+    "tracked_objects",
+    "Live service and model objects registered with the resource tracker, by type.",
+    ["type"],
+    resource_tracker.get_all_counts
+)
+
 # Global dictionary to store completion events for each session
 completion_events = {}
 session_tasks = {}
@@ -55,12 +68,14 @@ MONITORED_OBJECT_TYPES: List[Dict[str, str]] = [
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
-    app_profiler.start_profiling()
     await init_resources()
+    loop_monitor = asyncio.create_task(monitor_event_loop_lag())
     yield
     # Shutdown
+    loop_monitor.cancel()
     await shutdown_resources()
-    app_profiler.stop_profiling()
+    if sampling_profiler.is_running():
+        sampling_profiler.stop()
 
 app = FastAPI(lifespan=lifespan)
 
@@ -85,8 +100,15 @@ def setup_app():
         response = await call_next(request)
         process_time = time.time() - start_time
         response.headers["X-Process-Time"] = str(process_time)
+        # The route template, not the raw path, keeps label values bounded
+        route = getattr(request.scope.get("route"), "path", "unmatched")
+        http_request_seconds.labels(request.method, route, response.status_code).observe(process_time)
         return response
 
+    @app.get("/metrics")
+    async def get_metrics():
+        return PlainTextResponse(metrics_registry.render(), media_type="text/plain; version=0.0.4")
+
     @app.exception_handler(RequestValidationError)
     async def validation_exception_handler(request: Request, exc: RequestValidationError):
         return JSONResponse(
@@ -102,8 +124,47 @@ def setup_app():
             content={"detail": "Internal server error"}
         )
 
+    @app.get("/profile")
+    async def get_profile(seconds: float = 10.0, interval_ms: float = 5.0, format: str = "flamegraph"):
+        """
+        Sample every thread for a window and return the profile.
+
+        Args:
+            seconds: Length of the window.
+            interval_ms: Milliseconds between samples.
+            format: ``flamegraph`` (SVG), ``collapsed`` (flamegraph.pl input) or ``json``.
+        """
+        if format not in ("flamegraph", "collapsed", "json"):
+            return JSONResponse({"error": f"Unknown format: {format}"}, status_code=400)
+        try:
+            result = await sampling_profiler.profile(seconds, interval_ms / 1000)
+        except RuntimeError as e:
+            return JSONResponse({"error": str(e)}, status_code=409)
+        if format == "collapsed":
+            return PlainTextResponse(collapsed(result))
+        if format == "json":
+            return JSONResponse(result)
+        return Response(flamegraph_svg(result), media_type="image/svg+xml")
+
+    @app.post("/profile/start")
+    async def start_profile(seconds: float = 60.0, interval_ms: float = 5.0):
+        try:
+            return JSONResponse(sampling_profiler.start(seconds, interval_ms / 1000))
+        except RuntimeError as e:
+            return JSONResponse({"error": str(e)}, status_code=409)
+
+    @app.post("/profile/stop")
+    async def stop_profile(format: str = "json"):
+        result = await asyncio.to_thread(sampling_profiler.stop)
+        if not result:
+            return JSONResponse({"error": "No profile has been recorded"}, status_code=404)
+        if format == "collapsed":
+            return PlainTextResponse(collapsed(result))
+        if format == "flamegraph":
+            return Response(flamegraph_svg(result), media_type="image/svg+xml")
+        return JSONResponse(result)
+
     @app.get("/memory_profile")
-    @profile_async
     async def get_memory_profile():
         mem_usage = memory_usage((lambda: time.sleep(10), ()), interval=0.1, timeout=10)
         return JSONResponse({
@@ -114,7 +175,6 @@ def setup_app():
         })
 
     @app.get("/memory_snapshot")
-    @profile_async
     async def get_memory_snapshot():
         process = psutil.Process(os.getpid())
         memory_info = process.memory_info()
@@ -141,7 +201,6 @@ def setup_app():
         return JSONResponse(snapshot)
 
     @app.get("/gc_stats")
-    @profile_async
     async def get_gc_stats():
         gc.collect()
         return JSONResponse({
@@ -160,6 +219,7 @@ def setup_app():
             {"name": "Garbage Collector Stats", "url": f"{base_url}/gc_stats"},
             {"name": "Object Type Info", "url": f"{base_url}/object_type_info"},
             {"name": "Container Resources", "url": f"{base_url}/container_resources"},
+            {"name": "Metrics", "url": f"{base_url}/metrics"},
         ]
         html_content = "<h1>Debug Links</h1><ul>"
         for link in links:
@@ -268,7 +328,6 @@ def setup_app():
 
 
     @app.get("/")
-    @profile_async
     async def read_root():
         return {"Hello": "World"}
     
@@ -0,0 +1,150 @@
+# Description: Bulk-loads records into any Redis search index defined in app/services/cache/schemas/.
+# Usage:
+#   python seed_index.py --list
+#   python seed_index.py messages --source messages.jsonl
+#   python seed_index.py context --source seed_node_data:get_node_seed_data --nested context_info
+#   python seed_index.py --all --source-dir exports/
+#   python seed_index.py messages --rebuild
+# Which fields are stored and embedded comes from the index schema. Records whose content has not
+# changed since the last load are skipped, and an interrupted load resumes where it stopped when
+# rerun with the same arguments (pass --restart to start over). Indexes are not rebuilt when their
+# schema changes; pass --rebuild to recreate them and re-index the documents already stored.
+import argparse
+import asyncio
+import importlib
+import json
+import os
+import sys
+from typing import Any, Iterable, Iterator, List, Optional
+
+from tqdm import tqdm
+
+from app.logging_config import configure_logger
+from app.services.cache.index_registry import index_registry
+from app.services.cache.ingestion import fields_from_schema
+
+logger = configure_logger(__name__)
+
+
+def available_indexes() -> List[str]:
+    return sorted(name[:-5] for name in os.listdir(index_registry.schema_dir) if name.endswith(".yaml"))
+
+
+def iter_source(source: str) -> Iterable[Any]:
+    """
+    Open a record source lazily.
+
+    ``.jsonl`` files are read a line at a time, ``.json`` files must hold a list
+    of records, and ``module:function`` calls a function (such as the
+    ``get_*_seed_data`` helpers) returning an iterable of records.
+    """
+    if source.endswith(".jsonl"):
+        return _iter_jsonl(source)
+    if source.endswith(".json"):
+        with open(source) as f:
+            return json.load(f)
+    module_name, _, function_name = source.partition(":")
+    if not function_name:
+        raise ValueError(f"Unsupported source {source}: expected a .jsonl/.json file or module:function")
+    return getattr(importlib.import_module(module_name), function_name)()
+
+
+def _iter_jsonl(path: str) -> Iterator[dict]:
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def find_source(source_dir: str, index_name: str) -> Optional[str]:
+    for extension in (".jsonl", ".json"):
+        path = os.path.join(source_dir, index_name + extension)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+async def ingest(redis, index_name: str, source: str, args: argparse.Namespace) -> dict:
+    schema = index_registry.get_schema(index_name)
+    fields_vectorization, metadata_vector = fields_from_schema(schema)
+    await redis.get_index(index_name)
+
+    run_id = f"{index_name}:{os.path.abspath(source) if os.path.exists(source) else source}"
+    if args.restart:
+        await redis.client.delete(redis.ingestion.checkpoint_key(run_id))
+
+    with tqdm(desc=index_name, unit="records") as progress:
+        result = await redis.ingestion.ingest(
+            iter_source(source),
+            fields_vectorization,
+            schema.index.prefix,
+            id_column=args.id_column,
+            metadata_vector=metadata_vector,
+            overwrite=not args.keep_existing,
+            force=args.force,
+            run_id=run_id,
+            nested_field=args.nested,
+            on_chunk=lambda keys: progress.update(len(keys)),
+            chunk_size=args.chunk_size
+        )
+    logger.info(f"{index_name}: {json.dumps(result)}")
+    return result
+
+
+async def run(args: argparse.Namespace) -> int:
+    from containers import get_container
+
+    if args.all:
+        jobs = [(name, find_source(args.source_dir, name)) for name in available_indexes()]
+        for name, source in jobs:
+            if source is None:
+                logger.info(f"Skipping {name}: no {name}.jsonl or {name}.json in {args.source_dir}")
+        jobs = [(name, source) for name, source in jobs if source is not None]
+    else:
+        jobs = [(args.index, args.source)]
+
+    redis = get_container().redis()
+    await redis.ensure_connection()
+    try:
+        for index_name, source in jobs:
+            if args.rebuild:
+                await index_registry.rebuild(index_name, redis.client)
+            if source is not None:
+                await ingest(redis, index_name, source, args)
+    finally:
+        await redis.shutdown()
+    return 0
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Load records into a Redis search index defined in app/services/cache/schemas/.")
+    parser.add_argument("index", nargs="?", help="Index to load, e.g. context or messages.")
+    parser.add_argument("--source", help="A .jsonl or .json file, or module:function returning records.")
+    parser.add_argument("--all", action="store_true", help="Load every schema that has a <index>.jsonl or <index>.json in --source-dir.")
+    parser.add_argument("--source-dir", default=".", help="Directory searched by --all.")
+    parser.add_argument("--list", action="store_true", help="List the available indexes and exit.")
+    parser.add_argument("--id-column", default="id", help="Record field used for the key; records without one use their position.")
+    parser.add_argument("--nested", help="Read fields missing at the top level from this nested object, e.g. context_info.")
+    parser.add_argument("--chunk-size", type=int, help="Records embedded and written per round trip.")
+    parser.add_argument("--force", action="store_true", help="Re-embed records even if their content is unchanged.")
+    parser.add_argument("--keep-existing", action="store_true", help="Leave records that already exist untouched.")
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint of an interrupted run.")
+    parser.add_argument("--rebuild", action="store_true", help="Recreate the index from its schema first, re-indexing stored documents; --source is optional.")
+    args = parser.parse_args(argv)
+    if not args.list and not args.all and not (args.index and (args.source or args.rebuild)):
+        parser.error("give an index and --source or --rebuild, --all, or --list")
+    if args.index and args.index not in available_indexes():
+        parser.error(f"unknown index {args.index}; choose from {', '.join(available_indexes())}")
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    if args.list:
+        print("\n".join(available_indexes()))
+        return 0
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,33 +1,8 @@
-# Description: This script creates test data for intent and workflow indexes and stores them in Redis. It also creates the indexes for the intent and workflow data in Redisearch.
-# Usage: python test_create_index_service.py
-# The script will output the status of the test data creation and index creation in Redis.
+# Description: Seed records for the prompt_settings index (schemas/agents.yaml).
+# Usage: python seed_index.py agents --source seed_prompts_index:get_prompts_seed_data
+from typing import List, Optional
 
-import asyncio
-from enum import Enum, auto
-import json
-import os
-import re
-import string
-from typing import Dict, List, Literal, Optional, Tuple, Union
-from uuid import uuid4
-import numpy as np
 from pydantic import BaseModel, Field
-import redis
-from redis.commands.search.field import VectorField, TagField, TextField
-from redis.commands.search.indexDefinition import IndexDefinition, IndexType
-from redis.commands.search.query import Query
-from redisvl.utils.vectorize import (
-    CohereTextVectorizer,
-    OpenAITextVectorizer,
-    HFTextVectorizer
-)
-
-from app.services.cache.redis import RedisService
-from app.services.discovery import service_registry
-from app.services.discovery.service_registry import ServiceRegistry
-
-class Indexes(Enum):
-    Agents = "prompt_settings"
 
 class Agent(BaseModel):
     """
@@ -175,132 +150,6 @@ def create_test_data():
 
     return agent_test_data
 
-# Connect to Redis
-REDIS_HOST = os.getenv("REDIS_URL").split('//')[1].split(':')[0]
-REDIS_PORT = 6379
-r = redis.Redis(host=REDIS_HOST, port=REDIS_PORT)
-
-# Define the index schema for intent index
-agent_schema = (
-    TextField("name"),
-    TextField("instructions"),
-    TextField("description"),
-    TextField("tools"),
-    VectorField("instructions_vector", "HNSW", {"TYPE": "FLOAT32", "DIM": 384, "DISTANCE_METRIC": "COSINE"}),
-    VectorField("description_vector", "HNSW", {"TYPE": "FLOAT32", "DIM": 384, "DISTANCE_METRIC": "COSINE"}),
-    VectorField("tools_vector", "HNSW", {"TYPE": "FLOAT32", "DIM": 384, "DISTANCE_METRIC": "COSINE"}),
-    VectorField("metadata_vector", "HNSW", {"TYPE": "FLOAT32", "DIM": 384, "DISTANCE_METRIC": "COSINE"})
-)
-
-# Create the indexes
-try:
-    r.ft(Indexes.Agents.value).create_index(agent_schema, definition=IndexDefinition(prefix=["prompt_settings:"], index_type=IndexType.HASH))
-    print(f"Agents index created successfully")
-except:
-    print("Agents index already exists")
-
-# try:
-#     r.ft(Indexes.Workflow.value).create_index(workflow_schema, definition=IndexDefinition(prefix=["workflow:"], index_type=IndexType.HASH))
-#     print(f"Workflow index created successfully")
-# except:
-#     print("Workflow index already exists")
-
-model = HFTextVectorizer('sentence-transformers/all-MiniLM-L6-v2')
-
-def preprocess_text(text: str) -> str:
-    if not text:
-        return ""
-    # remove unicode characters
-    text = text.encode('ascii', 'ignore').decode()
-
-    # remove punctuation
-    text = re.sub('[%s]' % re.escape(string.punctuation), ' ', text)
-
-    # clean up the spacing
-    text = re.sub('\s{2,}', " ", text)
-
-    # remove newlines
-    text = text.replace("\n", " ")
-
-    # split on capitalized words
-    text = " ".join(re.split('(?=[A-Z])', text))
-
-    # clean up the spacing again
-    text = re.sub('\s{2,}', " ", text)
-
-    # make all words lowercase
-    text = text.lower()
-
-    return text.strip()
-
-def generate_embeddings(data: dict, fields: List[str]) -> Dict[str, np.ndarray]:
-    embeddings = {}
-    for field in fields:
-        field_data = data.get(field, "")
-        if isinstance(field_data, list):
-            field_data = " ".join([json.dumps(item) for item in field_data])
-        else:
-            field_data = json.dumps(field_data)
-        embeddings[f"{field}_vector"] = model.embed(field_data, preprocess=preprocess_text)
-        print(f"Generating metadata vector with {json.dumps(data)}")
-        embeddings["metadata_vector"] = model.embed(json.dumps(data), preprocess=preprocess_text)
-        
-        print(f"Embedding for {field} generated successfully")
-    return embeddings
-
-async def create_index(agent_test_data: List[Agent], index_name: str):
-    # Generate embeddings for each intent test data entry and store in Redis
-    for i, data in enumerate(agent_test_data):
-        embeddings = generate_embeddings(data.model_dump(), ["instructions", "description", "tools"])
-        # Print the length of the embeddings in each field
-        print(f"Length of instructions embeddings: {len(embeddings['instructions_vector'])}")
-        print(f"Length of description embeddings: {len(embeddings['description_vector'])}")
-        print(f"Length of tools embeddings: {len(embeddings['tools_vector'])}")
-        print(f"Length of metadata embeddings: {len(embeddings['metadata_vector'])}")
-        
-        r.hset(f"prompt_settings:{i}", mapping={
-            "name": data.name,
-            "instructions": data.instructions,
-            "description": data.description,
-            "tools": json.dumps([tool for tool in data.tools]),
-            **{field: np.array(vector, dtype=np.float32).tobytes() for field, vector in embeddings.items()}
-        })
-        print(f"Agent test data {i} stored in Redis")
-    
-    r.close()
-
-async def query_vector_database_for_prompts():
-    redis_url = os.getenv("REDIS_URL")
-    ServiceRegistry.instance().register(name="redis", service=RedisService, **{"redis_url": redis_url})
-    redis_service: RedisService = ServiceRegistry.instance().get(name="redis")
-    
-    embeddings = redis_service.generate_embeddings({"description": "This is a test."}, ["description"])
-    # Print the length of the embeddings in each field
-    print(f"Length of description embeddings: {len(embeddings['description_vector'])}")
-    
-    prompt = await redis_service.async_search_index(embeddings, f"description_vector", "agents.yaml", 2, ["description"])
-    print(prompt)
-
-async def main(agent_test_data: List[Agent]):
-    await create_index(agent_test_data, Indexes.Agents.value)
-    print("Index created successfully")
-    await query_vector_database_for_prompts()
-    
-    # Generate embeddings for each workflow test data entry and store in Redis
-    # for i, data in enumerate(workflow_test_data):
-    #     embeddings = generate_embeddings(data.dict(), ["steps", "metadata", "feedback"])
-    #     r.hset(f"workflow:{i}", mapping={
-    #         "name": data.name,
-    #         "description": data.description,
-    #         "domain": data.domain,
-    #         "steps": json.dumps([step.dict() for step in data.steps]),
-    #         "metadata": json.dumps(data.metadata),
-    #         "feedback": json.dumps([feedback.dict() for feedback in data.feedback]),
-    #         **{field: np.array(vector, dtype=np.float32).tobytes() for field, vector in embeddings.items()}
-    #     })
-    #     print(f"Workflow test data {i} stored in Redis")
 
-if __name__ == "__main__":
-    agent_test_data = create_test_data()
-    print("Test data and indexes created successfully")
-    asyncio.run(main(agent_test_data))
+def get_prompts_seed_data() -> List[Agent]:
+    return create_test_data()
@@ -1,32 +1,9 @@
-# Description: This script creates test data for intent and workflow indexes and stores them in Redis. It also creates the indexes for the intent and workflow data in Redisearch.
-# Usage: python test_create_index_service.py
-# The script will output the status of the test data creation and index creation in Redis.
-import asyncio
-from enum import Enum, auto
-import json
-import os
-import re
-import string
-from typing import Dict, List, Literal, Optional, Tuple, Union
+# Description: Seed records for the user_context index.
+# Usage: python seed_index.py user_context --source seed_user_context_index:get_user_context_seed_data
+from typing import List, Literal, Optional
 from uuid import uuid4
-import numpy as np
-from pydantic import BaseModel, Field
-import redis
-from redis.commands.search.field import VectorField, TagField, TextField
-from redis.commands.search.indexDefinition import IndexDefinition, IndexType
-from redis.commands.search.query import Query
-from redisvl.utils.vectorize import (
-    CohereTextVectorizer,
-    OpenAITextVectorizer,
-    HFTextVectorizer
-)
-
-from app.services.cache.redis import RedisService
-from app.services.discovery import service_registry
-from app.services.discovery.service_registry import ServiceRegistry
 
-class Indexes(Enum):
-    UserContext = "user_context"
+from pydantic import BaseModel, Field
 
 class ContextInfo(BaseModel):
     key: Optional[str] = Field(None, description="The key of the context.")
@@ -264,143 +241,6 @@ def create_test_data():
 
     return agent_test_data
 
-# Connect to Redis
-REDIS_HOST = os.getenv("REDIS_URL").split('//')[1].split(':')[0]
-REDIS_PORT = 6379
-r = redis.Redis(host=REDIS_HOST, port=REDIS_PORT)
-
-def create_index():
-    # Define the index schema for intent index
-    context_schema = (
-        TagField("meta_key"),
-        TagField("meta_value"),
-        VectorField("metadata_vector", "HNSW", {"TYPE": "FLOAT32", "DIM": 384, "DISTANCE_METRIC": "COSINE"})
-    )
-
-    # Create the indexes
-    try:
-        r.ft(Indexes.UserContext.value).create_index(context_schema, definition=IndexDefinition(prefix=["user_context:"], index_type=IndexType.HASH))
-        print(f"Context index created successfully")
-    except:
-        print("Context index already exists")
-
-#try:
-#    r.ft(Indexes.Workflow.value).create_index(workflow_schema, definition=IndexDefinition(prefix=["workflow:"], index_type=IndexType.HASH))
-#    print(f"Workflow index created successfully")
-#except:
-#    print("Workflow index already exists")
-
-model = HFTextVectorizer('sentence-transformers/all-MiniLM-L6-v2')
-
-def preprocess_text(text: str) -> str:
-    if not text:
-        return ""
-    # remove unicode characters
-    text = text.encode('ascii', 'ignore').decode()
-
-    # remove punctuation
-    text = re.sub('[%s]' % re.escape(string.punctuation), ' ', text)
-
-    # clean up the spacing
-    text = re.sub('\s{2,}', " ", text)
-
-    # remove newlines
-    text = text.replace("\n", " ")
-
-    # split on capitalized words
-    text = " ".join(re.split('(?=[A-Z])', text))
-
-    # clean up the spacing again
-    text = re.sub('\s{2,}', " ", text)
-
-    # make all words lowercase
-    text = text.lower()
-
-    return text.strip()
-
-def generate_embeddings(data: dict, fields: List[str]) -> Dict[str, np.ndarray]:
-    embeddings = {}
-    for field in fields:
-        field_data = data.get(field, "")
-        if isinstance(field_data, list):
-            field_data = " ".join([json.dumps(item) for item in field_data])
-        else:
-            field_data = json.dumps(field_data)
-        embeddings[f"{field}_vector"] = model.embed(field_data, preprocess=preprocess_text)
-        #print(f"Generating metadata vector with {json.dumps(data)}")
-        
-    embeddings["metadata_vector"] = model.embed(json.dumps(data), preprocess=preprocess_text)
-        #print(f"Embedding for {field} generated successfully")
-    return embeddings
-
-async def load_index(index_data: List[any], index_name: str):
-    # Generate embeddings for each intent test data entry and store in Redis
-    for i, data in enumerate(index_data):
-        context_info: ContextInfo = data.context_info
-        embeddings = generate_embeddings(context_info.model_dump(), ["input_description", "action_summary", "outcome_description", "feedback", "output"])
-        # Print the length of the embeddings in each field
-        #print(f"Length of input_description embeddings: {len(embeddings['input_description_vector'])}")
-        #print(f"Length of action_summary embeddings: {len(embeddings['action_summary_vector'])}")
-        #print(f"Length of outcome_description embeddings: {len(embeddings['outcome_description_vector'])}")
-        #print(f"Length of feedback embeddings: {len(embeddings['feedback_vector'])}")
-        #print(f"Length of output embeddings: {len(embeddings['output_vector'])}")
-        #print(f"Length of metadata embeddings: {len(embeddings['metadata_vector'])}")
-        print(f"data:{i} {data}")
-        if hasattr(data, "name"):
-            object_name = data.name
-        else:
-            object_name = data.__class__.__name__
-        r.hset(f"output:{i}", mapping={
-            "session_id": data.__class__.__name__,
-            "context_key": object_name,
-            "output_name": json.dumps(data.context_info.input_description),
-            "output_description": json.dumps(data.context_info.action_summary),
-            "output": json.dumps(data.context_info.outcome_description),
-            **{field: np.array(vector, dtype=np.float32).tobytes() for field, vector in embeddings.items()}
-        })
-        print(f"Context test data {i} stored in Redis")
-    
-    r.close()
-
-async def query_vector_database_for_prompts():
-    
-    redis_url = os.getenv("REDIS_URL")
-    ServiceRegistry.instance().register(name="redis", service=RedisService, **{"redis_url": redis_url})
-    redis_service: RedisService = ServiceRegistry.instance().get(name="redis")
-    
-    embeddings = redis_service.generate_embeddings({"description": "This is a test."}, ["description"])
-    # Print the length of the embeddings in each field
-    print(f"Length of description embeddings: {len(embeddings['description_vector'])}")
-    
-    prompt = await redis_service.async_search_index(embeddings, f"description_vector", "agents.yaml", 2, ["description"])
-    print(prompt)
-
-async def main(agent_test_data: List[Agent]):
-    create_index()
-    #await load_index(agent_test_data, "context")
-    print("Index created successfully")
-    #await query_vector_database_for_prompts()
-    
-
-    # Generate embeddings for each workflow test data entry and store in Redis
-    #for i, data in enumerate(workflow_test_data):
-    #    embeddings = generate_embeddings(data.dict(), ["steps", "metadata", "feedback"])
-    #    r.hset(f"workflow:{i}", mapping={
-    #        "name": data.name,
-    #        "description": data.description,
-    #        "domain": data.domain,
-    #        "steps": json.dumps([step.dict() for step in data.steps]),
-    #        "metadata": json.dumps(data.metadata),
-    #        "feedback": json.dumps([feedback.dict() for feedback in data.feedback]),
-    #        **{field: np.array(vector, dtype=np.float32).tobytes() for field, vector in embeddings.items()}
-    #    })
-    #    print(f"Workflow test data {i} stored in Redis")
-
-if __name__ == "__main__":
-    #agent_test_data = create_test_data()
-    agent_test_data = []
-    print("Test data and indexes created successfully")
-    asyncio.run(main(agent_test_data))
-    
-    
 
+def get_user_context_seed_data() -> List[dict]:
+    return [{"type": data.__class__.__name__, **data.model_dump()} for data in create_test_data()]
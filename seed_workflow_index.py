@@ -1,28 +1,10 @@
-# Description: This script creates test data for intent and workflow indexes and stores them in Redis. It also creates the indexes for the intent and workflow data in Redisearch.
-# Usage: python test_create_index_service.py
-# The script will output the status of the test data creation and index creation in Redis.
-import asyncio
-from enum import Enum, auto
+# Description: Seed records for the workflow index.
+# Usage: python seed_index.py workflow --source seed_workflow_index:get_workflow_seed_data --id-column key
 import json
-import re
-import os
-import string
-from typing import Dict, List, Literal, Optional, Tuple, Union
+from typing import List, Literal, Optional
 from uuid import uuid4
-import numpy as np
-from pydantic import BaseModel, Field
-import redis
-from redis.commands.search.field import VectorField, TagField, TextField
-from redis.commands.search.indexDefinition import IndexDefinition, IndexType
-from redis.commands.search.query import Query
-from redisvl.utils.vectorize import (
-    CohereTextVectorizer,
-    OpenAITextVectorizer,
-    HFTextVectorizer
-)
 
-class Indexes(Enum):
-    Workflow = "workflow"
+from pydantic import BaseModel, Field
 
 class Agent(BaseModel):
     """
@@ -59,14 +41,6 @@ class Workflow(BaseModel):
     def model_dump_json(self) -> str:
         return json.dumps(self.dict(), indent=4)
 
-class WorkflowModel(BaseModel):
-    name: str
-    description: str
-    domain: str
-    steps: List[Step]
-    metadata: Dict[str, str]
-    feedback: List[str]
-
 def create_test_data():
 
     # Define your test data
@@ -93,7 +67,7 @@ def create_test_data():
             steps=[
                 Step(description="Gather intake forms from clients", assignees=["IntakeAgent"], mode="parallel"),
                 Step(description="Gather supplemental forms for each condition", assignees=["SupplementalAgent"], mode="parallel", run="repeat"), # Identify the list of conditions and run the step on repeat for each item returned in the list.
-                Step(description="Utilizing the list of conditions found within the intake form provided by the customer, retrieve the rating criteria for each condition found from the 38CFR Part 4", data=f"https://url.com/api/get_forms({context['user:*'].One().id})", assignees=["RatingCriteriaResearcher"], mode="parallel", step_scope="list of conditions within the intake form"), # Identify the list of conditions and run the step on repeat for each item returned in the list.
+                Step(description="Utilizing the list of conditions found within the intake form provided by the customer, retrieve the rating criteria for each condition found from the 38CFR Part 4", data="https://url.com/api/get_forms({context['user:*'].One().id})", assignees=["RatingCriteriaResearcher"], mode="parallel", step_scope="list of conditions within the intake form"), # Identify the list of conditions and run the step on repeat for each item returned in the list.
                 Step(description="Retrieve the Discover Call notes for the customer", assignees=["DiscoveryCallNotesReviewer"], mode="parallel"),
                 Step(description="Extract a list of facts from the Discovery Call notes for each condition", assignees=["DiscoveryCallNotesReviewer"], mode="parallel", run="repeat"), # Identify the list of conditions and run the step on repeat for each item returned in the list.
                 Step(description="Develop a ConditionReport for each condition utilizing the intake forms, supplemental forms, rating criteria, and Discovery call notes specific to the condition in question", assignees=["UniverseAgent"], mode="parallel", run="repeat"), # Identify the list of conditions and run the step on repeat for each item returned in the list.
@@ -264,123 +238,6 @@ def create_test_data():
 
     return workflow_test_data
 
-    # Connect to Redis
-REDIS_HOST = os.getenv("REDIS_URL").split('//')[1].split(':')[0]
-REDIS_PORT = 6379
-r = redis.Redis(host=REDIS_HOST, port=REDIS_PORT)
-
-# Define the index schema for intent index
-workflow_schema = (
-    TextField("purpose"),
-    TextField("goals"),
-    TextField("steps"),
-    TextField("agents"),
-    TextField("feedback"),
-    VectorField("purpose_vector", "HNSW", {"TYPE": "FLOAT32", "DIM": 384, "DISTANCE_METRIC": "COSINE"}),
-    VectorField("goals_vector", "HNSW", {"TYPE": "FLOAT32", "DIM": 384, "DISTANCE_METRIC": "COSINE"}),
-    VectorField("steps_vector", "HNSW", {"TYPE": "FLOAT32", "DIM": 384, "DISTANCE_METRIC": "COSINE"}),
-    VectorField("agents_vector", "HNSW", {"TYPE": "FLOAT32", "DIM": 384, "DISTANCE_METRIC": "COSINE"}),
-    VectorField("feedback_vector", "HNSW", {"TYPE": "FLOAT32", "DIM": 384, "DISTANCE_METRIC": "COSINE"}),
-    VectorField("metadata_vector", "HNSW", {"TYPE": "FLOAT32", "DIM": 384, "DISTANCE_METRIC": "COSINE"})
-)
-
-# Define the index schema for workflow index
-#workflow_schema = (
-#    TagField("name"),
-#    TextField("description"),
-#    TagField("domain"),
-#    TextField("steps"),
-#    TextField("metadata"),
-#    TextField("feedback"),
-#    VectorField("steps_vector", "HNSW", {"TYPE": "FLOAT32", "DIM": 384, "DISTANCE_METRIC": "COSINE"}),
-#    VectorField("metadata_vector", "HNSW", {"TYPE": "FLOAT32", "DIM": 384, "DISTANCE_METRIC": "COSINE"}),
-#    VectorField("feedback_vector", "HNSW", {"TYPE": "FLOAT32", "DIM": 384, "DISTANCE_METRIC": "COSINE"})
-#)
-
-# Create the indexes
-try:
-    r.ft(Indexes.Workflow.value).create_index(workflow_schema, definition=IndexDefinition(prefix=["workflow:"], index_type=IndexType.HASH))
-    print(f"Intent index created successfully")
-except:
-    print("Intent index already exists")
-
-#try:
-#    r.ft(Indexes.Workflow.value).create_index(workflow_schema, definition=IndexDefinition(prefix=["workflow:"], index_type=IndexType.HASH))
-#    print(f"Workflow index created successfully")
-#except:
-#    print("Workflow index already exists")
-
-model = HFTextVectorizer('sentence-transformers/all-MiniLM-L6-v2')
-
-def preprocess_text(text: str) -> str:
-    if not text:
-        return ""
-    # remove unicode characters
-    text = text.encode('ascii', 'ignore').decode()
-
-    # remove punctuation
-    text = re.sub('[%s]' % re.escape(string.punctuation), ' ', text)
-
-    # clean up the spacing
-    text = re.sub('\s{2,}', " ", text)
-
-    # remove newlines
-    text = text.replace("\n", " ")
-
-    # split on capitalized words
-    text = " ".join(re.split('(?=[A-Z])', text))
-
-    # clean up the spacing again
-    text = re.sub('\s{2,}', " ", text)
-
-    # make all words lowercase
-    text = text.lower()
-
-    return text.strip()
-
-def generate_embeddings(data: dict, fields: List[str]) -> Dict[str, np.ndarray]:
-    embeddings = {}
-    for field in fields:
-        field_data = data.get(field, "")
-        if isinstance(field_data, list):
-            field_data = " ".join([json.dumps(item) for item in field_data])
-        else:
-            field_data = json.dumps(field_data)
-        embeddings[f"{field}_vector"] = model.embed(field_data, preprocess=preprocess_text)
-        embeddings["metadata_vector"] = model.embed(json.dumps(data), preprocess=preprocess_text)
-    return embeddings
-
-async def main(workflow_test_data):
-    # Generate embeddings for each intent test data entry and store in Redis
-    for i, data in enumerate(workflow_test_data):
-        embeddings = generate_embeddings(data.dict(), ["purpose", "goals", "steps", "agents", "feedback"])
-        r.hset(f"workflow:{i}", mapping={
-            "purpose": data.purpose,
-            "goals": json.dumps([goal for goal in data.goals]),
-            "steps": json.dumps([step.dict() for step in data.steps]),
-            "agents": json.dumps([agent.dict() for agent in data.agents]),
-            "feedback": json.dumps([feedback for feedback in data.feedback]),
-            **{field: np.array(vector, dtype=np.float32).tobytes() for field, vector in embeddings.items()}
-        })
-        print(f"Intent test data {i} stored in Redis")
-
-    # Generate embeddings for each workflow test data entry and store in Redis
-    #for i, data in enumerate(workflow_test_data):
-    #    embeddings = generate_embeddings(data.dict(), ["steps", "metadata", "feedback"])
-    #    r.hset(f"workflow:{i}", mapping={
-    #        "name": data.name,
-    #        "description": data.description,
-    #        "domain": data.domain,
-    #        "steps": json.dumps([step.dict() for step in data.steps]),
-    #        "metadata": json.dumps(data.metadata),
-    #        "feedback": json.dumps([feedback.dict() for feedback in data.feedback]),
-    #        **{field: np.array(vector, dtype=np.float32).tobytes() for field, vector in embeddings.items()}
-    #    })
-    #    print(f"Workflow test data {i} stored in Redis")
-
-if __name__ == "__main__":
-    workflow_test_data = create_test_data()
-    print("Test data and indexes created successfully")
-    asyncio.run(main(workflow_test_data))
-    
 
+def get_workflow_seed_data() -> List[Workflow]:
+    return create_test_data()
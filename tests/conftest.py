@@ -0,0 +1,14 @@
+import pytest
+
+
+@pytest.fixture
+def fake_redis():
+    """
+    Async in-memory Redis client for tests, backed by its own fakeredis server.
+
+    Like the production connection pool it does not decode responses, so
+    reads return bytes. Lua scripts additionally need lupa.
+    """
+    fakeredis = pytest.importorskip("fakeredis")
+    from fakeredis import aioredis
+    return aioredis.FakeRedis(server=fakeredis.FakeServer())
@@ -0,0 +1,66 @@
+import json
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+from app.models.assistant_registry import AssistantRegistry
+
+
+def make_agent(**overrides):
+    config = dict(
+        model="gpt-4o", name="Writer", description="Writes", instructions="Be brief.",
+        tool_resources={"file_search": {"vector_store_ids": ["vs_1"], "vector_stores": [{"file_ids": ["f1"]}]}},
+        temperature=0.3, top_p=1.0, response_format="auto", tools=[{"type": "function", "function": {"name": "Search"}}]
+    )
+    config.update(overrides)
+    tools = config.pop("tools")
+    return SimpleNamespace(get_oai_tools=lambda as_json=False: tools, **config)
+
+
+class TestAssistantRegistry(unittest.TestCase):
+    def setUp(self):
+        self.registry = AssistantRegistry(flush_delay=60)
+        self.addCleanup(self.registry.flush)
+
+    def test_same_configuration_hits_the_cache(self):
+        assistant = SimpleNamespace(id="asst_1")
+        self.assertIsNone(self.registry.get(AssistantRegistry.config_key(make_agent())))
+        self.registry.register(AssistantRegistry.config_key(make_agent()), assistant)
+
+        # A new agent object with the same configuration, even with other vector stores to upload
+        same = make_agent(tool_resources={"file_search": {"vector_store_ids": ["vs_1"], "vector_stores": []}})
+        self.assertIs(self.registry.get(AssistantRegistry.config_key(same)), assistant)
+        self.assertEqual((self.registry.stats["hits"], self.registry.stats["misses"]), (1, 1))
+
+    def test_changed_configuration_misses(self):
+        self.registry.register(AssistantRegistry.config_key(make_agent()), SimpleNamespace(id="asst_1"))
+
+        for changed in (make_agent(instructions="Be thorough."), make_agent(tools=[]), make_agent(temperature=0.9)):
+            self.assertIsNone(self.registry.get(AssistantRegistry.config_key(changed)))
+        self.assertEqual(self.registry.stats["misses"], 3)
+
+    def test_forget_drops_the_assistant(self):
+        key = AssistantRegistry.config_key(make_agent())
+        self.registry.register(key, SimpleNamespace(id="asst_1"))
+        self.registry.forget("asst_1")
+        self.assertIsNone(self.registry.get(key))
+
+    def test_flush_writes_the_latest_settings(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "settings.json")
+            self.registry.save_settings(path, {"id": "asst_1", "name": "Writer"})
+            self.registry.flush()
+            self.registry.save_settings(path, {"id": "asst_1", "name": "Editor"})
+            self.registry.save_settings(path, {"id": "asst_2", "name": "Reviewer"})
+            self.registry.flush()
+            self.registry.flush()
+
+            with open(path) as f:
+                self.assertEqual(json.load(f), [{"id": "asst_1", "name": "Editor"}, {"id": "asst_2", "name": "Reviewer"}])
+            self.assertEqual(self.registry.get_stats()["settings_writes"], 2)
+            self.assertEqual(self.registry.get_stats()["pending_writes"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,177 @@
+import json
+import unittest
+from types import SimpleNamespace
+from typing import ClassVar
+
+from deepdiff import DeepDiff
+from pydantic import Field
+
+from app.models.agents.Agent import Agent
+from app.tools.base_tool import BaseTool, canonical_json, warm_schema_cache
+
+
+class Lookup(BaseTool):
+    """
+    Look a record up.
+
+    Args:
+        query: What to search for.
+    """
+    query: str = Field(...)
+    limit: int = 5
+
+    async def run(self):
+        return self.query
+
+
+class Broken(BaseTool):
+    """A tool whose schema cannot be built."""
+
+    @classmethod
+    def _build_openai_schema(cls):
+        raise TypeError("no schema")
+
+    async def run(self):
+        return None
+
+
+def make_tool():
+    """A fresh tool class per test, counting how often its schema is built."""
+
+    class Search(BaseTool):
+        """
+        Search the knowledge base.
+
+        Args:
+            query: What to search for.
+        """
+        query: str = Field(...)
+        limit: int = 5
+        builds: ClassVar[int] = 0
+
+        class ToolConfig(BaseTool.ToolConfig):
+            strict = False
+
+        @classmethod
+        def _build_openai_schema(cls):
+            cls.builds += 1
+            return super()._build_openai_schema()
+
+        async def run(self):
+            return self.query
+
+    return Search
+
+
+def make_agent(*tools):
+    # Only what _check_parameters and get_oai_tools use; no OpenAI client
+    agent = Agent.__new__(Agent)
+    agent.name, agent.description, agent.instructions = "Researcher", "Finds things", "Be brief."
+    agent.tools = list(tools)
+    agent.context_info = SimpleNamespace(context={})
+    agent.temperature, agent.top_p, agent.model = 0.3, 1.0, "gpt-4o"
+    agent.tool_resources = None
+    agent.response_format = "auto"
+    return agent
+
+
+def settings_for(agent, tools):
+    return {
+        "name": agent.name, "description": agent.description, "instructions": agent.instructions, "tools": tools,
+        "temperature": agent.temperature, "top_p": agent.top_p, "tool_resources": None, "model": agent.model,
+        "response_format": agent.response_format,
+    }
+
+
+class TestToolSchemaCache(unittest.TestCase):
+    def test_schema_is_built_once_per_class(self):
+        tool = make_tool()
+        first = tool.openai_schema
+        self.assertEqual(tool.openai_schema, first)
+        self.assertEqual(json.loads(tool.openai_tool_json), {"type": "function", "function": first})
+        self.assertEqual(tool.builds, 1)
+
+        self.assertEqual(first["name"], "Search")
+        self.assertTrue(first["description"].startswith("Search the knowledge base."))
+        self.assertEqual(first["parameters"]["properties"]["query"]["description"], "What to search for.")
+        self.assertEqual(first["parameters"]["required"], ["query"])
+        # Another class gets its own schema
+        self.assertEqual(make_tool().builds, 0)
+
+    def test_openai_schema_returns_a_copy(self):
+        tool = make_tool()
+        tool.openai_schema["parameters"]["properties"].clear()
+        self.assertIn("query", tool.openai_schema["parameters"]["properties"])
+
+    def test_docstring_change_rebuilds_the_schema(self):
+        tool = make_tool()
+        tool.openai_schema
+        tool.__doc__ = "Search the archive."
+        self.assertEqual(tool.openai_schema["description"], "Search the archive.")
+        self.assertEqual(tool.builds, 2)
+
+    def test_strict_change_rebuilds_the_schema(self):
+        tool = make_tool()
+        self.assertFalse(tool.openai_schema["strict"])
+        tool.ToolConfig.strict = True
+        schema = tool.openai_schema
+        self.assertTrue(schema["strict"])
+        self.assertFalse(schema["parameters"]["additionalProperties"])
+        self.assertIn('"strict":true', tool.openai_tool_json)
+
+    def test_model_rebuild_rebuilds_the_schema(self):
+        tool = make_tool()
+        self.assertEqual(tool.openai_schema["parameters"]["properties"]["limit"]["default"], 5)
+        tool.model_fields["limit"].default = 10
+        tool.model_rebuild(force=True)
+        self.assertEqual(tool.openai_schema["parameters"]["properties"]["limit"]["default"], 10)
+        self.assertEqual(tool.builds, 2)
+
+    def test_clear_schema_cache(self):
+        tool = make_tool()
+        tool.openai_schema
+        tool.clear_schema_cache()
+        tool.openai_schema
+        self.assertEqual(tool.builds, 2)
+
+    def test_warm_schema_cache_skips_tools_that_fail(self):
+        Lookup.clear_schema_cache()
+        self.assertEqual(warm_schema_cache(__name__), 1)
+
+
+class TestCheckParameters(unittest.TestCase):
+    def test_canonical_comparison_agrees_with_deepdiff(self):
+        agent = make_agent(Lookup)
+        local = agent.get_oai_tools()
+        reordered = json.loads(json.dumps(local[0]))
+        reordered["function"] = dict(reversed(list(reordered["function"].items())))
+        changed = json.loads(json.dumps(local[0]))
+        changed["function"]["description"] = "Something else."
+        file_search = {"type": "file_search"}
+
+        cases = {
+            "identical": local,
+            "reordered keys": [reordered],
+            "reordered tools": [file_search, *local],
+            "changed description": [changed],
+            "missing tool": [],
+            "extra tool": [*local, file_search],
+        }
+        for name, remote in cases.items():
+            with self.subTest(name):
+                expected = DeepDiff(agent.get_oai_tools(), remote, ignore_order=True) == {}
+                self.assertEqual(agent._check_parameters(settings_for(agent, remote)), expected)
+                if sorted(agent.get_oai_tools(as_json=True)) == sorted(canonical_json(tool) for tool in remote):
+                    self.assertTrue(expected)
+
+        self.assertTrue(agent._check_parameters(settings_for(agent, [reordered])))
+        self.assertFalse(agent._check_parameters(settings_for(agent, [changed])))
+
+    def test_json_tools_are_the_cached_canonical_form(self):
+        agent = make_agent(Lookup)
+        self.assertEqual(agent.get_oai_tools(as_json=True), [Lookup.openai_tool_json])
+        self.assertEqual(agent.get_oai_tools(as_json=True), [canonical_json(tool) for tool in agent.get_oai_tools()])
+
+
+if __name__ == '__main__':
+    unittest.main()
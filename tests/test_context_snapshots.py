@@ -0,0 +1,126 @@
+import asyncio
+import hashlib
+import json
+import logging
+import unittest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.models.TaskProcessor import TaskProcessor
+from app.services.cache.context_snapshots import ContextSnapshotStore
+
+
+class TestContextSnapshotStore(unittest.TestCase):
+    @pytest.fixture(autouse=True)
+    def use_fake_redis(self, fake_redis):
+        self.client = fake_redis
+
+    def make_store(self, **kwargs):
+        return ContextSnapshotStore(lambda: self.client, **kwargs)
+
+    def test_reference_is_the_hash_of_the_sorted_json(self):
+        store = self.make_store()
+
+        async def put_both():
+            return await store.put({"b": 2, "a": [1]}), await store.put({"a": [1], "b": 2})
+
+        first, second = asyncio.run(put_both())
+        self.assertEqual(first, second)
+        self.assertEqual(first, hashlib.sha256(json.dumps({"a": [1], "b": 2}, sort_keys=True).encode("utf-8")).hexdigest())
+
+    def test_repeated_put_keeps_the_snapshot_and_refreshes_its_ttl(self):
+        store = self.make_store(ttl_seconds=600)
+
+        async def put_twice():
+            ref = await store.put({"a": 1})
+            await self.client.expire(f"context_snapshot:{ref}", 5)
+            again = await store.put({"a": 1})
+            return ref, again, await self.client.ttl(f"context_snapshot:{ref}")
+
+        ref, again, ttl = asyncio.run(put_twice())
+        self.assertEqual(ref, again)
+        self.assertGreater(ttl, 5)
+        self.assertEqual(store.get_stats()["writes"], 1)
+
+    def test_recent_snapshots_are_served_from_the_local_lru(self):
+        store = self.make_store(max_local_entries=1)
+
+        async def scenario():
+            first = await store.put({"n": 1})
+            second = await store.put({"n": 2})
+            # Only the latest snapshot is still local; the first comes back from Redis
+            return await store.get(second), await store.get(first)
+
+        self.assertEqual(asyncio.run(scenario()), ({"n": 2}, {"n": 1}))
+        stats = store.get_stats()
+        self.assertEqual((stats["local_hits"], stats["redis_hits"], stats["local_entries"]), (1, 1, 1))
+
+    def test_concurrent_gets_share_one_fetch(self):
+        writer = self.make_store()
+        reader = self.make_store()
+
+        async def scenario():
+            ref = await writer.put({"n": 1})
+            return await asyncio.gather(*(reader.get(ref) for _ in range(5)))
+
+        contexts = asyncio.run(scenario())
+        self.assertEqual(contexts, [{"n": 1}] * 5)
+        self.assertEqual(reader.get_stats()["redis_hits"], 1)
+        # Every caller gets its own copy to mutate
+        self.assertEqual(len({id(context) for context in contexts}), 5)
+
+    def test_missing_snapshot_raises_key_error(self):
+        store = self.make_store()
+
+        with self.assertRaisesRegex(KeyError, "deadbeef"):
+            asyncio.run(store.get("deadbeef"))
+        self.assertEqual(store.get_stats()["misses"], 1)
+
+    def test_small_contexts_are_sent_inline(self):
+        store = self.make_store(inline_max_bytes=10)
+        self.assertTrue(store.should_inline('{"a": 1}'))
+        self.assertFalse(store.should_inline('{"a": "long enough"}'))
+
+
+class TestExpandedTaskContext(unittest.TestCase):
+    def handle(self, snapshots, object_data, context=None):
+        redis = SimpleNamespace(client=SimpleNamespace(get=AsyncMock(return_value=None)), context_snapshots=snapshots)
+        container = SimpleNamespace(redis=lambda: redis, worker=lambda: SimpleNamespace(worker_uuid="w1"), event_manager=lambda: None)
+        with patch("containers.get_container", return_value=container), \
+                patch("app.models.TaskProcessor.configure_logger", return_value=logging.getLogger(__name__)), \
+                patch.object(TaskProcessor, "mark_task_failed", AsyncMock()) as mark_task_failed, \
+                patch.object(TaskProcessor, "_setup_and_process_task", AsyncMock()) as setup:
+            asyncio.run(TaskProcessor.handle("task:review:0", "execute", object_data, context))
+        return mark_task_failed, setup
+
+    def object_data(self, **overrides):
+        data = {
+            "name": "review", "session_id": "s1", "message_template": "Review", "shared_instructions": "", "result_keys": ["reviews"], "agent_class": "Reviewer",
+            "is_expanded_task": True, "parent_task_key": "task:review", "context_ref": "abc123",
+        }
+        data.update(overrides)
+        return data
+
+    def test_expired_snapshot_fails_the_task(self):
+        snapshots = SimpleNamespace(get=AsyncMock(side_effect=KeyError("Context snapshot abc123 not found")))
+
+        mark_task_failed, setup = self.handle(snapshots, self.object_data())
+
+        mark_task_failed.assert_awaited_once_with("review", "Context snapshot abc123 expired before task review could run")
+        setup.assert_not_awaited()
+
+    def test_inline_context_is_used_without_the_snapshot(self):
+        snapshots = SimpleNamespace(get=AsyncMock())
+
+        mark_task_failed, setup = self.handle(snapshots, self.object_data(), context=json.dumps({"topic": "barriers"}))
+
+        snapshots.get.assert_not_awaited()
+        mark_task_failed.assert_not_awaited()
+        processor = setup.await_args.args[0]
+        self.assertEqual(processor.context_info.context["topic"], "barriers")
+
+
+if __name__ == '__main__':
+    unittest.main()
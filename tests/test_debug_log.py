@@ -0,0 +1,64 @@
+import logging
+import unittest
+from unittest.mock import patch
+
+from app import debug_log
+from app.debug_log import log_debug, log_sampled, payload, render
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+class TestDebugLog(unittest.TestCase):
+    def setUp(self):
+        self.logger = logging.getLogger(f"test_debug_log.{self._testMethodName}")
+        self.logger.propagate = False
+        self.handler = ListHandler()
+        self.logger.addHandler(self.handler)
+
+    def test_payload_not_evaluated_when_debug_disabled(self):
+        self.logger.setLevel(logging.INFO)
+        calls = []
+        log_debug(self.logger, "event", value=lambda: calls.append(1))
+        self.logger.debug("value: %s", payload(lambda: calls.append(1)))
+        self.assertEqual(calls, [])
+        self.assertEqual(self.handler.messages, [])
+
+    def test_fields_rendered_and_capped(self):
+        self.logger.setLevel(logging.DEBUG)
+        log_debug(self.logger, "event", limit=10, data={"key": "x" * 50}, name="task")
+        message = self.handler.messages[0]
+        self.assertTrue(message.startswith('event data={"key": "x'))
+        self.assertIn("more chars)", message)
+        self.assertTrue(message.endswith("name=task"))
+
+    def test_sampled_logs_first_and_every_nth(self):
+        self.logger.setLevel(logging.DEBUG)
+        for _ in range(25):
+            log_sampled(self.logger, "channel", "message", every=10)
+        self.assertEqual(len(self.handler.messages), 3)
+        self.assertIn("sampled=11 (1/10)", self.handler.messages[1])
+
+    def test_sample_counters_are_bounded(self):
+        self.logger.setLevel(logging.DEBUG)
+        with patch.object(debug_log, "MAX_SAMPLE_KEYS", 3), patch.object(debug_log, "_sample_counts", type(debug_log._sample_counts)()):
+            for key in ("a", "b", "a", "c", "d"):
+                log_sampled(self.logger, key, "message", every=10)
+            # "b" was least recently used when "d" arrived
+            self.assertEqual([key for _, key in debug_log._sample_counts], ["a", "c", "d"])
+            self.assertEqual(debug_log._sample_counts[(self.logger.name, "a")], 2)
+
+    def test_render(self):
+        self.assertEqual(render("text"), "text")
+        self.assertEqual(render(lambda: [1, 2]), "[1, 2]")
+        self.assertEqual(render({"when": {1}}), '{"when": "{1}"}')
+
+
+if __name__ == '__main__':
+    unittest.main()
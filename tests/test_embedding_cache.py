@@ -0,0 +1,96 @@
+import asyncio
+import hashlib
+import unittest
+
+import numpy as np
+import pytest
+
+from app.services.cache.embedding_cache import EmbeddingCache
+
+
+class TestEmbeddingCache(unittest.TestCase):
+    @pytest.fixture(autouse=True)
+    def use_fake_redis(self, fake_redis):
+        self.client = fake_redis
+
+    def make_cache(self, **kwargs):
+        return EmbeddingCache("all-MiniLM-L6-v2", lambda: self.client, **kwargs)
+
+    def test_key_is_derived_from_model_and_text(self):
+        cache = self.make_cache()
+        digest = hashlib.sha256("all-MiniLM-L6-v2\0hello".encode("utf-8")).hexdigest()
+
+        self.assertEqual(cache.key_for("hello"), f"embedding_cache:{digest}")
+        self.assertEqual(cache.key_for("hello"), self.make_cache().key_for("hello"))
+        self.assertNotEqual(cache.key_for("hello"), cache.key_for("hello "))
+        self.assertNotEqual(cache.key_for("hello"), EmbeddingCache("other-model", lambda: self.client).key_for("hello"))
+
+    def test_vectors_are_stored_as_float32_bytes(self):
+        cache = self.make_cache(ttl_seconds=60)
+        vector = [0.1, -2.5, 3.0]
+
+        async def store():
+            await cache.set_many({"hello": vector})
+            return await self.client.get(cache.key_for("hello")), await self.client.ttl(cache.key_for("hello"))
+
+        stored, ttl = asyncio.run(store())
+        self.assertEqual(stored, np.asarray(vector, dtype=np.float32).tobytes())
+        self.assertTrue(0 < ttl <= 60)
+
+        # Another worker, with an empty local tier, reads the same vector back
+        other = self.make_cache()
+        found = asyncio.run(other.get_many(["hello"]))
+        np.testing.assert_array_equal(np.asarray(found["hello"], dtype=np.float32), np.asarray(vector, dtype=np.float32))
+
+    def test_zero_ttl_keeps_entries_without_expiry(self):
+        cache = self.make_cache(ttl_seconds=0)
+
+        async def store():
+            await cache.set_many({"hello": [1.0]})
+            return await self.client.ttl(cache.key_for("hello"))
+
+        self.assertEqual(asyncio.run(store()), -1)
+
+    def test_batch_lookup_mixes_local_redis_hits_and_misses(self):
+        cache = self.make_cache()
+
+        async def lookup():
+            await cache.set_many({"local": [1.0], "remote": [2.0]})
+            # Drop only "remote" from the in-process tier
+            cache._local.pop(cache.key_for("remote"))
+            return await cache.get_many(["local", "remote", "missing"])
+
+        self.assertEqual(asyncio.run(lookup()), {"local": [1.0], "remote": [2.0]})
+        stats = cache.get_stats()
+        self.assertEqual((stats["local_hits"], stats["redis_hits"], stats["misses"]), (1, 1, 1))
+        self.assertEqual(stats["writes"], 2)
+        self.assertAlmostEqual(stats["hit_rate"], 2 / 3)
+        # A Redis hit is promoted into the local tier
+        self.assertEqual(cache.get_local("remote"), [2.0])
+
+    def test_local_tier_evicts_the_least_recently_used(self):
+        cache = self.make_cache(max_local_entries=2)
+        cache.set_local("a", [1.0])
+        cache.set_local("b", [2.0])
+        cache.get_local("a")
+        cache.set_local("c", [3.0])
+
+        self.assertIsNone(cache.get_local("b"))
+        self.assertEqual((cache.get_local("a"), cache.get_local("c")), ([1.0], [3.0]))
+        self.assertEqual(cache.get_stats()["evictions"], 1)
+        self.assertEqual(cache.get_stats()["local_entries"], 2)
+
+    def test_without_a_client_only_the_local_tier_is_used(self):
+        cache = EmbeddingCache("all-MiniLM-L6-v2", lambda: None)
+
+        async def lookup():
+            await cache.set_many({"hello": [1.0]})
+            return await cache.get_many(["hello", "missing"])
+
+        self.assertEqual(asyncio.run(lookup()), {"hello": [1.0]})
+        self.assertEqual(cache.get_stats()["writes"], 0)
+        self.assertEqual(cache.get_stats()["misses"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+import asyncio
+import logging
+import threading
+import unittest
+
+from app.services.cache.embeddings import EmbeddingService
+from app.services.cache.redis import RedisService
+
+
+class StubVectorizer:
+    """Records each batch it is given and embeds a text as [len(text), number of spaces]."""
+
+    def __init__(self, release=None, error=None):
+        self.batches = []
+        self.threads = set()
+        self.release = release
+        self.error = error
+
+    def embed_many(self, texts):
+        self.threads.add(threading.current_thread().name)
+        if self.release is not None:
+            self.release.wait(timeout=5)
+        if self.error is not None:
+            raise self.error
+        self.batches.append(list(texts))
+        return [[float(len(text)), float(text.count(" "))] for text in texts]
+
+
+def make_service(model, **kwargs):
+    return EmbeddingService(lambda: model, **kwargs)
+
+
+class TestEmbeddingService(unittest.TestCase):
+    def test_concurrent_requests_share_one_model_call(self):
+        model = StubVectorizer()
+        service = make_service(model, batch_window_ms=5)
+        self.addCleanup(service.shutdown)
+
+        async def burst():
+            return await asyncio.gather(service.embed("a b"), service.embed("cc"), service.embed("a b"))
+
+        self.assertEqual(asyncio.run(burst()), [[3.0, 1.0], [2.0, 0.0], [3.0, 1.0]])
+        # Identical texts in a batch are embedded once, on the inference thread
+        self.assertEqual(model.batches, [["a b", "cc"]])
+        self.assertTrue(all(name.startswith("embedding") for name in model.threads))
+        stats = service.get_stats()
+        self.assertEqual((stats["requests"], stats["batches"], stats["texts_embedded"]), (3, 1, 2))
+        self.assertEqual(stats["avg_batch_size"], 2.0)
+        self.assertGreater(stats["texts_per_second"], 0)
+
+    def test_batches_are_capped_at_max_batch_size(self):
+        model = StubVectorizer()
+        service = make_service(model, batch_window_ms=5, max_batch_size=2)
+        self.addCleanup(service.shutdown)
+
+        vectors = asyncio.run(service.embed_many(["a", "bb", "ccc", "dddd", "eeeee"]))
+
+        self.assertEqual([vector[0] for vector in vectors], [1.0, 2.0, 3.0, 4.0, 5.0])
+        self.assertEqual(model.batches, [["a", "bb"], ["ccc", "dddd"], ["eeeee"]])
+
+    def test_queue_depth_counts_waiting_and_running_texts(self):
+        release = threading.Event()
+        model = StubVectorizer(release=release)
+        service = make_service(model, batch_window_ms=1)
+        self.addCleanup(service.shutdown)
+
+        async def blocked_model():
+            requests = asyncio.gather(*(service.embed(text) for text in ("a", "b", "c")))
+            # The loop keeps running while the model is busy
+            await asyncio.sleep(0.05)
+            depth = service.queue_depth
+            release.set()
+            await requests
+            return depth
+
+        self.assertEqual(asyncio.run(blocked_model()), 3)
+        self.assertEqual(service.queue_depth, 0)
+        self.assertEqual(service.get_stats()["max_queue_depth"], 3)
+
+    def test_model_failure_reaches_every_caller(self):
+        service = make_service(StubVectorizer(error=RuntimeError("model crashed")), batch_window_ms=1)
+        self.addCleanup(service.shutdown)
+
+        async def failing():
+            return await asyncio.gather(service.embed("a"), service.embed("b"), return_exceptions=True)
+
+        results = asyncio.run(failing())
+        self.assertEqual([str(result) for result in results], ["model crashed", "model crashed"])
+        self.assertEqual(service.get_stats()["failures"], 1)
+
+    def test_shutdown_fails_waiting_requests_and_allows_a_restart(self):
+        model = StubVectorizer()
+        service = make_service(model, batch_window_ms=1000)
+
+        async def shut_down_while_waiting():
+            waiting = asyncio.ensure_future(service.embed("a"))
+            await asyncio.sleep(0)
+            service.shutdown()
+            with self.assertRaisesRegex(RuntimeError, "shut down"):
+                await waiting
+
+        asyncio.run(shut_down_while_waiting())
+
+        # A restarted service embeds on a fresh thread pool
+        service.batch_window = 0.001
+        self.assertEqual(asyncio.run(service.embed("bb")), [2.0, 0.0])
+        service.shutdown()
+        self.assertEqual(asyncio.run(service.embed("ccc")), [3.0, 0.0])
+        service.shutdown()
+
+
+class TestRecordEmbeddings(unittest.TestCase):
+    def make_redis(self, model):
+        # Only what the record embedding helpers use; no server connection
+        service = RedisService.__new__(RedisService)
+        service.logger = logging.getLogger(__name__)
+        service.preprocess_texts = lambda texts, **kwargs: [text.lower() for text in texts]
+        service.embeddings = make_service(model, batch_window_ms=1)
+        self.addCleanup(service.embeddings.shutdown)
+        return service
+
+    def test_each_field_gets_its_own_vector(self):
+        model = StubVectorizer()
+        service = self.make_redis(model)
+        record = {"name": "Ada", "message": "Hello there", "tags": ["x", "y"], "meta": {"k": 1}}
+
+        vectors = asyncio.run(service.async_generate_embeddings(record, ["name", "message", "tags", "meta"]))
+
+        self.assertEqual(model.batches, [["ada", "hello there", '"x" "y"', '{"k": 1}', 'ada hello there "x" "y" {"k": 1}']])
+        self.assertEqual(vectors["name_vector"], [3.0, 0.0])
+        self.assertEqual(vectors["message_vector"], [11.0, 1.0])
+        self.assertEqual(vectors["tags_vector"], [7.0, 1.0])
+        self.assertEqual(vectors["meta_vector"], [8.0, 1.0])
+        # Only the metadata vector embeds the joined fields
+        self.assertEqual(vectors["metadata_vector"], [32.0, 6.0])
+
+    def test_sync_and_async_paths_agree(self):
+        record = {"name": "Ada", "message": "Hello there"}
+        sync = self.make_redis(StubVectorizer()).generate_embeddings(record, ["name", "message"])
+        on_loop = asyncio.run(self.make_redis(StubVectorizer()).async_generate_embeddings(record, ["name", "message"]))
+        self.assertEqual(sync, on_loop)
+
+
+if __name__ == '__main__':
+    unittest.main()
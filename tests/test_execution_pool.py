@@ -0,0 +1,45 @@
+import asyncio
+import unittest
+
+from app.services.worker.execution_pool import ExecutionPool
+
+
+class TestExecutionPool(unittest.TestCase):
+    def test_timeout_raised_by_the_job_is_a_failure(self):
+        pool = ExecutionPool(max_concurrent=1, task_timeout=5)
+
+        async def job():
+            raise TimeoutError("upstream API timed out")
+
+        async def scenario():
+            with self.assertRaisesRegex(TimeoutError, "upstream API"):
+                await pool.run(job)
+
+        asyncio.run(scenario())
+        self.assertEqual((pool.stats["failed"], pool.stats["timed_out"]), (1, 0))
+
+    def test_pool_deadline_is_a_timeout(self):
+        pool = ExecutionPool(max_concurrent=1)
+
+        async def scenario():
+            with self.assertRaises(asyncio.TimeoutError):
+                await pool.run(lambda: asyncio.sleep(1), timeout=0.01)
+
+        asyncio.run(scenario())
+        self.assertEqual((pool.stats["failed"], pool.stats["timed_out"]), (0, 1))
+
+    def test_default_deadline_is_finite(self):
+        self.assertEqual(ExecutionPool().task_timeout, 300)
+
+    def test_zero_timeout_opts_a_job_out_of_the_deadline(self):
+        pool = ExecutionPool(max_concurrent=1, task_timeout=0.01)
+
+        async def scenario():
+            return await pool.run(lambda: asyncio.sleep(0.05, result="done"), timeout=0)
+
+        self.assertEqual(asyncio.run(scenario()), "done")
+        self.assertEqual(pool.stats["timed_out"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import asyncio
+import unittest
+
+import pytest
+
+from app.services.cache.barrier import FanInBarrier
+
+
+class TestFanInBarrierScripts(unittest.TestCase):
+    @pytest.fixture(autouse=True)
+    def use_fake_redis(self, fake_redis):
+        # The barrier scripts run inside fakeredis, which needs lupa for Lua
+        pytest.importorskip("lupa")
+        self.client = fake_redis
+
+    def run_with_barrier(self, scenario):
+        return asyncio.run(scenario(FanInBarrier(lambda: self.client)))
+
+    def test_last_arrival_completes_and_duplicates_are_not_counted(self):
+        async def scenario(barrier):
+            await barrier.create("task:1", 2)
+            first = await barrier.arrive("task:1", "task:1:0", {"items": [1]})
+            duplicate = await barrier.arrive("task:1", "task:1:0", {"items": [1]})
+            last = await barrier.arrive("task:1", "task:1:1", {"items": [2]})
+            return first, duplicate, last, await barrier.state("task:1"), await barrier.results("task:1")
+
+        first, duplicate, last, state, results = self.run_with_barrier(scenario)
+        self.assertEqual(first, {"received": 1, "expected": 2, "completed": False})
+        self.assertEqual(duplicate, {"received": 1, "expected": 2, "completed": False})
+        self.assertEqual(last, {"received": 2, "expected": 2, "completed": True})
+        self.assertEqual((state["status"], state["received_tasks"]), ("completed", 2))
+        self.assertEqual(results, {"task:1:0": {"items": [1]}, "task:1:1": {"items": [2]}})
+
+    def test_redelivered_completing_arrival_completes_again(self):
+        async def scenario(barrier):
+            await barrier.create("task:1", 2)
+            await barrier.arrive("task:1", "task:1:0", {"items": [1]})
+            await barrier.arrive("task:1", "task:1:1", {"items": [2]})
+            other = await barrier.arrive("task:1", "task:1:0", {"items": [1]})
+            completing = await barrier.arrive("task:1", "task:1:1", {"items": [2]})
+            return other["completed"], completing["completed"]
+
+        self.assertEqual(self.run_with_barrier(scenario), (False, True))
+
+    def test_create_keeps_an_in_flight_barrier(self):
+        async def scenario(barrier):
+            created = await barrier.create("task:1", 2)
+            await barrier.arrive("task:1", "task:1:0", {"items": [1]})
+            recreated = await barrier.create("task:1", 2)
+            return created, recreated, await barrier.state("task:1")
+
+        created, recreated, state = self.run_with_barrier(scenario)
+        self.assertEqual((created, recreated), (True, False))
+        self.assertEqual(state["received_tasks"], 1)
+
+    def test_barrier_expecting_nothing_is_created_completed(self):
+        async def scenario(barrier):
+            created = await barrier.create("task:1", 0)
+            return created, await barrier.state("task:1"), await barrier.results("task:1")
+
+        created, state, results = self.run_with_barrier(scenario)
+        self.assertTrue(created)
+        self.assertEqual((state["status"], state["total_tasks"], state["received_tasks"]), ("completed", 0, 0))
+        self.assertEqual(results, {})
+
+    def test_arrival_without_a_barrier_raises(self):
+        async def scenario(barrier):
+            with self.assertRaises(KeyError):
+                await barrier.arrive("task:1", "task:1:0", {})
+
+        self.run_with_barrier(scenario)
+
+
+if __name__ == '__main__':
+    unittest.main()
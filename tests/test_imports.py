@@ -0,0 +1,21 @@
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestImports(unittest.TestCase):
+    def test_containers_import_in_a_fresh_interpreter(self):
+        # A fresh process, so modules already imported by other tests cannot hide an import cycle
+        env = dict(os.environ)
+        # The Supabase client is created at import time and needs a URL and key, not a server
+        env.setdefault("SUPABASE_URL", "http://localhost:54321")
+        env.setdefault("SUPABASE_AUTH_SERVICE_ROLE_KEY", "test-key")
+        result = subprocess.run([sys.executable, "-c", "import containers"], cwd=ROOT, env=env, capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+
+if __name__ == '__main__':
+    unittest.main()
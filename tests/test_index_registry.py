@@ -0,0 +1,101 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from app.services.cache.index_registry import IndexRegistry
+
+
+class FakeIndex:
+    server = {}
+    creates = []
+
+    def __init__(self, schema):
+        self.schema = schema
+
+    def set_client(self, client):
+        self.client = client
+
+    async def exists(self):
+        return self.schema.index.name in self.server
+
+    async def create(self, overwrite=False, drop=False):
+        self.creates.append((self.schema.index.name, overwrite, drop))
+        self.server[self.schema.index.name] = self.schema.fields
+
+
+def load_schema(path):
+    with open(path) as f:
+        fields = f.read()
+    return SimpleNamespace(index=SimpleNamespace(name="messages"), fields=fields, to_dict=lambda: {"fields": fields})
+
+
+@patch("app.services.cache.index_registry.IndexSchema.from_yaml", side_effect=load_schema)
+@patch("app.services.cache.index_registry.AsyncSearchIndex", FakeIndex)
+class TestIndexRegistry(unittest.TestCase):
+    @pytest.fixture(autouse=True)
+    def use_fake_redis(self, fake_redis):
+        self.client = fake_redis
+
+    def setUp(self):
+        FakeIndex.server = {}
+        FakeIndex.creates = []
+        self.schema_dir = tempfile.mkdtemp()
+        self.registry = IndexRegistry(schema_dir=self.schema_dir, check_interval=0)
+
+    def write_schema(self, fields, mtime):
+        path = os.path.join(self.schema_dir, "messages.yaml")
+        with open(path, "w") as f:
+            f.write(fields)
+        os.utime(path, (mtime, mtime))
+
+    def test_handle_is_reused_while_schema_is_unchanged(self, _):
+        self.write_schema("message", 1)
+
+        async def get_twice():
+            first = await self.registry.get("messages", self.client)
+            return first, await self.registry.get("messages.yaml", self.client)
+
+        first, second = asyncio.run(get_twice())
+        self.assertIs(first, second)
+        self.assertEqual(FakeIndex.creates, [("messages", False, False)])
+
+    def test_changed_schema_refreshes_the_handle_without_rebuilding(self, _):
+        self.write_schema("message", 1)
+        first = asyncio.run(self.registry.get("messages", self.client))
+        self.write_schema("message agent_name", 2)
+        with self.assertLogs(self.registry.logger, "WARNING"):
+            second = asyncio.run(self.registry.get("messages", self.client))
+
+        self.assertIsNot(first, second)
+        self.assertEqual(second.schema.fields, "message agent_name")
+        self.assertEqual(FakeIndex.creates, [("messages", False, False)])
+        self.assertEqual(FakeIndex.server["messages"], "message")
+
+    def test_rebuild_recreates_the_server_index(self, _):
+        self.write_schema("message", 1)
+        asyncio.run(self.registry.get("messages", self.client))
+        self.write_schema("message agent_name", 2)
+        asyncio.run(self.registry.rebuild("messages", self.client))
+
+        self.assertEqual(FakeIndex.creates, [("messages", False, False), ("messages", True, False)])
+        self.assertEqual(FakeIndex.server["messages"], "message agent_name")
+        # Other workers on the new schema now find the index up to date
+        asyncio.run(IndexRegistry(schema_dir=self.schema_dir).get("messages", self.client))
+        self.assertEqual(len(FakeIndex.creates), 2)
+
+    def test_index_without_a_fingerprint_is_adopted(self, _):
+        self.write_schema("message", 1)
+        asyncio.run(self.registry.get("messages", self.client))
+        # An index built before fingerprints were stored is left as it is
+        asyncio.run(self.client.flushall())
+        asyncio.run(IndexRegistry(schema_dir=self.schema_dir).get("messages", self.client))
+        self.assertEqual(FakeIndex.creates, [("messages", False, False)])
+        self.assertIsNotNone(asyncio.run(self.client.get("index_schema:messages")))
+
+if __name__ == '__main__':
+    unittest.main()
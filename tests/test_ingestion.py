@@ -0,0 +1,81 @@
+import asyncio
+import unittest
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.cache.ingestion import IngestionPipeline, fields_from_schema
+
+
+class TestIngestionPipeline(unittest.TestCase):
+    @pytest.fixture(autouse=True)
+    def use_fake_redis(self, fake_redis):
+        self.client = fake_redis
+
+    def setUp(self):
+        self.embedded = []
+        self.fail_after = None
+
+        async def embed(texts):
+            if self.fail_after is not None and len(self.embedded) >= self.fail_after:
+                raise RuntimeError("embedding backend went away")
+            self.embedded.extend(texts)
+            return [[float(len(text))] for text in texts]
+
+        self.pipeline = IngestionPipeline(lambda: self.client, embed, chunk_size=2)
+        self.fields = {"name": False, "message": True}
+
+    def records(self, count, suffix=""):
+        return ({"id": i, "name": f"agent{i}", "message": f"hello {i}{suffix}"} for i in range(count))
+
+    def test_unchanged_records_are_not_embedded_again(self):
+        async def load_twice():
+            first = await self.pipeline.ingest(self.records(5), self.fields, "message")
+            changed = [{"id": 1, "name": "agent1", "message": "edited"}]
+            second = await self.pipeline.ingest(list(self.records(5)) + changed, self.fields, "message")
+            return first, second
+
+        first, second = asyncio.run(load_twice())
+        self.assertEqual((first["written"], first["unchanged"]), (5, 0))
+        self.assertEqual((second["written"], second["unchanged"]), (1, 5))
+        # message_vector and metadata_vector for 5 records, then for the edited one
+        self.assertEqual(len(self.embedded), 12)
+        stored = asyncio.run(self.client.hgetall("message:1"))
+        self.assertEqual(stored[b"message"], b"edited")
+        self.assertIn(b"message_vector", stored)
+        self.assertNotIn(b"name_vector", stored)
+
+    def test_interrupted_run_resumes_from_checkpoint(self):
+        self.fail_after = 4  # two chunks of two records, two texts each
+
+        async def interrupted():
+            with self.assertRaises(RuntimeError):
+                await self.pipeline.ingest(self.records(7), self.fields, "message", run_id="messages:test", force=True)
+            return await self.client.hget(self.pipeline.checkpoint_key("messages:test"), "position")
+
+        self.pipeline.max_in_flight = 1
+        self.assertEqual(asyncio.run(interrupted()), b"2")
+
+        self.fail_after = None
+        self.embedded.clear()
+        keys = []
+        result = asyncio.run(self.pipeline.ingest(self.records(7), self.fields, "message", run_id="messages:test", force=True, on_chunk=keys.extend))
+        self.assertEqual((result["resumed"], result["written"]), (2, 5))
+        # Keys of the chunk loaded before the interruption are reported too
+        self.assertEqual(keys, [f"message:{i}" for i in range(7)])
+        self.assertEqual(len(self.embedded), 10)
+        self.assertFalse(asyncio.run(self.client.exists(self.pipeline.checkpoint_key("messages:test"))))
+        self.assertEqual(len(asyncio.run(self.client.keys("message:*"))), 7)
+
+    def test_fields_from_schema(self):
+        schema = SimpleNamespace(fields={
+            "agent_name": SimpleNamespace(type="tag"),
+            "message": SimpleNamespace(type="tag"),
+            "message_vector": SimpleNamespace(type="vector"),
+            "metadata_vector": SimpleNamespace(type="vector"),
+        })
+        self.assertEqual(fields_from_schema(schema), ({"agent_name": False, "message": True}, True))
+
+
+if __name__ == '__main__':
+    unittest.main()
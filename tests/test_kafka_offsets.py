@@ -0,0 +1,117 @@
+import asyncio
+import queue
+import threading
+import unittest
+from types import SimpleNamespace
+
+from kafka.structs import TopicPartition
+
+from app.services.queue.kafka import KafkaService
+
+
+def make_service():
+    # Only the consumer-side state _handle_batch uses; no broker connection
+    service = KafkaService.__new__(KafkaService)
+    service.logger = SimpleNamespace(error=lambda *args: None)
+    service.subscriptions = {}
+    service._commit_queue = queue.Queue()
+    service._pending_records = 0
+    service._pending_lock = threading.Lock()
+    service._outstanding = {}
+    service._record_tasks = set()
+    return service
+
+
+def record(offset, partition=0):
+    return SimpleNamespace(topic="agency_action", partition=partition, offset=offset, value={"offset": offset})
+
+
+def committed(service):
+    offsets = []
+    while not service._commit_queue.empty():
+        offsets.append(service._commit_queue.get_nowait())
+    return offsets
+
+
+class TestKafkaOffsets(unittest.TestCase):
+    def test_offsets_are_released_only_after_handlers_finish_in_order(self):
+        service = make_service()
+
+        async def scenario():
+            events = {0: asyncio.Event(), 1: asyncio.Event()}
+
+            def callback(value):
+                # Like EventManager, hand back a task that is still running
+                return asyncio.ensure_future(events[value["offset"]].wait())
+
+            service.subscriptions["agency_action"] = [(None, callback)]
+            batch = [record(0), record(1)]
+            service._pending_records = len(batch)
+            await service._handle_batch(batch)
+            await asyncio.sleep(0)
+            before = committed(service)
+
+            events[1].set()
+            await asyncio.sleep(0.01)
+            out_of_order = committed(service)
+
+            events[0].set()
+            await asyncio.sleep(0.01)
+            return before, out_of_order, committed(service)
+
+        before, out_of_order, after = asyncio.run(scenario())
+        self.assertEqual(before, [])
+        self.assertEqual(out_of_order, [])
+        self.assertEqual(after, [{TopicPartition("agency_action", 0): 2}])
+        self.assertEqual(service._pending_records, 0)
+
+    def test_async_callback_returning_a_task_holds_the_offset(self):
+        service = make_service()
+
+        async def scenario():
+            event = asyncio.Event()
+
+            async def callback(value):
+                # The EventManager listener shape: a coroutine that starts the handling and returns its task
+                return asyncio.create_task(event.wait())
+
+            service.subscriptions["agency_action"] = [(None, callback)]
+            service._pending_records = 1
+            await service._handle_batch([record(0)])
+            await asyncio.sleep(0.01)
+            before = committed(service)
+
+            event.set()
+            await asyncio.sleep(0.01)
+            return before, committed(service)
+
+        before, after = asyncio.run(scenario())
+        self.assertEqual(before, [])
+        self.assertEqual(after, [{TopicPartition("agency_action", 0): 1}])
+        self.assertEqual(service._pending_records, 0)
+
+    def test_revoked_partition_is_forgotten_and_unpaused(self):
+        service = make_service()
+        service._paused = True
+        service.consumer = None
+
+        async def scenario():
+            service.event_loop = asyncio.get_running_loop()
+            event = asyncio.Event()
+            service.subscriptions["agency_action"] = [(None, lambda value: event.wait())]
+            service._pending_records = 1
+            await service._handle_batch([record(5)])
+            service._on_partitions_revoked([TopicPartition("agency_action", 0)])
+            await asyncio.sleep(0)
+            event.set()
+            await asyncio.sleep(0.01)
+
+        asyncio.run(scenario())
+        self.assertFalse(service._paused)
+        self.assertEqual(service._outstanding, {})
+        self.assertEqual(committed(service), [])
+        self.assertEqual(service._pending_records, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,186 @@
+import asyncio
+import threading
+import unittest
+from types import SimpleNamespace
+
+from kafka.errors import KafkaTimeoutError
+
+from app.services.queue.kafka import KafkaService
+
+
+class StubSendFuture:
+    def __init__(self):
+        self.callbacks = []
+        self.errbacks = []
+
+    def add_callback(self, callback):
+        self.callbacks.append(callback)
+
+    def add_errback(self, errback):
+        self.errbacks.append(errback)
+
+
+class StubProducer:
+    """Records sends; the test acknowledges them from another thread, like the producer's sender thread."""
+
+    def __init__(self, fail_send=None):
+        self.sent = []
+        self.fail_send = fail_send
+
+    def send(self, topic, value=None, key=None):
+        if self.fail_send is not None:
+            raise self.fail_send
+        future = StubSendFuture()
+        self.sent.append((topic, value, key, future))
+        return future
+
+    def complete(self, index, error=None):
+        topic, _, _, future = self.sent[index]
+
+        def run():
+            if error is not None:
+                for errback in future.errbacks:
+                    errback(error)
+            else:
+                for callback in future.callbacks:
+                    callback(SimpleNamespace(topic=topic, partition=0, offset=index))
+
+        sender = threading.Thread(target=run, name="kafka-sender")
+        sender.start()
+        sender.join()
+
+
+def make_service(producer, max_in_flight=10):
+    # Only the producer-side state send_message/send_many use; no broker connection
+    service = KafkaService.__new__(KafkaService)
+    service.logger = SimpleNamespace(debug=lambda *args: None, info=lambda *args: None, warning=lambda *args: None, error=lambda *args: None)
+    service.producer = producer
+    service.ack_timeout = 1.0
+    service.max_in_flight = max_in_flight
+    service._inflight = asyncio.Semaphore(max_in_flight)
+    service._pending_acks = 0
+    service.producer_stats = {}
+    return service
+
+
+async def until(condition):
+    while not condition():
+        await asyncio.sleep(0)
+
+
+class TestKafkaProducer(unittest.TestCase):
+    def test_ack_is_resolved_on_the_event_loop(self):
+        producer = StubProducer()
+        service = make_service(producer)
+
+        resolved_on = []
+        resolve_ack = service._resolve_ack
+
+        def recording_resolve_ack(*args):
+            resolved_on.append(threading.current_thread().name)
+            resolve_ack(*args)
+
+        service._resolve_ack = recording_resolve_ack
+
+        async def scenario():
+            ack = await service.send_message("agency_action", {"n": 1}, key="k", wait=False)
+            producer.complete(0)
+            return await ack
+
+        metadata = asyncio.run(scenario())
+        self.assertEqual((metadata.topic, metadata.offset), ("agency_action", 0))
+        self.assertEqual(resolved_on, [threading.main_thread().name])
+        self.assertEqual(producer.sent[0][:3], ("agency_action", {"n": 1}, "k"))
+        self.assertEqual(service._pending_acks, 0)
+
+    def test_broker_error_reaches_the_caller(self):
+        producer = StubProducer()
+        service = make_service(producer)
+
+        async def scenario():
+            ack = await service.send_message("agency_action", {"n": 1}, wait=False)
+            producer.complete(0, error=KafkaTimeoutError("no broker"))
+            with self.assertRaises(KafkaTimeoutError):
+                await ack
+
+            waiting = asyncio.ensure_future(service.send_message("agency_action", {"n": 2}))
+            await until(lambda: len(producer.sent) == 2)
+            producer.complete(1, error=KafkaTimeoutError("no broker"))
+            return await waiting
+
+        self.assertIsNone(asyncio.run(scenario()))
+        self.assertEqual(service.get_producer_stats()["agency_action"]["failed"], 2)
+
+    def test_failed_enqueue_releases_its_in_flight_slot(self):
+        service = make_service(StubProducer(fail_send=BufferError("queue full")), max_in_flight=1)
+
+        async def scenario():
+            first = await service.send_message("agency_action", {"n": 1})
+            second = await service.send_message("agency_action", {"n": 2})
+            return first, second, service._inflight.locked()
+
+        self.assertEqual(asyncio.run(scenario()), (None, None, False))
+        self.assertEqual(service.get_producer_stats()["agency_action"]["failed"], 2)
+
+    def test_sends_wait_while_the_in_flight_window_is_full(self):
+        producer = StubProducer()
+        service = make_service(producer, max_in_flight=2)
+
+        async def scenario():
+            sends = [asyncio.ensure_future(service.send_message("agency_action", {"n": i})) for i in range(3)]
+            await until(lambda: len(producer.sent) == 2)
+            for _ in range(10):
+                await asyncio.sleep(0)
+            blocked = len(producer.sent)
+
+            producer.complete(0)
+            await until(lambda: len(producer.sent) == 3)
+            producer.complete(1)
+            producer.complete(2)
+            return blocked, [metadata.offset for metadata in await asyncio.gather(*sends)]
+
+        self.assertEqual(asyncio.run(scenario()), (2, [0, 1, 2]))
+
+    def test_send_many_keeps_message_order_and_keys(self):
+        producer = StubProducer()
+        service = make_service(producer)
+        messages = [{"key": f"task:{i}"} for i in range(4)]
+
+        async def scenario():
+            sending = asyncio.ensure_future(service.send_many("agency_action", messages, key_func=lambda m: m["key"]))
+            await until(lambda: len(producer.sent) == 4)
+            # Acknowledgements arrive out of order; one message fails
+            for index in (3, 1, 0):
+                producer.complete(index)
+            producer.complete(2, error=KafkaTimeoutError("no broker"))
+            return await sending
+
+        results = asyncio.run(scenario())
+        self.assertEqual([(value, key) for _, value, key, _ in producer.sent], [(m, m["key"]) for m in messages])
+        self.assertEqual([result.offset if result else None for result in results], [0, 1, None, 3])
+
+    def test_per_topic_counters(self):
+        producer = StubProducer()
+        service = make_service(producer)
+
+        async def scenario():
+            sending = asyncio.ensure_future(service.send_many("agency_action", [{"n": 1}, {"n": 2}]))
+            await until(lambda: len(producer.sent) == 2)
+            producer.complete(0)
+            producer.complete(1)
+            await sending
+            ack = await service.send_message("results", {"n": 3}, wait=False)
+            producer.complete(2, error=KafkaTimeoutError("no broker"))
+            await asyncio.gather(ack, return_exceptions=True)
+
+        asyncio.run(scenario())
+        stats = service.get_producer_stats()
+        self.assertEqual((stats["agency_action"]["sent"], stats["agency_action"]["failed"]), (2, 0))
+        self.assertEqual((stats["agency_action"]["batches"], stats["agency_action"]["batch_size_avg"]), (1, 2.0))
+        self.assertEqual((stats["results"]["sent"], stats["results"]["failed"], stats["results"]["batches"]), (0, 1, 0))
+        self.assertGreaterEqual(stats["agency_action"]["latency_ms_max"], stats["agency_action"]["latency_ms_avg"])
+        self.assertEqual(stats["agency_action"]["inflight"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+import logging
+import os
+import queue
+import tempfile
+import unittest
+
+from app.logging_config import BatchingQueueListener, LogFilePool, PooledFileHandler, RoutingQueueHandler
+
+
+def read(path):
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+
+class TestLogFilePool(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def path(self, *parts):
+        return os.path.join(self.tmp.name, *parts)
+
+    def test_flush_writes_buffered_lines_per_file(self):
+        pool = LogFilePool()
+        self.addCleanup(pool.close)
+        pool.append(self.path('a', 'x.log'), "one\n")
+        pool.append(self.path('a', 'x.log'), "two\n")
+        self.assertFalse(os.path.exists(self.path('a', 'x.log')))
+
+        pool.flush()
+        self.assertEqual(read(self.path('a', 'x.log')), "one\ntwo\n")
+
+    def test_files_past_max_bytes_are_rotated(self):
+        pool = LogFilePool(max_bytes=10, backup_count=2)
+        self.addCleanup(pool.close)
+        log = self.path('x.log')
+        for line in ("first line\n", "second line\n", "third line\n"):
+            pool.append(log, line)
+            pool.flush()
+
+        self.assertEqual(read(log + '.1'), "third line\n")
+        self.assertEqual(read(log + '.2'), "second line\n")
+        self.assertFalse(os.path.exists(log + '.3'))
+        self.assertFalse(os.path.exists(log))
+
+    def test_least_recently_written_file_is_closed(self):
+        pool = LogFilePool(max_open=2)
+        self.addCleanup(pool.close)
+        for name in ('a.log', 'b.log', 'a.log', 'c.log'):
+            pool.append(self.path(name), f"{name}\n")
+            pool.flush()
+
+        self.assertEqual(pool.open_files(), 2)
+        self.assertEqual(list(pool._files), [self.path('a.log'), self.path('c.log')])
+        # An evicted file is reopened for appending, not truncated
+        pool.append(self.path('b.log'), "again\n")
+        pool.flush()
+        self.assertEqual(read(self.path('b.log')), "b.log\nagain\n")
+
+
+class TestQueueLogging(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def make_logger(self, log_queue, *handlers):
+        logger = logging.getLogger(f"test_logging_queue.{self.id()}")
+        logger.propagate = False
+        logger.setLevel(logging.DEBUG)
+        logger.addHandler(RoutingQueueHandler(log_queue, list(handlers)))
+        self.addCleanup(logger.handlers.clear)
+        return logger
+
+    def test_listener_writes_every_record_once_stopped(self):
+        pool = LogFilePool()
+        log_queue = queue.SimpleQueue()
+        listener = BatchingQueueListener(log_queue, pool, batch_size=3)
+        log_file = os.path.join(self.tmp.name, 'app.log')
+        handler = PooledFileHandler(log_file, pool)
+        handler.setFormatter(logging.Formatter('%(levelname)s %(message)s'))
+        logger = self.make_logger(log_queue, handler)
+
+        listener.start()
+        for i in range(7):
+            logger.info("record %d", i)
+        listener.stop()
+
+        self.assertEqual(read(log_file).splitlines(), [f"INFO record {i}" for i in range(7)])
+        self.assertEqual(pool.open_files(), 0)
+
+    def test_traceback_reaches_the_listener_formatters(self):
+        pool = LogFilePool()
+        log_queue = queue.SimpleQueue()
+        listener = BatchingQueueListener(log_queue, pool)
+        errors_file = os.path.join(self.tmp.name, 'errors.log')
+        handler = PooledFileHandler(errors_file, pool, level=logging.ERROR)
+        handler.setFormatter(logging.Formatter('Message: %(message)s'))
+        logger = self.make_logger(log_queue, handler)
+
+        listener.start()
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logger.exception("failed %s", "job")
+        listener.stop()
+
+        written = read(errors_file)
+        self.assertTrue(written.startswith("Message: failed job\nTraceback (most recent call last):"))
+        self.assertIn("ValueError: boom", written)
+        self.assertEqual(written.count("Traceback"), 1)
+        self.assertNotIn("None", written)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+
+from app.services.metrics import MetricsRegistry
+
+
+class Source:
+    def __init__(self, depth):
+        self.depth = depth
+
+    def depths(self):
+        return {("events",): self.depth}
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    def test_histogram_renders_cumulative_buckets(self):
+        registry = MetricsRegistry()
+        histogram = registry.histogram("redis_command_seconds", "RTT.", ["command"], buckets=(0.01, 0.1))
+        for value in (0.005, 0.05, 0.05, 2.0):
+            histogram.labels("GET").observe(value)
+        text = registry.render()
+        self.assertIn('# TYPE redis_command_seconds histogram', text)
+        self.assertIn('redis_command_seconds_bucket{command="GET",le="0.01"} 1', text)
+        self.assertIn('redis_command_seconds_bucket{command="GET",le="0.1"} 3', text)
+        self.assertIn('redis_command_seconds_bucket{command="GET",le="+Inf"} 4', text)
+        self.assertIn('redis_command_seconds_count{command="GET"} 4', text)
+        self.assertIn('redis_command_seconds_sum{command="GET"} 2.105', text)
+
+    def test_metrics_are_shared_by_name(self):
+        registry = MetricsRegistry()
+        counter = registry.counter("runs", "Runs.", ["agent"])
+        self.assertIs(registry.counter("runs", "Runs.", ["agent"]), counter)
+        counter.labels(agent='say "hi"').inc()
+        self.assertIn('runs_total{agent="say \\"hi\\""} 1', registry.render())
+        with self.assertRaises(ValueError):
+            registry.gauge("runs", "Runs.")
+        with self.assertRaises(ValueError):
+            counter.labels("a", "b")
+
+    def test_callback_gauge_drops_collected_sources(self):
+        registry = MetricsRegistry()
+        source = Source(3)
+        registry.gauge_callback("event_queue_depth", "Depth.", ["queue"], source.depths)
+        self.assertIn('event_queue_depth{queue="events"} 3', registry.render())
+        del source
+        self.assertNotIn('event_queue_depth{', registry.render())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,190 @@
+import importlib.util
+import itertools
+import json
+import logging
+import re
+import string
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from app.services.cache.preprocessing import DEFAULT_PROCESS_CONFIG, Redactor, TextPreprocessor, get_preprocessor
+from app.services.cache.redis import RedisService
+
+HAS_PRESIDIO = all(importlib.util.find_spec(name) for name in ("presidio_analyzer", "presidio_anonymizer", "en_core_web_lg"))
+
+INPUTS = [
+    "Hello, World!",
+    "getUserID from 2024 logs",
+    "Line one\nLine two\n\n  indented",
+    "café — naïve ☃ résumé",
+    {"userName": "Ada", "age": 36},
+    "a--b..c  \t d",
+    "trailing punctuation...\n",
+    "\n",
+    "",
+    "XMLHttpRequest v2.0 (beta)",
+    "tabs\tand\r\nwindows  line\n endings",
+]
+
+
+def sequential_preprocess(text, process_config=None):
+    """The six sequential passes preprocess_text made before the pipeline was compiled."""
+    if isinstance(text, dict):
+        text = json.dumps(text)
+    if not text:
+        return ""
+    process_config = process_config or {}
+    text = text.encode('ascii', 'ignore').decode()
+    if process_config.get('remove_punctuation', True):
+        text = re.sub('[%s]' % re.escape(string.punctuation), ' ', text)
+    if process_config.get('remove_extra_whitespace', True):
+        text = re.sub(r'\s{2,}', " ", text)
+    if process_config.get('remove_newlines', True):
+        text = text.replace("\n", " ")
+    if process_config.get('split_camel_case', True):
+        text = " ".join(re.split('(?=[A-Z])', text))
+    if process_config.get('remove_digits', True):
+        text = re.sub(r'\d+', '', text)
+    if process_config.get('lowercase', True):
+        text = text.lower()
+    return text.strip()
+
+
+def make_service():
+    # Only what preprocess_texts uses; no server connection
+    service = RedisService.__new__(RedisService)
+    service.logger = logging.getLogger(__name__)
+    return service
+
+
+class TestTextPreprocessor(unittest.TestCase):
+    def test_default_pipeline_outputs(self):
+        expected = [
+            ("Hello, World!", "hello  world"),
+            ("getUserID from 2024 logs", "get user i d from  logs"),
+            ("Line one\nLine two\n\n  indented", "line one  line two indented"),
+            ("café — naïve ☃ résumé", "caf nave rsum"),
+            ({"userName": "Ada", "age": 36}, "user name  ada age"),
+            ("a--b..c  \t d", "a b c d"),
+            ("\n", ""),
+            ("XMLHttpRequest", "x m l http request"),
+        ]
+        service = make_service()
+        for text, output in expected:
+            with self.subTest(text=text):
+                self.assertEqual(service.preprocess_text(text), output)
+
+    def test_matches_the_sequential_passes_for_every_flag_combination(self):
+        service = make_service()
+        flags = sorted(DEFAULT_PROCESS_CONFIG)
+        for values in itertools.product([True, False], repeat=len(flags)):
+            config = dict(zip(flags, values))
+            with self.subTest(config=config):
+                self.assertEqual(service.preprocess_texts(INPUTS, process_config=config), [sequential_preprocess(text, config) for text in INPUTS])
+
+    def test_missing_flags_default_to_enabled(self):
+        self.assertEqual(TextPreprocessor({"lowercase": False}).config, {**DEFAULT_PROCESS_CONFIG, "lowercase": False})
+        self.assertEqual(make_service().preprocess_text("getUserID, 2024!", process_config={"split_camel_case": False, "lowercase": False}), "getUserID")
+
+    def test_pipelines_are_compiled_once_per_config(self):
+        self.assertIs(get_preprocessor({"lowercase": False, "remove_digits": True}), get_preprocessor({"remove_digits": True, "lowercase": False}))
+        self.assertIsNot(get_preprocessor({"lowercase": False}), get_preprocessor())
+
+    def test_hooks_run_after_the_pipeline(self):
+        service = make_service()
+        self.assertEqual(service.preprocess_texts(["hello world", ""], func=str.upper, reverse=lambda text: text[::-1]), ["DLROW OLLEH", ""])
+
+
+class FakeAnalyzer:
+    """Finds every capitalized word as a PERSON and every word with '@' as an EMAIL_ADDRESS."""
+
+    def __init__(self):
+        self.calls = []
+
+    def analyze(self, text, language, entities):
+        self.calls.append(("analyze", text, language, tuple(entities)))
+        results = []
+        for match in re.finditer(r"\S+", text):
+            word = match.group()
+            entity = "EMAIL_ADDRESS" if "@" in word else "PERSON" if word[0].isupper() else None
+            if entity:
+                results.append(SimpleNamespace(entity_type=entity, start=match.start(), end=match.end()))
+        return results
+
+
+class FakeBatchAnalyzer:
+    def __init__(self, analyzer):
+        self.analyzer = analyzer
+        self.batches = []
+
+    def analyze_iterator(self, texts, language, entities):
+        self.batches.append(list(texts))
+        return [self.analyzer.analyze(text, language, entities) for text in texts]
+
+
+class FakeAnonymizer:
+    def __init__(self):
+        self.calls = 0
+
+    def anonymize(self, text, analyzer_results):
+        self.calls += 1
+        for result in sorted(analyzer_results, key=lambda result: result.start, reverse=True):
+            text = text[:result.start] + f"<{result.entity_type}>" + text[result.end:]
+        return SimpleNamespace(text=text)
+
+
+class TestRedactor(unittest.TestCase):
+    def make_redactor(self):
+        redactor = Redactor()
+        analyzer = FakeAnalyzer()
+        redactor._analyzer = analyzer
+        redactor._batch_analyzer = FakeBatchAnalyzer(analyzer)
+        redactor._anonymizer = FakeAnonymizer()
+        return redactor
+
+    def test_every_entity_is_replaced_in_one_anonymize_pass(self):
+        redactor = self.make_redactor()
+        self.assertEqual(redactor.redact("mail Ada at ada@example.com or Grace"), "mail <PERSON> at <EMAIL_ADDRESS> or <PERSON>")
+        self.assertEqual(redactor._anonymizer.calls, 1)
+
+    def test_only_configured_entities_are_redacted(self):
+        redactor = self.make_redactor()
+        config = {"config": {"entities": ["EMAIL_ADDRESS"]}, "model": "en"}
+        self.assertEqual(redactor.redact("mail Ada at ada@example.com", config), "mail Ada at <EMAIL_ADDRESS>")
+        self.assertEqual(redactor._analyzer.calls[0][3], ("EMAIL_ADDRESS",))
+
+    def test_batches_share_one_analyzer_pass(self):
+        redactor = self.make_redactor()
+        texts = ["hi Ada", "nothing here", "ping ada@example.com"]
+
+        self.assertEqual(redactor.redact_many(texts), ["hi <PERSON>", "nothing here", "ping <EMAIL_ADDRESS>"])
+        self.assertEqual(redactor._batch_analyzer.batches, [texts])
+        # Texts without findings are not sent to the anonymizer
+        self.assertEqual(redactor._anonymizer.calls, 2)
+
+    def test_preprocess_redacts_before_normalizing(self):
+        service = make_service()
+        fake = self.make_redactor()
+
+        with patch("app.services.cache.redis.redactor", fake):
+            processed = service.preprocess_texts(["call Ada", ""], process_config={"split_camel_case": False}, redact_config={})
+
+        self.assertEqual(processed, ["call person", ""])
+        self.assertEqual(fake._batch_analyzer.batches, [])
+        self.assertEqual(len(fake._analyzer.calls), 1)
+
+    @unittest.skipUnless(HAS_PRESIDIO, "presidio and the en_core_web_lg model are required for real redaction")
+    def test_presidio_engines_are_loaded_once(self):
+        redactor = Redactor()
+        first = redactor.redact("Contact John Smith at john.smith@example.com")
+        engines = redactor._engines()
+
+        self.assertNotIn("john.smith@example.com", first)
+        self.assertNotIn("John Smith", first)
+        redactor.redact_many(["Call Jane Doe", "Email jane@example.com"])
+        self.assertEqual(redactor._engines(), engines)
+
+
+if __name__ == '__main__':
+    unittest.main()
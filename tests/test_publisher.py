@@ -0,0 +1,96 @@
+import asyncio
+import unittest
+
+import pytest
+
+from app.services.cache.publisher import PipelinedPublisher
+
+
+async def subscribe(client, *channels):
+    pubsub = client.pubsub()
+    await pubsub.subscribe(*channels)
+    return pubsub
+
+
+async def received(pubsub):
+    """(channel, message) pairs delivered to a subscription so far, decoded."""
+    messages = []
+    while (message := await pubsub.get_message(timeout=0.05)) is not None:
+        if message["type"] == "message":
+            messages.append((message["channel"].decode(), message["data"].decode()))
+    await pubsub.aclose()
+    return messages
+
+
+class TestPipelinedPublisher(unittest.TestCase):
+    @pytest.fixture(autouse=True)
+    def use_fake_redis(self, fake_redis):
+        self.client = fake_redis
+
+    def test_burst_shares_one_round_trip_and_coalesces_duplicates(self):
+        publisher = PipelinedPublisher(lambda: self.client, batch_window_ms=5)
+
+        async def burst():
+            pubsub = await subscribe(self.client, "a", "b")
+            results = await asyncio.gather(
+                publisher.publish("a", {"n": 1}),
+                publisher.publish("b", "x"),
+                publisher.publish("a", {"n": 1}),
+                publisher.publish("a", {"n": 2}),
+            )
+            return results, await received(pubsub)
+
+        results, sent = asyncio.run(burst())
+        self.assertEqual(results, [True, True, True, True])
+        self.assertEqual(sent, [("a", '{"n": 1}'), ("b", "x"), ("a", '{"n": 2}')])
+        self.assertEqual(publisher.get_stats()["batches"], 1)
+        self.assertEqual(publisher.get_stats()["coalesced"], 1)
+
+    def test_only_repeats_of_the_latest_pending_message_coalesce(self):
+        publisher = PipelinedPublisher(lambda: self.client, batch_window_ms=5)
+
+        async def burst():
+            pubsub = await subscribe(self.client, "a")
+            results = await asyncio.gather(
+                publisher.publish("a", "A"),
+                publisher.publish("a", "B"),
+                publisher.publish("a", "A"),
+            )
+            return results, await received(pubsub)
+
+        results, sent = asyncio.run(burst())
+        self.assertEqual(results, [True, True, True])
+        self.assertEqual(sent, [("a", "A"), ("a", "B"), ("a", "A")])
+        self.assertEqual(publisher.get_stats()["coalesced"], 0)
+
+    def test_publish_many_is_sent_after_pending_publishes(self):
+        publisher = PipelinedPublisher(lambda: self.client, batch_window_ms=50)
+
+        async def mixed():
+            pubsub = await subscribe(self.client, "a")
+            pending = asyncio.create_task(publisher.publish("a", "1"))
+            await asyncio.sleep(0)
+            sent = await publisher.publish_many([("a", "2")])
+            return sent, await pending, await received(pubsub)
+
+        sent, published, messages = asyncio.run(mixed())
+        self.assertEqual((sent, published), (1, True))
+        self.assertEqual(messages, [("a", "1"), ("a", "2")])
+
+    def test_publish_many_skips_channels_known_to_have_no_subscribers(self):
+        publisher = PipelinedPublisher(lambda: self.client, subscriber_ttl=60)
+
+        async def fan_out():
+            pubsub = await subscribe(self.client, "node:1")
+            first = await publisher.publish_many([("node:1", "m"), ("node:2", "m")], check_subscribers=True)
+            second = await publisher.publish_many([("node:1", "m"), ("node:2", "m")], check_subscribers=True)
+            await received(pubsub)
+            return first, second
+
+        self.assertEqual(asyncio.run(fan_out()), (2, 1))
+        self.assertEqual(publisher.get_stats()["batches"], 2)
+        self.assertEqual(publisher.get_stats()["skipped_no_subscribers"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import asyncio
+import unittest
+
+import pytest
+
+from app.services.cache.read_through import ReadThroughCache
+
+
+class TestReadThroughCache(unittest.TestCase):
+    @pytest.fixture(autouse=True)
+    def use_fake_redis(self, fake_redis):
+        self.client = fake_redis
+
+    def setUp(self):
+        self.published = []
+
+        async def publish(channel, message):
+            self.published.append((channel, message))
+
+        self.cache = ReadThroughCache(lambda: self.client, publish)
+        self.loads = 0
+
+    async def load(self):
+        self.loads += 1
+        await asyncio.sleep(0.01)
+        return {"rows": [self.loads]}
+
+    def redis_keys(self):
+        return sorted(key.decode("utf-8") for key in asyncio.run(self.client.keys("*")))
+
+    def test_concurrent_misses_share_one_load_and_later_reads_hit_memory(self):
+        async def read():
+            first = await asyncio.gather(*(self.cache.get("user_context:u1", "get_user", self.load) for _ in range(5)))
+            second = await self.cache.get("user_context:u1", "get_user", self.load)
+            return first, second
+
+        first, second = asyncio.run(read())
+        self.assertEqual(self.loads, 1)
+        self.assertEqual(first, [{"rows": [1]}] * 5)
+        self.assertEqual(second, {"rows": [1]})
+        stats = self.cache.get_stats()
+        self.assertEqual((stats["coalesced"], stats["local_hits"]), (4, 1))
+        self.assertTrue(asyncio.run(self.client.hexists("read_cache:user_context:u1", "get_user")))
+
+    def test_redis_tier_serves_other_workers(self):
+        other = ReadThroughCache(lambda: self.client, self.cache._publish)
+
+        async def read():
+            await self.cache.get("forms:u1", "intake", self.load)
+            return await other.get("forms:u1", "intake", self.load)
+
+        self.assertEqual(asyncio.run(read()), {"rows": [1]})
+        self.assertEqual(self.loads, 1)
+        self.assertEqual(other.get_stats()["redis_hits"], 1)
+
+    def test_invalidate_drops_both_tiers_and_discards_inflight_loads(self):
+        async def scenario():
+            await self.cache.get("forms:u1", "intake", self.load)
+            await self.cache.invalidate("forms:u1")
+            after_invalidate = await self.cache.get("forms:u1", "intake", self.load)
+            # A write landing while a load is in flight must not leave the stale load cached
+            pending = asyncio.ensure_future(self.cache.get("forms:u1", "supplemental", self.load))
+            await asyncio.sleep(0)
+            await self.cache.invalidate("forms:u1")
+            await pending
+            return after_invalidate
+
+        self.assertEqual(asyncio.run(scenario()), {"rows": [2]})
+        self.assertEqual(self.published, [("read_cache:invalidate", {"families": ["forms:u1"]})] * 2)
+        self.assertNotIn(("forms:u1", "supplemental"), self.cache._local)
+        self.assertNotIn("read_cache:forms:u1", self.redis_keys())
+
+    def test_private_reads_stay_out_of_redis(self):
+        async def read():
+            first = await self.cache.get("reports:u1", "decrypted_report", self.load, shared=False)
+            second = await self.cache.get("reports:u1", "decrypted_report", self.load, shared=False)
+            return first, second
+
+        self.assertEqual(asyncio.run(read()), ({"rows": [1]}, {"rows": [1]}))
+        self.assertEqual(self.loads, 1)
+        self.assertEqual(self.redis_keys(), [])
+
+    def test_invalidate_prefix_drops_every_owner(self):
+        async def scenario():
+            await self.cache.get("user_meta:u1", "get_meta", self.load)
+            await self.cache.get("user_meta:u2", "get_meta", self.load)
+            await self.cache.get("courses:u1", "get_courses", self.load)
+            await self.cache.invalidate_prefix("user_meta:")
+
+        asyncio.run(scenario())
+        self.assertEqual(list(self.cache._local), [("courses:u1", "get_courses")])
+        self.assertEqual(self.redis_keys(), ["read_cache:courses:u1"])
+        self.assertEqual(self.published[-1], ("read_cache:invalidate", {"prefixes": ["user_meta:"]}))
+
+
+if __name__ == '__main__':
+    unittest.main()
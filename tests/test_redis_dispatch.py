@@ -0,0 +1,60 @@
+import asyncio
+import json
+import logging
+import unittest
+
+from app.services.cache.redis import RedisService
+
+
+def make_service():
+    # Only the pub/sub registry _dispatch uses; no server connection
+    service = RedisService.__new__(RedisService)
+    service.logger = logging.getLogger(__name__)
+    service.overflow_policy = "block"
+    service.subscriptions = {}
+    return service
+
+
+def message(value):
+    return {"type": "message", "channel": b"session:s1:results", "data": json.dumps(value).encode("utf-8")}
+
+
+class TestRedisDispatch(unittest.TestCase):
+    def test_full_subscriber_does_not_hold_up_the_others(self):
+        service = make_service()
+
+        async def scenario():
+            slow = asyncio.Queue(maxsize=1)
+            fast = asyncio.Queue()
+            service.subscriptions["session:s1:results"] = [
+                service._new_subscription(slow, None, None),
+                service._new_subscription(fast, None, None),
+            ]
+            for value in range(3):
+                await asyncio.wait_for(service._dispatch(message(value)), timeout=1)
+            delivered_fast = [fast.get_nowait() for _ in range(fast.qsize())]
+
+            # The slow subscriber still gets everything, in order, as it catches up
+            delivered_slow = [await asyncio.wait_for(slow.get(), timeout=1) for _ in range(3)]
+            return delivered_fast, delivered_slow
+
+        delivered_fast, delivered_slow = asyncio.run(scenario())
+        self.assertEqual(delivered_fast, [0, 1, 2])
+        self.assertEqual(delivered_slow, [0, 1, 2])
+
+    def test_drop_policy_discards_while_full(self):
+        service = make_service()
+
+        async def scenario():
+            queue = asyncio.Queue(maxsize=1)
+            subscription = service._new_subscription(queue, None, None, overflow_policy="drop")
+            service.subscriptions["session:s1:results"] = [subscription]
+            for value in range(3):
+                await service._dispatch(message(value))
+            return queue.get_nowait(), subscription["dropped_count"]
+
+        self.assertEqual(asyncio.run(scenario()), (0, 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import asyncio
+import time
+import unittest
+
+from app.services.profiling import SamplingProfiler, collapsed, flamegraph_svg, tag_session
+
+
+def busy(seconds):
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        sum(range(1000))
+
+
+class TestSamplingProfiler(unittest.TestCase):
+    def test_idle_profiler_has_no_thread(self):
+        profiler = SamplingProfiler()
+        self.assertFalse(profiler.is_running())
+        self.assertEqual(profiler.stop(), {})
+
+    def test_samples_are_attributed_to_tagged_sessions(self):
+        profiler = SamplingProfiler()
+
+        async def work(session_id):
+            tag_session(session_id)
+            for _ in range(10):
+                busy(0.01)
+                await asyncio.sleep(0)
+
+        async def run():
+            profiler.start(5.0, interval=0.002)
+            with self.assertRaises(RuntimeError):
+                profiler.start(1.0)
+            await asyncio.gather(work("session-a"), work("session-b"))
+            return await asyncio.to_thread(profiler.stop)
+
+        result = asyncio.run(run())
+        self.assertFalse(profiler.is_running())
+        self.assertGreater(result["samples"], 0)
+        self.assertIn("session-a", result["by_session"])
+        self.assertIn("session-b", result["by_session"])
+        self.assertTrue(any("busy (" in stack for stack in result["stacks"]))
+
+    def test_profile_ends_at_its_deadline(self):
+        profiler = SamplingProfiler()
+        profiler.start(0.05, interval=0.002)
+        busy(0.2)
+        self.assertFalse(profiler.is_running())
+        self.assertGreater(profiler.result()["samples"], 0)
+        self.assertEqual(profiler.stop(), profiler.result())
+
+        profiler.start(0.01)
+        profiler.stop()
+        self.assertEqual(profiler.get_stats()["profiles"], 2)
+
+    def test_interval_is_clamped_to_the_minimum(self):
+        profiler = SamplingProfiler(min_interval=0.002)
+        for interval in (0.0, -1.0):
+            with self.subTest(interval=interval):
+                self.assertEqual(profiler.start(0.05, interval=interval)["interval"], 0.002)
+                result = profiler.stop()
+                self.assertEqual(result["interval"], 0.002)
+                self.assertLess(result["samples"], 100)
+
+    def test_output_formats(self):
+        result = {"stacks": {"task:a;session:s;main (x.py:1);busy (x.py:5)": 3, "loop;idle": 1}}
+        self.assertEqual(collapsed(result), "task:a;session:s;main (x.py:1);busy (x.py:5) 3\nloop;idle 1\n")
+        svg = flamegraph_svg(result)
+        self.assertTrue(svg.startswith("<svg"))
+        self.assertEqual(svg.count("<rect"), 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+import asyncio
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from types import SimpleNamespace
+from typing import List, Optional
+
+import pytest
+from pydantic import BaseModel
+
+import seed_context_index
+import seed_index
+from app.services.cache.ingestion import IngestionPipeline, fields_from_schema
+from app.services.cache.index_registry import index_registry
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Seed modules whose records build without the application container
+SEED_SOURCES = {
+    "messages": "seed_messages_index:get_messages_seed_data",
+    "outputs": "seed_outputs_index:get_outputs_seed_data",
+    "user_context": "seed_user_context_index:get_user_context_seed_data",
+    "agents": "seed_prompts_index:get_prompts_seed_data",
+    "workflow": "seed_workflow_index:get_workflow_seed_data",
+}
+
+
+async def embed(texts):
+    return [[0.0] * 384 for _ in texts]
+
+
+def stub_redis(client):
+    async def get_index(index_name):
+        # fakeredis has no search module; only the records are checked here
+        return None
+
+    return SimpleNamespace(client=client, get_index=get_index, ingestion=IngestionPipeline(lambda: client, embed, chunk_size=2))
+
+
+class StubContext(BaseModel):
+    input_description: str
+
+
+class StubNode(BaseModel):
+    name: str
+    context_info: Optional[StubContext] = None
+    collection: Optional[List["StubNode"]] = None
+
+
+class TestSeedIndex(unittest.TestCase):
+    @pytest.fixture(autouse=True)
+    def use_fake_redis(self, fake_redis):
+        self.client = fake_redis
+
+    def test_list_from_the_command_line(self):
+        result = subprocess.run([sys.executable, "seed_index.py", "--list"], cwd=ROOT, capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertIn("messages", result.stdout.split())
+
+    def test_main_lists_indexes(self):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.assertEqual(seed_index.main(["--list"]), 0)
+        self.assertEqual(output.getvalue().split(), seed_index.available_indexes())
+
+    def test_rebuild_needs_no_source(self):
+        args = seed_index.parse_args(["messages", "--rebuild"])
+        self.assertTrue(args.rebuild)
+        self.assertIsNone(args.source)
+        with contextlib.redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+            seed_index.parse_args(["messages"])
+
+    def test_load_against_fakeredis(self):
+        source = os.path.join(tempfile.mkdtemp(), "messages.jsonl")
+        with open(source, "w") as f:
+            for i in range(5):
+                f.write(json.dumps({"id": i, "agent_name": f"agent{i}", "message": f"hello {i}"}) + "\n")
+
+        async def load_twice():
+            redis = stub_redis(self.client)
+            args = seed_index.parse_args(["messages", "--source", source])
+            first = await seed_index.ingest(redis, "messages", source, args)
+            second = await seed_index.ingest(redis, "messages", source, args)
+            stored = await self.client.hgetall("message:3")
+            return first, second, stored
+
+        first, second, stored = asyncio.run(load_twice())
+        self.assertEqual((first["records"], first["written"]), (5, 5))
+        self.assertEqual((second["written"], second["unchanged"]), (0, 5))
+        self.assertEqual(stored[b"message"], b"hello 3")
+        self.assertIn(b"message_vector", stored)
+
+    def test_seed_modules_are_module_function_sources(self):
+        pipeline = IngestionPipeline(lambda: self.client, embed)
+        for index_name, source in SEED_SOURCES.items():
+            with self.subTest(index_name):
+                fields, _ = fields_from_schema(index_registry.get_schema(index_name))
+                records = list(seed_index.iter_source(source))
+                self.assertGreater(len(records), 0)
+                for record in records:
+                    _, stored = pipeline.build_record(record, fields)
+                    # Every record fills fields of the index it is seeded into
+                    self.assertTrue(any(stored[field] for field in fields), stored)
+
+    def test_load_seed_module(self):
+        source = SEED_SOURCES["outputs"]
+
+        async def load():
+            args = seed_index.parse_args(["outputs", "--source", source])
+            result = await seed_index.ingest(stub_redis(self.client), "outputs", source, args)
+            return result, await self.client.hgetall("output:0")
+
+        result, stored = asyncio.run(load())
+        self.assertEqual(result["written"], len(list(seed_index.iter_source(source))))
+        self.assertEqual(stored[b"context_key"], b"IntakeAgent")
+        self.assertIn(b"metadata_vector", stored)
+
+    def test_context_collections_are_flattened_under_their_parent(self):
+        leaf = StubNode(name="leaf", context_info=StubContext(input_description="c"))
+        root = StubNode(name="root", context_info=StubContext(input_description="a"), collection=[
+            StubNode(name="child", context_info=StubContext(input_description="b"), collection=[leaf]),
+            StubNode(name="no context"),
+        ])
+
+        records = list(seed_context_index._flatten(root, "0"))
+
+        self.assertEqual([(r["id"], r["name"], r.get("parent_id")) for r in records], [
+            ("0", "root", None), ("0:0", "child", "context:0"), ("0:0:0", "leaf", "context:0:0"),
+        ])
+        self.assertNotIn("collection", records[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+import asyncio
+import unittest
+
+from app.services.supabase.rest_client import SupabaseRestClient, build_filters
+
+
+class RecordingClient(SupabaseRestClient):
+    def __init__(self, **kwargs):
+        super().__init__("https://example.supabase.co", "key", **kwargs)
+        self.calls = []
+
+    async def _request(self, method, path, params=None, json=None, prefer=None):
+        self.calls.append((method, path, params, json, prefer))
+        return None
+
+
+class TestSupabaseRestClient(unittest.TestCase):
+    def test_build_filters(self):
+        self.assertEqual(
+            build_filters({"user_id": "u1", "id": ["a", 'b"c'], "deleted_at": None}),
+            {"user_id": "eq.u1", "id": 'in.("a","b\\"c")', "deleted_at": "is.null"}
+        )
+
+    def test_upsert_groups_rows_by_columns_and_chunks(self):
+        client = RecordingClient(chunk_size=2)
+        rows = [{"id": 1, "a": 1}, {"id": 2, "a": 2}, {"id": 3, "a": 3}, {"id": 4, "b": 4}]
+        asyncio.run(client.upsert("videos", rows))
+        self.assertEqual([len(call[3]) for call in client.calls], [2, 1, 1])
+        self.assertTrue(all(call[2] == {"on_conflict": "id"} for call in client.calls))
+        self.assertTrue(all(call[4].startswith("resolution=merge-duplicates") for call in client.calls))
+
+    def test_bulk_delete_uses_one_in_filter_per_chunk(self):
+        client = RecordingClient(chunk_size=2)
+        asyncio.run(client.delete("videos", {"id": [1, 2, 3]}))
+        self.assertEqual([call[2] for call in client.calls], [{"id": 'in.("1","2")'}, {"id": 'in.("3")'}])
+        with self.assertRaises(ValueError):
+            asyncio.run(client.delete("videos", {}))
+
+
+if __name__ == '__main__':
+    unittest.main()
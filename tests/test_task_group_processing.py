@@ -0,0 +1,66 @@
+import asyncio
+import logging
+import unittest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+from app.models.ContextInfo import ContextInfo
+from app.models.TaskGroup import TaskGroup
+
+
+class StubRedis:
+    """Records subscriptions and delivers messages to them the way RedisService does."""
+
+    def __init__(self):
+        self.subscriptions = {}
+        self.client = SimpleNamespace(mget=AsyncMock(side_effect=lambda keys: [None] * len(keys)))
+        self.publish_many = AsyncMock()
+
+    async def subscribe(self, channel, queue, callback=None, **kwargs):
+        self.subscriptions[channel] = (queue, callback)
+
+    async def unsubscribe(self, channel, queue):
+        self.subscriptions.pop(channel, None)
+
+    def deliver(self, channel, data):
+        queue, callback = self.subscriptions[channel]
+        queue.put_nowait((callback, data))
+
+
+def task(name, result_keys=()):
+    return {"name": name, "agent_class": "Writer", "message_template": "Do {name}", "shared_instructions": "", "result_keys": list(result_keys), "tools": []}
+
+
+class TestProcessTasks(unittest.TestCase):
+    def test_processor_side_failure_frees_the_slot_and_ends_the_run(self):
+        redis = StubRedis()
+        dispatched = []
+
+        async def execute_task(group, task_info):
+            dispatched.append(task_info.name)
+            if task_info.name == "draft":
+                redis.deliver("session:s1:task_failed:draft", {"type": "task_failed", "task_name": "draft", "error": "boom"})
+            else:
+                redis.deliver("session:s1:task_done:notify", {"type": "task_done", "task_name": "notify"})
+
+        async def scenario():
+            with patch("containers.get_container", return_value=SimpleNamespace(redis=lambda: redis)), \
+                    patch("app.models.TaskGroup.configure_logger", return_value=logging.getLogger(__name__)):
+                group = TaskGroup(
+                    key="task_group:g1", id="g1", name="group", session_id="s1",
+                    context_info=ContextInfo(context={}), max_concurrency=1,
+                    tasks=[task("draft", ["draft_text"]), task("notify")],
+                )
+            with patch.object(TaskGroup, "execute_task", execute_task):
+                await asyncio.wait_for(group.process_tasks(timeout=30), timeout=2)
+            return group
+
+        group = asyncio.run(scenario())
+        self.assertEqual(dispatched, ["draft", "notify"])
+        self.assertEqual(group.tasks_failed, {"draft": "boom"})
+        self.assertEqual(group.tasks_completed, {"notify"})
+        self.assertEqual(redis.subscriptions, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
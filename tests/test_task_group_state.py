@@ -0,0 +1,100 @@
+import asyncio
+import json
+import unittest
+
+import pytest
+
+from app.models.task_group_state import TaskGroupStateStore
+
+HEADER = {"id": "g1", "name": "group", "session_id": "s1"}
+
+
+class TestTaskGroupStateStore(unittest.TestCase):
+    @pytest.fixture(autouse=True)
+    def use_fake_redis(self, fake_redis):
+        self.client = fake_redis
+
+    def run_with_client(self, scenario):
+        return asyncio.run(scenario(self.client))
+
+    async def save(self, store, client, context, tasks=None):
+        return await store.save(client, header=HEADER, task_states=tasks or {}, received_results={}, context=context)
+
+    def test_deltas_are_replayed_onto_the_snapshot(self):
+        async def scenario(client):
+            store = TaskGroupStateStore("g1")
+            base = {"filler": "x" * 500, "a": 1, "b": 2}
+            await self.save(store, client, base)
+            await self.save(store, client, {**base, "a": 10})
+            await self.save(store, client, {"filler": base["filler"], "a": 10, "c": 3})
+            deltas = await client.lrange(store.deltas_key, 0, -1)
+            return deltas, await TaskGroupStateStore("g1").load(client)
+
+        deltas, state = self.run_with_client(scenario)
+        self.assertEqual(len(deltas), 2)
+        self.assertEqual(json.loads(deltas[1]), {"set": {"c": 3}, "del": ["b"]})
+        self.assertEqual(state["context"], {"filler": "x" * 500, "a": 10, "c": 3})
+
+    def test_unchanged_state_sends_nothing(self):
+        async def scenario(client):
+            store = TaskGroupStateStore("g1")
+            await self.save(store, client, {"a": 1}, tasks={"t1": {"status": "running"}})
+            return await self.save(store, client, {"a": 1}, tasks={"t1": {"status": "running"}})
+
+        self.assertEqual(self.run_with_client(scenario), 0)
+
+    def test_deltas_are_compacted_into_a_new_snapshot(self):
+        async def scenario(client):
+            store = TaskGroupStateStore("g1", compact_every=3)
+            context = {"filler": "x" * 500, "n": 0}
+            await self.save(store, client, context)
+            for n in range(1, 4):
+                await self.save(store, client, {**context, "n": n})
+            snapshot = json.loads(await client.get(store.context_key))
+            return snapshot, await client.llen(store.deltas_key), await TaskGroupStateStore("g1").load(client)
+
+        snapshot, delta_count, state = self.run_with_client(scenario)
+        self.assertEqual(snapshot["n"], 3)
+        self.assertEqual(delta_count, 0)
+        self.assertEqual(state["context"]["n"], 3)
+
+    def test_concurrent_saves_replay_in_call_order(self):
+        async def scenario(client):
+            store = TaskGroupStateStore("g1")
+            filler = "x" * 500
+            await self.save(store, client, {"filler": filler, "value": 0})
+            await asyncio.gather(*(self.save(store, client, {"filler": filler, "value": n}) for n in range(1, 6)))
+            return await TaskGroupStateStore("g1").load(client)
+
+        self.assertEqual(self.run_with_client(scenario)["context"]["value"], 5)
+
+    def test_legacy_header_layout_is_loaded(self):
+        async def scenario(client):
+            store = TaskGroupStateStore("g1")
+            await client.set(store.state_key, json.dumps({
+                **HEADER,
+                "version": "2.0",
+                "tasks_completed": ["t1"],
+                "tasks_failed": {"t2": "boom"},
+                "running_tasks": ["t3"],
+                "received_results": {"r1": [{"v": 1}]},
+            }))
+            await client.set(store.context_key, json.dumps({"a": 1}))
+            state = await store.load(client)
+            # The first save after a legacy load rewrites the header in the current layout
+            await self.save(store, client, state["context"], tasks=state["tasks"])
+            return state, json.loads(await client.get(store.state_key))
+
+        state, header = self.run_with_client(scenario)
+        self.assertEqual(state["tasks"], {
+            "t1": {"status": "completed"},
+            "t2": {"status": "failed", "error": "boom"},
+            "t3": {"status": "running"},
+        })
+        self.assertEqual(state["received"], {"r1": [{"v": 1}]})
+        self.assertEqual(state["context"], {"a": 1})
+        self.assertEqual(header["version"], TaskGroupStateStore.VERSION)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+import asyncio
+import json
+import unittest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.models.TaskInfo import TaskInfo
+from app.models.TaskProcessor import TaskProcessor
+
+
+class TestExecuteSingleTask(unittest.TestCase):
+    def test_agent_receives_rendered_message_template(self):
+        task = TaskInfo(
+            key="task:summary",
+            name="summary",
+            agent_class="Writer",
+            message_template="Summarize {topic} for {user}",
+            shared_instructions="Write for {user}",
+            result_keys=["summary"],
+            tools=[],
+        )
+        agent = SimpleNamespace(context_info=SimpleNamespace(context={"summary": "done"}))
+        processor = SimpleNamespace(
+            session_id="session-1",
+            context_info=SimpleNamespace(context={"topic": "fan-in barriers", "user": "Ada"}),
+            task_info=task,
+            _task_logger=MagicMock(),
+            _redis=SimpleNamespace(client=SimpleNamespace(hset=AsyncMock())),
+            _notify_subscribers=AsyncMock(),
+            mark_task_completed=AsyncMock(),
+        )
+        agency = MagicMock(get_completion=AsyncMock())
+
+        with patch("app.factories.agent_factory.AgentFactory.from_name", AsyncMock(return_value=agent)), \
+                patch("app.models.TaskProcessor.Agency", return_value=agency):
+            outputs = asyncio.run(TaskProcessor._execute_single_task(processor, task, tools=[]))
+
+        agency.get_completion.assert_awaited_once_with("Summarize fan-in barriers for Ada", additional_instructions="Write for Ada")
+        self.assertEqual(outputs, {"summary": "done"})
+        processor.mark_task_completed.assert_awaited_once_with("summary", results={"summary": "done"})
+
+
+class TestExpandTask(unittest.TestCase):
+    def make_processor(self):
+        task = TaskInfo(
+            key="task:review",
+            name="review",
+            agent_class="Reviewer",
+            message_template="Review {document}",
+            shared_instructions="Be specific",
+            result_keys=["reviews"],
+            dependencies=["documents"],
+            expansion_config={"array_mapping": {"document": "documents"}, "identifiers": {"document": "id"}},
+            tools=[],
+        )
+        redis = SimpleNamespace(
+            client=SimpleNamespace(hset=AsyncMock()),
+            barriers=SimpleNamespace(create=AsyncMock(return_value=True), results=AsyncMock(return_value={})),
+            context_snapshots=SimpleNamespace(put=AsyncMock(return_value="ctx:1")),
+        )
+        processor = SimpleNamespace(
+            session_id="session-1",
+            lane=None,
+            context_info=SimpleNamespace(context={"documents": []}),
+            task_info=task,
+            _task_logger=MagicMock(),
+            _redis=redis,
+            _event_handler=SimpleNamespace(handle_event=AsyncMock()),
+            _notify_subscribers=AsyncMock(),
+        )
+        processor._publish_expansion_results = lambda *args: TaskProcessor._publish_expansion_results(processor, *args)
+        return processor
+
+    def test_empty_expansion_publishes_empty_results(self):
+        processor = self.make_processor()
+        kafka = SimpleNamespace(send_many=AsyncMock())
+
+        with patch("app.models.task_expansion.TaskExpansion._expand_array_task", return_value=[]), \
+                patch("containers.get_container", return_value=SimpleNamespace(kafka=lambda: kafka)):
+            self.assertIsNone(asyncio.run(TaskProcessor.execute_task(processor)))
+
+        processor._redis.barriers.create.assert_awaited_once_with("task:review", 0)
+        kafka.send_many.assert_not_awaited()
+        processor._redis.client.hset.assert_awaited_once_with("session:session-1:task_results", "reviews", "[]")
+        processor._notify_subscribers.assert_awaited_once_with({"task_name": "review", "result_key": "reviews", "value": []})
+        self.assertEqual(processor.context_info.context["reviews"], [])
+
+
+class TestMarkTaskFailed(unittest.TestCase):
+    def mark_failed(self, **task_fields):
+        task = TaskInfo(
+            key="task_execute:session-1:review:0",
+            name="review_doc-1",
+            agent_class="Reviewer",
+            message_template="Review",
+            shared_instructions="",
+            result_keys=["reviews"],
+            tools=[],
+            **task_fields,
+        )
+        processor = SimpleNamespace(
+            session_id="session-1",
+            task_info=task,
+            tasks_running=set(),
+            tasks_failed={},
+            _tasks_lock=asyncio.Lock(),
+            _task_logger=MagicMock(),
+            _redis=SimpleNamespace(publish=AsyncMock()),
+            _event_handler=SimpleNamespace(handle_event=AsyncMock()),
+            cleanup_task_resources=AsyncMock(),
+        )
+        processor._group_task_name = lambda name: TaskProcessor._group_task_name(processor, name)
+        asyncio.run(TaskProcessor.mark_task_failed(processor, task.name, "boom"))
+        return processor._redis.publish
+
+    def test_failure_is_published_to_the_group(self):
+        publish = self.mark_failed()
+        publish.assert_awaited_once_with(
+            "session:session-1:task_failed:review_doc-1",
+            json.dumps({"type": "task_failed", "task_name": "review_doc-1", "error": "boom"})
+        )
+
+    def test_expanded_task_failure_fails_its_parent(self):
+        publish = self.mark_failed(is_expanded_task=True, parent_task_key="task_execute:session-1:review")
+        self.assertEqual(publish.await_args.args[0], "session:session-1:task_failed:review")
+
+
+if __name__ == '__main__':
+    unittest.main()
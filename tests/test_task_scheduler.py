@@ -0,0 +1,86 @@
+import unittest
+from app.models.task_scheduler import TaskScheduler
+from app.utilities.errors import ConfigurationError, DependencyError
+
+
+class TestTaskScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.tasks = [
+            {"name": "gather", "result_keys": ["details"]},
+            {"name": "research", "dependencies": ["details"], "result_keys": ["research"]},
+            {"name": "profile", "result_keys": ["profile"]},
+            {"name": "summary", "dependencies": ["research", "user_input"], "result_keys": ["summary"]},
+        ]
+
+    def test_releases_task_when_last_dependency_resolves(self):
+        scheduler = TaskScheduler(self.tasks)
+        self.assertEqual(scheduler.take_ready(), ["gather", "profile"])
+        self.assertEqual(scheduler.take_ready(), [])
+
+        scheduler.resolve("details")
+        self.assertEqual(scheduler.take_ready(), ["research"])
+        scheduler.resolve("research")
+        # user_input is not produced in the group, so it does not gate the task
+        self.assertEqual(scheduler.take_ready(), ["summary"])
+
+    def test_critical_path_first_under_concurrency_cap(self):
+        scheduler = TaskScheduler(self.tasks, max_concurrency=1)
+        self.assertEqual(scheduler.take_ready(), ["gather"])
+        scheduler.resolve("details")
+        self.assertEqual(scheduler.take_ready(), ["research"])
+        self.assertNotIn("profile", scheduler.dispatched)
+
+    def test_available_keys_are_resolved_at_load(self):
+        scheduler = TaskScheduler(self.tasks, available_keys=["details"])
+        self.assertIn("research", scheduler.take_ready())
+
+    def test_idle_after_all_results(self):
+        scheduler = TaskScheduler(self.tasks)
+        for key in ["details", "profile", "research", "summary"]:
+            scheduler.take_ready()
+            scheduler.resolve(key)
+        self.assertTrue(scheduler.is_idle)
+        self.assertEqual(scheduler.completed, {"gather", "research", "profile", "summary"})
+
+    def test_failure_blocks_dependents_until_retry(self):
+        scheduler = TaskScheduler(self.tasks)
+        scheduler.take_ready()
+        scheduler.fail("gather")
+        scheduler.resolve("profile")
+        self.assertTrue(scheduler.is_idle)
+        self.assertEqual(scheduler.blocked, {"research", "summary"})
+
+        scheduler.retry("gather")
+        self.assertEqual(scheduler.take_ready(), ["gather"])
+
+    def test_already_published_results_skip_dispatch(self):
+        scheduler = TaskScheduler(self.tasks)
+        scheduler.resolve("profile")
+        self.assertEqual(scheduler.take_ready(), ["gather"])
+        self.assertIn("profile", scheduler.completed)
+
+    def test_task_without_result_keys_holds_a_slot_until_completed(self):
+        tasks = [{"name": "notify"}, {"name": "profile", "result_keys": ["profile"]}]
+        scheduler = TaskScheduler(tasks, max_concurrency=1)
+        self.assertEqual(scheduler.take_ready(), ["notify"])
+        self.assertEqual(scheduler.take_ready(), [])
+        self.assertFalse(scheduler.is_idle)
+
+        scheduler.complete("notify")
+        self.assertEqual(scheduler.take_ready(), ["profile"])
+
+    def test_cycle_detected_at_load(self):
+        tasks = [
+            {"name": "a", "dependencies": ["y"], "result_keys": ["x"]},
+            {"name": "b", "dependencies": ["x"], "result_keys": ["y"]},
+        ]
+        with self.assertRaises(DependencyError):
+            TaskScheduler(tasks)
+
+    def test_duplicate_task_names_rejected(self):
+        with self.assertRaises(ConfigurationError):
+            TaskScheduler([{"name": "a"}, {"name": "a"}])
+
+if __name__ == '__main__':
+    unittest.main()
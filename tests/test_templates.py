@@ -0,0 +1,44 @@
+import unittest
+from app.utilities.templates import FORMAT, PLACEHOLDER, TemplateValues, compile_template
+
+
+class TestCompiledTemplate(unittest.TestCase):
+
+    def test_format_style_matches_str_format(self):
+        context = {"name": "Ada", "items": ["a", "b"], "score": 3.14159, "info": {"city": "Paris"}}
+        for source in ["Hi {name}!", "{{literal}} {name!r}", "{score:.2f} {items[1]}", "{info[city]}", "{score:{width}}"]:
+            values = TemplateValues({**context, "width": 8})
+            self.assertEqual(compile_template(source, FORMAT).render(values), source.format(**context, width=8))
+
+    def test_format_style_field_paths(self):
+        values = TemplateValues({"num": 1 + 2j, "rows": [{"id": 7}]})
+        self.assertEqual(compile_template("{num.imag} {rows[0][id]}").render(values), "2.0 7")
+        for source in ["{num.}", "{rows[0}", "{rows[0]x}"]:
+            with self.assertRaises(ValueError):
+                compile_template(source).render(values)
+
+    def test_format_style_reports_missing_keys(self):
+        template = compile_template("{name} lives in {city}")
+        self.assertEqual(template.missing(TemplateValues({"name": "Ada"})), ["city"])
+        self.assertEqual(template.missing(TemplateValues({"name": "Ada"}), {"city": "Paris"}), [])
+        with self.assertRaises(KeyError):
+            template.render(TemplateValues({"name": "Ada"}))
+
+    def test_placeholder_style_leaves_unknown_braces(self):
+        template = compile_template('Use {name} with {"json": 1} and {unknown}', PLACEHOLDER)
+        self.assertEqual(template.render(TemplateValues({"name": "Ada"}, str)), 'Use Ada with {"json": 1} and {unknown}')
+
+    def test_only_referenced_values_are_formatted_once(self):
+        calls = []
+        values = TemplateValues({"a": 1, "b": 2}, format_value=lambda v: calls.append(v) or str(v))
+        template = compile_template("{a}-{a}")
+        self.assertEqual(template.render(values), "1-1")
+        self.assertEqual(template.render(values, {"b": 3}), "1-1")
+        self.assertEqual(calls, [1])
+
+    def test_overrides_take_precedence(self):
+        values = TemplateValues({"url": "context"})
+        self.assertEqual(compile_template("{url}").render(values, {"url": "item"}), "item")
+
+if __name__ == '__main__':
+    unittest.main()
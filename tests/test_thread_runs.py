@@ -0,0 +1,171 @@
+import asyncio
+import json
+import logging
+import unittest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import httpx
+from openai import APIError
+
+from app.models.thread import Thread
+
+
+class FakeStream:
+    """Async run stream that feeds scripted events to the handler, then reports the final run."""
+
+    def __init__(self, event_handler, run, events):
+        self.event_handler = event_handler
+        self.run = run
+        self.events = events
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def until_done(self):
+        for event in self.events:
+            await self.event_handler.on_event(event)
+
+    async def get_final_run(self):
+        return self.run
+
+
+class FakeRuns:
+    def __init__(self, outcomes):
+        # Runs, or exceptions to raise, in the order the streams are opened
+        self.outcomes = list(outcomes)
+        self.streams = []
+        self.submitted = []
+
+    def _open(self, kind, event_handler):
+        outcome = self.outcomes.pop(0)
+        self.streams.append(kind)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return FakeStream(event_handler, outcome, [f"{kind}:{outcome.status}"])
+
+    def stream(self, event_handler, **kwargs):
+        return self._open("run", event_handler)
+
+    def submit_tool_outputs_stream(self, event_handler, tool_outputs, **kwargs):
+        self.submitted.append(tool_outputs)
+        return self._open("submit", event_handler)
+
+
+class FakeMessages:
+    def __init__(self, reply):
+        self.reply = reply
+        self.created = []
+
+    async def create(self, **kwargs):
+        self.created.append(kwargs["content"])
+        return SimpleNamespace(id=f"msg_{len(self.created)}", content=[])
+
+    async def list(self, **kwargs):
+        content = [SimpleNamespace(text=SimpleNamespace(value=self.reply))]
+        return SimpleNamespace(data=[SimpleNamespace(role="assistant", content=content)])
+
+
+class RecordingHandler:
+    """Stands in for AgencyEventHandler: a sync handler class the bridge drives."""
+    events = []
+
+    @classmethod
+    def set_agent(cls, agent):
+        pass
+
+    @classmethod
+    def set_recipient_agent(cls, agent):
+        pass
+
+    def _emit_sse_event(self, event):
+        RecordingHandler.events.append(event)
+
+
+class Echo:
+    ToolConfig = SimpleNamespace(one_call_at_a_time=False, max_concurrency=None)
+
+    def __init__(self, text="", **_):
+        self.text = text
+
+    async def run(self):
+        return f"echo:{self.text}"
+
+
+def make_thread(runs, reply="done"):
+    # Only what get_completion touches; the async client is replaced by the fakes above
+    recipient = SimpleNamespace(
+        id="asst_1", name="Worker", assistant=SimpleNamespace(id="asst_1"), tools=[], functions=[Echo],
+        session_id="s1", context_info=SimpleNamespace(context={}), response_validator=None,
+        max_prompt_tokens=None, max_completion_tokens=None, truncation_strategy=None,
+        parallel_tool_calls=True, additional_instructions=None
+    )
+    thread = Thread.__new__(Thread)
+    thread.logger = logging.getLogger(__name__)
+    thread.agent = SimpleNamespace(name="Caller")
+    thread.recipient_agent = recipient
+    thread.id = "thread_1"
+    thread.thread = SimpleNamespace(id="thread_1")
+    thread.run = None
+    thread.num_run_retries = 0
+    thread._run_steps = 0
+    thread.async_client = SimpleNamespace(beta=SimpleNamespace(threads=SimpleNamespace(runs=runs, messages=FakeMessages(reply))))
+    return thread
+
+
+def requires_action(*tool_calls):
+    return SimpleNamespace(
+        id="run_1", status="requires_action", last_error=None,
+        required_action=SimpleNamespace(submit_tool_outputs=SimpleNamespace(tool_calls=list(tool_calls)))
+    )
+
+
+def server_error():
+    return APIError("The server had an error processing your request", httpx.Request("POST", "https://api.openai.com/v1/threads/runs"), body=None)
+
+
+async def complete(thread, event_handler=None):
+    return [item async for item in thread.get_completion("hello", event_handler=event_handler)]
+
+
+class TestThreadRuns(unittest.TestCase):
+    def setUp(self):
+        RecordingHandler.events = []
+
+    def test_tool_call_round_trip_is_streamed_to_the_handler(self):
+        tool_call = SimpleNamespace(id="call_1", function=SimpleNamespace(name="Echo", arguments=json.dumps({"text": "hi"})))
+        runs = FakeRuns([requires_action(tool_call), SimpleNamespace(id="run_1", status="completed")])
+        thread = make_thread(runs)
+
+        self.assertEqual(asyncio.run(complete(thread, RecordingHandler)), ["done"])
+        self.assertEqual(runs.streams, ["run", "submit"])
+        self.assertEqual(runs.submitted, [[{"tool_call_id": "call_1", "output": "echo:hi"}]])
+        self.assertEqual(RecordingHandler.events, ["run:requires_action", "submit:completed"])
+        self.assertEqual(thread.run.status, "completed")
+        self.assertEqual(thread._run_steps, 1)
+
+    @patch("app.models.thread.asyncio.sleep", new_callable=AsyncMock)
+    def test_server_errors_are_retried_up_to_the_limit(self, sleep):
+        runs = FakeRuns([server_error(), server_error(), SimpleNamespace(id="run_1", status="completed")])
+        thread = make_thread(runs)
+
+        self.assertEqual(asyncio.run(complete(thread)), ["done"])
+        self.assertEqual(runs.streams, ["run", "run", "run"])
+        self.assertEqual(thread.num_run_retries, 2)
+
+    @patch("app.models.thread.asyncio.sleep", new_callable=AsyncMock)
+    def test_retries_stop_after_three_attempts(self, sleep):
+        runs = FakeRuns([server_error() for _ in range(5)])
+        thread = make_thread(runs)
+
+        with self.assertRaises(APIError):
+            asyncio.run(complete(thread))
+        self.assertEqual(len(runs.streams), 4)
+        self.assertEqual([call.args[0] for call in sleep.await_args_list], [1, 2, 3])
+
+
+if __name__ == '__main__':
+    unittest.main()
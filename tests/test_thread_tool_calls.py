@@ -0,0 +1,116 @@
+import asyncio
+import json
+import logging
+import unittest
+from types import SimpleNamespace
+
+from app.models.thread import Thread
+
+
+def make_thread():
+    # Only what _execute_tool_calls and execute_tool use; no OpenAI client
+    thread = Thread.__new__(Thread)
+    thread.logger = logging.getLogger(__name__)
+    return thread
+
+
+def make_agent(*tools):
+    return SimpleNamespace(functions=list(tools), session_id="s1", context_info=SimpleNamespace(context={}))
+
+
+def call(call_id, name, **arguments):
+    return SimpleNamespace(id=call_id, function=SimpleNamespace(name=name, arguments=json.dumps(arguments)))
+
+
+class Probe:
+    """Records how many calls of a tool overlap."""
+
+    def __init__(self):
+        self.running = 0
+        self.max_running = 0
+        self.started = []
+
+    async def enter(self, label):
+        self.started.append(label)
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(0.01)
+        self.running -= 1
+
+
+def make_tool(name, probe, one_call_at_a_time=False, max_concurrency=None, fail_on=None):
+    class ToolConfig:
+        pass
+
+    ToolConfig.one_call_at_a_time = one_call_at_a_time
+    ToolConfig.max_concurrency = max_concurrency
+
+    class Tool:
+        def __init__(self, label="", delay=0, **_):
+            self.label = label
+            self.delay = delay
+
+        async def run(self):
+            await asyncio.sleep(self.delay)
+            await probe.enter(self.label)
+            if self.label == fail_on:
+                raise ValueError(f"{self.label} failed")
+            return f"{name}:{self.label}"
+
+    Tool.__name__ = name
+    Tool.ToolConfig = ToolConfig
+    return Tool
+
+
+class TestExecuteToolCalls(unittest.TestCase):
+    def test_outputs_keep_the_order_of_the_tool_calls(self):
+        probe = Probe()
+        agent = make_agent(make_tool("Search", probe))
+        # Later calls finish first
+        calls = [call(f"c{i}", "Search", label=str(i), delay=0.03 - i * 0.01) for i in range(3)]
+
+        outputs = asyncio.run(make_thread()._execute_tool_calls(calls, agent, None))
+
+        self.assertEqual(outputs, [
+            ("Search", {"tool_call_id": "c0", "output": "Search:0"}),
+            ("Search", {"tool_call_id": "c1", "output": "Search:1"}),
+            ("Search", {"tool_call_id": "c2", "output": "Search:2"}),
+        ])
+        self.assertEqual(probe.started, ["2", "1", "0"])
+        self.assertGreater(probe.max_running, 1)
+
+    def test_one_call_at_a_time_tool_runs_only_its_first_call(self):
+        probe = Probe()
+        agent = make_agent(make_tool("SendMessage", probe, one_call_at_a_time=True))
+        calls = [call("c0", "SendMessage", label="first"), call("c1", "SendMessage", label="second")]
+
+        outputs = asyncio.run(make_thread()._execute_tool_calls(calls, agent, None))
+
+        self.assertEqual(outputs[0][1]["output"], "SendMessage:first")
+        self.assertTrue(outputs[1][1]["output"].startswith("Error: Function SendMessage is already called"))
+        self.assertEqual(probe.started, ["first"])
+
+    def test_tool_max_concurrency_serializes_its_calls(self):
+        serial, parallel = Probe(), Probe()
+        agent = make_agent(make_tool("Write", serial, max_concurrency=1), make_tool("Read", parallel))
+        calls = [call(f"w{i}", "Write", label=str(i)) for i in range(3)] + [call(f"r{i}", "Read", label=str(i)) for i in range(3)]
+
+        asyncio.run(make_thread()._execute_tool_calls(calls, agent, None))
+
+        self.assertEqual(serial.max_running, 1)
+        self.assertEqual(serial.started, ["0", "1", "2"])
+        self.assertEqual(parallel.max_running, 3)
+
+    def test_failing_tool_becomes_its_output_without_cancelling_the_others(self):
+        probe = Probe()
+        agent = make_agent(make_tool("Fetch", probe, fail_on="bad"))
+        calls = [call("c0", "Fetch", label="bad"), call("c1", "Fetch", label="good", delay=0.02)]
+
+        outputs = asyncio.run(make_thread()._execute_tool_calls(calls, agent, None))
+
+        self.assertTrue(outputs[0][1]["output"].startswith("Error: bad failed"))
+        self.assertEqual(outputs[1][1]["output"], "Fetch:good")
+
+
+if __name__ == '__main__':
+    unittest.main()